@@ -18,19 +18,28 @@
 # ------------------------------------------------------------------------------
 
 """This module contains the implementation of an Autonomous Economic Agent."""
+import asyncio
+import functools
+import inspect
 import logging
 from asyncio import AbstractEventLoop
-from typing import Optional, cast, List
+from types import MappingProxyType
+from typing import Dict, Hashable, Optional, cast, List, Set, Tuple
 
-from aea.agent import Agent
+from aea.agent import Agent, AsyncAgent
 from aea.connections.base import Connection
 from aea.context.base import AgentContext
 from aea.crypto.ledger_apis import LedgerApis
 from aea.crypto.wallet import Wallet
 from aea.decision_maker.base import DecisionMaker
-from aea.mail.base import Envelope
+from aea.helpers.async_utils import CoroutineScheduler
+from aea.helpers.base import await_if_awaitable, discard_if_awaitable
+from aea.mail.base import Envelope, Route
+from aea.protocols.base import FieldDecodingError, Message, Protocol, Serializer
 from aea.registries.base import Filter, Resources
+from aea.skills.base import Behaviour, Handler, SkillContext
 from aea.skills.error.handlers import ErrorHandler
+from aea.skills.tasks import TaskManager
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +55,11 @@ class AEA(Agent):
                  loop: Optional[AbstractEventLoop] = None,
                  timeout: float = 0.0,
                  debug: bool = False,
-                 max_reactions: int = 20) -> None:
+                 max_reactions: int = 20,
+                 event_driven: bool = False,
+                 protocol_priorities: Optional[Dict[str, int]] = None,
+                 relay: bool = False,
+                 routes: Optional[Dict[Route, str]] = None) -> None:
         """
         Instantiate the agent.
 
@@ -59,17 +72,34 @@ class AEA(Agent):
         :param timeout: the time in (fractions of) seconds to time out an agent between act and react
         :param debug: if True, run the agent in debug mode.
         :param max_reactions: the processing rate of messages per iteration.
+        :param event_driven: if True, the main loop blocks until an envelope, a decision maker message,
+                           | a due behaviour or task, or the timeout wakes it up.
+        :param protocol_priorities: the priority class of the envelopes, by protocol id. Reactions drain
+                                  | the inbox by weighted round robin over the priority classes.
+        :param relay: if True, the envelopes addressed to other agents are forwarded through the outbox
+                    | as they are, i.e. routed on 'to', 'sender' and 'protocol_id' only, without decoding their message.
+        :param routes: the routing table of the envelopes, mapping pairs (destination address, protocol id)
+                     | to connection ids (see Multiplexer).
 
         :return: None
         """
-        super().__init__(name=name, wallet=wallet, connections=connections, loop=loop, timeout=timeout, debug=debug)
+        super().__init__(name=name, wallet=wallet, connections=connections, loop=loop, timeout=timeout, debug=debug,
+                         event_driven=event_driven, protocol_priorities=protocol_priorities, routes=routes)
 
         self.max_reactions = max_reactions
+        self._relay = relay
+        self._own_addresses = frozenset(self.wallet.public_keys.values())
+        # the dispatch table, refilled whenever a protocol or a handler is added to or removed from the registries.
+        self._protocols = {}  # type: Dict[str, Protocol]
+        self._serializers = {}  # type: Dict[str, Serializer]
+        self._error_handler = None  # type: Optional[ErrorHandler]
+        self._dispatch_version = None  # type: Optional[Tuple[int, int]]
         self._decision_maker = DecisionMaker(self.name,
                                              self.max_reactions,
                                              self.outbox,
                                              self.wallet,
                                              ledger_apis)
+        self._task_manager = TaskManager()
         self._context = AgentContext(self.name,
                                      self.wallet.public_keys,
                                      self.wallet.addresses,
@@ -79,9 +109,24 @@ class AEA(Agent):
                                      self.decision_maker.message_in_queue,
                                      self.decision_maker.ownership_state,
                                      self.decision_maker.preferences,
-                                     self.decision_maker.goal_pursuit_readiness)
+                                     self.decision_maker.goal_pursuit_readiness,
+                                     MappingProxyType(self._serializers),
+                                     self._task_manager)
         self._resources = resources
-        self._filter = Filter(self.resources, self.decision_maker.message_out_queue)
+        self._filter = Filter(self.resources, self.decision_maker.message_out_queue, task_manager=self._task_manager)
+        self.decision_maker.message_in_queue.add_listener(self.wake_up)
+        self.decision_maker.message_out_queue.add_listener(self.wake_up)
+        self._task_manager.completed.add_listener(self.wake_up)
+
+    @property
+    def is_relay(self) -> bool:
+        """Check whether the agent forwards the envelopes addressed to other agents."""
+        return self._relay
+
+    @property
+    def task_manager(self) -> TaskManager:
+        """Get the manager which runs the tasks on their executors."""
+        return self._task_manager
 
     @property
     def decision_maker(self) -> DecisionMaker:
@@ -102,6 +147,7 @@ class AEA(Agent):
     def resources(self, resources: 'Resources'):
         """Set resources."""
         self._resources = resources
+        self._clear_dispatch_table()
 
     @property
     def filter(self) -> Filter:
@@ -116,6 +162,69 @@ class AEA(Agent):
         """
         self.resources.load(self.context)
         self.resources.setup()
+        self._fill_dispatch_table()
+
+    def _fill_dispatch_table(self) -> None:
+        """
+        Fill the dispatch table from the registries, and record their versions.
+
+        :return: None
+        """
+        self._clear_dispatch_table()
+        for protocol in self.resources.protocol_registry.fetch_all():
+            self._add_to_dispatch_table(protocol.id, protocol)
+        self._error_handler = cast(Optional[ErrorHandler],
+                                   self.resources.handler_registry.fetch_by_skill("default", "error"))
+        self._dispatch_version = (self.resources.protocol_registry.version, self.resources.handler_registry.version)
+
+    def _check_dispatch_table(self) -> None:
+        """
+        Refill the dispatch table if a protocol or a handler was added or removed since it was filled.
+
+        :return: None
+        """
+        if self._dispatch_version != (self.resources.protocol_registry.version, self.resources.handler_registry.version):
+            self._fill_dispatch_table()
+
+    def _add_to_dispatch_table(self, protocol_id: str, protocol: Protocol) -> None:
+        """
+        Add a protocol and its serializer to the dispatch table.
+
+        :param protocol_id: the protocol id.
+        :param protocol: the protocol.
+        :return: None
+        """
+        self._protocols[protocol_id] = protocol
+        self._serializers[protocol_id] = protocol.serializer
+
+    def _clear_dispatch_table(self) -> None:
+        """
+        Clear the dispatch table, e.g. when the resources change.
+
+        :return: None
+        """
+        self._protocols.clear()
+        self._serializers.clear()
+        self._error_handler = None
+        self._dispatch_version = None
+
+    @property
+    def error_handler(self) -> ErrorHandler:
+        """Get the error handler of the agent."""
+        self._check_dispatch_table()
+        if self._error_handler is None:
+            error_handler = self.resources.handler_registry.fetch_by_skill("default", "error")
+            assert error_handler is not None, "ErrorHandler not initialized"
+            self._error_handler = cast(ErrorHandler, error_handler)
+        return self._error_handler
+
+    def _get_next_due_delay(self) -> Optional[float]:
+        """
+        Get the time until the next behaviour or task is due.
+
+        :return: the delay in seconds, or None if no behaviour or task will be due.
+        """
+        return self.filter.get_next_due_delay()
 
     def act(self) -> None:
         """
@@ -124,7 +233,7 @@ class AEA(Agent):
         :return: None
         """
         for behaviour in self.filter.get_active_behaviours():
-            behaviour.act()
+            discard_if_awaitable(behaviour.act(), behaviour)
 
     def react(self) -> None:
         """
@@ -143,38 +252,61 @@ class AEA(Agent):
         """
         Handle an envelope.
 
+        If a handler reads a lazy field of the message which cannot be decoded,
+        the error handler replies with a decoding error.
+
         :param envelope: the envelope to handle.
         :return: None
         """
-        logger.debug("Handling envelope: {}".format(envelope))
-        protocol = self.resources.protocol_registry.fetch(envelope.protocol_id)
+        dispatch = self._prepare_dispatch(envelope)
+        if dispatch is None:
+            return
 
-        error_handler = self.resources.handler_registry.fetch_by_skill("default", "error")
-        assert error_handler is not None, "ErrorHandler not initialized"
-        error_handler = cast(ErrorHandler, error_handler)
+        msg, handlers = dispatch
+        try:
+            for handler in handlers:
+                discard_if_awaitable(handler.handle(msg, envelope.sender), handler)
+        except FieldDecodingError:
+            self.error_handler.send_decoding_error(envelope)
+
+    def _prepare_dispatch(self, envelope: Envelope) -> Optional[Tuple[Message, Tuple[Handler, ...]]]:
+        """
+        Decode an envelope and find the handlers for it.
+
+        If the envelope cannot be handled, the error handler replies to the sender.
+        In relay mode, the envelopes addressed to other agents are forwarded instead.
+
+        :param envelope: the envelope to handle.
+        :return: the decoded message and the handlers to dispatch it to, or None if the envelope cannot be handled.
+        """
+        logger.debug("Handling envelope: {}".format(envelope))
+        if self._relay and envelope.to not in self._own_addresses:
+            logger.debug("Relaying envelope: {}".format(envelope))
+            self.outbox.put(envelope)
+            return None
 
+        self._check_dispatch_table()
+        protocol = self._protocols.get(envelope.protocol_id, None)
         if protocol is None:
-            error_handler.send_unsupported_protocol(envelope)
-            return
+            self.error_handler.send_unsupported_protocol(envelope)
+            return None
 
         try:
-            msg = protocol.serializer.decode(envelope.message)
+            msg = self._serializers[envelope.protocol_id].decode(bytes(envelope.message))
         except Exception:
-            error_handler.send_decoding_error(envelope)
-            return
+            self.error_handler.send_decoding_error(envelope)
+            return None
 
-        if not protocol.check(msg):                         # pragma: no cover
-            error_handler.send_invalid_message(envelope)    # pragma: no cover
-            return                                          # pragma: no cover
+        if not protocol.check(msg):                             # pragma: no cover
+            self.error_handler.send_invalid_message(envelope)   # pragma: no cover
+            return None                                         # pragma: no cover
 
         handlers = self.filter.get_active_handlers(protocol.id)
         if handlers is None:
-            if error_handler is not None:
-                error_handler.send_unsupported_skill(envelope)
-            return
+            self.error_handler.send_unsupported_skill(envelope)
+            return None
 
-        for handler in handlers:
-            handler.handle(msg, envelope.sender)
+        return msg, handlers
 
     def update(self) -> None:
         """
@@ -183,7 +315,7 @@ class AEA(Agent):
         :return None
         """
         for task in self.filter.get_active_tasks():
-            task.execute()
+            discard_if_awaitable(self.task_manager.execute(task), task)
         self.decision_maker.execute()
         self.filter.handle_internal_messages()
 
@@ -193,5 +325,200 @@ class AEA(Agent):
 
         :return: None
         """
+        self._task_manager.shutdown()
         if self._resources is not None:
             self._resources.teardown()
+        self._clear_dispatch_table()
+
+
+class AsyncAEA(AsyncAgent, AEA):
+    """
+    This class implements an autonomous economic agent running on the multiplexer's event loop.
+
+    Behaviours, handlers and tasks are called on the event loop thread. Handlers and behaviours
+    which are coroutine functions ('async def') are scheduled concurrently, so that a skill awaiting I/O
+    does not block the other skills nor the connections:
+
+    - the coroutines of a skill run at most 'max_concurrency' at a time (see the skill configuration,
+      DEFAULT_SKILL_CONCURRENCY if not set);
+    - at most SKILL_MAX_BACKLOG coroutines of a skill handling envelopes are pending (running or waiting to run):
+      beyond, the agent stops taking envelopes from the inbox until one of them completes;
+    - the messages of a dialogue (or, for protocols without dialogues, from a sender) are handled in order;
+    - a behaviour does not act again while its previous act is running.
+
+    Coroutine tasks are awaited. The 'timeout' is the maximum idle time between two iterations
+    of the main loop (see AsyncAgent).
+    """
+
+    DEFAULT_SKILL_CONCURRENCY = 10
+    SKILL_MAX_BACKLOG = 100
+
+    _coroutine_scheduler = None  # type: Optional[CoroutineScheduler]
+    _acting_behaviours = None  # type: Optional[Set[Behaviour]]
+
+    @property
+    def coroutine_scheduler(self) -> CoroutineScheduler:
+        """Get the scheduler of the coroutines of the handlers and behaviours."""
+        if self._coroutine_scheduler is None:
+            self._coroutine_scheduler = CoroutineScheduler()
+        return self._coroutine_scheduler
+
+    async def _async_main_loop(self) -> None:
+        """
+        Run the main loop, and cancel the pending coroutines of the skills when it terminates.
+
+        :return: None
+        """
+        try:
+            await super()._async_main_loop()
+        finally:
+            if self._coroutine_scheduler is not None:
+                await self._coroutine_scheduler.close()
+
+    def _schedule(self, coroutine, context: SkillContext, key: Optional[Hashable] = None) -> asyncio.Future:
+        """
+        Schedule the coroutine of a handler or behaviour.
+
+        :param coroutine: the coroutine.
+        :param context: the context of the skill of the handler or behaviour.
+        :param key: the ordering key of the coroutine.
+        :return: the future of the coroutine.
+        """
+        limit = context.max_concurrency or self.DEFAULT_SKILL_CONCURRENCY
+        return self.coroutine_scheduler.submit(coroutine, context, limit, key)
+
+    async def async_act(self) -> None:
+        """
+        Perform actions.
+
+        :return: None
+        """
+        if self._acting_behaviours is None:
+            self._acting_behaviours = set()
+        acting_behaviours = self._acting_behaviours
+        for behaviour in self.filter.get_active_behaviours():
+            if behaviour in acting_behaviours:
+                continue
+            result = behaviour.act()
+            if inspect.isawaitable(result):
+                acting_behaviours.add(behaviour)
+                future = self._schedule(result, behaviour.context)
+                future.add_done_callback(functools.partial(self._on_act_done, behaviour))
+
+    def _on_act_done(self, behaviour: Behaviour, future: asyncio.Future) -> None:
+        """
+        Allow a behaviour to act again once its coroutine completed.
+
+        :param behaviour: the behaviour.
+        :param future: the future of its act coroutine.
+        :return: None
+        """
+        if self._acting_behaviours is not None:
+            self._acting_behaviours.discard(behaviour)
+
+    async def async_react(self) -> None:
+        """
+        React to incoming events (envelopes).
+
+        :return: None
+        """
+        counter = 0
+        while not self.inbox.empty() and counter < self.max_reactions:
+            counter += 1
+            envelope = self.inbox.get_nowait()  # type: Optional[Envelope]
+            if envelope is not None:
+                await self._async_handle(envelope)
+
+    async def _async_handle(self, envelope: Envelope) -> None:
+        """
+        Handle an envelope.
+
+        If a handler reads a lazy field of the message which cannot be decoded,
+        the error handler replies with a decoding error.
+
+        :param envelope: the envelope to handle.
+        :return: None
+        """
+        dispatch = self._prepare_dispatch(envelope)
+        if dispatch is None:
+            return
+
+        msg, handlers = dispatch
+        for handler in handlers:
+            try:
+                result = handler.handle(msg, envelope.sender)
+            except FieldDecodingError:
+                self.error_handler.send_decoding_error(envelope)
+                return
+            if inspect.isawaitable(result):
+                await self._wait_for_room(result, handler.context)
+                self._schedule(self._reply_to_decoding_error(result, envelope), handler.context,
+                               self._get_ordering_key(handler, msg, envelope))
+
+    async def _wait_for_room(self, coroutine, context: SkillContext) -> None:
+        """
+        Wait until the backlog of the coroutines of a skill is below SKILL_MAX_BACKLOG.
+
+        :param coroutine: the coroutine to schedule next, closed if the wait is cancelled.
+        :param context: the context of the skill.
+        :return: None
+        """
+        try:
+            await self.coroutine_scheduler.wait_for_room(context, self.SKILL_MAX_BACKLOG)
+        except asyncio.CancelledError:
+            close = getattr(coroutine, "close", None)
+            if close is not None:
+                close()
+            raise
+
+    async def _reply_to_decoding_error(self, coroutine, envelope: Envelope) -> None:
+        """
+        Await the coroutine of a handler, replying with a decoding error if a lazy field of the message is malformed.
+
+        :param coroutine: the coroutine returned by the handler.
+        :param envelope: the envelope of the message.
+        :return: None
+        """
+        try:
+            await coroutine
+        except FieldDecodingError:
+            self.error_handler.send_decoding_error(envelope)
+
+    @staticmethod
+    def _get_ordering_key(handler: Handler, msg: Message, envelope: Envelope) -> Hashable:
+        """
+        Get the ordering key of the handling of a message: its handler, sender and dialogue, if any.
+
+        :param handler: the handler.
+        :param msg: the message.
+        :param envelope: the envelope of the message.
+        :return: the key.
+        """
+        dialogue_reference = msg.get("dialogue_reference") if msg.is_set("dialogue_reference") else None
+        # the starter reference identifies the dialogue from its first message on.
+        dialogue = dialogue_reference[0] if dialogue_reference is not None else None
+        return handler, envelope.sender, dialogue
+
+    async def async_update(self) -> None:
+        """
+        Update the current state of the agent.
+
+        :return None
+        """
+        for task in self.filter.get_active_tasks():
+            await await_if_awaitable(self.task_manager.execute(task))
+        self.decision_maker.execute()
+        self.filter.handle_internal_messages(self._dispatch_internal_message)
+
+    def _dispatch_internal_message(self, handler: Handler, message: Message, sender: str) -> None:
+        """
+        Handle an internal message, scheduling the coroutine of an async handler.
+
+        :param handler: the handler.
+        :param message: the message from the decision maker or the task manager.
+        :param sender: the sender of the message.
+        :return: None
+        """
+        result = handler.handle(message, sender)
+        if inspect.isawaitable(result):
+            self._schedule(result, handler.context, (handler, sender))
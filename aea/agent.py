@@ -20,16 +20,19 @@
 
 """This module contains the implementation of a template agent."""
 
+import asyncio
 import logging
 import time
 from abc import abstractmethod, ABC
 from asyncio import AbstractEventLoop
+from concurrent.futures import Future
 from enum import Enum
-from typing import Optional, List
+from threading import Event
+from typing import Dict, Optional, List
 
 from aea.connections.base import Connection
 from aea.crypto.wallet import Wallet
-from aea.mail.base import InBox, OutBox, Multiplexer
+from aea.mail.base import InBox, OutBox, Multiplexer, Route
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +66,10 @@ class Agent(ABC):
                  wallet: Wallet,
                  loop: Optional[AbstractEventLoop] = None,
                  timeout: float = 1.0,
-                 debug: bool = False) -> None:
+                 debug: bool = False,
+                 event_driven: bool = False,
+                 protocol_priorities: Optional[Dict[str, int]] = None,
+                 routes: Optional[Dict[Route, str]] = None) -> None:
         """
         Instantiate the agent.
 
@@ -71,8 +77,13 @@ class Agent(ABC):
         :param connections: the list of connections of the agent.
         :param wallet: the crypto wallet of the agent.
         :param loop: the event loop to run the connections.
-        :param timeout: the time in (fractions of) seconds to time out an agent between act and react
+        :param timeout: the time in (fractions of) seconds to time out an agent between act and react.
+                      | In event-driven mode, it is the maximum time the agent stays idle
+                      | waiting for a wakeup signal (a non-positive value means no limit).
         :param debug: if True, run the agent in debug mode.
+        :param event_driven: if True, the main loop blocks on a wakeup signal instead of sleeping.
+        :param protocol_priorities: the priority class of the envelopes, by protocol id (see Multiplexer).
+        :param routes: the routing table of the envelopes, by destination address and protocol id (see Multiplexer).
 
         :return: None
         """
@@ -80,11 +91,15 @@ class Agent(ABC):
         self._connections = connections
         self._wallet = wallet
 
-        self._multiplexer = Multiplexer(self._connections, loop=loop)
+        self._multiplexer = Multiplexer(self._connections, loop=loop, protocol_priorities=protocol_priorities,
+                                        routes=routes)
         self._inbox = InBox(self._multiplexer)
         self._outbox = OutBox(self._multiplexer)
         self._liveness = Liveness()
         self._timeout = timeout
+        self._event_driven = event_driven
+        self._wakeup = Event()
+        self._multiplexer.in_queue.add_listener(self.wake_up)
 
         self.debug = debug
 
@@ -118,6 +133,21 @@ class Agent(ABC):
         """Get the liveness."""
         return self._liveness
 
+    @property
+    def is_event_driven(self) -> bool:
+        """Check whether the main loop is driven by wakeup signals."""
+        return self._event_driven
+
+    def wake_up(self) -> None:
+        """
+        Wake the main loop up, if it is waiting for a wakeup signal.
+
+        This method is thread-safe.
+
+        :return: None
+        """
+        self._wakeup.set()
+
     @property
     def agent_state(self) -> AgentState:
         """
@@ -162,12 +192,65 @@ class Agent(ABC):
         :return: None
         """
         logger.debug("[{}]: Start processing messages...".format(self.name))
+        if self.is_event_driven:
+            self._run_event_driven_loop()
+        else:
+            while not self.liveness.is_stopped:
+                self.act()
+                time.sleep(self._timeout)
+                self.react()
+                self.update()
+        logger.debug("[{}]: Exiting main loop...".format(self.name))
+
+    def _run_event_driven_loop(self) -> None:
+        """
+        Run the main loop, blocking on the wakeup signal between iterations.
+
+        The signal is cleared before act/react/update, so that any signal raised
+        while processing makes the next wait return immediately.
+
+        :return: None
+        """
         while not self.liveness.is_stopped:
+            self._wakeup.clear()
             self.act()
-            time.sleep(self._timeout)
             self.react()
             self.update()
-        logger.debug("[{}]: Exiting main loop...".format(self.name))
+            if self.liveness.is_stopped or self._has_pending_work():
+                continue
+            timeout = self._get_wakeup_timeout()
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout=timeout)
+
+    def _has_pending_work(self) -> bool:
+        """
+        Check whether there is work that can be processed without waiting.
+
+        :return: True if the inbox is not empty, False otherwise.
+        """
+        return not self.inbox.empty()
+
+    def _get_next_due_delay(self) -> Optional[float]:
+        """
+        Get the time until some work is due without any wakeup signal, e.g. a scheduled behaviour.
+
+        :return: the delay in seconds, or None if no work is due.
+        """
+        return None
+
+    def _get_wakeup_timeout(self) -> Optional[float]:
+        """
+        Get the maximum time to wait for a wakeup signal.
+
+        The wait ends at the latest after the timeout of the agent, or when the next work is due.
+
+        :return: the timeout in seconds, or None to wait indefinitely.
+        """
+        timeout = self._timeout if self._timeout > 0 else None
+        due_delay = self._get_next_due_delay()
+        if due_delay is not None and (timeout is None or due_delay < timeout):
+            timeout = due_delay
+        return timeout
 
     def stop(self) -> None:
         """
@@ -176,6 +259,7 @@ class Agent(ABC):
         :return: None
         """
         self.liveness._is_stopped = True
+        self.wake_up()
         logger.debug("[{}]: Calling teardown method...".format(self.name))
         self.teardown()
 
@@ -221,3 +305,116 @@ class Agent(ABC):
 
         :return: None
         """
+
+
+class AsyncAgent(Agent, ABC):
+    """
+    This class implements a template agent whose main loop runs as a coroutine.
+
+    The main loop is scheduled on the event loop of the multiplexer, so act/react/update
+    run on the same thread as the connections: envelopes are enqueued and dequeued without
+    any cross-thread hop. The loop is always driven by wakeup signals (see the 'timeout'
+    parameter of the Agent in event-driven mode).
+    """
+
+    _async_wakeup = None  # type: Optional[asyncio.Event]
+    _main_loop_future = None  # type: Optional[Future]
+
+    def wake_up(self) -> None:
+        """
+        Wake the main loop up, if it is waiting for a wakeup signal.
+
+        This method is thread-safe.
+
+        :return: None
+        """
+        super().wake_up()
+        loop = self.multiplexer.loop
+        if self._async_wakeup is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._async_wakeup.set)
+
+    def _run_main_loop(self) -> None:
+        """
+        Run the main loop of the agent on the multiplexer's event loop, and wait for it to terminate.
+
+        :return: None
+        """
+        logger.debug("[{}]: Start processing messages...".format(self.name))
+        loop = self.multiplexer.loop
+        if loop.is_running():
+            self._main_loop_future = asyncio.run_coroutine_threadsafe(self._async_main_loop(), loop)
+            self._main_loop_future.result()
+        else:
+            loop.run_until_complete(self._async_main_loop())
+        logger.debug("[{}]: Exiting main loop...".format(self.name))
+
+    async def _async_main_loop(self) -> None:
+        """
+        Run the main loop, awaiting the wakeup signal between iterations.
+
+        :return: None
+        """
+        self._async_wakeup = asyncio.Event()
+        while not self.liveness.is_stopped:
+            self._async_wakeup.clear()
+            await self.async_act()
+            await self.async_react()
+            await self.async_update()
+            if self.liveness.is_stopped:
+                break
+            timeout = self._get_wakeup_timeout()
+            if self._has_pending_work() or (timeout is not None and timeout <= 0):
+                # give the connections the chance to run before the next iteration.
+                await asyncio.sleep(0)
+                continue
+            try:
+                await asyncio.wait_for(self._async_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        """
+        Stop the agent.
+
+        Waits for the current iteration of the main loop to complete before tearing the agent down.
+
+        :return: None
+        """
+        self.liveness._is_stopped = True
+        self.wake_up()
+        if self._main_loop_future is not None and not self.multiplexer.is_in_loop_thread():
+            try:
+                self._main_loop_future.result()
+            except Exception as e:
+                logger.exception("[{}]: Error in the main loop: {}".format(self.name, str(e)))
+        super().stop()
+
+    async def async_act(self) -> None:
+        """
+        Perform actions.
+
+        By default, it calls the synchronous 'act' method.
+
+        :return: None
+        """
+        self.act()
+
+    async def async_react(self) -> None:
+        """
+        React to incoming events.
+
+        By default, it calls the synchronous 'react' method.
+
+        :return: None
+        """
+        self.react()
+
+    async def async_update(self) -> None:
+        """
+        Update the current state of the agent.
+
+        By default, it calls the synchronous 'update' method.
+
+        :return: None
+        """
+        self.update()
@@ -24,7 +24,7 @@ import os
 import re
 import sys
 from pathlib import Path
-from typing import cast, List
+from typing import cast, Dict, List
 
 import click
 from click import pass_context
@@ -44,6 +44,7 @@ from aea.crypto.helpers import _create_default_private_key, _create_fetchai_priv
 from aea.crypto.ledger_apis import LedgerApis, _try_to_instantiate_fetchai_ledger_api, \
     _try_to_instantiate_ethereum_ledger_api, SUPPORTED_LEDGER_APIS
 from aea.crypto.wallet import Wallet, DEFAULT, SUPPORTED_CRYPTOS
+from aea.mail.base import Route
 from aea.registries.base import Resources
 
 
@@ -174,6 +175,24 @@ def _setup_connection(connection_name: str, public_key: str, ctx: Context) -> Co
     return connection
 
 
+def _get_routes(ctx: Context, connections: List[Connection]) -> Dict[Route, str]:
+    """
+    Get the routing table from the agent configuration, for the connections in use.
+
+    :param ctx: the CLI context.
+    :param connections: the connections of the agent.
+    :return: the routes, mapping pairs (destination address, protocol id) to connection ids.
+    """
+    connection_ids = {connection.connection_id for connection in connections}
+    routes = {}  # type: Dict[Route, str]
+    for route in ctx.agent_config.routes:
+        if route.connection not in connection_ids:
+            logger.warning("Ignoring the route through '{}': the connection is not in use.".format(route.connection))
+            continue
+        routes[(route.address, route.protocol)] = route.connection
+    return routes
+
+
 @click.command()
 @click.option('--connections', "connection_names", cls=ConnectionsOption, required=False, default=None,
               help="The connection names to use for running the agent. Must be declared in the agent's configuration file.")
@@ -214,7 +233,8 @@ def run(click_context, connection_names: List[str], env_file: str, install_deps:
         else:
             click_context.invoke(install)
 
-    agent = AEA(agent_name, connections, wallet, ledger_apis, resources=Resources(str(Path("."))))
+    routes = _get_routes(ctx, connections)
+    agent = AEA(agent_name, connections, wallet, ledger_apis, resources=Resources(str(Path("."))), routes=routes)
     try:
         agent.start()
     except KeyboardInterrupt:
@@ -20,7 +20,7 @@
 """Classes to handle AEA configurations."""
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Optional, List, Tuple, Dict, Set, cast
+from typing import TypeVar, Generic, Optional, List, Tuple, Dict, Set, Any, cast
 
 DEFAULT_AEA_CONFIG_FILE = "aea-config.yaml"
 DEFAULT_SKILL_CONFIG_FILE = "skill.yaml"
@@ -159,6 +159,35 @@ class LedgerAPIConfig(Configuration):
         )
 
 
+class RouteConfig(Configuration):
+    """Handle a route configuration, i.e. the connection of the envelopes to an address and/or with a protocol."""
+
+    def __init__(self, connection: str = "", address: Optional[str] = None, protocol: Optional[str] = None):
+        """Initialize a route configuration."""
+        self.connection = connection
+        self.address = address
+        self.protocol = protocol
+
+    @property
+    def json(self) -> Dict:
+        """Return the JSON representation."""
+        result = {"connection": self.connection}  # type: Dict[str, str]
+        if self.address is not None:
+            result["address"] = self.address
+        if self.protocol is not None:
+            result["protocol"] = self.protocol
+        return result
+
+    @classmethod
+    def from_json(cls, obj: Dict):
+        """Initialize from a JSON object."""
+        return RouteConfig(
+            connection=cast(str, obj.get("connection")),
+            address=cast(Optional[str], obj.get("address")),
+            protocol=cast(Optional[str], obj.get("protocol"))
+        )
+
+
 class ConnectionConfig(Configuration):
     """Handle connection configuration."""
 
@@ -298,18 +327,28 @@ class HandlerConfig(Configuration):
 class BehaviourConfig(Configuration):
     """Handle a skill behaviour configuration."""
 
-    def __init__(self, class_name: str = "", **args):
-        """Initialize a behaviour configuration."""
+    def __init__(self, class_name: str = "", schedule: Optional[Dict] = None, **args):
+        """
+        Initialize a behaviour configuration.
+
+        :param class_name: the name of the behaviour class.
+        :param schedule: the schedule of the behaviour (see aea.skills.schedule.Schedule). If None, it runs on every tick.
+        :param args: the keyword arguments of the behaviour.
+        """
         self.class_name = class_name
+        self.schedule = schedule
         self.args = args
 
     @property
     def json(self) -> Dict:
         """Return the JSON representation."""
-        return {
+        result = {
             "class_name": self.class_name,
             "args": self.args
-        }
+        }  # type: Dict[str, Any]
+        if self.schedule is not None:
+            result["schedule"] = self.schedule
+        return result
 
     @classmethod
     def from_json(cls, obj: Dict):
@@ -317,6 +356,7 @@ class BehaviourConfig(Configuration):
         class_name = cast(str, obj.get("class_name"))
         return BehaviourConfig(
             class_name=class_name,
+            schedule=obj.get("schedule"),
             **obj.get("args", {})
         )
 
@@ -324,18 +364,37 @@ class BehaviourConfig(Configuration):
 class TaskConfig(Configuration):
     """Handle a skill task configuration."""
 
-    def __init__(self, class_name: str = "", **args):
-        """Initialize a task configuration."""
+    def __init__(self, class_name: str = "", schedule: Optional[Dict] = None, executor: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, **args):
+        """
+        Initialize a task configuration.
+
+        :param class_name: the name of the task class.
+        :param schedule: the schedule of the task (see aea.skills.schedule.Schedule). If None, it runs on every tick.
+        :param executor: the executor of the task: 'inline', 'thread' or 'process'. If None, it runs inline.
+        :param max_concurrency: the maximum number of executions of the task in flight. If None, one.
+        :param args: the keyword arguments of the task.
+        """
         self.class_name = class_name
+        self.schedule = schedule
+        self.executor = executor
+        self.max_concurrency = max_concurrency
         self.args = args
 
     @property
     def json(self) -> Dict:
         """Return the JSON representation."""
-        return {
+        result = {
             "class_name": self.class_name,
             "args": self.args
-        }
+        }  # type: Dict[str, Any]
+        if self.schedule is not None:
+            result["schedule"] = self.schedule
+        if self.executor is not None:
+            result["executor"] = self.executor
+        if self.max_concurrency is not None:
+            result["max_concurrency"] = self.max_concurrency
+        return result
 
     @classmethod
     def from_json(cls, obj: Dict):
@@ -343,6 +402,9 @@ class TaskConfig(Configuration):
         class_name = cast(str, obj.get("class_name"))
         return TaskConfig(
             class_name=class_name,
+            schedule=obj.get("schedule"),
+            executor=obj.get("executor"),
+            max_concurrency=obj.get("max_concurrency"),
             **obj.get("args", {})
         )
 
@@ -384,7 +446,8 @@ class SkillConfig(Configuration):
                  url: str = "",
                  protocols: List[str] = None,
                  dependencies: Optional[List[str]] = None,
-                 description: str = ""):
+                 description: str = "",
+                 max_concurrency: Optional[int] = None):
         """Initialize a skill configuration."""
         self.name = name
         self.authors = authors
@@ -394,6 +457,7 @@ class SkillConfig(Configuration):
         self.protocols = protocols if protocols is not None else []  # type: List[str]
         self.dependencies = dependencies
         self.description = description
+        self.max_concurrency = max_concurrency
         self.handlers = CRUDCollection[HandlerConfig]()
         self.behaviours = CRUDCollection[BehaviourConfig]()
         self.tasks = CRUDCollection[TaskConfig]()
@@ -402,7 +466,7 @@ class SkillConfig(Configuration):
     @property
     def json(self) -> Dict:
         """Return the JSON representation."""
-        return {
+        result = {
             "name": self.name,
             "authors": self.authors,
             "version": self.version,
@@ -415,7 +479,10 @@ class SkillConfig(Configuration):
             "tasks": [{"task": t.json} for _, t in self.tasks.read_all()],
             "shared_classes": [{"shared_class": s.json} for _, s in self.shared_classes.read_all()],
             "description": self.description
-        }
+        }  # type: Dict[str, Any]
+        if self.max_concurrency is not None:
+            result["max_concurrency"] = self.max_concurrency
+        return result
 
     @classmethod
     def from_json(cls, obj: Dict):
@@ -428,6 +495,7 @@ class SkillConfig(Configuration):
         protocols = cast(List[str], obj.get("protocols", []))
         dependencies = cast(List[str], obj.get("dependencies", []))
         description = cast(str, obj.get("description"))
+        max_concurrency = cast(Optional[int], obj.get("max_concurrency"))
         skill_config = SkillConfig(
             name=name,
             authors=authors,
@@ -436,7 +504,8 @@ class SkillConfig(Configuration):
             url=url,
             protocols=protocols,
             dependencies=dependencies,
-            description=description
+            description=description,
+            max_concurrency=max_concurrency
         )
 
         for b in obj.get("behaviours", []):  # type: ignore
@@ -472,7 +541,8 @@ class AgentConfig(Configuration):
                  description: str = "",
                  private_key_paths: Dict[str, str] = None,
                  ledger_apis: Dict[str, Tuple[str, int]] = None,
-                 logging_config: Optional[Dict] = None):
+                 logging_config: Optional[Dict] = None,
+                 routes: Optional[List[RouteConfig]] = None):
         """Instantiate the agent configuration object."""
         self.agent_name = agent_name
         self.aea_version = aea_version
@@ -494,6 +564,7 @@ class AgentConfig(Configuration):
             self.ledger_apis.create(ledger, LedgerAPIConfig(ledger, addr, port))
 
         self.logging_config = logging_config if logging_config is not None else {}
+        self.routes = routes if routes is not None else []  # type: List[RouteConfig]
         self._default_connection = None  # type: Optional[str]
         self.connections = set()  # type: Set[str]
         self.protocols = set()  # type: Set[str]
@@ -522,7 +593,7 @@ class AgentConfig(Configuration):
     @property
     def json(self) -> Dict:
         """Return the JSON representation."""
-        return {
+        result = {
             "agent_name": self.agent_name,
             "aea_version": self.aea_version,
             "authors": self.authors,
@@ -539,6 +610,9 @@ class AgentConfig(Configuration):
             "protocols": sorted(self.protocols),
             "skills": sorted(self.skills)
         }
+        if len(self.routes) > 0:
+            result["routes"] = [{"route": r.json} for r in self.routes]
+        return result
 
     @classmethod
     def from_json(cls, obj: Dict):
@@ -564,7 +638,8 @@ class AgentConfig(Configuration):
             description=cast(str, obj.get("description")),
             logging_config=cast(Dict, obj.get("logging_config", {})),
             private_key_paths=cast(Dict, private_key_paths),
-            ledger_apis=cast(Dict, ledger_apis)
+            ledger_apis=cast(Dict, ledger_apis),
+            routes=[RouteConfig.from_json(r["route"]) for r in obj.get("routes", [])]  # type: ignore
         )
 
         agent_config.connections = set(cast(List[str], obj.get("connections")))
@@ -22,7 +22,7 @@
 import logging
 from abc import abstractmethod, ABC
 from asyncio import AbstractEventLoop
-from typing import TYPE_CHECKING, Optional, Set
+from typing import TYPE_CHECKING, Callable, Optional, Set
 
 from aea.configurations.base import ConnectionConfig
 
@@ -56,6 +56,7 @@ class Connection(ABC):
 
         self._loop = None  # type: Optional[AbstractEventLoop]
         self._connection_status = ConnectionStatus()
+        self._address_listener = None  # type: Optional[Callable[[str, str, bool], None]]
 
     def _get_restricted_to_protocols(self, restricted_to_protocols: Optional[Set[str]] = None) -> Set[str]:
         if restricted_to_protocols is not None:
@@ -96,6 +97,35 @@ class Connection(ABC):
         """Get the connection status."""
         return self._connection_status
 
+    @property
+    def address_listener(self) -> Optional[Callable[[str, str, bool], None]]:
+        """Get the listener of the addresses reachable through the connection."""
+        return self._address_listener
+
+    @address_listener.setter
+    def address_listener(self, listener: Optional[Callable[[str, str, bool], None]]) -> None:
+        """
+        Set the listener of the addresses reachable through the connection.
+
+        The listener is called with the connection id, the address, and whether the address
+        became reachable (True) or unreachable (False) through the connection.
+
+        :param listener: the listener.
+        :return: None
+        """
+        self._address_listener = listener
+
+    def notify_address(self, address: str, is_reachable: bool = True) -> None:
+        """
+        Notify the listener that an address became reachable, or unreachable, through the connection.
+
+        :param address: the address (i.e. public key) of the peer.
+        :param is_reachable: whether the address became reachable or unreachable.
+        :return: None
+        """
+        if self._address_listener is not None:
+            self._address_listener(self.connection_id, address, is_reachable)
+
     @abstractmethod
     async def connect(self):
         """Set up the connection."""
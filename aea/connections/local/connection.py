@@ -22,12 +22,12 @@
 import asyncio
 import logging
 from asyncio import Queue, AbstractEventLoop
-from collections import defaultdict
 from threading import Thread
-from typing import Dict, List, Optional, cast, Set
+from typing import Dict, Optional, cast, Set
 
 from aea.configurations.base import ConnectionConfig
 from aea.connections.base import Connection
+from aea.connections.local.directory import ServiceDirectory
 from aea.mail.base import Envelope, AEAConnectionError
 from aea.protocols.oef.message import OEFMessage
 from aea.protocols.oef.models import Description, Query
@@ -47,8 +47,8 @@ class LocalNode:
 
         :param loop: the event loop. If None, a new event loop is instantiated.
         """
-        self.agents = defaultdict(lambda: [])  # type: Dict[str, List[Description]]
-        self.services = defaultdict(lambda: [])  # type: Dict[str, List[Description]]
+        self.agents = ServiceDirectory()
+        self.services = ServiceDirectory()
         self._lock = asyncio.Lock()
         self._loop = loop if loop is not None else asyncio.new_event_loop()
         self._thread = Thread(target=self._run_loop)
@@ -57,6 +57,7 @@ class LocalNode:
         self._out_queues = {}  # type: Dict[str, asyncio.Queue]
 
         self._receiving_loop_task = None  # type: Optional[asyncio.Task]
+        self._serializer = OEFSerializer()
 
     def __enter__(self):
         """Start the local node."""
@@ -120,7 +121,11 @@ class LocalNode:
                 logger.debug("Receiving loop terminated.")
                 return
             logger.debug("Handling envelope: {}".format(envelope))
-            await self._handle_envelope(envelope)
+            try:
+                await self._handle_envelope(envelope)
+            except Exception as e:
+                # a faulty envelope must not stop the node.
+                logger.exception("Error while handling envelope {}: {}".format(envelope, e))
 
     async def _handle_envelope(self, envelope: Envelope) -> None:
         """Handle an envelope.
@@ -139,7 +144,11 @@ class LocalNode:
         :param envelope: the envelope
         :return: None
         """
-        oef_message = OEFSerializer().decode(envelope.message)
+        try:
+            oef_message = self._serializer.decode(bytes(envelope.message))
+        except ValueError as e:
+            logger.warning("Discarding a malformed OEF message from {}: {}".format(envelope.sender, e))
+            return
         sender = envelope.sender
         request_id = cast(int, oef_message.get("id"))
         oef_type = OEFMessage.Type(oef_message.get("type"))
@@ -170,7 +179,7 @@ class LocalNode:
 
         if destination not in self._out_queues.keys():
             msg = OEFMessage(oef_type=OEFMessage.Type.DIALOGUE_ERROR, id=STUB_DIALOGUE_ID, dialogue_id=STUB_DIALOGUE_ID, origin=destination)
-            msg_bytes = OEFSerializer().encode(msg)
+            msg_bytes = self._serializer.encode(msg)
             error_envelope = Envelope(to=envelope.sender, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
             await self._send(error_envelope)
             return
@@ -181,12 +190,14 @@ class LocalNode:
         """
         Register a service agent in the service directory of the node.
 
+        Registering the same description again is a no-op, so that agents can re-register periodically.
+
         :param public_key: the public key of the service agent to be registered.
         :param service_description: the description of the service agent to be registered.
         :return: None
         """
         async with self._lock:
-            self.services[public_key].append(service_description)
+            self.services.register(public_key, service_description)
 
     async def _register_agent(self, public_key: str, agent_description: Description):
         """
@@ -197,7 +208,7 @@ class LocalNode:
         :return: None
         """
         async with self._lock:
-            self.agents[public_key].append(agent_description)
+            self.agents.register(public_key, agent_description)
 
     async def _register_service_wide(self, public_key: str, service_description: Description):
         """Register service wide."""
@@ -213,15 +224,11 @@ class LocalNode:
         :return: None
         """
         async with self._lock:
-            if public_key not in self.services:
+            if not self.services.unregister(public_key, service_description):
                 msg = OEFMessage(oef_type=OEFMessage.Type.OEF_ERROR, id=msg_id, operation=OEFMessage.OEFErrorOperation.UNREGISTER_SERVICE)
-                msg_bytes = OEFSerializer().encode(msg)
+                msg_bytes = self._serializer.encode(msg)
                 envelope = Envelope(to=public_key, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
                 await self._send(envelope)
-            else:
-                self.services[public_key].remove(service_description)
-                if len(self.services[public_key]) == 0:
-                    self.services.pop(public_key)
 
     async def _unregister_agent(self, public_key: str, msg_id: int, agent_description: Description) -> None:
         """
@@ -233,39 +240,27 @@ class LocalNode:
         :return: None
         """
         async with self._lock:
-            if public_key not in self.agents:
+            if not self.agents.unregister(public_key, agent_description):
                 msg = OEFMessage(oef_type=OEFMessage.Type.OEF_ERROR, id=msg_id, operation=OEFMessage.OEFErrorOperation.UNREGISTER_AGENT)
-                msg_bytes = OEFSerializer().encode(msg)
+                msg_bytes = self._serializer.encode(msg)
                 envelope = Envelope(to=public_key, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
                 await self._send(envelope)
-            else:
-                self.agents[public_key].remove(agent_description)
-                if len(self.agents[public_key]) == 0:
-                    self.agents.pop(public_key)
 
     async def _search_agents(self, public_key: str, search_id: int, query: Query) -> None:
         """
         Search the agents in the local Agent Directory, and send back the result.
 
-        This is actually a dummy search, it will return all the registered agents with the specified data model.
-        If the data model is not specified, it will return all the agents.
+        It returns the agents with a description which satisfies the query (see ServiceDirectory.search).
 
         :param public_key: the source of the search request.
         :param search_id: the search identifier associated with the search request.
         :param query: the query that constitutes the search.
         :return: None
         """
-        result = []  # type: List[str]
-        if query.model is None:
-            result = list(set(self.services.keys()))
-        else:
-            for agent_public_key, descriptions in self.agents.items():
-                for description in descriptions:
-                    if query.model == description.data_model:
-                        result.append(agent_public_key)
+        result = self.agents.search(query)
 
-        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_RESULT, id=search_id, agents=sorted(set(result)))
-        msg_bytes = OEFSerializer().encode(msg)
+        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_RESULT, id=search_id, agents=result)
+        msg_bytes = self._serializer.encode(msg)
         envelope = Envelope(to=public_key, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         await self._send(envelope)
 
@@ -273,25 +268,17 @@ class LocalNode:
         """
         Search the agents in the local Service Directory, and send back the result.
 
-        This is actually a dummy search, it will return all the registered agents with the specified data model.
-        If the data model is not specified, it will return all the agents.
+        It returns the agents with a service description which satisfies the query (see ServiceDirectory.search).
 
         :param public_key: the source of the search request.
         :param search_id: the search identifier associated with the search request.
         :param query: the query that constitutes the search.
         :return: None
         """
-        result = []  # type: List[str]
-        if query.model is None:
-            result = list(set(self.services.keys()))
-        else:
-            for agent_public_key, descriptions in self.services.items():
-                for description in descriptions:
-                    if description.data_model == query.model:
-                        result.append(agent_public_key)
+        result = self.services.search(query)
 
-        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_RESULT, id=search_id, agents=sorted(set(result)))
-        msg_bytes = OEFSerializer().encode(msg)
+        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_RESULT, id=search_id, agents=result)
+        msg_bytes = self._serializer.encode(msg)
         envelope = Envelope(to=public_key, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         await self._send(envelope)
 
@@ -311,8 +298,8 @@ class LocalNode:
         """
         async with self._lock:
             self._out_queues.pop(public_key, None)
-            self.services.pop(public_key, None)
-            self.agents.pop(public_key, None)
+            self.services.remove(public_key)
+            self.agents.remove(public_key)
 
 
 class OEFLocalConnection(Connection):
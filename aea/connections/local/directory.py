@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""This module contains the indexed directory of the descriptions registered in the local node."""
+import bisect
+import itertools
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from aea.protocols.oef.models import And, Constraint, ConstraintExpr, ConstraintTypes, Description, Or, Query
+
+EntryId = int
+
+
+class _SortedIndex:
+    """
+    The values of an attribute of a given type, sorted, with the ids of their entries.
+
+    To keep the registrations O(1) amortized, the added values are buffered and the removed ids
+    are only marked; both are merged into the sorted lists once the buffer or the marks grow
+    beyond a fraction of the index.
+
+    The values which are not equal to themselves (NaN) are left out: they break the order of the
+    sort and of the bisection, and cannot satisfy a range constraint anyway.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Any, EntryId]]):
+        """
+        Sort the (value, entry id) pairs.
+
+        :param items: the pairs.
+        """
+        self.values = []  # type: Optional[List[Any]]
+        self.ids = []  # type: List[EntryId]
+        self._pending = dict((entry_id, value) for value, entry_id in items if value == value)  # type: Dict[EntryId, Any]
+        self._removed = set()  # type: Set[EntryId]
+        self._merge()
+
+    def _merge(self) -> None:
+        """
+        Merge the buffered values and drop the removed ids.
+
+        :return: None
+        """
+        if self.values is None:
+            return
+        pairs = [(value, entry_id) for value, entry_id in zip(self.values, self.ids) if entry_id not in self._removed]
+        pairs.extend((value, entry_id) for entry_id, value in self._pending.items())
+        try:
+            # the sorted run and the buffer are merged by the sort in linear time.
+            pairs.sort(key=lambda item: item[0])
+        except TypeError:
+            # the values of this type cannot be ordered: range searches return all of them.
+            self.values = None
+            self.ids = []
+            self._pending = dict((entry_id, value) for value, entry_id in pairs)
+            self._removed = set()
+            return
+        self.values = [value for value, _ in pairs]
+        self.ids = [entry_id for _, entry_id in pairs]
+        self._pending = {}
+        self._removed = set()
+
+    def _merge_if_needed(self) -> None:
+        """
+        Merge when the buffered values or the removed ids outgrow a fraction of the index.
+
+        :return: None
+        """
+        if len(self._pending) > 32 + len(self.ids) // 16 or len(self._removed) > 32 + len(self.ids) // 4:
+            self._merge()
+
+    def add(self, value: Any, entry_id: EntryId) -> None:
+        """
+        Add a value.
+
+        :param value: the value.
+        :param entry_id: the id of its entry.
+        :return: None
+        """
+        if value != value:
+            return
+        self._pending[entry_id] = value
+        self._merge_if_needed()
+
+    def remove(self, value: Any, entry_id: EntryId) -> None:
+        """
+        Remove a value.
+
+        :param value: the value.
+        :param entry_id: the id of its entry.
+        :return: None
+        """
+        if value != value:
+            return
+        if entry_id in self._pending:
+            del self._pending[entry_id]
+        elif self.values is not None:
+            self._removed.add(entry_id)
+            self._merge_if_needed()
+
+    def range(self, low: Any = None, high: Any = None, include_low: bool = True, include_high: bool = True) -> List[EntryId]:
+        """
+        Get the ids of the entries whose value is in a range.
+
+        :param low: the lower bound. If None, unbounded.
+        :param high: the upper bound. If None, unbounded.
+        :param include_low: whether the lower bound is included.
+        :param include_high: whether the upper bound is included.
+        :return: the ids.
+        """
+        if self.values is None:
+            return list(self._pending.keys())
+        start, end = 0, len(self.values)
+        if low is not None:
+            start = (bisect.bisect_left if include_low else bisect.bisect_right)(self.values, low)
+        if high is not None:
+            end = (bisect.bisect_right if include_high else bisect.bisect_left)(self.values, high)
+        ids = self.ids[start:end]
+        if len(self._removed) > 0:
+            ids = [entry_id for entry_id in ids if entry_id not in self._removed]
+        for entry_id, value in self._pending.items():
+            if (low is None or low < value or (include_low and low == value)) \
+                    and (high is None or value < high or (include_high and value == high)):
+                ids.append(entry_id)
+        return ids
+
+
+class ServiceDirectory:
+    """
+    An indexed directory of the descriptions registered by the agents.
+
+    The descriptions are indexed by the name of their data model and, for each attribute,
+    by value (for the EQUAL and IN constraints) and by sorted value (for the range and WITHIN constraints).
+    A search uses the indexes to select the candidate descriptions, then checks each candidate
+    against the full query, so the indexes only have to return a superset of the matches.
+    """
+
+    def __init__(self):
+        """Initialize an empty directory."""
+        self._entries = {}  # type: Dict[EntryId, Tuple[str, Description]]
+        self._ids_by_public_key = defaultdict(dict)  # type: Dict[str, Dict[Description, EntryId]]
+        self._ids_by_model = defaultdict(set)  # type: Dict[Optional[str], Set[EntryId]]
+        self._ids_by_value = defaultdict(lambda: defaultdict(set))  # type: Dict[str, Dict[Any, Set[EntryId]]]
+        self._unhashable_ids = defaultdict(set)  # type: Dict[str, Set[EntryId]]
+        self._ids_by_type = defaultdict(lambda: defaultdict(set))  # type: Dict[str, Dict[type, Set[EntryId]]]
+        self._sorted_indexes = defaultdict(dict)  # type: Dict[str, Dict[type, _SortedIndex]]
+        self._next_id = itertools.count()
+
+    def __len__(self) -> int:
+        """Get the number of registered descriptions."""
+        return len(self._entries)
+
+    def __contains__(self, public_key: str) -> bool:
+        """Check whether an agent has registered descriptions."""
+        return public_key in self._ids_by_public_key
+
+    @property
+    def public_keys(self) -> List[str]:
+        """Get the public keys of the agents with registered descriptions."""
+        return list(self._ids_by_public_key.keys())
+
+    def get(self, public_key: str) -> List[Description]:
+        """
+        Get the descriptions registered by an agent.
+
+        :param public_key: the public key of the agent.
+        :return: the descriptions, in order of registration.
+        """
+        return list(self._ids_by_public_key.get(public_key, {}).keys())
+
+    def register(self, public_key: str, description: Description) -> bool:
+        """
+        Register a description of an agent.
+
+        The descriptions of an agent have set semantics: registering a description again is a no-op.
+
+        :param public_key: the public key of the agent.
+        :param description: the description.
+        :return: whether the description was added.
+        """
+        ids = self._ids_by_public_key[public_key]
+        if description in ids:
+            return False
+        entry_id = next(self._next_id)
+        self._entries[entry_id] = (public_key, description)
+        ids[description] = entry_id
+        self._ids_by_model[self._model_name(description)].add(entry_id)
+        for name, value in description.values.items():
+            self._index_value(entry_id, name, value)
+        return True
+
+    def unregister(self, public_key: str, description: Description) -> bool:
+        """
+        Unregister a description of an agent.
+
+        :param public_key: the public key of the agent.
+        :param description: the description.
+        :return: whether the description was registered.
+        """
+        entry_id = self._ids_by_public_key.get(public_key, {}).get(description)
+        if entry_id is None:
+            return False
+        self._remove_entry(entry_id)
+        return True
+
+    def replace(self, public_key: str, old_description: Description, new_description: Description) -> bool:
+        """
+        Replace a description of an agent, e.g. to update its attributes.
+
+        :param public_key: the public key of the agent.
+        :param old_description: the registered description.
+        :param new_description: the new description. It is registered even if the old one was not.
+        :return: whether the old description was registered.
+        """
+        was_registered = self.unregister(public_key, old_description)
+        self.register(public_key, new_description)
+        return was_registered
+
+    def remove(self, public_key: str) -> None:
+        """
+        Unregister all the descriptions of an agent.
+
+        :param public_key: the public key of the agent.
+        :return: None
+        """
+        for entry_id in list(self._ids_by_public_key.get(public_key, {}).values()):
+            self._remove_entry(entry_id)
+
+    def search(self, query: Query) -> List[str]:
+        """
+        Search the agents with a description which satisfies a query.
+
+        If the query has a data model, only the descriptions with the same data model are considered.
+        The agents are ranked and limited as specified by the query (see Query.rank).
+
+        :param query: the query.
+        :return: the public keys of the matching agents: sorted, or ranked by the ordering attribute of the query.
+        """
+        if query.model is not None:
+            candidates = self._ids_by_model.get(query.model.name, set())  # type: Optional[Set[EntryId]]
+        else:
+            candidates = None
+        for constraint in query.constraints:
+            if candidates is not None and len(candidates) == 0:
+                break
+            candidates = self._intersect(candidates, self._candidates(constraint))
+
+        entries = self._entries.values() if candidates is None else (self._entries[entry_id] for entry_id in candidates)
+        predicate = query.compile()
+        # without an ordering, a single matching description per agent is enough.
+        is_ranked = query.order_by is not None
+        matches = []  # type: List[Tuple[str, Description]]
+        matching_public_keys = set()  # type: Set[str]
+        for public_key, description in entries:
+            if not is_ranked and public_key in matching_public_keys:
+                continue
+            if (query.model is None or description.data_model == query.model) and predicate(description):
+                matching_public_keys.add(public_key)
+                matches.append((public_key, description))
+        return query.rank(matches)
+
+    @staticmethod
+    def _model_name(description: Description) -> Optional[str]:
+        """Get the name of the data model of a description, if any."""
+        return description.data_model.name if description.data_model is not None else None
+
+    def _index_value(self, entry_id: EntryId, name: str, value: Any) -> None:
+        """Add the value of an attribute of an entry to the indexes."""
+        try:
+            self._ids_by_value[name][value].add(entry_id)
+        except TypeError:
+            self._unhashable_ids[name].add(entry_id)
+        self._ids_by_type[name][type(value)].add(entry_id)
+        index = self._sorted_indexes[name].get(type(value))
+        if index is not None:
+            index.add(value, entry_id)
+
+    def _remove_entry(self, entry_id: EntryId) -> None:
+        """Remove an entry from the directory and its indexes."""
+        public_key, description = self._entries.pop(entry_id)
+        ids = self._ids_by_public_key[public_key]
+        del ids[description]
+        if len(ids) == 0:
+            del self._ids_by_public_key[public_key]
+        self._discard(self._ids_by_model, self._model_name(description), entry_id)
+        for name, value in description.values.items():
+            try:
+                self._discard(self._ids_by_value[name], value, entry_id)
+            except TypeError:
+                self._discard(self._unhashable_ids, name, entry_id)
+            self._discard(self._ids_by_type[name], type(value), entry_id)
+            index = self._sorted_indexes[name].get(type(value))
+            if index is not None:
+                index.remove(value, entry_id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[EntryId]], key: Any, entry_id: EntryId) -> None:
+        """Remove an id from an index, dropping the key when it has no ids left."""
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(entry_id)
+            if len(ids) == 0:
+                del index[key]
+
+    @staticmethod
+    def _intersect(first: Optional[Set[EntryId]], second: Optional[Set[EntryId]]) -> Optional[Set[EntryId]]:
+        """Intersect two candidate sets, where None stands for all the entries."""
+        if first is None:
+            return second
+        if second is None:
+            return first
+        return first & second if len(first) <= len(second) else second & first
+
+    def _candidates(self, expression: ConstraintExpr) -> Optional[Set[EntryId]]:
+        """
+        Get a superset of the entries which satisfy a constraint expression.
+
+        :param expression: the constraint expression.
+        :return: the ids of the candidate entries, or None if the indexes cannot narrow them down.
+        """
+        if isinstance(expression, Constraint):
+            return self._constraint_candidates(expression)
+        if isinstance(expression, And):
+            candidates = None  # type: Optional[Set[EntryId]]
+            for sub_expression in expression.constraints:
+                candidates = self._intersect(candidates, self._candidates(sub_expression))
+            return candidates
+        if isinstance(expression, Or):
+            union = set()  # type: Set[EntryId]
+            for sub_expression in expression.constraints:
+                candidates = self._candidates(sub_expression)
+                if candidates is None:
+                    return None
+                union |= candidates
+            return union
+        # e.g. Not: its candidates are (almost) all the entries.
+        return None
+
+    def _constraint_candidates(self, constraint: Constraint) -> Optional[Set[EntryId]]:
+        """
+        Get a superset of the entries which satisfy an atomic constraint.
+
+        The ranges follow the semantics of ConstraintType.check, where the constraint value is
+        the left operand, e.g. ConstraintType("<", 3) matches the values greater than 3.
+
+        :param constraint: the constraint.
+        :return: the ids of the candidate entries, or None if the indexes cannot narrow them down.
+        """
+        name = constraint.attribute_name
+        constraint_type = constraint.constraint_type.type
+        value = constraint.constraint_type.value
+        if constraint_type == ConstraintTypes.EQUAL:
+            return self._lookup(name, [value])
+        if constraint_type == ConstraintTypes.IN:
+            return self._lookup(name, value)
+        if constraint_type == ConstraintTypes.WITHIN:
+            return self._range(name, type(value[0]), low=value[0], high=value[1])
+        if constraint_type == ConstraintTypes.LESS_THAN:
+            return self._range(name, type(value), low=value, include_low=False)
+        if constraint_type == ConstraintTypes.LESS_THAN_EQ:
+            return self._range(name, type(value), low=value)
+        if constraint_type == ConstraintTypes.GREATER_THAN:
+            return self._range(name, type(value), high=value, include_high=False)
+        if constraint_type == ConstraintTypes.GREATER_THAN_EQ:
+            return self._range(name, type(value), high=value)
+        # NOT_EQUAL and NOT_IN match (almost) all the entries.
+        return None
+
+    def _lookup(self, name: str, values: Iterable[Any]) -> Set[EntryId]:
+        """Get the ids of the entries whose attribute has one of the values (or an unhashable value)."""
+        ids_by_value = self._ids_by_value.get(name, {})
+        candidates = set(self._unhashable_ids.get(name, set()))
+        for value in values:
+            candidates |= ids_by_value.get(value, set())
+        return candidates
+
+    def _range(self, name: str, value_type: type, **bounds: Any) -> Set[EntryId]:
+        """
+        Get the ids of the entries whose attribute is in a range.
+
+        Only the values of the type of the bounds (or of a subtype) can satisfy the constraint,
+        so each such type has its own sorted index, built on the first range search over it
+        and then kept up to date by the registrations.
+
+        :param name: the name of the attribute.
+        :param value_type: the type of the bounds.
+        :param bounds: the bounds of the range (see _SortedIndex.range).
+        :return: the ids.
+        """
+        candidates = set()  # type: Set[EntryId]
+        sorted_indexes = self._sorted_indexes[name]
+        for attribute_type, ids in self._ids_by_type.get(name, {}).items():
+            if not issubclass(attribute_type, value_type):
+                continue
+            index = sorted_indexes.get(attribute_type)
+            if index is None:
+                index = _SortedIndex((self._entries[entry_id][1].values[name], entry_id) for entry_id in ids)
+                sorted_indexes[attribute_type] = index
+            candidates.update(index.range(**bounds))
+        return candidates
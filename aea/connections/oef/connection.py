@@ -20,12 +20,13 @@
 
 """Extension to the OEF Python SDK."""
 import asyncio
+import heapq
 import logging
 import pickle
 import time
 from asyncio import AbstractEventLoop, CancelledError
 from threading import Thread
-from typing import List, Optional, cast, Set
+from typing import Callable, Dict, List, Optional, cast, Set
 
 import oef
 from oef.agents import OEFAgent
@@ -125,6 +126,26 @@ class OEFObjectTranslator:
         else:
             raise ValueError("Constraint type not recognized.")
 
+    @classmethod
+    def from_oef_search_result(cls, agents: List[str], query: Query) -> List[str]:
+        """
+        From the agents found by the OEF to the result of our query.
+
+        The OEF search returns only the public keys of the agents, so they cannot be ranked by the ordering attribute.
+        Without an ordering, the first results up to the limit of the query are selected, with a heap.
+        With an ordering, all the agents are returned, so that the best ones are not dropped.
+
+        :param agents: the public keys of the agents found by the OEF.
+        :param query: our query.
+        :return: the public keys of the result.
+        """
+        if query.order_by is not None:
+            logger.warning("The OEF does not rank the search results: ignoring the ordering and the limit of the query.")
+            return sorted(agents)
+        if query.limit is not None:
+            return heapq.nsmallest(query.limit, agents)
+        return list(agents)
+
     @classmethod
     def from_oef_description(cls, oef_desc: OEFDescription) -> Description:
         """From an OEF description to our description."""
@@ -204,6 +225,10 @@ class OEFChannel(OEFAgent):
                          logger=lambda *x: None, logger_debug=lambda *x: None)
         self.in_queue = None  # type: Optional[asyncio.Queue]
         self.loop = None  # type: Optional[AbstractEventLoop]
+        self.address_notifier = None  # type: Optional[Callable[[str], None]]
+        self._oef_serializer = OEFSerializer()
+        self._fipa_serializer = FIPASerializer()
+        self._ranked_queries = {}  # type: Dict[int, Query]
 
     def on_message(self, msg_id: int, dialogue_id: int, origin: str, content: bytes) -> None:
         """
@@ -245,7 +270,7 @@ class OEFChannel(OEFAgent):
                           target=target,
                           performative=FIPAMessage.Performative.CFP,
                           query=query if query != b"" else None)
-        msg_bytes = FIPASerializer().encode(msg)
+        msg_bytes = self._fipa_serializer.encode(msg)
         envelope = Envelope(to=self.public_key, sender=origin, protocol_id=FIPAMessage.protocol_id, message=msg_bytes)
         asyncio.run_coroutine_threadsafe(self.in_queue.put(envelope), self.loop).result()
 
@@ -302,8 +327,14 @@ class OEFChannel(OEFAgent):
         """
         assert self.in_queue is not None
         assert self.loop is not None
+        query = self._ranked_queries.pop(search_id, None)
+        if query is not None:
+            agents = OEFObjectTranslator.from_oef_search_result(list(agents), query)
+        if self.address_notifier is not None:
+            for agent in agents:
+                self.address_notifier(agent)
         msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_RESULT, id=search_id, agents=agents)
-        msg_bytes = OEFSerializer().encode(msg)
+        msg_bytes = self._oef_serializer.encode(msg)
         envelope = Envelope(to=self.public_key, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         asyncio.run_coroutine_threadsafe(self.in_queue.put(envelope), self.loop).result()
 
@@ -317,13 +348,14 @@ class OEFChannel(OEFAgent):
         """
         assert self.in_queue is not None
         assert self.loop is not None
+        self._ranked_queries.pop(answer_id, None)
         try:
             operation = OEFMessage.OEFErrorOperation(operation)
         except ValueError:
             operation = OEFMessage.OEFErrorOperation.OTHER
 
         msg = OEFMessage(oef_type=OEFMessage.Type.OEF_ERROR, id=answer_id, operation=operation)
-        msg_bytes = OEFSerializer().encode(msg)
+        msg_bytes = self._oef_serializer.encode(msg)
         envelope = Envelope(to=self.public_key, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         asyncio.run_coroutine_threadsafe(self.in_queue.put(envelope), self.loop).result()
 
@@ -342,7 +374,7 @@ class OEFChannel(OEFAgent):
                          id=answer_id,
                          dialogue_id=dialogue_id,
                          origin=origin)
-        msg_bytes = OEFSerializer().encode(msg)
+        msg_bytes = self._oef_serializer.encode(msg)
         envelope = Envelope(to=self.public_key, sender=DEFAULT_OEF, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         asyncio.run_coroutine_threadsafe(self.in_queue.put(envelope), self.loop).result()
 
@@ -372,7 +404,7 @@ class OEFChannel(OEFAgent):
         :param envelope: the message.
         :return: None
         """
-        oef_message = OEFSerializer().decode(envelope.message)
+        oef_message = self._oef_serializer.decode(envelope.message)
         oef_type = OEFMessage.Type(oef_message.get("type"))
         oef_msg_id = cast(int, oef_message.get("id"))
         if oef_type == OEFMessage.Type.REGISTER_SERVICE:
@@ -388,14 +420,27 @@ class OEFChannel(OEFAgent):
         elif oef_type == OEFMessage.Type.SEARCH_AGENTS:
             query = cast(Query, oef_message.get("query"))
             oef_query = OEFObjectTranslator.to_oef_query(query)
+            self._remember_ranked_query(oef_msg_id, query)
             self.search_agents(oef_msg_id, oef_query)
         elif oef_type == OEFMessage.Type.SEARCH_SERVICES:
             query = cast(Query, oef_message.get("query"))
             oef_query = OEFObjectTranslator.to_oef_query(query)
+            self._remember_ranked_query(oef_msg_id, query)
             self.search_services(oef_msg_id, oef_query)
         else:
             raise ValueError("OEF request not recognized.")
 
+    def _remember_ranked_query(self, search_id: int, query: Query) -> None:
+        """
+        Remember a query with an ordering or a limit, to select the result of the search when it arrives.
+
+        :param search_id: the search id.
+        :param query: the query.
+        :return: None
+        """
+        if query.order_by is not None or query.limit is not None:
+            self._ranked_queries[search_id] = query
+
 
 class OEFConnection(Connection):
     """The OEFConnection connects the to the mailbox."""
@@ -417,6 +462,7 @@ class OEFConnection(Connection):
         self._core = AsyncioCore(logger=logger)  # type: AsyncioCore
         self.in_queue = None  # type: Optional[asyncio.Queue]
         self.channel = OEFChannel(public_key, oef_addr, oef_port, core=self._core)
+        self.channel.address_notifier = self.notify_address
 
         self._connection_check_thread = None  # type: Optional[Thread]
 
@@ -49,16 +49,7 @@ class _ConnectionFileSystemEventHandler(FileSystemEventHandler):
 
 
 def _encode(e: Envelope, separator: bytes = SEPARATOR):
-    result = b""
-    result += e.to.encode("utf-8")
-    result += separator
-    result += e.sender.encode("utf-8")
-    result += separator
-    result += e.protocol_id.encode("utf-8")
-    result += separator
-    result += e.message
-
-    return result
+    return separator.join((e.to.encode("utf-8"), e.sender.encode("utf-8"), e.protocol_id.encode("utf-8"), e.message))
 
 
 def _decode(e: bytes, separator: bytes = SEPARATOR):
@@ -73,6 +73,7 @@ class TCPServerConnection(TCPConnection):
             self.connections[public_key] = (reader, writer)
             read_task = asyncio.ensure_future(self._recv(reader), loop=self._loop)
             self._read_tasks_to_public_key[read_task] = public_key
+            self.notify_address(public_key)
 
     async def receive(self, *args, **kwargs) -> Optional['Envelope']:
         """
@@ -116,6 +117,7 @@ class TCPServerConnection(TCPConnection):
         """Tear the connection down."""
         for pbk, (reader, _) in self.connections.items():
             reader.feed_eof()
+            self.notify_address(pbk, is_reachable=False)
 
         for t in self._read_tasks_to_public_key:
             t.cancel()
@@ -20,7 +20,8 @@
 """This module contains the agent context class."""
 
 from queue import Queue
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 from aea.connections.base import ConnectionStatus
 from aea.decision_maker.base import OwnershipState, Preferences, GoalPursuitReadiness
@@ -28,6 +29,8 @@ from aea.mail.base import OutBox
 from aea.crypto.default import DEFAULT
 from aea.crypto.fetchai import FETCHAI
 from aea.crypto.ledger_apis import LedgerApis
+from aea.protocols.base import Serializer
+from aea.skills.tasks import TaskManager
 
 
 class AgentContext:
@@ -42,7 +45,9 @@ class AgentContext:
                  decision_maker_message_queue: Queue,
                  ownership_state: OwnershipState,
                  preferences: Preferences,
-                 goal_pursuit_readiness: GoalPursuitReadiness):
+                 goal_pursuit_readiness: GoalPursuitReadiness,
+                 serializers: Optional[Mapping[str, Serializer]] = None,
+                 task_manager: Optional[TaskManager] = None):
         """
         Initialize an agent context.
 
@@ -55,6 +60,8 @@ class AgentContext:
         :param ownership_state: the ownership state of the agent
         :param preferences: the preferences of the agent
         :param goal_pursuit_readiness: ready to pursuit its goals
+        :param serializers: the serializers of the agent's protocols, by protocol id.
+        :param task_manager: the manager which runs the tasks on their executors.
         """
         self._agent_name = agent_name
         self._public_keys = public_keys
@@ -66,6 +73,8 @@ class AgentContext:
         self._ownership_state = ownership_state
         self._preferences = preferences
         self._goal_pursuit_readiness = goal_pursuit_readiness
+        self._serializers = serializers if serializers is not None else MappingProxyType({})
+        self._task_manager = task_manager if task_manager is not None else TaskManager()
 
     @property
     def agent_name(self) -> str:
@@ -126,3 +135,13 @@ class AgentContext:
     def ledger_apis(self) -> LedgerApis:
         """Get the ledger APIs."""
         return self._ledger_apis
+
+    @property
+    def serializers(self) -> Mapping[str, Serializer]:
+        """Get the serializers of the agent's protocols, by protocol id."""
+        return self._serializers
+
+    @property
+    def task_manager(self) -> TaskManager:
+        """Get the manager which runs the tasks on their executors."""
+        return self._task_manager
@@ -23,7 +23,6 @@ import copy
 from enum import Enum
 import math
 import logging
-from queue import Queue
 from typing import Dict, List, Optional, cast
 
 from aea.crypto.wallet import Wallet
@@ -31,7 +30,7 @@ from aea.crypto.ledger_apis import LedgerApis
 from aea.decision_maker.messages.transaction import TransactionMessage
 from aea.decision_maker.messages.state_update import StateUpdateMessage
 from aea.helpers.preference_representations.base import logarithmic_utility, linear_utility
-from aea.mail.base import OutBox  # , Envelope
+from aea.mail.base import OutBox, NotifyingQueue
 from aea.protocols.base import Message
 
 CurrencyHoldings = Dict[str, int]  # a map from identifier to quantity
@@ -336,19 +335,19 @@ class DecisionMaker:
         self._outbox = outbox
         self._wallet = wallet
         self._ledger_apis = ledger_apis
-        self._message_in_queue = Queue()  # type: Queue
-        self._message_out_queue = Queue()  # type: Queue
+        self._message_in_queue = NotifyingQueue()  # type: NotifyingQueue
+        self._message_out_queue = NotifyingQueue()  # type: NotifyingQueue
         self._ownership_state = OwnershipState()
         self._preferences = Preferences()
         self._goal_pursuit_readiness = GoalPursuitReadiness()
 
     @property
-    def message_in_queue(self) -> Queue:
+    def message_in_queue(self) -> NotifyingQueue:
         """Get (in) queue."""
         return self._message_in_queue
 
     @property
-    def message_out_queue(self) -> Queue:
+    def message_out_queue(self) -> NotifyingQueue:
         """Get (out) queue."""
         return self._message_out_queue
 
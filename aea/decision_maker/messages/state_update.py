@@ -37,6 +37,8 @@ ExchangeParams = Dict[str, float]   # a map from identifier to quantity
 class StateUpdateMessage(Message):
     """The state update message class."""
 
+    __slots__ = ()
+
     protocol_id = "internal"
 
     class Performative(Enum):
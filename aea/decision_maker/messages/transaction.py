@@ -23,7 +23,7 @@
 from enum import Enum
 from typing import Dict, Optional, Union, cast
 
-from aea.protocols.base import Message
+from aea.protocols.base import Message, MessageField
 
 TransactionId = str
 Address = str
@@ -32,6 +32,8 @@ Address = str
 class TransactionMessage(Message):
     """The transaction message class."""
 
+    __slots__ = ()
+
     protocol_id = "internal"
 
     class Performative(Enum):
@@ -41,6 +43,21 @@ class TransactionMessage(Message):
         ACCEPT = "accept"
         REJECT = "reject"
 
+    performative = MessageField()  # type: MessageField[Union[str, TransactionMessage.Performative]]
+    skill_id = MessageField()  # type: MessageField[str]
+    transaction_id = MessageField()  # type: MessageField[TransactionId]
+    sender = MessageField()  # type: MessageField[Address]
+    counterparty = MessageField()  # type: MessageField[Address]
+    is_sender_buyer = MessageField()  # type: MessageField[bool]
+    currency_pbk = MessageField()  # type: MessageField[str]
+    amount = MessageField()  # type: MessageField[int]
+    sender_tx_fee = MessageField()  # type: MessageField[int]
+    counterparty_tx_fee = MessageField()  # type: MessageField[int]
+    quantities_by_good_pbk = MessageField()  # type: MessageField[Dict[str, int]]
+    transaction_digest = MessageField()  # type: MessageField[Optional[str]]
+    dialogue_label = MessageField()  # type: MessageField[Optional[Dict[str, str]]]
+    ledger_id = MessageField()  # type: MessageField[Optional[str]]
+
     def __init__(self, performative: Union[str, Performative],
                  skill_id: str,
                  transaction_id: TransactionId,
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the scheduler of the coroutines of the skills."""
+
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Dict, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class CoroutineScheduler:
+    """
+    Run coroutines concurrently on the running event loop.
+
+    Each coroutine belongs to a group, whose coroutines run at most 'limit' at a time,
+    and optionally to an ordering key: the coroutines with the same key run one after the other,
+    in the order they were submitted.
+
+    The coroutines submitted are scheduled at once, whether they can run or not: the callers bound
+    the backlog of a group by waiting for room (see wait_for_room) before submitting.
+    """
+
+    def __init__(self):
+        """Initialize the scheduler."""
+        self._semaphores = {}  # type: Dict[Hashable, asyncio.Semaphore]
+        self._tails = {}  # type: Dict[Hashable, asyncio.Future]
+        self._futures = set()  # type: Set[asyncio.Future]
+        self._backlogs = {}  # type: Dict[Hashable, int]
+        self._room_waiters = {}  # type: Dict[Hashable, List[asyncio.Future]]
+
+    @property
+    def pending(self) -> int:
+        """Get the number of coroutines submitted and not completed yet."""
+        return len(self._futures)
+
+    def backlog(self, group: Hashable) -> int:
+        """
+        Get the number of coroutines of a group submitted and not completed yet, running or waiting to run.
+
+        :param group: the group.
+        :return: the number of coroutines.
+        """
+        return self._backlogs.get(group, 0)
+
+    async def wait_for_room(self, group: Hashable, max_backlog: int) -> None:
+        """
+        Wait until the backlog of a group is below a maximum.
+
+        :param group: the group.
+        :param max_backlog: the maximum number of coroutines of the group submitted and not completed yet.
+        :return: None
+        """
+        while self._backlogs.get(group, 0) >= max_backlog:
+            waiter = asyncio.get_event_loop().create_future()
+            waiters = self._room_waiters.setdefault(group, [])
+            waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in waiters:
+                    waiters.remove(waiter)
+
+    def submit(self, coroutine: Awaitable, group: Hashable, limit: int, key: Optional[Hashable] = None) -> asyncio.Future:
+        """
+        Schedule a coroutine.
+
+        It must be called from the event loop thread.
+
+        :param coroutine: the coroutine.
+        :param group: the group of the coroutine (e.g. its skill).
+        :param limit: the maximum number of coroutines of the group running at the same time.
+                      | It is fixed by the first coroutine submitted for the group.
+        :param key: the ordering key of the coroutine (e.g. its dialogue). If None, it is not ordered.
+        :return: the future of the coroutine.
+        """
+        previous = self._tails.get(key, None) if key is not None else None
+        future = asyncio.ensure_future(self._run(coroutine, group, limit, previous))
+        self._futures.add(future)
+        self._backlogs[group] = self._backlogs.get(group, 0) + 1
+        future.add_done_callback(functools.partial(self._on_done, group))
+        if key is not None:
+            self._tails[key] = future
+            future.add_done_callback(lambda f: self._tails.pop(key) if self._tails.get(key, None) is f else None)
+        return future
+
+    async def _run(self, coroutine: Awaitable, group: Hashable, limit: int, previous: Optional[asyncio.Future]) -> Any:
+        """
+        Run a coroutine after its predecessor, within the limit of its group.
+
+        :param coroutine: the coroutine.
+        :param group: the group of the coroutine.
+        :param limit: the concurrency limit of the group.
+        :param previous: the future of the coroutine to wait for, if any.
+        :return: the value returned by the coroutine.
+        """
+        try:
+            if previous is not None:
+                # the outcome of the predecessor is reported by its own future.
+                await asyncio.wait([previous])
+            semaphore = self._semaphores.get(group, None)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(limit)
+                self._semaphores[group] = semaphore
+            async with semaphore:
+                return await coroutine
+        finally:
+            # avoid the 'coroutine was never awaited' warning if cancelled before it started.
+            close = getattr(coroutine, "close", None)
+            if close is not None:
+                close()
+
+    def _on_done(self, group: Hashable, future: asyncio.Future) -> None:
+        """
+        Forget a completed coroutine, wake up a caller waiting for room in its group, and log its exception, if any.
+
+        :param group: the group of the coroutine.
+        :param future: the future of the coroutine.
+        :return: None
+        """
+        self._futures.discard(future)
+        backlog = self._backlogs.get(group, 0) - 1
+        if backlog > 0:
+            self._backlogs[group] = backlog
+        else:
+            self._backlogs.pop(group, None)
+        waiters = self._room_waiters.get(group, [])
+        while len(waiters) > 0:
+            # skip the waiters cancelled meanwhile.
+            waiter = waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+        if len(waiters) == 0:
+            self._room_waiters.pop(group, None)
+        exception = future.exception() if not future.cancelled() else None
+        if exception is not None:
+            logger.error("Error in a skill coroutine: {}".format(exception), exc_info=exception)
+
+    async def close(self) -> None:
+        """
+        Cancel the pending coroutines and wait for them to terminate.
+
+        :return: None
+        """
+        futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+        if len(futures) > 0:
+            await asyncio.wait(futures)
+        self._tails = {}
+        self._semaphores = {}
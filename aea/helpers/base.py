@@ -21,8 +21,10 @@
 
 import builtins
 import importlib.util
+import inspect
 import logging
 import os
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -68,3 +70,31 @@ def locate(path):
         except AttributeError:
             return None
     return object
+
+
+async def await_if_awaitable(result: Any) -> Any:
+    """
+    Await the result of a call if it is awaitable, e.g. the coroutine returned by an 'async def' method.
+
+    :param result: the result of the call.
+    :return: the awaited result, or the result itself if it is not awaitable.
+    """
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def discard_if_awaitable(result: Any, owner: Any) -> None:
+    """
+    Discard the awaitable returned by a skill component of a synchronous agent, which has no loop to run it.
+
+    :param result: the result of the call.
+    :param owner: the handler, behaviour or task which returned it.
+    :return: None
+    """
+    if inspect.isawaitable(result):
+        logger.error("{} returned an awaitable, which is discarded: coroutine skill components need an AsyncAEA."
+                     .format(type(owner).__name__))
+        close = getattr(result, "close", None)
+        if close is not None:
+            close()
@@ -21,11 +21,14 @@
 import asyncio
 import logging
 import queue
+import struct
 from abc import ABC, abstractmethod
+from collections import deque
 from asyncio import AbstractEventLoop, CancelledError
 from concurrent.futures import Future
+import threading
 from threading import Thread, Lock
-from typing import Optional, TYPE_CHECKING, List, Tuple, Dict, cast
+from typing import Optional, TYPE_CHECKING, Any, List, Tuple, Dict, Callable, Deque, Iterable, Iterator, Sequence, cast
 
 from aea.configurations.base import Address, ProtocolId
 from aea.connections.base import ConnectionStatus
@@ -36,6 +39,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+MAX_READS_PER_WAKEUP = 32
+
+HIGH_PRIORITY = 0
+NORMAL_PRIORITY = 1
+LOW_PRIORITY = 2
+DEFAULT_PRIORITY_WEIGHTS = (8, 4, 1)
+
+Route = Tuple[Optional[Address], Optional[ProtocolId]]
+
 
 class AEAConnectionError(Exception):
     """Exception class for connection errors."""
@@ -45,19 +57,228 @@ class Empty(Exception):
     """Exception for when the inbox is empty."""
 
 
+class Full(Exception):
+    """Exception for when the outbox is full."""
+
+
+class PriorityLanes:
+    """
+    A FIFO container split in priority lanes, drained by weighted round robin.
+
+    Lane 0 is the highest priority lane. At each round, up to weights[i] items are
+    taken from lane i before moving on to the next lane, so an item waits for at most
+    sum(weights) items, whatever the backlog of the lower priority lanes.
+    It implements the subset of the deque interface used by queue.Queue and asyncio.Queue.
+    """
+
+    def __init__(self, lane_of: Callable[[Any], int], weights: Sequence[int] = DEFAULT_PRIORITY_WEIGHTS):
+        """
+        Initialize the lanes.
+
+        :param lane_of: the function that maps an item to the index of its lane.
+        :param weights: the number of items taken from each lane at each round.
+        """
+        assert len(weights) > 0 and all(w > 0 for w in weights), "Lane weights must be positive."
+        self._lane_of = lane_of
+        self._weights = tuple(weights)
+        self._lanes = [deque() for _ in self._weights]  # type: List[Deque[Any]]
+        self._size = 0
+        self._current = 0
+        self._credit = self._weights[0]
+
+    def append(self, item: Any) -> None:
+        """Append an item to its lane."""
+        lane = min(max(self._lane_of(item), 0), len(self._lanes) - 1)
+        self._lanes[lane].append(item)
+        self._size += 1
+
+    def popleft(self) -> Any:
+        """
+        Take the next item, according to the weights of the lanes.
+
+        :return: the item.
+        :raises IndexError: if all the lanes are empty.
+        """
+        if self._size == 0:
+            raise IndexError("pop from empty PriorityLanes")
+        while True:
+            lane = self._lanes[self._current]
+            if len(lane) > 0 and self._credit > 0:
+                self._credit -= 1
+                self._size -= 1
+                return lane.popleft()
+            self._current = (self._current + 1) % len(self._lanes)
+            self._credit = self._weights[self._current]
+
+    def clear(self) -> None:
+        """Remove all the items."""
+        for lane in self._lanes:
+            lane.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Get the number of items."""
+        return self._size
+
+    def __bool__(self) -> bool:
+        """Check whether there is any item."""
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items, lane by lane."""
+        for lane in self._lanes:
+            yield from lane
+
+
+class PriorityAsyncQueue(asyncio.Queue):
+    """An asyncio queue whose items are stored in priority lanes."""
+
+    def __init__(self, lanes: PriorityLanes, **kwargs):
+        """
+        Initialize the queue.
+
+        :param lanes: the (empty) priority lanes to store the items.
+        """
+        self._lanes = lanes
+        super().__init__(**kwargs)
+
+    def _init(self, maxsize):
+        """Initialize the storage of the queue."""
+        self._queue = self._lanes
+
+
+class NotifyingQueue(queue.Queue):
+    """
+    A thread-safe FIFO queue that notifies listeners whenever an item is put.
+
+    The listeners are callables without arguments (e.g. the `set` method of a threading event),
+    so that a consumer can block on a single signal raised by any of the queues it is interested in.
+    """
+
+    def __init__(self, maxsize: int = 0, lanes: Optional[PriorityLanes] = None):
+        """
+        Initialize the queue.
+
+        :param maxsize: the maximum size of the queue. If non-positive, the queue is unbounded.
+        :param lanes: the (empty) priority lanes to store the items. If None, the queue is a plain FIFO.
+        """
+        self._lanes = lanes
+        super().__init__(maxsize)
+        self._listeners = []  # type: List[Callable[[], None]]
+        self._get_listeners = []  # type: List[Callable[[], None]]
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Add a callable to be called every time an item is put in the queue.
+
+        :param listener: the listener.
+        :return: None
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Remove a listener.
+
+        :param listener: the listener.
+        :return: None
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def add_get_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Add a callable to be called every time an item is got from the queue.
+
+        The listener is called while holding the lock of the queue, so it must not call
+        the blocking methods of the queue (e.g. 'qsize').
+
+        :param listener: the listener.
+        :return: None
+        """
+        if listener not in self._get_listeners:
+            self._get_listeners.append(listener)
+
+    def _init(self, maxsize):
+        """Initialize the storage of the queue."""
+        super()._init(maxsize)
+        if self._lanes is not None:
+            self.queue = self._lanes  # type: ignore
+
+    def _put(self, item) -> None:
+        """Put the item in the queue and notify the listeners."""
+        super()._put(item)
+        for listener in self._listeners:
+            listener()
+
+    def _get(self):
+        """Get an item from the queue and notify the get listeners."""
+        item = super()._get()
+        for listener in self._get_listeners:
+            listener()
+        return item
+
+
+class Watermarks:
+    """The high and low watermarks of a queue, used to apply backpressure."""
+
+    def __init__(self, high: int, low: Optional[int] = None):
+        """
+        Initialize the watermarks.
+
+        :param high: the number of items at which the queue is considered full.
+        :param low: the number of items at which a full queue is considered drained. Defaults to half the high watermark.
+        """
+        assert high > 0, "The high watermark must be positive."
+        self.high = high
+        self.low = low if low is not None else high // 2
+        assert 0 <= self.low < self.high, "The low watermark must be non-negative and lower than the high watermark."
+
+
+class MultiplexerStats:
+    """Counters of the envelopes affected by the backpressure of the multiplexer."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.nb_dropped_envelopes = 0
+        self.nb_deferred_puts = 0
+        self.nb_deferred_receptions = 0
+
+    def __str__(self):
+        """Get the string representation of the counters."""
+        return "MultiplexerStats(nb_dropped_envelopes={}, nb_deferred_puts={}, nb_deferred_receptions={})"\
+            .format(self.nb_dropped_envelopes, self.nb_deferred_puts, self.nb_deferred_receptions)
+
+
 class EnvelopeContext:
     """Extra information for the handling of an envelope."""
 
+    __slots__ = ("connection_id",)
+
     def __init__(self, connection_id: Optional[str] = None):
         """Initialize the envelope context."""
         self.connection_id = connection_id
 
+    def replace(self, connection_id: Optional[str]) -> 'EnvelopeContext':
+        """
+        Get a copy of the context with another connection id.
+
+        :param connection_id: the id of the connection to send the envelope through.
+        :return: the new envelope context.
+        """
+        return EnvelopeContext(connection_id=connection_id)
+
     def __eq__(self, other):
         """Compare with another object."""
         return isinstance(other, EnvelopeContext) \
             and self.connection_id == other.connection_id
 
 
+# only compared against, never handed out, so it stays empty.
+_EMPTY_ENVELOPE_CONTEXT = EnvelopeContext()
+
+
 class EnvelopeSerializer(ABC):
     """This abstract class let the devloper to specify serialization layer for the envelope."""
 
@@ -79,7 +300,7 @@ class ProtobufEnvelopeSerializer(EnvelopeSerializer):
         envelope_pb.to = envelope.to
         envelope_pb.sender = envelope.sender
         envelope_pb.protocol_id = envelope.protocol_id
-        envelope_pb.message = envelope.message
+        envelope_pb.message = bytes(envelope.message)
 
         envelope_bytes = envelope_pb.SerializeToString()
         return envelope_bytes
@@ -99,14 +320,73 @@ class ProtobufEnvelopeSerializer(EnvelopeSerializer):
         return envelope
 
 
+class LengthPrefixedEnvelopeSerializer(EnvelopeSerializer):
+    """
+    Envelope serializer with a fixed-size header followed by the raw fields.
+
+    The header holds the lengths of 'to', 'sender' and 'protocol_id' (unsigned 16 bits)
+    and of the message (unsigned 32 bits), in network byte order. Then come the
+    UTF-8 encoded addresses and protocol id, and the message as is.
+
+    Decoding does not copy the message: it is a memoryview on the decoded buffer,
+    so an envelope can be relayed, i.e. decoded and encoded again, with a single
+    copy of the payload, in the new frame. Notice that the view keeps the whole buffer
+    alive, and that the envelope is hashable only if the buffer is read-only (e.g. bytes).
+    """
+
+    HEADER = struct.Struct("!HHHI")
+
+    def encode(self, envelope: 'Envelope') -> bytes:
+        """Encode the envelope."""
+        to = envelope.to.encode("utf-8")
+        sender = envelope.sender.encode("utf-8")
+        protocol_id = envelope.protocol_id.encode("utf-8")
+        message = envelope.message
+        header = self.HEADER.pack(len(to), len(sender), len(protocol_id), len(message))
+        return b"".join((header, to, sender, protocol_id, message))
+
+    def decode(self, envelope_bytes: bytes) -> 'Envelope':
+        """
+        Decode the envelope.
+
+        :param envelope_bytes: the encoded envelope. Any bytes-like object is accepted.
+        :return: the envelope, whose message is a memoryview on envelope_bytes.
+        :raises ValueError: if the buffer is truncated or has trailing bytes.
+        """
+        view = memoryview(envelope_bytes)
+        if len(view) < self.HEADER.size:
+            raise ValueError("Expected at least {} bytes, got {}.".format(self.HEADER.size, len(view)))
+        to_length, sender_length, protocol_id_length, message_length = self.HEADER.unpack_from(view)
+        start = self.HEADER.size
+        sender_start = start + to_length
+        protocol_id_start = sender_start + sender_length
+        message_start = protocol_id_start + protocol_id_length
+        end = message_start + message_length
+        if end != len(view):
+            raise ValueError("Expected {} bytes, got {}.".format(end, len(view)))
+
+        to = str(view[start:sender_start], "utf-8")
+        sender = str(view[sender_start:protocol_id_start], "utf-8")
+        protocol_id = str(view[protocol_id_start:message_start], "utf-8")
+        message = cast(bytes, view[message_start:end])
+        return Envelope(to=to, sender=sender, protocol_id=protocol_id, message=message)
+
+
 DefaultEnvelopeSerializer = ProtobufEnvelopeSerializer
 
 
 class Envelope:
-    """The top level message class."""
+    """
+    The top level message class.
+
+    The fields are plain slots, so they are read and set without going through a property.
+    The context is created on first access, so the envelopes sent without one do not allocate it.
+    """
 
     default_serializer = DefaultEnvelopeSerializer()
 
+    __slots__ = ("to", "sender", "protocol_id", "message", "_context")
+
     def __init__(self, to: Address,
                  sender: Address,
                  protocol_id: ProtocolId,
@@ -118,67 +398,39 @@ class Envelope:
         :param to: the public key of the receiver.
         :param sender: the public key of the sender.
         :param protocol_id: the protocol id.
-        :param message: the protocol-specific message
+        :param message: the protocol-specific message. Any bytes-like object is accepted, e.g. a memoryview.
+        :param context: the envelope context.
         """
-        self._to = to
-        self._sender = sender
-        self._protocol_id = protocol_id
-        self._message = message
-        self._context = context if context is not None else EnvelopeContext()  # type: Optional[EnvelopeContext]
+        self.to = to
+        self.sender = sender
+        self.protocol_id = protocol_id
+        self.message = message
+        self._context = context  # type: Optional[EnvelopeContext]
 
     @property
-    def to(self) -> Address:
-        """Get public key of receiver."""
-        return self._to
-
-    @to.setter
-    def to(self, to: Address) -> None:
-        """Set public key of receiver."""
-        self._to = to
-
-    @property
-    def sender(self) -> Address:
-        """Get public key of sender."""
-        return self._sender
-
-    @sender.setter
-    def sender(self, sender: Address) -> None:
-        """Set public key of sender."""
-        self._sender = sender
-
-    @property
-    def protocol_id(self) -> ProtocolId:
-        """Get protocol id."""
-        return self._protocol_id
-
-    @protocol_id.setter
-    def protocol_id(self, protocol_id: ProtocolId) -> None:
-        """Set the protocol id."""
-        self._protocol_id = protocol_id
-
-    @property
-    def message(self) -> bytes:
-        """Get the Message."""
-        return self._message
-
-    @message.setter
-    def message(self, message: bytes) -> None:
-        """Set the message."""
-        self._message = message
-
-    @property
-    def context(self) -> Optional[EnvelopeContext]:
+    def context(self) -> EnvelopeContext:
         """Get the envelope context."""
+        if self._context is None:
+            self._context = EnvelopeContext()
         return self._context
 
     def __eq__(self, other):
         """Compare with another object."""
-        return isinstance(other, Envelope) \
-            and self.to == other.to \
+        if self is other:
+            return True
+        if not isinstance(other, Envelope):
+            return False
+        context = self._context if self._context is not None else _EMPTY_ENVELOPE_CONTEXT
+        other_context = other._context if other._context is not None else _EMPTY_ENVELOPE_CONTEXT
+        return self.to == other.to \
             and self.sender == other.sender \
             and self.protocol_id == other.protocol_id \
             and self.message == other.message \
-            and self.context == other.context
+            and context == other_context
+
+    def __hash__(self):
+        """Get the hash of the envelope. The context is left out, as it can be changed."""
+        return hash((self.to, self.sender, self.protocol_id, self.message))
 
     def encode(self, serializer: Optional[EnvelopeSerializer] = None) -> bytes:
         """
@@ -216,7 +468,13 @@ class Multiplexer:
     """This class can handle multiple connections at once."""
 
     def __init__(self, connections: List['Connection'],
-                 default_connection_index: int = 0, loop: Optional[AbstractEventLoop] = None):
+                 default_connection_index: int = 0, loop: Optional[AbstractEventLoop] = None,
+                 in_queue_watermarks: Optional[Watermarks] = None,
+                 out_queue_watermarks: Optional[Watermarks] = None,
+                 block_when_full: bool = True,
+                 routes: Optional[Dict[Route, str]] = None,
+                 protocol_priorities: Optional[Dict[ProtocolId, int]] = None,
+                 priority_weights: Sequence[int] = DEFAULT_PRIORITY_WEIGHTS):
         """
         Initialize the connection multiplexer.
 
@@ -225,6 +483,21 @@ class Multiplexer:
                                        | this information is used for envelopes which
                                        | don't specify any routing context.
         :param loop: the event loop to run the multiplexer. If None, a new event loop is created.
+        :param in_queue_watermarks: the watermarks of the in queue. When the high watermark is reached,
+                                  | the multiplexer stops receiving from the connections that deliver envelopes,
+                                  | until the queue is drained to the low watermark. If None, the queue is unbounded.
+        :param out_queue_watermarks: the watermarks of the outgoing envelopes. If None, they are unbounded.
+        :param block_when_full: if True, putting envelopes when the high watermark of the outgoing envelopes
+                              | is reached blocks until they are drained to the low watermark;
+                              | otherwise, it fails fast raising Full.
+        :param routes: the initial routing table, mapping pairs (destination address, protocol id) to connection ids.
+                     | Either element of a pair can be None, meaning 'any'. The connections restricted to
+                     | some protocols are added as routes for those protocols, unless already routed.
+                     | The addresses notified by the connections are kept apart, and never override these routes.
+        :param protocol_priorities: the priority class of the envelopes, by protocol id (HIGH_PRIORITY,
+                                  | NORMAL_PRIORITY or LOW_PRIORITY, i.e. the index of the lane). The protocols
+                                  | not listed have NORMAL_PRIORITY. If None, the queues are plain FIFOs.
+        :param priority_weights: the number of envelopes taken from each priority lane at each round.
         """
         assert len(connections) > 0, "List of connections cannot be empty."
         assert 0 <= default_connection_index <= len(connections) - 1, "Default connection index out of range."
@@ -234,18 +507,63 @@ class Multiplexer:
         self.default_connection = self._connections[default_connection_index]  # type: Connection
         self._connection_status = ConnectionStatus()
 
+        self._routing_table = {}  # type: Dict[Route, str]
+        # the connections through which each address was notified reachable, the first one is used.
+        self._learned_routes = {}  # type: Dict[Address, Tuple[str, ...]]
+        for connection in self._connections:
+            connection.address_listener = self._on_address_notified
+            for protocol_id in connection.restricted_to_protocols:
+                self._routing_table.setdefault((None, protocol_id), connection.connection_id)
+        for (address, protocol_id), connection_id in (routes or {}).items():
+            self.add_route(connection_id, address=address, protocol_id=protocol_id)
+
         self._lock = Lock()
         self._loop = loop if loop is not None else asyncio.new_event_loop()
         self._thread = Thread(target=self._run_loop)
+        self._loop_thread_id = None  # type: Optional[int]
 
-        self._in_queue = queue.Queue()  # type: queue.Queue
+        self._protocol_priorities = protocol_priorities
+        self._priority_weights = priority_weights
+        self._in_queue = NotifyingQueue(lanes=self._new_priority_lanes())  # type: NotifyingQueue
         self._out_queue = None  # type: Optional[asyncio.Queue]
+        self._out_buffer = deque()  # type: Deque[Envelope]
+        self._out_buffer_lock = Lock()
+        self._is_flush_scheduled = False
+
+        self._in_queue_watermarks = in_queue_watermarks
+        self._out_queue_watermarks = out_queue_watermarks
+        self._block_when_full = block_when_full
+        self._in_queue_drained = None  # type: Optional[asyncio.Event]
+        self._out_not_full = threading.Condition()
+        self._nb_blocked_putters = 0
+        self._is_out_closed = False
+        self._stats = MultiplexerStats()
+        if self._in_queue_watermarks is not None:
+            self._in_queue.add_get_listener(self._on_in_queue_get)
 
         self._recv_loop_task = None  # type: Optional[Future]
         self._send_loop_task = None  # type: Optional[Future]
 
+    def _new_priority_lanes(self) -> Optional[PriorityLanes]:
+        """Create the priority lanes of a queue, if priorities are configured."""
+        if self._protocol_priorities is None:
+            return None
+        protocol_priorities = self._protocol_priorities
+
+        def lane_of(envelope: Optional[Envelope]) -> int:
+            if envelope is None:
+                return HIGH_PRIORITY
+            return protocol_priorities.get(envelope.protocol_id, NORMAL_PRIORITY)
+
+        return PriorityLanes(lane_of, self._priority_weights)
+
+    @property
+    def loop(self) -> AbstractEventLoop:
+        """Get the event loop of the multiplexer."""
+        return self._loop
+
     @property
-    def in_queue(self) -> queue.Queue:
+    def in_queue(self) -> NotifyingQueue:
         """Get the in queue."""
         return self._in_queue
 
@@ -255,6 +573,16 @@ class Multiplexer:
         assert self._out_queue is not None, "Accessing out queue before loop is started."
         return self._out_queue
 
+    @property
+    def stats(self) -> MultiplexerStats:
+        """Get the backpressure counters."""
+        return self._stats
+
+    @property
+    def out_buffer(self) -> Deque[Envelope]:
+        """Get the buffer of the envelopes not yet moved to the out queue."""
+        return self._out_buffer
+
     @property
     def connections(self) -> Tuple['Connection']:
         """Get the connections."""
@@ -270,6 +598,92 @@ class Multiplexer:
         """Get the connection status."""
         return self._connection_status
 
+    @property
+    def routing_table(self) -> Dict[Route, str]:
+        """Get (a copy of) the routing table, i.e. the routes set on construction or with add_route."""
+        return dict(self._routing_table)
+
+    @property
+    def learned_routes(self) -> Dict[Address, str]:
+        """Get the connections through which the addresses notified by the connections are routed."""
+        return {address: connection_ids[0] for address, connection_ids in self._learned_routes.items()}
+
+    def add_route(self, connection_id: str, address: Optional[Address] = None, protocol_id: Optional[ProtocolId] = None) -> None:
+        """
+        Route the envelopes with a destination address and/or protocol id through a connection.
+
+        The routes are applied to the envelopes whose context does not specify a connection.
+        The most specific route wins: (address, protocol id), then address, then an address
+        notified by a connection, then protocol id.
+
+        :param connection_id: the id of the connection.
+        :param address: the destination address. If None, the route applies to any destination.
+        :param protocol_id: the protocol id. If None, the route applies to any protocol.
+        :return: None
+        :raises ValueError: if the connection is not registered, or neither the address nor the protocol id is provided.
+        """
+        if connection_id not in self._name_to_connection:
+            raise ValueError("No connection registered with id: {}.".format(connection_id))
+        if address is None and protocol_id is None:
+            raise ValueError("A route needs a destination address or a protocol id.")
+        self._routing_table[(address, protocol_id)] = connection_id
+
+    def remove_route(self, address: Optional[Address] = None, protocol_id: Optional[ProtocolId] = None) -> None:
+        """
+        Remove a route.
+
+        :param address: the destination address of the route.
+        :param protocol_id: the protocol id of the route.
+        :return: None
+        """
+        self._routing_table.pop((address, protocol_id), None)
+
+    def _on_address_notified(self, connection_id: str, address: Address, is_reachable: bool) -> None:
+        """
+        Update the learned routes when a connection notifies an address.
+
+        The learned routes are kept apart from the routing table, so they never replace a route set explicitly.
+        An address stays routed through the first connection that notified it, until that connection
+        notifies it unreachable; then the next connection that notified it takes over.
+
+        :param connection_id: the id of the connection.
+        :param address: the address.
+        :param is_reachable: whether the address became reachable or unreachable through the connection.
+        :return: None
+        """
+        # the tuples are replaced, not mutated, so that a concurrent lookup never sees an empty one.
+        connection_ids = self._learned_routes.get(address, ())
+        if is_reachable:
+            if connection_id not in connection_ids:
+                self._learned_routes[address] = connection_ids + (connection_id,)
+        elif connection_id in connection_ids:
+            connection_ids = tuple(c for c in connection_ids if c != connection_id)
+            if len(connection_ids) > 0:
+                self._learned_routes[address] = connection_ids
+            else:
+                self._learned_routes.pop(address, None)
+
+    def _route(self, envelope: Envelope) -> Optional['Connection']:
+        """
+        Find the connection to send an envelope through, from the routing table.
+
+        :param envelope: the envelope.
+        :return: the connection, or None if no route matches.
+        """
+        routing_table = self._routing_table
+        if len(routing_table) == 0 and len(self._learned_routes) == 0:
+            return None
+        connection_id = routing_table.get((envelope.to, envelope.protocol_id))
+        if connection_id is None:
+            connection_id = routing_table.get((envelope.to, None))
+        if connection_id is None:
+            connection_ids = self._learned_routes.get(envelope.to)
+            if connection_ids is not None:
+                connection_id = connection_ids[0]
+        if connection_id is None:
+            connection_id = routing_table.get((None, envelope.protocol_id))
+        return self._name_to_connection.get(connection_id) if connection_id is not None else None
+
     def connect(self) -> None:
         """Connect the multiplexer."""
         with self._lock:
@@ -277,6 +691,7 @@ class Multiplexer:
                 logger.debug("Multiplexer already connected.")
                 return
             self._start_loop_threaded()
+            self._is_out_closed = False
             try:
                 asyncio.run_coroutine_threadsafe(self._connect_all(), loop=self._loop).result()
                 assert self.is_connected
@@ -312,8 +727,12 @@ class Multiplexer:
         """
         logger.debug("Starting threaded asyncio loop...")
         asyncio.set_event_loop(self._loop)
-        self._out_queue = asyncio.Queue()
+        self._loop_thread_id = threading.get_ident()
+        lanes = self._new_priority_lanes()
+        self._out_queue = asyncio.Queue() if lanes is None else PriorityAsyncQueue(lanes)
+        self._in_queue_drained = asyncio.Event()
         self._loop.run_forever()
+        self._loop_thread_id = None
         logger.debug("Asyncio loop has been stopped.")
 
     def _start_loop_threaded(self):
@@ -327,6 +746,11 @@ class Multiplexer:
         if self._recv_loop_task is not None and not self._recv_loop_task.done():
             self._recv_loop_task.cancel()
 
+        # wake up the threads blocked on a full out queue: nothing drains it anymore.
+        with self._out_not_full:
+            self._is_out_closed = True
+            self._out_not_full.notify_all()
+
         if self._send_loop_task is not None and not self._send_loop_task.done():
             # send a 'stop' token (a None value) to wake up the coroutine waiting for outgoing messages.
             asyncio.run_coroutine_threadsafe(self.out_queue.put(None), self._loop).result()
@@ -402,6 +826,7 @@ class Multiplexer:
             try:
                 logger.debug("Waiting for outgoing messages...")
                 envelope = await self.out_queue.get()
+                self._on_out_queue_get()
                 if envelope is None:
                     logger.debug("Received empty message. Quitting the sending loop...")
                     return None
@@ -417,41 +842,154 @@ class Multiplexer:
                 return
 
     async def _receiving_loop(self):
-        """Process incoming messages."""
+        """Process incoming messages, running one reader per connection."""
         logger.debug("Starting receving loop...")
-        task_to_connection = {asyncio.ensure_future(conn.receive()): conn for conn in self.connections}
+        readers = [asyncio.ensure_future(self._read_connection(conn)) for conn in self.connections]
 
-        while self.connection_status.is_connected and len(task_to_connection) > 0:
-            try:
-                logger.debug("Waiting for incoming messages...")
-                done, pending = await asyncio.wait(task_to_connection.keys(),
-                                                   return_when=asyncio.FIRST_COMPLETED)
-
-                # process completed receiving tasks.
-                for task in done:
-                    envelope = task.result()
-                    if envelope is not None:
-                        self.in_queue.put_nowait(envelope)
-
-                    # reinstantiate receiving task, but only if the connection is still up.
-                    connection = task_to_connection.pop(task)
-                    if connection.connection_status.is_connected:
-                        new_task = asyncio.ensure_future(connection.receive())
-                        task_to_connection[new_task] = connection
+        try:
+            logger.debug("Waiting for incoming messages...")
+            await asyncio.wait(readers)
+        except asyncio.CancelledError:
+            logger.debug("Receiving loop cancelled.")
+            for reader in readers:
+                reader.cancel()
+            return
+        except Exception as e:
+            logger.error("Error in the receiving loop: {}".format(str(e)))
+            for reader in readers:
+                reader.cancel()
+            return
+
+        logger.debug("Receiving loop terminated.")
+
+    async def _read_connection(self, connection: 'Connection') -> None:
+        """
+        Receive the envelopes from a connection and put them in the in queue, as long as the connection is up.
 
+        Ready envelopes are received without yielding to the event loop, up to
+        MAX_READS_PER_WAKEUP envelopes in a row. When the in queue is full, the reader
+        stops receiving until the queue is drained to its low watermark.
+
+        :param connection: the connection.
+        :return: None
+        """
+        nb_reads = 0
+        while self.connection_status.is_connected and connection.connection_status.is_connected:
+            try:
+                envelope = await connection.receive()
+                if envelope is not None:
+                    self.in_queue.put_nowait(envelope)
+
+                if self._is_in_queue_full():
+                    logger.debug("In queue full. Pausing the reception from connection {}.".format(connection.connection_id))
+                    self._stats.nb_deferred_receptions += 1
+                    await self._wait_in_queue_drained()
+                    nb_reads = 0
+                    continue
+
+                nb_reads += 1
+                if nb_reads >= MAX_READS_PER_WAKEUP:
+                    # let the other readers run.
+                    nb_reads = 0
+                    await asyncio.sleep(0)
             except asyncio.CancelledError:
-                logger.debug("Receiving loop cancelled.")
-                for t in task_to_connection.keys():
-                    await t
                 return
             except Exception as e:
                 logger.error("Error in the receiving loop: {}".format(str(e)))
                 return
 
-        # cancel all the receiving tasks.
-        for t in task_to_connection.keys():
-            t.cancel()
-        logger.debug("Receiving loop terminated.")
+    def _is_in_queue_full(self) -> bool:
+        """Check whether the in queue reached its high watermark."""
+        return self._in_queue_watermarks is not None and self.in_queue.qsize() >= self._in_queue_watermarks.high
+
+    def _wait_in_queue_drained(self) -> asyncio.Future:
+        """
+        Get a task that completes when the in queue is drained to its low watermark.
+
+        This method is supposed to be run only in the Multiplexer thread.
+        """
+        assert self._in_queue_drained is not None and self._in_queue_watermarks is not None
+        self._in_queue_drained.clear()
+        # the queue might have been drained before the event was cleared.
+        if self.in_queue.qsize() <= self._in_queue_watermarks.low:
+            self._in_queue_drained.set()
+        return asyncio.ensure_future(self._in_queue_drained.wait())
+
+    def _on_in_queue_get(self) -> None:
+        """
+        Signal the receiving loop when the in queue is drained to its low watermark.
+
+        This method is called by the consumer thread, while holding the lock of the in queue.
+        """
+        drained = self._in_queue_drained
+        watermarks = cast(Watermarks, self._in_queue_watermarks)
+        if drained is not None and not drained.is_set() and len(self.in_queue.queue) <= watermarks.low:
+            self._loop.call_soon_threadsafe(drained.set)
+
+    def _out_size(self) -> int:
+        """Get the number of outgoing envelopes not yet sent."""
+        out_queue_size = self._out_queue.qsize() if self._out_queue is not None else 0
+        return len(self._out_buffer) + out_queue_size
+
+    def _is_out_full(self) -> bool:
+        """Check whether the outgoing envelopes reached their high watermark."""
+        return self._out_queue_watermarks is not None and self._out_size() >= self._out_queue_watermarks.high
+
+    def _on_out_queue_get(self) -> None:
+        """
+        Wake up the threads blocked on a full out queue, if it is drained to its low watermark.
+
+        This method is supposed to be run only in the Multiplexer thread.
+        """
+        if self._nb_blocked_putters > 0 and self._out_size() <= cast(Watermarks, self._out_queue_watermarks).low:
+            with self._out_not_full:
+                self._out_not_full.notify_all()
+
+    def _wait_out_not_full(self, block: bool, timeout: Optional[float]) -> None:
+        """
+        Apply backpressure on the producers of outgoing envelopes.
+
+        :param block: whether to wait for the outgoing envelopes to be drained to the low watermark.
+        :param timeout: the maximum time to wait, in seconds. If None, wait indefinitely.
+        :return: None
+        :raises Full: if the outgoing envelopes are above the high watermark and cannot be waited for.
+        :raises AEAConnectionError: if the multiplexer is disconnected while waiting.
+        """
+        watermarks = cast(Watermarks, self._out_queue_watermarks)
+        if block and not self.is_in_loop_thread():
+            self._stats.nb_deferred_puts += 1
+            with self._out_not_full:
+                self._nb_blocked_putters += 1
+                try:
+                    self._out_not_full.wait_for(
+                        lambda: self._out_size() <= watermarks.low or self._is_out_closed or not self.connection_status.is_connected,
+                        timeout=timeout)
+                finally:
+                    self._nb_blocked_putters -= 1
+                if self._is_out_closed:
+                    raise AEAConnectionError("The multiplexer was disconnected while waiting to send envelopes.")
+            if not self._is_out_full():
+                return
+        raise Full("The outgoing envelopes reached the high watermark ({}).".format(watermarks.high))
+
+    def _apply_backpressure(self, nb_envelopes: int, block: Optional[bool], timeout: Optional[float]) -> None:
+        """
+        Wait for the outgoing envelopes to be drained, if they reached the high watermark.
+
+        :param nb_envelopes: the number of envelopes to put, counted as dropped if they cannot be put.
+        :param block: whether to block. If None, the 'block_when_full' policy of the multiplexer is applied.
+        :param timeout: the maximum time to block, in seconds. If None, block indefinitely.
+        :return: None
+        :raises Full: if the outgoing envelopes are above the high watermark and cannot be waited for.
+        :raises AEAConnectionError: if the multiplexer is disconnected while waiting.
+        """
+        if not self._is_out_full():
+            return
+        try:
+            self._wait_out_not_full(self._block_when_full if block is None else block, timeout)
+        except (Full, AEAConnectionError):
+            self._stats.nb_dropped_envelopes += nb_envelopes
+            raise
 
     async def _send(self, envelope: Envelope) -> None:
         """
@@ -462,14 +1000,17 @@ class Multiplexer:
         :raises ValueError: if the connection id provided is not valid.
         :raises AEAConnectionError: if the connection id provided is not valid.
         """
-        envelope_context = envelope.context
-        connection_id = envelope_context.connection_id if envelope_context is not None else None
+        # read the slot, so that no context is created for the envelopes sent without one.
+        context = envelope._context
+        connection_id = context.connection_id if context is not None else None
 
         if connection_id is not None and connection_id not in self._name_to_connection:
             raise AEAConnectionError("No connection registered with id: {}.".format(connection_id))
 
         connection_id = cast(str, connection_id)
         connection = self._name_to_connection.get(connection_id, None)
+        if connection is None:
+            connection = self._route(envelope)
         if connection is None:
             logger.debug("Using default connection: {}".format(self.default_connection))
             connection = self.default_connection
@@ -497,19 +1038,90 @@ class Multiplexer:
         except queue.Empty:
             raise Empty
 
+    def is_in_loop_thread(self) -> bool:
+        """Check whether the caller is running in the thread of the multiplexer's event loop."""
+        return self._loop_thread_id is not None and self._loop_thread_id == threading.get_ident()
+
     def put(self, envelope: Envelope) -> None:
         """
         Schedule an envelope for sending it.
 
         Notice that the output queue is an asyncio.Queue which uses an event loop
         running on a different thread than the one used in this function.
+        If the caller is already running in the loop thread (e.g. an asynchronous agent),
+        the envelope is enqueued directly.
+        The backpressure is applied as in put_many, with the 'block_when_full' policy of the multiplexer.
 
         :param envelope: the envelope to be sent.
         :return: None
+        :raises Full: if the outgoing envelopes reached their high watermark and the call does not block.
+        :raises AEAConnectionError: if the multiplexer is disconnected while the call blocks.
         """
+        self._apply_backpressure(1, None, None)
+        if self.is_in_loop_thread():
+            self.out_queue.put_nowait(envelope)
+            return
         fut = asyncio.run_coroutine_threadsafe(self.out_queue.put(envelope), self._loop)
         return fut.result()
 
+    def put_nowait(self, envelope: Envelope) -> None:
+        """
+        Schedule an envelope for sending it, without waiting for it to be enqueued.
+
+        :param envelope: the envelope to be sent.
+        :return: None
+        :raises Full: if the outgoing envelopes reached their high watermark.
+        """
+        self.put_many([envelope], block=False)
+
+    def put_many(self, envelopes: Iterable[Envelope], block: Optional[bool] = None, timeout: Optional[float] = None) -> None:
+        """
+        Schedule a batch of envelopes for sending them, without waiting for them to be enqueued.
+
+        The envelopes are appended to a thread-safe buffer; the event loop is woken up
+        only once per batch, however many envelopes are put before the buffer is flushed.
+        The order of the envelopes is preserved.
+
+        :param envelopes: the envelopes to be sent.
+        :param block: whether to block when the outgoing envelopes reached their high watermark.
+                    | If None, the 'block_when_full' policy of the multiplexer is applied.
+                    | The call never blocks in the thread of the event loop.
+        :param timeout: the maximum time to block, in seconds. If None, block indefinitely.
+        :return: None
+        :raises Full: if the outgoing envelopes reached their high watermark and the call does not block,
+                    | or the timeout expires. In that case, none of the envelopes is sent.
+        :raises AEAConnectionError: if the multiplexer is disconnected while the call blocks.
+                    | In that case, none of the envelopes is sent.
+        """
+        if self._is_out_full():
+            envelopes = list(envelopes)
+            self._apply_backpressure(len(envelopes), block, timeout)
+
+        if self.is_in_loop_thread():
+            for envelope in envelopes:
+                self.out_queue.put_nowait(envelope)
+            return
+
+        with self._out_buffer_lock:
+            self._out_buffer.extend(envelopes)
+            if self._is_flush_scheduled or len(self._out_buffer) == 0:
+                return
+            self._is_flush_scheduled = True
+        self._loop.call_soon_threadsafe(self._flush_out_buffer)
+
+    def _flush_out_buffer(self) -> None:
+        """
+        Move the buffered envelopes to the out queue.
+
+        This method is supposed to be run only in the Multiplexer thread.
+        """
+        with self._out_buffer_lock:
+            envelopes = list(self._out_buffer)
+            self._out_buffer.clear()
+            self._is_flush_scheduled = False
+        for envelope in envelopes:
+            self.out_queue.put_nowait(envelope)
+
 
 class InBox(object):
     """A queue from where you can only consume messages."""
@@ -580,7 +1192,7 @@ class OutBox(object):
 
         :return: boolean indicating whether there is a message or not
         """
-        return self._multiplexer.out_queue.empty()
+        return len(self._multiplexer.out_buffer) == 0 and self._multiplexer.out_queue.empty()
 
     def put(self, envelope: Envelope) -> None:
         """
@@ -588,10 +1200,24 @@ class OutBox(object):
 
         :param envelope: the envelope.
         :return: None
+        :raises Full: if the outbox is full and the multiplexer does not block when full.
+        :raises AEAConnectionError: if the multiplexer is disconnected while the call blocks on a full outbox.
         """
         logger.debug("Put an envelope in the queue: to='{}' sender='{}' protocol_id='{}' message='{!r}'..."
                      .format(envelope.to, envelope.sender, envelope.protocol_id, envelope.message))
-        self._multiplexer.put(envelope)
+        self._multiplexer.put_many([envelope])
+
+    def put_many(self, envelopes: List[Envelope]) -> None:
+        """
+        Put a batch of envelopes into the queue.
+
+        :param envelopes: the envelopes.
+        :return: None
+        :raises Full: if the outbox is full and the multiplexer does not block when full.
+        :raises AEAConnectionError: if the multiplexer is disconnected while the call blocks on a full outbox.
+        """
+        logger.debug("Put {} envelopes in the queue...".format(len(envelopes)))
+        self._multiplexer.put_many(envelopes)
 
     def put_message(self, to: Address, sender: Address,
                     protocol_id: ProtocolId, message: bytes) -> None:
@@ -603,6 +1229,8 @@ class OutBox(object):
         :param protocol_id: the protocol id.
         :param message: the content of the message.
         :return: None
+        :raises Full: if the outbox is full and the multiplexer does not block when full.
+        :raises AEAConnectionError: if the multiplexer is disconnected while the call blocks on a full outbox.
         """
         envelope = Envelope(to=to, sender=sender, protocol_id=protocol_id, message=message)
-        self._multiplexer.put(envelope)
+        self._multiplexer.put_many([envelope])
@@ -22,4 +22,4 @@ from typing import List
 
 default_dependencies = []  # type: List[str]
 fipa_dependencies = ["protobuf"]  # type: List[str]
-oef_dependencies = ["colorlog", "oef"]  # type: List[str]
+oef_dependencies = ["colorlog", "numpy", "oef"]  # type: List[str]
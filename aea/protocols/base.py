@@ -23,16 +23,84 @@
 from abc import abstractmethod, ABC
 from copy import copy
 import json
-from typing import Any, Dict, Optional
+import struct
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
 
 from google.protobuf.struct_pb2 import Struct
 
 from aea.configurations.base import ProtocolConfig
 
+FieldType = TypeVar("FieldType")
+
+
+class FieldDecodingError(ValueError):
+    """Raised when a lazy field of a decoded message cannot be decoded."""
+
+
+class LazyField:
+    """
+    A value of the message body which is decoded on first access.
+
+    Serializers store it in the body of the decoded message instead of the value,
+    so that the fields a handler never reads are never decoded.
+    """
+
+    __slots__ = ("_decode", "_encoded")
+
+    def __init__(self, decode: Callable[[Any], Any], encoded: Any):
+        """
+        Initialize the lazy field.
+
+        :param decode: the function which decodes the value.
+        :param encoded: the encoded value, passed to the decode function.
+        """
+        self._decode = decode
+        self._encoded = encoded
+
+    def decode(self) -> Any:
+        """Decode the value."""
+        return self._decode(self._encoded)
+
+
+class MessageField(Generic[FieldType]):
+    """
+    A typed accessor to a value of the message body.
+
+    Messages declare one per field, e.g. `target = MessageField()  # type: MessageField[int]`,
+    so that `msg.target` is equivalent to `msg.get("target")`.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: Optional[str] = None):
+        """
+        Initialize the message field.
+
+        :param name: the key of the value in the body. Defaults to the name of the attribute.
+        """
+        self.name = name  # type: Optional[str]
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """Set the key of the value in the body, if not provided."""
+        if self.name is None:
+            self.name = name
+
+    def __get__(self, instance: Optional['Message'], owner: type) -> FieldType:
+        """Get the value of the field."""
+        if instance is None:
+            return self  # type: ignore
+        return instance.get(self.name)  # type: ignore
+
+    def __set__(self, instance: 'Message', value: FieldType) -> None:
+        """Set the value of the field."""
+        instance.set(self.name, value)  # type: ignore
+
 
 class Message:
     """This class implements a message."""
 
+    __slots__ = ("_body",)
+
     protocol_id = 'base'
 
     def __init__(self, body: Optional[Dict] = None,
@@ -51,8 +119,14 @@ class Message:
         """
         Get the body of the message (in dictionary form).
 
+        It decodes the lazy fields which have not been accessed yet.
+
         :return: the body
+        :raises FieldDecodingError: if a lazy field cannot be decoded.
         """
+        for key, value in self._body.items():
+            if type(value) is LazyField:
+                self._body[key] = self._decode_field(key, value)
         return self._body
 
     @body.setter
@@ -76,8 +150,30 @@ class Message:
         self._body[key] = value
 
     def get(self, key: str) -> Optional[Any]:
-        """Get value for key."""
-        return self._body.get(key, None)
+        """
+        Get value for key.
+
+        :raises FieldDecodingError: if the value is a lazy field which cannot be decoded.
+        """
+        value = self._body.get(key, None)
+        if type(value) is LazyField:
+            value = self._body[key] = self._decode_field(key, value)
+        return value
+
+    @staticmethod
+    def _decode_field(key: str, field: LazyField) -> Any:
+        """
+        Decode a lazy field of the body.
+
+        :param key: the key of the field.
+        :param field: the lazy field.
+        :return: the decoded value.
+        :raises FieldDecodingError: if the encoded value is malformed.
+        """
+        try:
+            return field.decode()
+        except Exception as e:
+            raise FieldDecodingError("Cannot decode the field '{}': {}".format(key, e)) from e
 
     def unset(self, key: str) -> None:
         """Unset valye for key."""
@@ -87,6 +183,10 @@ class Message:
         """Check value is set for key."""
         return key in self._body
 
+    def is_decoded(self, key: str) -> bool:
+        """Check the value for key is not a lazy field still to be decoded."""
+        return type(self._body.get(key, None)) is not LazyField
+
     def check_consistency(self) -> bool:
         """Check that the data is consistent."""
         return True
@@ -183,6 +283,233 @@ class JSONSerializer(Serializer):
         return Message(json_msg)
 
 
+_FIXINTS = [bytes((i,)) for i in range(0x80)]
+_NEGATIVE_FIXINTS = {i: bytes((i & 0xff,)) for i in range(-32, 0)}
+_FIXSTR_TAGS = [bytes((0xa0 | i,)) for i in range(32)]
+_UINT8 = struct.Struct("!B")
+_UINT16 = struct.Struct("!H")
+_UINT32 = struct.Struct("!I")
+_UINT64 = struct.Struct("!Q")
+_INT8 = struct.Struct("!b")
+_INT16 = struct.Struct("!h")
+_INT32 = struct.Struct("!i")
+_INT64 = struct.Struct("!q")
+_FLOAT64 = struct.Struct("!d")
+
+
+def _pack_length(length: int, fix_tag: Optional[int], tags: Tuple[Optional[int], int, int], parts: List[bytes]) -> None:
+    """
+    Write the header of a string, binary, array or map.
+
+    :param length: the length of the value.
+    :param fix_tag: the tag of the values shorter than 16, which holds the length (if any).
+    :param tags: the tags of the values with a 8-bit (if any), 16-bit and 32-bit length.
+    :param parts: the encoded parts.
+    :return: None
+    """
+    if fix_tag is not None and length < 16:
+        parts.append(bytes((fix_tag | length,)))
+    elif tags[0] is not None and length <= 0xff:
+        parts.append(bytes((tags[0], length)))
+    elif length <= 0xffff:
+        parts.append(bytes((tags[1],)) + _UINT16.pack(length))
+    elif length <= 0xffffffff:
+        parts.append(bytes((tags[2],)) + _UINT32.pack(length))
+    else:
+        raise ValueError("Value too long: {}".format(length))
+
+
+def _pack(value: Any, parts: List[bytes]) -> None:
+    """Write the MessagePack encoding of a value."""
+    value_type = type(value)
+    if value_type is str:
+        data = value.encode("utf-8")
+        if len(data) < 32:
+            parts.append(_FIXSTR_TAGS[len(data)])
+        else:
+            _pack_length(len(data), None, (0xd9, 0xda, 0xdb), parts)
+        parts.append(data)
+    elif value_type is int:
+        if 0 <= value < 0x80:
+            parts.append(_FIXINTS[value])
+        elif -32 <= value < 0:
+            parts.append(_NEGATIVE_FIXINTS[value])
+        elif value > 0:
+            if value <= 0xff:
+                parts.append(b"\xcc" + _UINT8.pack(value))
+            elif value <= 0xffff:
+                parts.append(b"\xcd" + _UINT16.pack(value))
+            elif value <= 0xffffffff:
+                parts.append(b"\xce" + _UINT32.pack(value))
+            elif value <= 0xffffffffffffffff:
+                parts.append(b"\xcf" + _UINT64.pack(value))
+            else:
+                raise ValueError("Integer too large: {}".format(value))
+        elif value >= -0x80:
+            parts.append(b"\xd0" + _INT8.pack(value))
+        elif value >= -0x8000:
+            parts.append(b"\xd1" + _INT16.pack(value))
+        elif value >= -0x80000000:
+            parts.append(b"\xd2" + _INT32.pack(value))
+        elif value >= -0x8000000000000000:
+            parts.append(b"\xd3" + _INT64.pack(value))
+        else:
+            raise ValueError("Integer too small: {}".format(value))
+    elif value is None:
+        parts.append(b"\xc0")
+    elif value_type is bool:
+        parts.append(b"\xc3" if value else b"\xc2")
+    elif value_type is float:
+        parts.append(b"\xcb" + _FLOAT64.pack(value))
+    elif value_type is dict:
+        _pack_length(len(value), 0x80, (None, 0xde, 0xdf), parts)
+        for key, item in value.items():
+            _pack(key, parts)
+            _pack(item, parts)
+    elif value_type is list or value_type is tuple:
+        _pack_length(len(value), 0x90, (None, 0xdc, 0xdd), parts)
+        for item in value:
+            _pack(item, parts)
+    elif value_type is bytes or value_type is bytearray or value_type is memoryview:
+        _pack_length(len(value), None, (0xc4, 0xc5, 0xc6), parts)
+        parts.append(value)
+    # the subclasses of the supported types (e.g. an IntEnum, a namedtuple) are encoded as their base type.
+    elif isinstance(value, int):
+        _pack(int.__int__(value), parts)
+    elif isinstance(value, float):
+        _pack(float.__float__(value), parts)
+    elif isinstance(value, str):
+        _pack(str.__str__(value), parts)
+    elif isinstance(value, dict):
+        _pack(dict(value), parts)
+    elif isinstance(value, (list, tuple)):
+        _pack(list(value), parts)
+    elif isinstance(value, (bytes, bytearray)):
+        _pack(bytes(value), parts)
+    else:
+        raise ValueError("Value type not supported: {}".format(value_type))
+
+
+def _unpack(data: bytes, offset: int) -> Tuple[Any, int]:
+    """
+    Read the MessagePack encoding of a value.
+
+    :param data: the encoded data.
+    :param offset: the offset of the value in the data.
+    :return: the value and the offset after it.
+    """
+    tag = data[offset]
+    offset += 1
+    if tag < 0x80:
+        return tag, offset
+    if 0xa0 <= tag < 0xc0:
+        end = offset + (tag & 0x1f)
+        return str(data[offset:end], "utf-8"), end
+    if tag == 0xd9:
+        end = offset + 1 + data[offset]
+        return str(data[offset + 1:end], "utf-8"), end
+    if tag >= 0xe0:
+        return tag - 0x100, offset
+    if tag < 0xa0:
+        if tag < 0x90:
+            return _unpack_map(data, offset, tag & 0x0f)
+        return _unpack_array(data, offset, tag & 0x0f)
+    if tag == 0xc0:
+        return None, offset
+    if tag == 0xc2:
+        return False, offset
+    if tag == 0xc3:
+        return True, offset
+    if tag in _FIXED_SIZE_TAGS:
+        unpacker = _FIXED_SIZE_TAGS[tag]
+        return unpacker.unpack_from(data, offset)[0], offset + unpacker.size
+    if tag in _LENGTH_TAGS:
+        kind, unpacker = _LENGTH_TAGS[tag]
+        length = unpacker.unpack_from(data, offset)[0]
+        offset += unpacker.size
+        if kind == "map":
+            return _unpack_map(data, offset, length)
+        if kind == "array":
+            return _unpack_array(data, offset, length)
+        end = offset + length
+        if kind == "str":
+            return str(data[offset:end], "utf-8"), end
+        return bytes(data[offset:end]), end
+    raise ValueError("Tag not supported: {:#x}".format(tag))
+
+
+def _unpack_array(data: bytes, offset: int, length: int) -> Tuple[List[Any], int]:
+    """Read the items of an array."""
+    items = []
+    for _ in range(length):
+        item, offset = _unpack(data, offset)
+        items.append(item)
+    return items, offset
+
+
+def _unpack_map(data: bytes, offset: int, length: int) -> Tuple[Dict[Any, Any], int]:
+    """Read the items of a map."""
+    items = {}
+    for _ in range(length):
+        tag = data[offset]
+        if 0xa0 <= tag < 0xc0:
+            # most keys are short strings
+            end = offset + 1 + (tag & 0x1f)
+            key = str(data[offset + 1:end], "utf-8")
+            offset = end
+        else:
+            key, offset = _unpack(data, offset)
+        items[key], offset = _unpack(data, offset)
+    return items, offset
+
+
+_FIXED_SIZE_TAGS = {0xca: struct.Struct("!f"), 0xcb: _FLOAT64,
+                    0xcc: _UINT8, 0xcd: _UINT16, 0xce: _UINT32, 0xcf: _UINT64,
+                    0xd0: _INT8, 0xd1: _INT16, 0xd2: _INT32, 0xd3: _INT64}
+_LENGTH_TAGS = {0xc4: ("bin", _UINT8), 0xc5: ("bin", _UINT16), 0xc6: ("bin", _UINT32),
+                0xd9: ("str", _UINT8), 0xda: ("str", _UINT16), 0xdb: ("str", _UINT32),
+                0xdc: ("array", _UINT16), 0xdd: ("array", _UINT32),
+                0xde: ("map", _UINT16), 0xdf: ("map", _UINT32)}
+
+
+class MessagePackSerializer(Serializer):
+    """
+    Generic serialization of the message body in the MessagePack format.
+
+    Unlike the Protobuf and JSON serializers, it preserves integers and bytes:
+    the body may hold None, booleans, 64-bit integers, floats, strings, bytes,
+    and lists and dictionaries of them. Tuples are decoded as lists.
+    """
+
+    def encode(self, msg: Message) -> bytes:
+        """
+        Encode a message into bytes using MessagePack.
+
+        :param msg: the message to be encoded.
+        :return: the serialized message.
+        :raises ValueError: if the body holds a value that is not supported.
+        """
+        parts = []  # type: List[bytes]
+        _pack(msg.body, parts)
+        return b"".join(parts)
+
+    def decode(self, obj: bytes) -> Message:
+        """
+        Decode bytes into a message using MessagePack.
+
+        :param obj: the serialized message.
+        :return: the decoded message.
+        :raises ValueError: if the bytes are not a MessagePack map.
+        """
+        try:
+            body, offset = _unpack(obj, 0)
+        except (IndexError, TypeError, struct.error, UnicodeDecodeError) as e:
+            raise ValueError("Malformed message: {}".format(e))
+        if type(body) is not dict or offset != len(obj):
+            raise ValueError("Malformed message: not a single map.")
+        return Message(body=body)
+
+
 class Protocol(ABC):
     """
     This class implements a specifications for a protocol.
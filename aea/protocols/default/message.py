@@ -20,14 +20,16 @@
 
 """This module contains the default message definition."""
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
-from aea.protocols.base import Message
+from aea.protocols.base import Message, MessageField
 
 
 class DefaultMessage(Message):
     """The Default message class."""
 
+    __slots__ = ()
+
     protocol_id = "default"
 
     class Type(Enum):
@@ -49,6 +51,12 @@ class DefaultMessage(Message):
         UNSUPPORTED_SKILL = -10004
         INVALID_DIALOGUE = -10005
 
+    type = MessageField()  # type: MessageField[DefaultMessage.Type]
+    content = MessageField()  # type: MessageField[bytes]
+    error_code = MessageField()  # type: MessageField[Union[DefaultMessage.ErrorCode, int]]
+    error_msg = MessageField()  # type: MessageField[str]
+    error_data = MessageField()  # type: MessageField[Dict[str, Any]]
+
     def __init__(self, type: Optional[Type] = None,
                  **kwargs):
         """
@@ -2,8 +2,6 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: fipa.proto
 
-import sys
-_b=sys.version_info[0]<3 and (lambda x:x) or (lambda x:x.encode('latin1'))
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from google.protobuf import reflection as _reflection
@@ -20,11 +18,638 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='fetch.aea.fipa',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\nfipa.proto\x12\x0e\x66\x65tch.aea.fipa\"\xe6\x07\n\x0b\x46IPAMessage\x12\x12\n\nmessage_id\x18\x01 \x01(\x05\x12\"\n\x1a\x64ialogue_starter_reference\x18\x02 \x01(\t\x12$\n\x1c\x64ialogue_responder_reference\x18\x03 \x01(\t\x12\x0e\n\x06target\x18\x04 \x01(\x05\x12.\n\x03\x63\x66p\x18\x05 \x01(\x0b\x32\x1f.fetch.aea.fipa.FIPAMessage.CFPH\x00\x12\x36\n\x07propose\x18\x06 \x01(\x0b\x32#.fetch.aea.fipa.FIPAMessage.ProposeH\x00\x12\x34\n\x06\x61\x63\x63\x65pt\x18\x07 \x01(\x0b\x32\".fetch.aea.fipa.FIPAMessage.AcceptH\x00\x12?\n\x0cmatch_accept\x18\x08 \x01(\x0b\x32\'.fetch.aea.fipa.FIPAMessage.MatchAcceptH\x00\x12\x36\n\x07\x64\x65\x63line\x18\t \x01(\x0b\x32#.fetch.aea.fipa.FIPAMessage.DeclineH\x00\x12\x34\n\x06inform\x18\n \x01(\x0b\x32\".fetch.aea.fipa.FIPAMessage.InformH\x00\x12\x46\n\x10\x61\x63\x63\x65pt_w_address\x18\x0b \x01(\x0b\x32*.fetch.aea.fipa.FIPAMessage.AcceptWAddressH\x00\x12Q\n\x16match_accept_w_address\x18\x0c \x01(\x0b\x32/.fetch.aea.fipa.FIPAMessage.MatchAcceptWAddressH\x00\x1a}\n\x03\x43\x46P\x12\x0f\n\x05\x62ytes\x18\x01 \x01(\x0cH\x00\x12:\n\x07nothing\x18\x02 \x01(\x0b\x32\'.fetch.aea.fipa.FIPAMessage.CFP.NothingH\x00\x12\x15\n\x0bquery_bytes\x18\x03 \x01(\x0cH\x00\x1a\t\n\x07NothingB\x07\n\x05query\x1a\x1b\n\x07Propose\x12\x10\n\x08proposal\x18\x01 \x03(\x0c\x1a\x08\n\x06\x41\x63\x63\x65pt\x1a\r\n\x0bMatchAccept\x1a#\n\x10\x41\x63\x63\x65pt_W_Address\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x1a(\n\x15MatchAccept_W_Address\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x1a\t\n\x07\x44\x65\x63line\x1a\x17\n\x06Inform\x12\r\n\x05\x62ytes\x18\x01 \x01(\x0c\x1a!\n\x0e\x41\x63\x63\x65ptWAddress\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x1a&\n\x13MatchAcceptWAddress\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\tB\x0e\n\x0cperformativeb\x06proto3')
+  serialized_pb=b'\n\nfipa.proto\x12\x0e\x66\x65tch.aea.fipa\"q\n\x05Value\x12\x10\n\x06string\x18\x01 \x01(\tH\x00\x12\x10\n\x06\x64ouble\x18\x02 \x01(\x01H\x00\x12\x11\n\x07\x62oolean\x18\x03 \x01(\x08H\x00\x12\x11\n\x07integer\x18\x04 \x01(\x03H\x00\x12\x15\n\x0b\x62ig_integer\x18\x05 \x01(\tH\x00\x42\x07\n\x05value\"\xa1\x01\n\tAttribute\x12\x0c\n\x04name\x18\x01 \x01(\t\x12,\n\x04type\x18\x02 \x01(\x0e\x32\x1e.fetch.aea.fipa.Attribute.Type\x12\x10\n\x08required\x18\x03 \x01(\x08\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\"1\n\x04Type\x12\n\n\x06\x44OUBLE\x10\x00\x12\x08\n\x04\x42OOL\x10\x01\x12\x07\n\x03INT\x10\x02\x12\n\n\x06STRING\x10\x03\"]\n\tDataModel\x12\x0c\n\x04name\x18\x01 \x01(\t\x12-\n\nattributes\x18\x02 \x03(\x0b\x32\x19.fetch.aea.fipa.Attribute\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\"\xd9\x01\n\x0c\x44\x65scriptions\x12\x0c\n\x04keys\x18\x01 \x03(\t\x12\r\n\x05sizes\x18\x02 \x01(\x0c\x12\x13\n\x0bkey_indexes\x18\x03 \x01(\x0c\x12\r\n\x05types\x18\x04 \x01(\x0c\x12\x10\n\x08integers\x18\x05 \x01(\x0c\x12\x0f\n\x07\x64oubles\x18\x06 \x01(\x0c\x12\x0f\n\x07strings\x18\x07 \x03(\t\x12\r\n\x05\x62lobs\x18\x08 \x03(\x0c\x12.\n\x0b\x64\x61ta_models\x18\t \x03(\x0b\x32\x19.fetch.aea.fipa.DataModel\x12\x15\n\rmodel_indexes\x18\n \x01(\x0c\"\xe7\x06\n\x0e\x43onstraintExpr\x12\x32\n\x04\x61nd_\x18\x01 \x01(\x0b\x32\".fetch.aea.fipa.ConstraintExpr.AndH\x00\x12\x30\n\x03or_\x18\x02 \x01(\x0b\x32!.fetch.aea.fipa.ConstraintExpr.OrH\x00\x12\x32\n\x04not_\x18\x03 \x01(\x0b\x32\".fetch.aea.fipa.ConstraintExpr.NotH\x00\x12?\n\nconstraint\x18\x04 \x01(\x0b\x32).fetch.aea.fipa.ConstraintExpr.ConstraintH\x00\x1a:\n\x03\x41nd\x12\x33\n\x0b\x65xpressions\x18\x01 \x03(\x0b\x32\x1e.fetch.aea.fipa.ConstraintExpr\x1a\x39\n\x02Or\x12\x33\n\x0b\x65xpressions\x18\x01 \x03(\x0b\x32\x1e.fetch.aea.fipa.ConstraintExpr\x1a\x39\n\x03Not\x12\x32\n\nexpression\x18\x01 \x01(\x0b\x32\x1e.fetch.aea.fipa.ConstraintExpr\x1a\xb9\x03\n\nConstraint\x12\x16\n\x0e\x61ttribute_name\x18\x01 \x01(\t\x12\x44\n\x08operator\x18\x02 \x01(\x0e\x32\x32.fetch.aea.fipa.ConstraintExpr.Constraint.Operator\x12$\n\x05value\x18\x03 \x01(\x0b\x32\x15.fetch.aea.fipa.Value\x12%\n\x06values\x18\x04 \x03(\x0b\x32\x15.fetch.aea.fipa.Value\x12\x46\n\tcontainer\x18\x05 \x01(\x0e\x32\x33.fetch.aea.fipa.ConstraintExpr.Constraint.Container\"\x8c\x01\n\x08Operator\x12\t\n\x05\x45QUAL\x10\x00\x12\r\n\tNOT_EQUAL\x10\x01\x12\r\n\tLESS_THAN\x10\x02\x12\x10\n\x0cLESS_THAN_EQ\x10\x03\x12\x10\n\x0cGREATER_THAN\x10\x04\x12\x13\n\x0fGREATER_THAN_EQ\x10\x05\x12\n\n\x06WITHIN\x10\x06\x12\x06\n\x02IN\x10\x07\x12\n\n\x06NOT_IN\x10\x08\")\n\tContainer\x12\x08\n\x04LIST\x10\x00\x12\t\n\x05TUPLE\x10\x01\x12\x07\n\x03SET\x10\x02\x42\x0c\n\nexpression\"\xa9\x01\n\x05Query\x12\x33\n\x0b\x63onstraints\x18\x01 \x03(\x0b\x32\x1e.fetch.aea.fipa.ConstraintExpr\x12(\n\x05model\x18\x02 \x01(\x0b\x32\x19.fetch.aea.fipa.DataModel\x12\x12\n\x08order_by\x18\x03 \x01(\tH\x00\x12\x12\n\ndescending\x18\x04 \x01(\x08\x12\r\n\x05limit\x18\x05 \x01(\x04\x42\n\n\x08ordering\"\xb2\x08\n\x0b\x46IPAMessage\x12\x12\n\nmessage_id\x18\x01 \x01(\x05\x12\"\n\x1a\x64ialogue_starter_reference\x18\x02 \x01(\t\x12$\n\x1c\x64ialogue_responder_reference\x18\x03 \x01(\t\x12\x0e\n\x06target\x18\x04 \x01(\x05\x12.\n\x03\x63\x66p\x18\x05 \x01(\x0b\x32\x1f.fetch.aea.fipa.FIPAMessage.CFPH\x00\x12\x36\n\x07propose\x18\x06 \x01(\x0b\x32#.fetch.aea.fipa.FIPAMessage.ProposeH\x00\x12\x34\n\x06\x61\x63\x63\x65pt\x18\x07 \x01(\x0b\x32\".fetch.aea.fipa.FIPAMessage.AcceptH\x00\x12?\n\x0cmatch_accept\x18\x08 \x01(\x0b\x32\'.fetch.aea.fipa.FIPAMessage.MatchAcceptH\x00\x12\x36\n\x07\x64\x65\x63line\x18\t \x01(\x0b\x32#.fetch.aea.fipa.FIPAMessage.DeclineH\x00\x12\x34\n\x06inform\x18\n \x01(\x0b\x32\".fetch.aea.fipa.FIPAMessage.InformH\x00\x12\x46\n\x10\x61\x63\x63\x65pt_w_address\x18\x0b \x01(\x0b\x32*.fetch.aea.fipa.FIPAMessage.AcceptWAddressH\x00\x12Q\n\x16match_accept_w_address\x18\x0c \x01(\x0b\x32/.fetch.aea.fipa.FIPAMessage.MatchAcceptWAddressH\x00\x1a\x98\x01\n\x03\x43\x46P\x12\x0f\n\x05\x62ytes\x18\x01 \x01(\x0cH\x00\x12:\n\x07nothing\x18\x02 \x01(\x0b\x32\'.fetch.aea.fipa.FIPAMessage.CFP.NothingH\x00\x12*\n\toef_query\x18\x04 \x01(\x0b\x32\x15.fetch.aea.fipa.QueryH\x00\x1a\t\n\x07NothingB\x07\n\x05queryJ\x04\x08\x03\x10\x04\x1aK\n\x07Propose\x12.\n\x08proposal\x18\x04 \x01(\x0b\x32\x1c.fetch.aea.fipa.DescriptionsJ\x04\x08\x01\x10\x02J\x04\x08\x02\x10\x03J\x04\x08\x03\x10\x04\x1a\x08\n\x06\x41\x63\x63\x65pt\x1a\r\n\x0bMatchAccept\x1a#\n\x10\x41\x63\x63\x65pt_W_Address\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x1a(\n\x15MatchAccept_W_Address\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x1a\t\n\x07\x44\x65\x63line\x1a\x17\n\x06Inform\x12\r\n\x05\x62ytes\x18\x01 \x01(\x0c\x1a!\n\x0e\x41\x63\x63\x65ptWAddress\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\x1a&\n\x13MatchAcceptWAddress\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\tB\x0e\n\x0cperformativeb\x06proto3'
 )
 
 
 
+_ATTRIBUTE_TYPE = _descriptor.EnumDescriptor(
+  name='Type',
+  full_name='fetch.aea.fipa.Attribute.Type',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='DOUBLE', index=0, number=0,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='BOOL', index=1, number=1,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='INT', index=2, number=2,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='STRING', index=3, number=3,
+      serialized_options=None,
+      type=None),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=258,
+  serialized_end=307,
+)
+_sym_db.RegisterEnumDescriptor(_ATTRIBUTE_TYPE)
+
+_CONSTRAINTEXPR_CONSTRAINT_OPERATOR = _descriptor.EnumDescriptor(
+  name='Operator',
+  full_name='fetch.aea.fipa.ConstraintExpr.Constraint.Operator',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='EQUAL', index=0, number=0,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='NOT_EQUAL', index=1, number=1,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='LESS_THAN', index=2, number=2,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='LESS_THAN_EQ', index=3, number=3,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='GREATER_THAN', index=4, number=4,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='GREATER_THAN_EQ', index=5, number=5,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='WITHIN', index=6, number=6,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='IN', index=7, number=7,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='NOT_IN', index=8, number=8,
+      serialized_options=None,
+      type=None),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=1299,
+  serialized_end=1439,
+)
+_sym_db.RegisterEnumDescriptor(_CONSTRAINTEXPR_CONSTRAINT_OPERATOR)
+
+_CONSTRAINTEXPR_CONSTRAINT_CONTAINER = _descriptor.EnumDescriptor(
+  name='Container',
+  full_name='fetch.aea.fipa.ConstraintExpr.Constraint.Container',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='LIST', index=0, number=0,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='TUPLE', index=1, number=1,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='SET', index=2, number=2,
+      serialized_options=None,
+      type=None),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=1441,
+  serialized_end=1482,
+)
+_sym_db.RegisterEnumDescriptor(_CONSTRAINTEXPR_CONSTRAINT_CONTAINER)
+
+
+_VALUE = _descriptor.Descriptor(
+  name='Value',
+  full_name='fetch.aea.fipa.Value',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='string', full_name='fetch.aea.fipa.Value.string', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='double', full_name='fetch.aea.fipa.Value.double', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='boolean', full_name='fetch.aea.fipa.Value.boolean', index=2,
+      number=3, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='integer', full_name='fetch.aea.fipa.Value.integer', index=3,
+      number=4, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='big_integer', full_name='fetch.aea.fipa.Value.big_integer', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='value', full_name='fetch.aea.fipa.Value.value',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=30,
+  serialized_end=143,
+)
+
+
+_ATTRIBUTE = _descriptor.Descriptor(
+  name='Attribute',
+  full_name='fetch.aea.fipa.Attribute',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='fetch.aea.fipa.Attribute.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='type', full_name='fetch.aea.fipa.Attribute.type', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='required', full_name='fetch.aea.fipa.Attribute.required', index=2,
+      number=3, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='description', full_name='fetch.aea.fipa.Attribute.description', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+    _ATTRIBUTE_TYPE,
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=146,
+  serialized_end=307,
+)
+
+
+_DATAMODEL = _descriptor.Descriptor(
+  name='DataModel',
+  full_name='fetch.aea.fipa.DataModel',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='fetch.aea.fipa.DataModel.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='attributes', full_name='fetch.aea.fipa.DataModel.attributes', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='description', full_name='fetch.aea.fipa.DataModel.description', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=309,
+  serialized_end=402,
+)
+
+
+_DESCRIPTIONS = _descriptor.Descriptor(
+  name='Descriptions',
+  full_name='fetch.aea.fipa.Descriptions',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='keys', full_name='fetch.aea.fipa.Descriptions.keys', index=0,
+      number=1, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='sizes', full_name='fetch.aea.fipa.Descriptions.sizes', index=1,
+      number=2, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='key_indexes', full_name='fetch.aea.fipa.Descriptions.key_indexes', index=2,
+      number=3, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='types', full_name='fetch.aea.fipa.Descriptions.types', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='integers', full_name='fetch.aea.fipa.Descriptions.integers', index=4,
+      number=5, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='doubles', full_name='fetch.aea.fipa.Descriptions.doubles', index=5,
+      number=6, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='strings', full_name='fetch.aea.fipa.Descriptions.strings', index=6,
+      number=7, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='blobs', full_name='fetch.aea.fipa.Descriptions.blobs', index=7,
+      number=8, type=12, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='data_models', full_name='fetch.aea.fipa.Descriptions.data_models', index=8,
+      number=9, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='model_indexes', full_name='fetch.aea.fipa.Descriptions.model_indexes', index=9,
+      number=10, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=405,
+  serialized_end=622,
+)
+
+
+_CONSTRAINTEXPR_AND = _descriptor.Descriptor(
+  name='And',
+  full_name='fetch.aea.fipa.ConstraintExpr.And',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='expressions', full_name='fetch.aea.fipa.ConstraintExpr.And.expressions', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=862,
+  serialized_end=920,
+)
+
+_CONSTRAINTEXPR_OR = _descriptor.Descriptor(
+  name='Or',
+  full_name='fetch.aea.fipa.ConstraintExpr.Or',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='expressions', full_name='fetch.aea.fipa.ConstraintExpr.Or.expressions', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=922,
+  serialized_end=979,
+)
+
+_CONSTRAINTEXPR_NOT = _descriptor.Descriptor(
+  name='Not',
+  full_name='fetch.aea.fipa.ConstraintExpr.Not',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='expression', full_name='fetch.aea.fipa.ConstraintExpr.Not.expression', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=981,
+  serialized_end=1038,
+)
+
+_CONSTRAINTEXPR_CONSTRAINT = _descriptor.Descriptor(
+  name='Constraint',
+  full_name='fetch.aea.fipa.ConstraintExpr.Constraint',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='attribute_name', full_name='fetch.aea.fipa.ConstraintExpr.Constraint.attribute_name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='operator', full_name='fetch.aea.fipa.ConstraintExpr.Constraint.operator', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='fetch.aea.fipa.ConstraintExpr.Constraint.value', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='values', full_name='fetch.aea.fipa.ConstraintExpr.Constraint.values', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='container', full_name='fetch.aea.fipa.ConstraintExpr.Constraint.container', index=4,
+      number=5, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+    _CONSTRAINTEXPR_CONSTRAINT_OPERATOR,
+    _CONSTRAINTEXPR_CONSTRAINT_CONTAINER,
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1041,
+  serialized_end=1482,
+)
+
+_CONSTRAINTEXPR = _descriptor.Descriptor(
+  name='ConstraintExpr',
+  full_name='fetch.aea.fipa.ConstraintExpr',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='and_', full_name='fetch.aea.fipa.ConstraintExpr.and_', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='or_', full_name='fetch.aea.fipa.ConstraintExpr.or_', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='not_', full_name='fetch.aea.fipa.ConstraintExpr.not_', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='constraint', full_name='fetch.aea.fipa.ConstraintExpr.constraint', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[_CONSTRAINTEXPR_AND, _CONSTRAINTEXPR_OR, _CONSTRAINTEXPR_NOT, _CONSTRAINTEXPR_CONSTRAINT, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='expression', full_name='fetch.aea.fipa.ConstraintExpr.expression',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=625,
+  serialized_end=1496,
+)
+
+
+_QUERY = _descriptor.Descriptor(
+  name='Query',
+  full_name='fetch.aea.fipa.Query',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='constraints', full_name='fetch.aea.fipa.Query.constraints', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='model', full_name='fetch.aea.fipa.Query.model', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='order_by', full_name='fetch.aea.fipa.Query.order_by', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='descending', full_name='fetch.aea.fipa.Query.descending', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='limit', full_name='fetch.aea.fipa.Query.limit', index=4,
+      number=5, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='ordering', full_name='fetch.aea.fipa.Query.ordering',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=1499,
+  serialized_end=1668,
+)
+
 
 _FIPAMESSAGE_CFP_NOTHING = _descriptor.Descriptor(
   name='Nothing',
@@ -45,8 +670,8 @@ _FIPAMESSAGE_CFP_NOTHING = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=751,
-  serialized_end=760,
+  serialized_start=2413,
+  serialized_end=2422,
 )
 
 _FIPAMESSAGE_CFP = _descriptor.Descriptor(
@@ -59,7 +684,7 @@ _FIPAMESSAGE_CFP = _descriptor.Descriptor(
     _descriptor.FieldDescriptor(
       name='bytes', full_name='fetch.aea.fipa.FIPAMessage.CFP.bytes', index=0,
       number=1, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b(""),
+      has_default_value=False, default_value=b"",
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -71,9 +696,9 @@ _FIPAMESSAGE_CFP = _descriptor.Descriptor(
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
     _descriptor.FieldDescriptor(
-      name='query_bytes', full_name='fetch.aea.fipa.FIPAMessage.CFP.query_bytes', index=2,
-      number=3, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b(""),
+      name='oef_query', full_name='fetch.aea.fipa.FIPAMessage.CFP.oef_query', index=2,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -92,8 +717,8 @@ _FIPAMESSAGE_CFP = _descriptor.Descriptor(
       name='query', full_name='fetch.aea.fipa.FIPAMessage.CFP.query',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=644,
-  serialized_end=769,
+  serialized_start=2285,
+  serialized_end=2437,
 )
 
 _FIPAMESSAGE_PROPOSE = _descriptor.Descriptor(
@@ -105,8 +730,8 @@ _FIPAMESSAGE_PROPOSE = _descriptor.Descriptor(
   fields=[
     _descriptor.FieldDescriptor(
       name='proposal', full_name='fetch.aea.fipa.FIPAMessage.Propose.proposal', index=0,
-      number=1, type=12, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -122,8 +747,8 @@ _FIPAMESSAGE_PROPOSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=771,
-  serialized_end=798,
+  serialized_start=2439,
+  serialized_end=2514,
 )
 
 _FIPAMESSAGE_ACCEPT = _descriptor.Descriptor(
@@ -145,8 +770,8 @@ _FIPAMESSAGE_ACCEPT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=800,
-  serialized_end=808,
+  serialized_start=2516,
+  serialized_end=2524,
 )
 
 _FIPAMESSAGE_MATCHACCEPT = _descriptor.Descriptor(
@@ -168,8 +793,8 @@ _FIPAMESSAGE_MATCHACCEPT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=810,
-  serialized_end=823,
+  serialized_start=2526,
+  serialized_end=2539,
 )
 
 _FIPAMESSAGE_ACCEPT_W_ADDRESS = _descriptor.Descriptor(
@@ -182,7 +807,7 @@ _FIPAMESSAGE_ACCEPT_W_ADDRESS = _descriptor.Descriptor(
     _descriptor.FieldDescriptor(
       name='address', full_name='fetch.aea.fipa.FIPAMessage.Accept_W_Address.address', index=0,
       number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -198,8 +823,8 @@ _FIPAMESSAGE_ACCEPT_W_ADDRESS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=825,
-  serialized_end=860,
+  serialized_start=2541,
+  serialized_end=2576,
 )
 
 _FIPAMESSAGE_MATCHACCEPT_W_ADDRESS = _descriptor.Descriptor(
@@ -212,7 +837,7 @@ _FIPAMESSAGE_MATCHACCEPT_W_ADDRESS = _descriptor.Descriptor(
     _descriptor.FieldDescriptor(
       name='address', full_name='fetch.aea.fipa.FIPAMessage.MatchAccept_W_Address.address', index=0,
       number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -228,8 +853,8 @@ _FIPAMESSAGE_MATCHACCEPT_W_ADDRESS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=862,
-  serialized_end=902,
+  serialized_start=2578,
+  serialized_end=2618,
 )
 
 _FIPAMESSAGE_DECLINE = _descriptor.Descriptor(
@@ -251,8 +876,8 @@ _FIPAMESSAGE_DECLINE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=904,
-  serialized_end=913,
+  serialized_start=2620,
+  serialized_end=2629,
 )
 
 _FIPAMESSAGE_INFORM = _descriptor.Descriptor(
@@ -265,7 +890,7 @@ _FIPAMESSAGE_INFORM = _descriptor.Descriptor(
     _descriptor.FieldDescriptor(
       name='bytes', full_name='fetch.aea.fipa.FIPAMessage.Inform.bytes', index=0,
       number=1, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b(""),
+      has_default_value=False, default_value=b"",
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -281,8 +906,8 @@ _FIPAMESSAGE_INFORM = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=915,
-  serialized_end=938,
+  serialized_start=2631,
+  serialized_end=2654,
 )
 
 _FIPAMESSAGE_ACCEPTWADDRESS = _descriptor.Descriptor(
@@ -295,7 +920,7 @@ _FIPAMESSAGE_ACCEPTWADDRESS = _descriptor.Descriptor(
     _descriptor.FieldDescriptor(
       name='address', full_name='fetch.aea.fipa.FIPAMessage.AcceptWAddress.address', index=0,
       number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -311,8 +936,8 @@ _FIPAMESSAGE_ACCEPTWADDRESS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=940,
-  serialized_end=973,
+  serialized_start=2656,
+  serialized_end=2689,
 )
 
 _FIPAMESSAGE_MATCHACCEPTWADDRESS = _descriptor.Descriptor(
@@ -325,7 +950,7 @@ _FIPAMESSAGE_MATCHACCEPTWADDRESS = _descriptor.Descriptor(
     _descriptor.FieldDescriptor(
       name='address', full_name='fetch.aea.fipa.FIPAMessage.MatchAcceptWAddress.address', index=0,
       number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -341,8 +966,8 @@ _FIPAMESSAGE_MATCHACCEPTWADDRESS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=975,
-  serialized_end=1013,
+  serialized_start=2691,
+  serialized_end=2729,
 )
 
 _FIPAMESSAGE = _descriptor.Descriptor(
@@ -362,14 +987,14 @@ _FIPAMESSAGE = _descriptor.Descriptor(
     _descriptor.FieldDescriptor(
       name='dialogue_starter_reference', full_name='fetch.aea.fipa.FIPAMessage.dialogue_starter_reference', index=1,
       number=2, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
     _descriptor.FieldDescriptor(
       name='dialogue_responder_reference', full_name='fetch.aea.fipa.FIPAMessage.dialogue_responder_reference', index=2,
       number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -451,12 +1076,66 @@ _FIPAMESSAGE = _descriptor.Descriptor(
       name='performative', full_name='fetch.aea.fipa.FIPAMessage.performative',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=31,
-  serialized_end=1029,
+  serialized_start=1671,
+  serialized_end=2745,
 )
 
+_VALUE.oneofs_by_name['value'].fields.append(
+  _VALUE.fields_by_name['string'])
+_VALUE.fields_by_name['string'].containing_oneof = _VALUE.oneofs_by_name['value']
+_VALUE.oneofs_by_name['value'].fields.append(
+  _VALUE.fields_by_name['double'])
+_VALUE.fields_by_name['double'].containing_oneof = _VALUE.oneofs_by_name['value']
+_VALUE.oneofs_by_name['value'].fields.append(
+  _VALUE.fields_by_name['boolean'])
+_VALUE.fields_by_name['boolean'].containing_oneof = _VALUE.oneofs_by_name['value']
+_VALUE.oneofs_by_name['value'].fields.append(
+  _VALUE.fields_by_name['integer'])
+_VALUE.fields_by_name['integer'].containing_oneof = _VALUE.oneofs_by_name['value']
+_VALUE.oneofs_by_name['value'].fields.append(
+  _VALUE.fields_by_name['big_integer'])
+_VALUE.fields_by_name['big_integer'].containing_oneof = _VALUE.oneofs_by_name['value']
+_ATTRIBUTE.fields_by_name['type'].enum_type = _ATTRIBUTE_TYPE
+_ATTRIBUTE_TYPE.containing_type = _ATTRIBUTE
+_DATAMODEL.fields_by_name['attributes'].message_type = _ATTRIBUTE
+_DESCRIPTIONS.fields_by_name['data_models'].message_type = _DATAMODEL
+_CONSTRAINTEXPR_AND.fields_by_name['expressions'].message_type = _CONSTRAINTEXPR
+_CONSTRAINTEXPR_AND.containing_type = _CONSTRAINTEXPR
+_CONSTRAINTEXPR_OR.fields_by_name['expressions'].message_type = _CONSTRAINTEXPR
+_CONSTRAINTEXPR_OR.containing_type = _CONSTRAINTEXPR
+_CONSTRAINTEXPR_NOT.fields_by_name['expression'].message_type = _CONSTRAINTEXPR
+_CONSTRAINTEXPR_NOT.containing_type = _CONSTRAINTEXPR
+_CONSTRAINTEXPR_CONSTRAINT.fields_by_name['operator'].enum_type = _CONSTRAINTEXPR_CONSTRAINT_OPERATOR
+_CONSTRAINTEXPR_CONSTRAINT.fields_by_name['value'].message_type = _VALUE
+_CONSTRAINTEXPR_CONSTRAINT.fields_by_name['values'].message_type = _VALUE
+_CONSTRAINTEXPR_CONSTRAINT.fields_by_name['container'].enum_type = _CONSTRAINTEXPR_CONSTRAINT_CONTAINER
+_CONSTRAINTEXPR_CONSTRAINT.containing_type = _CONSTRAINTEXPR
+_CONSTRAINTEXPR_CONSTRAINT_OPERATOR.containing_type = _CONSTRAINTEXPR_CONSTRAINT
+_CONSTRAINTEXPR_CONSTRAINT_CONTAINER.containing_type = _CONSTRAINTEXPR_CONSTRAINT
+_CONSTRAINTEXPR.fields_by_name['and_'].message_type = _CONSTRAINTEXPR_AND
+_CONSTRAINTEXPR.fields_by_name['or_'].message_type = _CONSTRAINTEXPR_OR
+_CONSTRAINTEXPR.fields_by_name['not_'].message_type = _CONSTRAINTEXPR_NOT
+_CONSTRAINTEXPR.fields_by_name['constraint'].message_type = _CONSTRAINTEXPR_CONSTRAINT
+_CONSTRAINTEXPR.oneofs_by_name['expression'].fields.append(
+  _CONSTRAINTEXPR.fields_by_name['and_'])
+_CONSTRAINTEXPR.fields_by_name['and_'].containing_oneof = _CONSTRAINTEXPR.oneofs_by_name['expression']
+_CONSTRAINTEXPR.oneofs_by_name['expression'].fields.append(
+  _CONSTRAINTEXPR.fields_by_name['or_'])
+_CONSTRAINTEXPR.fields_by_name['or_'].containing_oneof = _CONSTRAINTEXPR.oneofs_by_name['expression']
+_CONSTRAINTEXPR.oneofs_by_name['expression'].fields.append(
+  _CONSTRAINTEXPR.fields_by_name['not_'])
+_CONSTRAINTEXPR.fields_by_name['not_'].containing_oneof = _CONSTRAINTEXPR.oneofs_by_name['expression']
+_CONSTRAINTEXPR.oneofs_by_name['expression'].fields.append(
+  _CONSTRAINTEXPR.fields_by_name['constraint'])
+_CONSTRAINTEXPR.fields_by_name['constraint'].containing_oneof = _CONSTRAINTEXPR.oneofs_by_name['expression']
+_QUERY.fields_by_name['constraints'].message_type = _CONSTRAINTEXPR
+_QUERY.fields_by_name['model'].message_type = _DATAMODEL
+_QUERY.oneofs_by_name['ordering'].fields.append(
+  _QUERY.fields_by_name['order_by'])
+_QUERY.fields_by_name['order_by'].containing_oneof = _QUERY.oneofs_by_name['ordering']
 _FIPAMESSAGE_CFP_NOTHING.containing_type = _FIPAMESSAGE_CFP
 _FIPAMESSAGE_CFP.fields_by_name['nothing'].message_type = _FIPAMESSAGE_CFP_NOTHING
+_FIPAMESSAGE_CFP.fields_by_name['oef_query'].message_type = _QUERY
 _FIPAMESSAGE_CFP.containing_type = _FIPAMESSAGE
 _FIPAMESSAGE_CFP.oneofs_by_name['query'].fields.append(
   _FIPAMESSAGE_CFP.fields_by_name['bytes'])
@@ -465,8 +1144,9 @@ _FIPAMESSAGE_CFP.oneofs_by_name['query'].fields.append(
   _FIPAMESSAGE_CFP.fields_by_name['nothing'])
 _FIPAMESSAGE_CFP.fields_by_name['nothing'].containing_oneof = _FIPAMESSAGE_CFP.oneofs_by_name['query']
 _FIPAMESSAGE_CFP.oneofs_by_name['query'].fields.append(
-  _FIPAMESSAGE_CFP.fields_by_name['query_bytes'])
-_FIPAMESSAGE_CFP.fields_by_name['query_bytes'].containing_oneof = _FIPAMESSAGE_CFP.oneofs_by_name['query']
+  _FIPAMESSAGE_CFP.fields_by_name['oef_query'])
+_FIPAMESSAGE_CFP.fields_by_name['oef_query'].containing_oneof = _FIPAMESSAGE_CFP.oneofs_by_name['query']
+_FIPAMESSAGE_PROPOSE.fields_by_name['proposal'].message_type = _DESCRIPTIONS
 _FIPAMESSAGE_PROPOSE.containing_type = _FIPAMESSAGE
 _FIPAMESSAGE_ACCEPT.containing_type = _FIPAMESSAGE
 _FIPAMESSAGE_MATCHACCEPT.containing_type = _FIPAMESSAGE
@@ -508,91 +1188,171 @@ _FIPAMESSAGE.fields_by_name['accept_w_address'].containing_oneof = _FIPAMESSAGE.
 _FIPAMESSAGE.oneofs_by_name['performative'].fields.append(
   _FIPAMESSAGE.fields_by_name['match_accept_w_address'])
 _FIPAMESSAGE.fields_by_name['match_accept_w_address'].containing_oneof = _FIPAMESSAGE.oneofs_by_name['performative']
+DESCRIPTOR.message_types_by_name['Value'] = _VALUE
+DESCRIPTOR.message_types_by_name['Attribute'] = _ATTRIBUTE
+DESCRIPTOR.message_types_by_name['DataModel'] = _DATAMODEL
+DESCRIPTOR.message_types_by_name['Descriptions'] = _DESCRIPTIONS
+DESCRIPTOR.message_types_by_name['ConstraintExpr'] = _CONSTRAINTEXPR
+DESCRIPTOR.message_types_by_name['Query'] = _QUERY
 DESCRIPTOR.message_types_by_name['FIPAMessage'] = _FIPAMESSAGE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
-FIPAMessage = _reflection.GeneratedProtocolMessageType('FIPAMessage', (_message.Message,), dict(
+Value = _reflection.GeneratedProtocolMessageType('Value', (_message.Message,), {
+  'DESCRIPTOR' : _VALUE,
+  '__module__' : 'fipa_pb2'
+  # @@protoc_insertion_point(class_scope:fetch.aea.fipa.Value)
+  })
+_sym_db.RegisterMessage(Value)
+
+Attribute = _reflection.GeneratedProtocolMessageType('Attribute', (_message.Message,), {
+  'DESCRIPTOR' : _ATTRIBUTE,
+  '__module__' : 'fipa_pb2'
+  # @@protoc_insertion_point(class_scope:fetch.aea.fipa.Attribute)
+  })
+_sym_db.RegisterMessage(Attribute)
+
+DataModel = _reflection.GeneratedProtocolMessageType('DataModel', (_message.Message,), {
+  'DESCRIPTOR' : _DATAMODEL,
+  '__module__' : 'fipa_pb2'
+  # @@protoc_insertion_point(class_scope:fetch.aea.fipa.DataModel)
+  })
+_sym_db.RegisterMessage(DataModel)
+
+Descriptions = _reflection.GeneratedProtocolMessageType('Descriptions', (_message.Message,), {
+  'DESCRIPTOR' : _DESCRIPTIONS,
+  '__module__' : 'fipa_pb2'
+  # @@protoc_insertion_point(class_scope:fetch.aea.fipa.Descriptions)
+  })
+_sym_db.RegisterMessage(Descriptions)
+
+ConstraintExpr = _reflection.GeneratedProtocolMessageType('ConstraintExpr', (_message.Message,), {
+
+  'And' : _reflection.GeneratedProtocolMessageType('And', (_message.Message,), {
+    'DESCRIPTOR' : _CONSTRAINTEXPR_AND,
+    '__module__' : 'fipa_pb2'
+    # @@protoc_insertion_point(class_scope:fetch.aea.fipa.ConstraintExpr.And)
+    })
+  ,
+
+  'Or' : _reflection.GeneratedProtocolMessageType('Or', (_message.Message,), {
+    'DESCRIPTOR' : _CONSTRAINTEXPR_OR,
+    '__module__' : 'fipa_pb2'
+    # @@protoc_insertion_point(class_scope:fetch.aea.fipa.ConstraintExpr.Or)
+    })
+  ,
+
+  'Not' : _reflection.GeneratedProtocolMessageType('Not', (_message.Message,), {
+    'DESCRIPTOR' : _CONSTRAINTEXPR_NOT,
+    '__module__' : 'fipa_pb2'
+    # @@protoc_insertion_point(class_scope:fetch.aea.fipa.ConstraintExpr.Not)
+    })
+  ,
+
+  'Constraint' : _reflection.GeneratedProtocolMessageType('Constraint', (_message.Message,), {
+    'DESCRIPTOR' : _CONSTRAINTEXPR_CONSTRAINT,
+    '__module__' : 'fipa_pb2'
+    # @@protoc_insertion_point(class_scope:fetch.aea.fipa.ConstraintExpr.Constraint)
+    })
+  ,
+  'DESCRIPTOR' : _CONSTRAINTEXPR,
+  '__module__' : 'fipa_pb2'
+  # @@protoc_insertion_point(class_scope:fetch.aea.fipa.ConstraintExpr)
+  })
+_sym_db.RegisterMessage(ConstraintExpr)
+_sym_db.RegisterMessage(ConstraintExpr.And)
+_sym_db.RegisterMessage(ConstraintExpr.Or)
+_sym_db.RegisterMessage(ConstraintExpr.Not)
+_sym_db.RegisterMessage(ConstraintExpr.Constraint)
+
+Query = _reflection.GeneratedProtocolMessageType('Query', (_message.Message,), {
+  'DESCRIPTOR' : _QUERY,
+  '__module__' : 'fipa_pb2'
+  # @@protoc_insertion_point(class_scope:fetch.aea.fipa.Query)
+  })
+_sym_db.RegisterMessage(Query)
+
+FIPAMessage = _reflection.GeneratedProtocolMessageType('FIPAMessage', (_message.Message,), {
 
-  CFP = _reflection.GeneratedProtocolMessageType('CFP', (_message.Message,), dict(
+  'CFP' : _reflection.GeneratedProtocolMessageType('CFP', (_message.Message,), {
 
-    Nothing = _reflection.GeneratedProtocolMessageType('Nothing', (_message.Message,), dict(
-      DESCRIPTOR = _FIPAMESSAGE_CFP_NOTHING,
-      __module__ = 'fipa_pb2'
+    'Nothing' : _reflection.GeneratedProtocolMessageType('Nothing', (_message.Message,), {
+      'DESCRIPTOR' : _FIPAMESSAGE_CFP_NOTHING,
+      '__module__' : 'fipa_pb2'
       # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.CFP.Nothing)
-      ))
+      })
     ,
-    DESCRIPTOR = _FIPAMESSAGE_CFP,
-    __module__ = 'fipa_pb2'
+    'DESCRIPTOR' : _FIPAMESSAGE_CFP,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.CFP)
-    ))
+    })
   ,
 
-  Propose = _reflection.GeneratedProtocolMessageType('Propose', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_PROPOSE,
-    __module__ = 'fipa_pb2'
+  'Propose' : _reflection.GeneratedProtocolMessageType('Propose', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_PROPOSE,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.Propose)
-    ))
+    })
   ,
 
-  Accept = _reflection.GeneratedProtocolMessageType('Accept', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_ACCEPT,
-    __module__ = 'fipa_pb2'
+  'Accept' : _reflection.GeneratedProtocolMessageType('Accept', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_ACCEPT,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.Accept)
-    ))
+    })
   ,
 
-  MatchAccept = _reflection.GeneratedProtocolMessageType('MatchAccept', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_MATCHACCEPT,
-    __module__ = 'fipa_pb2'
+  'MatchAccept' : _reflection.GeneratedProtocolMessageType('MatchAccept', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_MATCHACCEPT,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.MatchAccept)
-    ))
+    })
   ,
 
-  Accept_W_Address = _reflection.GeneratedProtocolMessageType('Accept_W_Address', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_ACCEPT_W_ADDRESS,
-    __module__ = 'fipa_pb2'
+  'Accept_W_Address' : _reflection.GeneratedProtocolMessageType('Accept_W_Address', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_ACCEPT_W_ADDRESS,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.Accept_W_Address)
-    ))
+    })
   ,
 
-  MatchAccept_W_Address = _reflection.GeneratedProtocolMessageType('MatchAccept_W_Address', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_MATCHACCEPT_W_ADDRESS,
-    __module__ = 'fipa_pb2'
+  'MatchAccept_W_Address' : _reflection.GeneratedProtocolMessageType('MatchAccept_W_Address', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_MATCHACCEPT_W_ADDRESS,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.MatchAccept_W_Address)
-    ))
+    })
   ,
 
-  Decline = _reflection.GeneratedProtocolMessageType('Decline', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_DECLINE,
-    __module__ = 'fipa_pb2'
+  'Decline' : _reflection.GeneratedProtocolMessageType('Decline', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_DECLINE,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.Decline)
-    ))
+    })
   ,
 
-  Inform = _reflection.GeneratedProtocolMessageType('Inform', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_INFORM,
-    __module__ = 'fipa_pb2'
+  'Inform' : _reflection.GeneratedProtocolMessageType('Inform', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_INFORM,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.Inform)
-    ))
+    })
   ,
 
-  AcceptWAddress = _reflection.GeneratedProtocolMessageType('AcceptWAddress', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_ACCEPTWADDRESS,
-    __module__ = 'fipa_pb2'
+  'AcceptWAddress' : _reflection.GeneratedProtocolMessageType('AcceptWAddress', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_ACCEPTWADDRESS,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.AcceptWAddress)
-    ))
+    })
   ,
 
-  MatchAcceptWAddress = _reflection.GeneratedProtocolMessageType('MatchAcceptWAddress', (_message.Message,), dict(
-    DESCRIPTOR = _FIPAMESSAGE_MATCHACCEPTWADDRESS,
-    __module__ = 'fipa_pb2'
+  'MatchAcceptWAddress' : _reflection.GeneratedProtocolMessageType('MatchAcceptWAddress', (_message.Message,), {
+    'DESCRIPTOR' : _FIPAMESSAGE_MATCHACCEPTWADDRESS,
+    '__module__' : 'fipa_pb2'
     # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage.MatchAcceptWAddress)
-    ))
+    })
   ,
-  DESCRIPTOR = _FIPAMESSAGE,
-  __module__ = 'fipa_pb2'
+  'DESCRIPTOR' : _FIPAMESSAGE,
+  '__module__' : 'fipa_pb2'
   # @@protoc_insertion_point(class_scope:fetch.aea.fipa.FIPAMessage)
-  ))
+  })
 _sym_db.RegisterMessage(FIPAMessage)
 _sym_db.RegisterMessage(FIPAMessage.CFP)
 _sym_db.RegisterMessage(FIPAMessage.CFP.Nothing)
@@ -20,15 +20,17 @@
 
 """This module contains the FIPA message definition."""
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Union, cast
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
-from aea.protocols.base import Message
+from aea.protocols.base import Message, MessageField
 from aea.protocols.oef.models import Description, Query
 
 
 class FIPAMessage(Message):
     """The FIPA message class."""
 
+    __slots__ = ()
+
     protocol_id = "fipa"
 
     STARTING_MESSAGE_ID = 1
@@ -50,6 +52,15 @@ class FIPAMessage(Message):
             """Get string representation."""
             return self.value
 
+    message_id = MessageField()  # type: MessageField[int]
+    dialogue_reference = MessageField()  # type: MessageField[Tuple[str, str]]
+    target = MessageField()  # type: MessageField[int]
+    performative = MessageField()  # type: MessageField[FIPAMessage.Performative]
+    query = MessageField()  # type: MessageField[Union[Query, bytes, None]]
+    proposal = MessageField()  # type: MessageField[List[Description]]
+    address = MessageField()  # type: MessageField[str]
+    json_data = MessageField()  # type: MessageField[Dict[str, Any]]
+
     def __init__(self, dialogue_reference: Tuple[str, str] = None,
                  message_id: Optional[int] = None,
                  target: Optional[int] = None,
@@ -85,27 +96,30 @@ class FIPAMessage(Message):
             performative = FIPAMessage.Performative(self.get("performative"))
             if performative == FIPAMessage.Performative.CFP:
                 assert self.is_set("query")
-                query = self.get("query")
-                assert isinstance(query, Query) or isinstance(query, bytes) or query is None
-                assert len(self.body) == 5
+                if self.is_decoded("query"):
+                    query = self.get("query")
+                    assert isinstance(query, Query) or isinstance(query, bytes) or query is None
+                assert len(self._body) == 5
             elif performative == FIPAMessage.Performative.PROPOSE:
                 assert self.is_set("proposal")
-                proposal = self.get("proposal")
-                assert type(proposal) == list and all(isinstance(d, Description) or type(d) == bytes for d in proposal)  # type: ignore
-                assert len(self.body) == 5
+                if self.is_decoded("proposal"):
+                    proposal = self.get("proposal")
+                    assert type(proposal) == list and all(isinstance(d, Description) or type(d) == bytes for d in proposal)  # type: ignore
+                assert len(self._body) == 5
             elif performative == FIPAMessage.Performative.ACCEPT \
                     or performative == FIPAMessage.Performative.MATCH_ACCEPT \
                     or performative == FIPAMessage.Performative.DECLINE:
-                assert len(self.body) == 4
+                assert len(self._body) == 4
             elif performative == FIPAMessage.Performative.ACCEPT_W_ADDRESS\
                     or performative == FIPAMessage.Performative.MATCH_ACCEPT_W_ADDRESS:
                 assert self.is_set("address")
-                assert len(self.body) == 5
+                assert len(self._body) == 5
             elif performative == FIPAMessage.Performative.INFORM:
                 assert self.is_set("json_data")
-                json_data = self.get("json_data")
-                assert isinstance(json_data, dict)
-                assert len(self.body) == 5
+                if self.is_decoded("json_data"):
+                    json_data = self.get("json_data")
+                    assert isinstance(json_data, dict)
+                assert len(self._body) == 5
             else:
                 raise ValueError("Performative not recognized.")
 
@@ -20,18 +20,340 @@
 
 """Serialization for the FIPA protocol."""
 import json
-import pickle
-from typing import Tuple, cast
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
-from aea.protocols.base import Message
+from aea.protocols.base import LazyField, Message
 from aea.protocols.base import Serializer
 from aea.protocols.fipa import fipa_pb2
 from aea.protocols.fipa.message import FIPAMessage
-from aea.protocols.oef.models import Description, Query
+from aea.protocols.oef.models import Attribute, DataModel, Description, Query, ConstraintExpr, And, Or, Not, \
+    Constraint, ConstraintType, ConstraintTypes
+
+_ATTRIBUTE_TYPE_TO_PB = {float: fipa_pb2.Attribute.DOUBLE, bool: fipa_pb2.Attribute.BOOL,
+                         int: fipa_pb2.Attribute.INT, str: fipa_pb2.Attribute.STRING}
+_PB_TO_ATTRIBUTE_TYPE = {pb_type: type_ for type_, pb_type in _ATTRIBUTE_TYPE_TO_PB.items()}
+_PB_TO_CONSTRAINT_TYPE = list(ConstraintTypes)
+_CONSTRAINT_TYPE_TO_PB = {type_: pb_type for pb_type, type_ in enumerate(_PB_TO_CONSTRAINT_TYPE)}
+_COLLECTION_CONSTRAINT_TYPES = {ConstraintTypes.WITHIN, ConstraintTypes.IN, ConstraintTypes.NOT_IN}
+_CONTAINER_TO_PB = {list: fipa_pb2.ConstraintExpr.Constraint.LIST, tuple: fipa_pb2.ConstraintExpr.Constraint.TUPLE,
+                    set: fipa_pb2.ConstraintExpr.Constraint.SET}  # type: Dict[type, int]
+_PB_TO_CONTAINER = {pb_container: type_ for type_, pb_container in _CONTAINER_TO_PB.items()}
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+# the types of the values of the descriptions (see the Descriptions message).
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INTEGER = 3
+_BIG_INTEGER = 4
+_DOUBLE = 5
+_STRING = 6
+_BYTES = 7
+# the larger limits are not distinguishable from no limit.
+_UINT64_MAX = 2 ** 64 - 1
+
+
+def _value_to_pb(value: Any, value_pb: fipa_pb2.Value) -> None:
+    """Fill a protobuf value from an attribute value."""
+    if isinstance(value, bool):
+        value_pb.boolean = value
+    elif isinstance(value, int):
+        if _INT64_MIN <= value <= _INT64_MAX:
+            value_pb.integer = value
+        else:
+            value_pb.big_integer = str(int(value))
+    elif isinstance(value, float):
+        value_pb.double = value
+    elif isinstance(value, str):
+        value_pb.string = value
+    else:
+        raise ValueError("Value type not supported: {}".format(type(value)))
+
+
+def _value_from_pb(value_pb: fipa_pb2.Value) -> Any:
+    """Get an attribute value from a protobuf value."""
+    value_type = value_pb.WhichOneof("value")
+    if value_type is None:
+        raise ValueError("Value not set.")
+    if value_type == "big_integer":
+        return int(value_pb.big_integer)
+    return getattr(value_pb, value_type)
+
+
+def _data_model_to_pb(data_model: DataModel, data_model_pb: fipa_pb2.DataModel) -> None:
+    """Fill a protobuf data model from a data model."""
+    data_model_pb.SetInParent()
+    data_model_pb.name = data_model.name
+    data_model_pb.description = data_model.description
+    for attribute in data_model.attributes:
+        attribute_pb = data_model_pb.attributes.add()
+        attribute_pb.name = attribute.name
+        attribute_pb.type = _ATTRIBUTE_TYPE_TO_PB[attribute.type]
+        attribute_pb.required = attribute.is_required
+        attribute_pb.description = attribute.description
+
+
+def _data_model_from_pb(data_model_pb: fipa_pb2.DataModel) -> DataModel:
+    """Get a data model from a protobuf data model."""
+    attributes = [Attribute(attribute_pb.name, _PB_TO_ATTRIBUTE_TYPE[attribute_pb.type], attribute_pb.required,
+                            attribute_pb.description)
+                  for attribute_pb in data_model_pb.attributes]
+    return DataModel(data_model_pb.name, attributes, data_model_pb.description)
+
+
+def _descriptions_to_pb(descriptions: Sequence[Description], descriptions_pb: fipa_pb2.Descriptions) -> None:
+    """
+    Fill protobuf descriptions, stored by column, from descriptions.
+
+    The values are appended to plain lists, and each column is then added to the message at once.
+
+    :param descriptions: the descriptions.
+    :param descriptions_pb: the protobuf descriptions to fill.
+    :return: None
+    :raises ValueError: if a value is not None, a boolean, an integer, a float, a string or bytes.
+    """
+    descriptions_pb.SetInParent()
+    key_to_index = {}  # type: Dict[str, int]
+    sizes = []  # type: List[int]
+    key_indexes = []  # type: List[int]
+    types = bytearray()
+    integers = []  # type: List[int]
+    doubles = []  # type: List[float]
+    strings = []  # type: List[str]
+    blobs = []  # type: List[bytes]
+    data_models = []  # type: List[DataModel]
+    model_indexes = []  # type: List[int]
+    for description in descriptions:
+        values = description.values
+        sizes.append(len(values))
+        for key, value in values.items():
+            key_index = key_to_index.get(key)
+            if key_index is None:
+                key_index = key_to_index[key] = len(key_to_index)
+            key_indexes.append(key_index)
+            # the exact types first, then their subclasses (e.g. an IntEnum).
+            value_type = type(value)
+            if value_type is str:
+                types.append(_STRING)
+                strings.append(value)
+            elif value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+                types.append(_INTEGER)
+                integers.append(value)
+            elif value_type is float:
+                types.append(_DOUBLE)
+                doubles.append(value)
+            elif value_type is bool:
+                types.append(_TRUE if value else _FALSE)
+            elif value is None:
+                types.append(_NONE)
+            elif isinstance(value, bool):
+                types.append(_TRUE if value else _FALSE)
+            elif isinstance(value, int):
+                if _INT64_MIN <= value <= _INT64_MAX:
+                    types.append(_INTEGER)
+                    integers.append(int(value))
+                else:
+                    types.append(_BIG_INTEGER)
+                    strings.append(str(int(value)))
+            elif isinstance(value, float):
+                types.append(_DOUBLE)
+                doubles.append(float(value))
+            elif isinstance(value, str):
+                types.append(_STRING)
+                strings.append(str(value))
+            elif isinstance(value, bytes):
+                types.append(_BYTES)
+                blobs.append(bytes(value))
+            else:
+                raise ValueError("Value type not supported: {}".format(value_type))
+        model_indexes.append(_data_model_index(description.data_model, data_models))
+    descriptions_pb.keys.extend(key_to_index)
+    descriptions_pb.sizes = _pack_column("I", sizes)
+    descriptions_pb.key_indexes = _pack_column("I", key_indexes)
+    descriptions_pb.types = bytes(types)
+    descriptions_pb.integers = _pack_column("q", integers)
+    descriptions_pb.doubles = _pack_column("d", doubles)
+    descriptions_pb.strings.extend(strings)
+    descriptions_pb.blobs.extend(blobs)
+    for data_model in data_models:
+        _data_model_to_pb(data_model, descriptions_pb.data_models.add())
+    descriptions_pb.model_indexes = _pack_column("I", model_indexes)
+
+
+def _pack_column(item_format: str, items: Sequence) -> bytes:
+    """Pack a numeric column as a little-endian array."""
+    return struct.pack("<{}{}".format(len(items), item_format), *items)
+
+
+def _unpack_column(item_format: str, column: bytes) -> Tuple:
+    """
+    Unpack a numeric column packed as a little-endian array.
+
+    :raises ValueError: if the size of the column is not a multiple of the size of its items.
+    """
+    item_size = struct.calcsize("<" + item_format)
+    if len(column) % item_size != 0:
+        raise ValueError("Invalid size of a column of descriptions: {}.".format(len(column)))
+    return struct.unpack("<{}{}".format(len(column) // item_size, item_format), column)
+
+
+def _data_model_index(data_model: Optional[DataModel], data_models: List[DataModel]) -> int:
+    """
+    Get the 1-based index of a data model in the distinct data models, adding it if missing.
+
+    :param data_model: the data model, if any.
+    :param data_models: the distinct data models.
+    :return: the index, or 0 for no data model.
+    """
+    if data_model is None:
+        return 0
+    for index, other in enumerate(data_models, 1):
+        if other is data_model or other == data_model:
+            return index
+    data_models.append(data_model)
+    return len(data_models)
+
+
+def _descriptions_from_pb(descriptions_pb: fipa_pb2.Descriptions) -> List[Description]:
+    """
+    Get descriptions from protobuf descriptions, stored by column.
+
+    :param descriptions_pb: the protobuf descriptions.
+    :return: the descriptions.
+    :raises ValueError: if the columns are not consistent.
+    """
+    keys = list(descriptions_pb.keys)
+    sizes = _unpack_column("I", descriptions_pb.sizes)
+    key_indexes = _unpack_column("I", descriptions_pb.key_indexes)
+    types = descriptions_pb.types
+    model_indexes = _unpack_column("I", descriptions_pb.model_indexes)
+    if len(model_indexes) != len(sizes) or len(key_indexes) != len(types) or sum(sizes) != len(types):
+        raise ValueError("Inconsistent columns of descriptions.")
+    integers = iter(_unpack_column("q", descriptions_pb.integers))
+    doubles = iter(_unpack_column("d", descriptions_pb.doubles))
+    strings = iter(descriptions_pb.strings)
+    blobs = iter(descriptions_pb.blobs)
+    data_models = [None] + [_data_model_from_pb(data_model_pb) for data_model_pb in descriptions_pb.data_models]  # type: List[Optional[DataModel]]
+    descriptions = []  # type: List[Description]
+    position = 0
+    try:
+        for size, model_index in zip(sizes, model_indexes):
+            values = {}  # type: Dict[str, Any]
+            for index in range(position, position + size):
+                value_type = types[index]
+                if value_type == _STRING:
+                    value = next(strings)  # type: Any
+                elif value_type == _INTEGER:
+                    value = next(integers)
+                elif value_type == _DOUBLE:
+                    value = next(doubles)
+                elif value_type == _TRUE:
+                    value = True
+                elif value_type == _FALSE:
+                    value = False
+                elif value_type == _NONE:
+                    value = None
+                elif value_type == _BIG_INTEGER:
+                    value = int(next(strings))
+                elif value_type == _BYTES:
+                    value = next(blobs)
+                else:
+                    raise ValueError("Value type not recognized: {}.".format(value_type))
+                values[keys[key_indexes[index]]] = value
+            position += size
+            descriptions.append(Description(values, data_model=data_models[model_index]))
+    except StopIteration:
+        raise ValueError("Missing values in the columns of descriptions.")
+    return descriptions
+
+
+def _constraint_expr_to_pb(expr: ConstraintExpr, expr_pb: fipa_pb2.ConstraintExpr) -> None:
+    """Fill a protobuf constraint expression from a constraint expression."""
+    if isinstance(expr, Constraint):
+        constraint_pb = expr_pb.constraint
+        constraint_pb.SetInParent()
+        constraint_pb.attribute_name = expr.attribute_name
+        constraint_type = expr.constraint_type.type
+        constraint_pb.operator = _CONSTRAINT_TYPE_TO_PB[constraint_type]
+        value = expr.constraint_type.value
+        if constraint_type in _COLLECTION_CONSTRAINT_TYPES:
+            constraint_pb.container = _CONTAINER_TO_PB[type(value)]
+            for item in value:
+                _value_to_pb(item, constraint_pb.values.add())
+        else:
+            _value_to_pb(value, constraint_pb.value)
+    elif isinstance(expr, And):
+        expr_pb.and_.SetInParent()
+        for sub_expr in expr.constraints:
+            _constraint_expr_to_pb(sub_expr, expr_pb.and_.expressions.add())
+    elif isinstance(expr, Or):
+        expr_pb.or_.SetInParent()
+        for sub_expr in expr.constraints:
+            _constraint_expr_to_pb(sub_expr, expr_pb.or_.expressions.add())
+    elif isinstance(expr, Not):
+        expr_pb.not_.SetInParent()
+        _constraint_expr_to_pb(expr.constraint, expr_pb.not_.expression)
+    else:
+        raise ValueError("Constraint expression not supported: {}".format(type(expr)))
+
+
+def _constraint_expr_from_pb(expr_pb: fipa_pb2.ConstraintExpr) -> ConstraintExpr:
+    """Get a constraint expression from a protobuf constraint expression."""
+    expr_type = expr_pb.WhichOneof("expression")
+    if expr_type == "constraint":
+        constraint_pb = expr_pb.constraint
+        constraint_type = _PB_TO_CONSTRAINT_TYPE[constraint_pb.operator]
+        if constraint_type in _COLLECTION_CONSTRAINT_TYPES:
+            values = [_value_from_pb(value_pb) for value_pb in constraint_pb.values]  # type: List[Any]
+            value = _PB_TO_CONTAINER[constraint_pb.container](values)
+        else:
+            value = _value_from_pb(constraint_pb.value)
+        return Constraint(constraint_pb.attribute_name, ConstraintType(constraint_type, value))
+    elif expr_type == "and_":
+        return And([_constraint_expr_from_pb(sub_expr_pb) for sub_expr_pb in expr_pb.and_.expressions])
+    elif expr_type == "or_":
+        return Or([_constraint_expr_from_pb(sub_expr_pb) for sub_expr_pb in expr_pb.or_.expressions])
+    elif expr_type == "not_":
+        return Not(_constraint_expr_from_pb(expr_pb.not_.expression))
+    raise ValueError("Constraint expression not recognized.")
+
+
+def _query_to_pb(query: Query, query_pb: fipa_pb2.Query) -> None:
+    """Fill a protobuf query from a query."""
+    query_pb.SetInParent()
+    for expr in query.constraints:
+        _constraint_expr_to_pb(expr, query_pb.constraints.add())
+    if query.model is not None:
+        _data_model_to_pb(query.model, query_pb.model)
+    if query.order_by is not None:
+        query_pb.order_by = query.order_by
+    query_pb.descending = query.descending
+    if query.limit is not None:
+        query_pb.limit = min(query.limit, _UINT64_MAX)
+
+
+def _query_from_pb(query_pb: fipa_pb2.Query) -> Query:
+    """Get a query from a protobuf query."""
+    constraints = [_constraint_expr_from_pb(expr_pb) for expr_pb in query_pb.constraints]
+    model = _data_model_from_pb(query_pb.model) if query_pb.HasField("model") else None
+    order_by = query_pb.order_by if query_pb.WhichOneof("ordering") == "order_by" else None
+    return Query(constraints, model=model, order_by=order_by, descending=query_pb.descending, limit=query_pb.limit or None)
+
+
+def _proposal_from_pb(propose_pb: fipa_pb2.FIPAMessage.Propose) -> List[Description]:
+    """Get the proposal from a protobuf PROPOSE."""
+    return _descriptions_from_pb(propose_pb.proposal)
 
 
 class FIPASerializer(Serializer):
-    """Serialization for the FIPA protocol."""
+    """
+    Serialization for the FIPA protocol.
+
+    The query of a CFP and the proposal of a PROPOSE are decoded on first access
+    to the field of the decoded message; a malformed one raises a FieldDecodingError then.
+    """
 
     def encode(self, msg: Message) -> bytes:
         """Encode a FIPA message into bytes."""
@@ -50,19 +372,15 @@ class FIPASerializer(Serializer):
                 nothing = fipa_pb2.FIPAMessage.CFP.Nothing()  # type: ignore
                 performative.nothing.CopyFrom(nothing)
             elif type(query) == Query:
-                query = pickle.dumps(query)
-                performative.query_bytes = query
+                _query_to_pb(query, performative.oef_query)
             elif type(query) == bytes:
                 performative.bytes = query
             else:
                 raise ValueError("Query type not supported: {}".format(type(query)))
             fipa_msg.cfp.CopyFrom(performative)
         elif performative_id == FIPAMessage.Performative.PROPOSE:
-            performative = fipa_pb2.FIPAMessage.Propose()  # type: ignore
-            proposal = cast(Description, msg.get("proposal"))
-            p_array_bytes = [pickle.dumps(p) for p in proposal]
-            performative.proposal.extend(p_array_bytes)
-            fipa_msg.propose.CopyFrom(performative)
+            proposal = cast(List[Description], msg.get("proposal"))
+            _descriptions_to_pb(proposal, fipa_msg.propose.proposal)
         elif performative_id == FIPAMessage.Performative.ACCEPT:
             performative = fipa_pb2.FIPAMessage.Accept()  # type: ignore
             fipa_msg.accept.CopyFrom(performative)
@@ -106,24 +424,20 @@ class FIPASerializer(Serializer):
 
         performative = fipa_pb.WhichOneof("performative")
         performative_id = FIPAMessage.Performative(str(performative))
-        performative_content = dict()
+        performative_content = dict()  # type: Dict[str, Any]
         if performative_id == FIPAMessage.Performative.CFP:
             query_type = fipa_pb.cfp.WhichOneof("query")
             if query_type == "nothing":
-                query = None
-            elif query_type == "query_bytes":
-                query = pickle.loads(fipa_pb.cfp.query_bytes)
+                query = None  # type: Any
+            elif query_type == "oef_query":
+                query = LazyField(_query_from_pb, fipa_pb.cfp.oef_query)
             elif query_type == "bytes":
                 query = fipa_pb.cfp.bytes
             else:
                 raise ValueError("Query type not recognized.")  # pragma: no cover
             performative_content["query"] = query
         elif performative_id == FIPAMessage.Performative.PROPOSE:
-            descriptions = []
-            for p_bytes in fipa_pb.propose.proposal:
-                p = pickle.loads(p_bytes)  # type: Description
-                descriptions.append(p)
-            performative_content["proposal"] = descriptions
+            performative_content["proposal"] = LazyField(_proposal_from_pb, fipa_pb.propose)
         elif performative_id == FIPAMessage.Performative.ACCEPT:
             pass
         elif performative_id == FIPAMessage.Performative.MATCH_ACCEPT:
@@ -137,8 +451,7 @@ class FIPASerializer(Serializer):
         elif performative_id == FIPAMessage.Performative.DECLINE:
             pass
         elif performative_id == FIPAMessage.Performative.INFORM:
-            data = json.loads(fipa_pb.inform.bytes)
-            performative_content["json_data"] = data
+            performative_content["json_data"] = json.loads(fipa_pb.inform.bytes)
         else:
             raise ValueError("Performative not valid: {}.".format(performative))
 
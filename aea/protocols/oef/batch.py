@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Columnar batches of descriptions, to evaluate the queries with vectorized operations."""
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from aea.protocols.oef.models import Constraint, ConstraintTypes, Description
+
+_INT64_INFO = np.iinfo(np.int64)
+
+_COMPARISONS = {
+    ConstraintTypes.EQUAL: operator.eq,
+    ConstraintTypes.NOT_EQUAL: operator.ne,
+    ConstraintTypes.LESS_THAN: operator.lt,
+    ConstraintTypes.LESS_THAN_EQ: operator.le,
+    ConstraintTypes.GREATER_THAN: operator.gt,
+    ConstraintTypes.GREATER_THAN_EQ: operator.ge,
+}  # type: Dict[ConstraintTypes, Callable[[Any, Any], Any]]
+
+
+def _to_array(value_type: type, values: List[Any]) -> np.ndarray:
+    """
+    Convert the values of a type into a typed array, or into an object array if there is no equivalent dtype.
+
+    :param value_type: the exact type of the values.
+    :param values: the values.
+    :return: the array.
+    """
+    if value_type is bool:
+        return np.array(values, dtype=bool)
+    elif value_type is float:
+        return np.array(values, dtype=np.float64)
+    elif value_type is int and _INT64_INFO.min <= min(values) and max(values) <= _INT64_INFO.max:
+        return np.array(values, dtype=np.int64)
+    elif value_type is str and not any(value.endswith("\x00") for value in values):
+        # NumPy strips the trailing null characters of the strings.
+        return np.array(values, dtype=str)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class DescriptionBatch:
+    """
+    A batch of descriptions, stored by column.
+
+    For every attribute, the values are grouped by type, and each group is stored in a NumPy array
+    with the positions of the descriptions which have a value of that type.
+    A constraint is then evaluated with a few vectorized operations per group instead of one check per description.
+
+    The batch is a snapshot: it does not follow the later changes of the descriptions.
+    """
+
+    def __init__(self, descriptions: Iterable[Description]):
+        """
+        Initialize a batch of descriptions.
+
+        :param descriptions: the descriptions.
+        """
+        self._descriptions = list(descriptions)
+        groups = {}  # type: Dict[str, Dict[type, Tuple[List[int], List[Any]]]]
+        for position, description in enumerate(self._descriptions):
+            for name, value in description.values.items():
+                positions, values = groups.setdefault(name, {}).setdefault(type(value), ([], []))
+                positions.append(position)
+                values.append(value)
+        self._columns = {
+            name: {value_type: (np.array(positions, dtype=np.intp), _to_array(value_type, values))
+                   for value_type, (positions, values) in groups_by_type.items()}
+            for name, groups_by_type in groups.items()
+        }  # type: Dict[str, Dict[type, Tuple[np.ndarray, np.ndarray]]]
+
+    @property
+    def descriptions(self) -> List[Description]:
+        """Get the descriptions of the batch."""
+        return self._descriptions
+
+    def __len__(self) -> int:
+        """Get the number of descriptions in the batch."""
+        return len(self._descriptions)
+
+    def full(self, value: bool) -> np.ndarray:
+        """
+        Get a new mask with the same value for every description.
+
+        :param value: the value.
+        :return: the mask.
+        """
+        return np.full(len(self._descriptions), value, dtype=bool)
+
+    def select(self, mask: np.ndarray) -> List[Description]:
+        """
+        Get the descriptions selected by a mask.
+
+        :param mask: the boolean mask, with one element per description.
+        :return: the selected descriptions, in the order of the batch.
+        """
+        return [self._descriptions[position] for position in np.flatnonzero(mask)]
+
+    def mask_of(self, predicate: Callable[[Description], bool]) -> np.ndarray:
+        """
+        Evaluate a predicate on every description, one at a time.
+
+        :param predicate: the predicate.
+        :return: the mask.
+        """
+        return np.fromiter((predicate(description) for description in self._descriptions), dtype=bool, count=len(self._descriptions))
+
+    def mask(self, constraint: Constraint) -> np.ndarray:
+        """
+        Evaluate a constraint on every description, with the same result as Constraint.check.
+
+        :param constraint: the constraint.
+        :return: the mask.
+        """
+        result = self.full(False)
+        constraint_value = constraint.constraint_type.value
+        if type(constraint_value) in {list, tuple, set}:
+            expected_type = type(next(iter(constraint_value))) if len(constraint_value) > 0 else object  # type: type
+        else:
+            expected_type = type(constraint_value)
+        for value_type, (positions, values) in self._columns.get(constraint.attribute_name, {}).items():
+            if issubclass(value_type, expected_type):
+                result[positions] = self._test(constraint, value_type, values)
+        return result
+
+    @staticmethod
+    def _test(constraint: Constraint, value_type: type, values: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the test of a constraint on the values of a group.
+
+        The test is vectorized when NumPy gives the same result as Python, and is applied to each value otherwise.
+
+        :param constraint: the constraint.
+        :param value_type: the exact type of the values.
+        :param values: the values.
+        :return: the mask of the group.
+        """
+        constraint_type = constraint.constraint_type
+        constraint_value = constraint_type.value
+        if values.dtype != object:
+            try:
+                if constraint_type.type in _COMPARISONS:
+                    if not isinstance(constraint_value, (bool, int, float, str)) or _not_representable(constraint_value):
+                        raise TypeError("Constraint value not supported by the typed arrays.")
+                    return np.asarray(_COMPARISONS[constraint_type.type](constraint_value, values), dtype=bool)
+                elif constraint_type.type == ConstraintTypes.WITHIN:
+                    low, high = constraint_value[0], constraint_value[1]
+                    if _not_representable(low) or _not_representable(high):
+                        raise TypeError("Constraint value not supported by the typed arrays.")
+                    return (low <= values) & (values <= high)
+                elif all(type(element) is value_type and element == element and not _not_representable(element) for element in constraint_value):
+                    # the dtype is inferred: forcing the one of the column would truncate the longer strings.
+                    is_in = np.isin(values, np.array(list(constraint_value)))
+                    return is_in if constraint_type.type == ConstraintTypes.IN else ~is_in
+            except (TypeError, OverflowError):
+                pass
+        test = constraint_type.check
+        return np.fromiter((test(value) for value in values.tolist()), dtype=bool, count=len(values))
+
+
+def _not_representable(value: Any) -> bool:
+    """Check whether a value changes in the typed arrays: an integer out of their range, or a string with trailing null characters."""
+    if type(value) is int:
+        return not _INT64_INFO.min <= value <= _INT64_INFO.max
+    return type(value) is str and value.endswith("\x00")
@@ -22,13 +22,15 @@
 from enum import Enum
 from typing import Optional, List, cast
 
-from aea.protocols.base import Message
+from aea.protocols.base import Message, MessageField
 from aea.protocols.oef.models import Description, Query
 
 
 class OEFMessage(Message):
     """The OEF message class."""
 
+    __slots__ = ()
+
     protocol_id = "oef"
 
     class Type(Enum):
@@ -66,6 +68,18 @@ class OEFMessage(Message):
             """Get string representation."""
             return str(self.value)
 
+    type = MessageField()  # type: MessageField[OEFMessage.Type]
+    id = MessageField()  # type: MessageField[int]
+    service_id = MessageField()  # type: MessageField[str]
+    service_description = MessageField()  # type: MessageField[Description]
+    agent_id = MessageField()  # type: MessageField[str]
+    agent_description = MessageField()  # type: MessageField[Description]
+    query = MessageField()  # type: MessageField[Query]
+    agents = MessageField()  # type: MessageField[List[str]]
+    operation = MessageField()  # type: MessageField[OEFMessage.OEFErrorOperation]
+    dialogue_id = MessageField()  # type: MessageField[int]
+    origin = MessageField()  # type: MessageField[str]
+
     def __init__(self, oef_type: Optional[Type] = None,
                  **kwargs):
         """
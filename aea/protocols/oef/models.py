@@ -19,13 +19,23 @@
 # ------------------------------------------------------------------------------
 
 """Useful classes for the OEF protocol."""
+import functools
+import heapq
+import operator
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from enum import Enum
-from typing import Dict, Type, Union, Optional, List, Any
+from typing import Callable, Dict, Iterable, Tuple, Type, Union, Optional, List, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np  # noqa: F401
+    from aea.protocols.oef.batch import DescriptionBatch  # noqa: F401
 
 ATTRIBUTE_TYPES = Union[float, str, bool, int]
 
+Predicate = Callable[['Description'], bool]
+_MISSING = object()
+
 
 class JSONSerializable(ABC):
     """Interface for JSON-serializable objects."""
@@ -99,6 +109,27 @@ class DataModel:
             and self.attributes == other.attributes
 
 
+def _freeze(value: Any) -> Any:
+    """
+    Get a hashable version of a value, recursively converting the mutable containers.
+
+    :param value: the value.
+    :return: the hashable value.
+    """
+    if isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+_IMMUTABLE_TYPES = frozenset([bool, int, float, str, bytes, type(None)])
+
+
 class Description:
     """Implements an OEF description."""
 
@@ -108,7 +139,12 @@ class Description:
 
         :param values: the values in the description.
         """
-        _values = deepcopy(values)
+        # the values are copied so that the description does not change with them;
+        # a shallow copy is enough when none of them is a container.
+        if all(type(value) in _IMMUTABLE_TYPES for value in values.values()):
+            _values = dict(values)
+        else:
+            _values = deepcopy(values)
         self.values = _values
         self.data_model = data_model
 
@@ -118,6 +154,14 @@ class Description:
             and self.values == other.values \
             and self.data_model == other.data_model
 
+    def __hash__(self) -> int:
+        """
+        Get a hash of the content of the description, consistent with the equality.
+
+        The descriptions are not expected to change once built, e.g. while registered in a directory.
+        """
+        return hash((self.data_model.name if self.data_model is not None else None, _freeze(self.values)))
+
     def __iter__(self):
         """Create an iterator."""
         return iter(self.values)
@@ -250,6 +294,48 @@ class ConstraintType:
         else:
             raise ValueError("Constraint type not recognized.")
 
+    def compile(self) -> Callable[[Any], bool]:
+        """
+        Compile the constraint type into a function equivalent to check, with the operator and the value bound.
+
+        :return: the function.
+        :raises ValueError: if the constraint type is not recognized.
+        """
+        value = self.value
+        if self.type == ConstraintTypes.EQUAL:
+            return functools.partial(operator.eq, value)
+        elif self.type == ConstraintTypes.NOT_EQUAL:
+            return functools.partial(operator.ne, value)
+        elif self.type == ConstraintTypes.LESS_THAN:
+            return functools.partial(operator.lt, value)
+        elif self.type == ConstraintTypes.LESS_THAN_EQ:
+            return functools.partial(operator.le, value)
+        elif self.type == ConstraintTypes.GREATER_THAN:
+            return functools.partial(operator.gt, value)
+        elif self.type == ConstraintTypes.GREATER_THAN_EQ:
+            return functools.partial(operator.ge, value)
+        elif self.type == ConstraintTypes.WITHIN:
+            low, high = value[0], value[1]
+            return lambda x: low <= x <= high
+        elif self.type in (ConstraintTypes.IN, ConstraintTypes.NOT_IN):
+            try:
+                container = frozenset(value)
+            except TypeError:
+                container = value
+
+            def contains(x: Any) -> bool:
+                try:
+                    return x in container
+                except TypeError:
+                    # an unhashable value is not in the set: look it up in the original collection, as check does.
+                    return x in value
+
+            if self.type == ConstraintTypes.IN:
+                return contains
+            return lambda x: not contains(x)
+        else:
+            raise ValueError("Constraint type not recognized.")
+
     def __eq__(self, other):
         """Check equality with another object."""
         return isinstance(other, ConstraintType) and self.value == other.value and self.type == other.type
@@ -267,6 +353,28 @@ class ConstraintExpr(ABC):
         :return: True if the description satisfy the constraint expression, False otherwise.
         """
 
+    def compile(self) -> Predicate:
+        """
+        Compile the constraint expression into a predicate equivalent to check.
+
+        The predicate is meant to be built once and evaluated on many descriptions.
+        By default, it is the check method itself.
+
+        :return: the predicate.
+        """
+        return self.check
+
+    def mask(self, batch: 'DescriptionBatch') -> 'np.ndarray':
+        """
+        Evaluate the constraint expression on a batch of descriptions.
+
+        By default, the check method is applied to each description.
+
+        :param batch: the batch of descriptions.
+        :return: the boolean mask of the descriptions which satisfy the constraint expression.
+        """
+        return batch.mask_of(self.check)
+
 
 class And(ConstraintExpr):
     """Implementation of the 'And' constraint expression."""
@@ -288,6 +396,23 @@ class And(ConstraintExpr):
         """
         return all(expr.check(description) for expr in self.constraints)
 
+    def compile(self) -> Predicate:
+        """
+        Compile the 'And' expression, flattening the nested 'And' expressions.
+
+        :return: the predicate.
+        """
+        return _compile_all(self.constraints)
+
+    def mask(self, batch: 'DescriptionBatch') -> 'np.ndarray':
+        """
+        Evaluate the 'And' expression on a batch of descriptions.
+
+        :param batch: the batch of descriptions.
+        :return: the boolean mask.
+        """
+        return _mask_all(self.constraints, batch)
+
     def __eq__(self, other):
         """Compare with another object."""
         return isinstance(other, And) and self.constraints == other.constraints
@@ -313,6 +438,36 @@ class Or(ConstraintExpr):
         """
         return any(expr.check(description) for expr in self.constraints)
 
+    def compile(self) -> Predicate:
+        """
+        Compile the 'Or' expression, flattening the nested 'Or' expressions.
+
+        :return: the predicate.
+        """
+        predicates = tuple(expr.compile() for expr in _flatten(self.constraints, Or))
+        if len(predicates) == 1:
+            return predicates[0]
+
+        def predicate(description: Description) -> bool:
+            for sub_predicate in predicates:
+                if sub_predicate(description):
+                    return True
+            return False
+
+        return predicate
+
+    def mask(self, batch: 'DescriptionBatch') -> 'np.ndarray':
+        """
+        Evaluate the 'Or' expression on a batch of descriptions.
+
+        :param batch: the batch of descriptions.
+        :return: the boolean mask.
+        """
+        result = batch.full(False)
+        for expr in self.constraints:
+            result |= expr.mask(batch)
+        return result
+
     def __eq__(self, other):
         """Compare with another object."""
         return isinstance(other, Or) and self.constraints == other.constraints
@@ -338,6 +493,26 @@ class Not(ConstraintExpr):
         """
         return not self.constraint.check(description)
 
+    def compile(self) -> Predicate:
+        """
+        Compile the 'Not' expression, cancelling the double negations.
+
+        :return: the predicate.
+        """
+        if isinstance(self.constraint, Not):
+            return self.constraint.constraint.compile()
+        sub_predicate = self.constraint.compile()
+        return lambda description: not sub_predicate(description)
+
+    def mask(self, batch: 'DescriptionBatch') -> 'np.ndarray':
+        """
+        Evaluate the 'Not' expression on a batch of descriptions.
+
+        :param batch: the batch of descriptions.
+        :return: the boolean mask.
+        """
+        return ~self.constraint.mask(batch)
+
     def __eq__(self, other):
         """Compare with another object."""
         return isinstance(other, Not) and self.constraint == other.constraint
@@ -405,16 +580,46 @@ class Constraint(ConstraintExpr):
             return False
 
         # if the type of the value is different from the type of the attribute, return false.
+        # for the collection constraints (within, in, not_in), the type of the attribute is the type of the elements.
         value = description.values[name]
-        if type(self.constraint_type.value) in {list, tuple, set} \
-                and not isinstance(value, type(next(iter(self.constraint_type.value)))):
-            return False
-        if not isinstance(value, type(self.constraint_type.value)):
+        if type(self.constraint_type.value) in {list, tuple, set}:
+            if len(self.constraint_type.value) > 0 and not isinstance(value, type(next(iter(self.constraint_type.value)))):
+                return False
+        elif not isinstance(value, type(self.constraint_type.value)):
             return False
 
         # dispatch the check to the right implementation for the concrete constraint type.
         return self.constraint_type.check(value)
 
+    def compile(self) -> Predicate:
+        """
+        Compile the constraint, with the attribute name, the expected type and the test pre-resolved.
+
+        :return: the predicate.
+        """
+        name = self.attribute_name
+        constraint_value = self.constraint_type.value
+        if type(constraint_value) in {list, tuple, set}:
+            expected_type = type(next(iter(constraint_value))) if len(constraint_value) > 0 else object  # type: type
+        else:
+            expected_type = type(constraint_value)
+        test = self.constraint_type.compile()
+
+        def predicate(description: Description) -> bool:
+            value = description.values.get(name, _MISSING)
+            return value is not _MISSING and isinstance(value, expected_type) and test(value)
+
+        return predicate
+
+    def mask(self, batch: 'DescriptionBatch') -> 'np.ndarray':
+        """
+        Evaluate the constraint on a batch of descriptions, with vectorized operations on its columns.
+
+        :param batch: the batch of descriptions.
+        :return: the boolean mask.
+        """
+        return batch.mask(self)
+
     def __eq__(self, other):
         """Compare with another object."""
         return isinstance(other, Constraint) \
@@ -425,15 +630,23 @@ class Constraint(ConstraintExpr):
 class Query:
     """This class lets you build a query for the OEF."""
 
-    def __init__(self, constraints: List[ConstraintExpr], model: Optional[DataModel] = None) -> None:
+    def __init__(self, constraints: List[ConstraintExpr], model: Optional[DataModel] = None,
+                 order_by: Optional[str] = None, descending: bool = False, limit: Optional[int] = None) -> None:
         """
         Initialize a query.
 
         :param constraints: a list of constraint expressions.
         :param model: the data model that the query refers to.
+        :param order_by: the name of the attribute the results are ranked by, if any.
+        :param descending: whether the results are ranked by decreasing value of the attribute.
+        :param limit: the maximum number of results, if any.
         """
+        assert limit is None or limit > 0, "The limit of a query must be positive."
         self.constraints = constraints
         self.model = model
+        self.order_by = order_by
+        self.descending = descending
+        self.limit = limit
 
     def check(self, description: Description) -> bool:
         """
@@ -446,8 +659,167 @@ class Query:
         """
         return all(c.check(description) for c in self.constraints)
 
+    def compile(self) -> Predicate:
+        """
+        Compile the constraints of the query into a predicate equivalent to check.
+
+        Compiling resolves the attribute names, the types and the operators once, so the predicate
+        is cheaper to evaluate on many descriptions, e.g.:
+
+            >>> query = Query([Constraint("year", ConstraintType("==", 1991))])
+            >>> predicate = query.compile()
+            >>> [predicate(Description({"year": year})) for year in (1990, 1991)]
+            [False, True]
+
+        The predicate does not follow the later changes of the query.
+
+        :return: the predicate.
+        """
+        return _compile_all(self.constraints)
+
+    def mask(self, batch: 'DescriptionBatch') -> 'np.ndarray':
+        """
+        Evaluate the constraints of the query on a batch of descriptions.
+
+        :param batch: the batch of descriptions.
+        :return: the boolean mask of the descriptions which satisfy the query, with the same result as check.
+        """
+        return _mask_all(self.constraints, batch)
+
+    def filter(self, batch: 'DescriptionBatch') -> List[Description]:
+        """
+        Get the descriptions of a batch which satisfy the query.
+
+        This is equivalent to checking the descriptions one at a time, but the constraints are evaluated
+        as boolean masks over the columns of the batch, e.g.:
+
+            >>> from aea.protocols.oef.batch import DescriptionBatch
+            >>> batch = DescriptionBatch([Description({"year": year}) for year in (1989, 1991, 1995)])
+            >>> query = Query([Constraint("year", ConstraintType("within", (1990, 2000)))])
+            >>> [description.values["year"] for description in query.filter(batch)]
+            [1991, 1995]
+
+        :param batch: the batch of descriptions.
+        :return: the descriptions which satisfy the query, in the order of the batch.
+        """
+        return batch.select(self.mask(batch))
+
+    def ordering_key(self, description: Description) -> Tuple:
+        """
+        Get the key of a description in the ranking of the query: the smaller, the better.
+
+        The descriptions with a number for the ordering attribute come first, then the ones with a string,
+        then the ones without a comparable value (missing, NaN or of another type), which are tied.
+
+        :param description: the description.
+        :return: the key.
+        """
+        value = description.values.get(self.order_by) if self.order_by is not None else None
+        if isinstance(value, (int, float)) and value == value:
+            rank = 0
+        elif isinstance(value, str):
+            rank = 1
+        else:
+            return 2, 0
+        return rank, _Reversed(value) if self.descending else value
+
+    def rank(self, matches: Iterable[Tuple[str, Description]]) -> List[str]:
+        """
+        Select the results of the query, among the agents with a matching description.
+
+        An agent is ranked by its best matching description, and the agents with the same key are sorted by public key.
+        Only the first results up to the limit are selected, with a heap.
+
+        :param matches: the pairs of public key and matching description.
+        :return: the ranked public keys.
+        """
+        if self.order_by is None:
+            public_keys = {public_key for public_key, _ in matches}
+            return sorted(public_keys) if self.limit is None else heapq.nsmallest(self.limit, public_keys)
+
+        key_by_public_key = {}  # type: Dict[str, Tuple]
+        for public_key, description in matches:
+            key = self.ordering_key(description)
+            if public_key not in key_by_public_key or key < key_by_public_key[public_key]:
+                key_by_public_key[public_key] = key
+        ranked = ((key, public_key) for public_key, key in key_by_public_key.items())
+        selected = sorted(ranked) if self.limit is None else heapq.nsmallest(self.limit, ranked)
+        return [public_key for _, public_key in selected]
+
     def __eq__(self, other):
         """Compare with another object."""
         return isinstance(other, Query) \
             and self.constraints == other.constraints \
-            and self.model == other.model
+            and self.model == other.model \
+            and self.order_by == other.order_by \
+            and self.descending == other.descending \
+            and self.limit == other.limit
+
+
+class _Reversed:
+    """Wrap a value to compare it in the reverse order."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        """Initialize the wrapper."""
+        self.value = value
+
+    def __eq__(self, other):
+        """Compare with another wrapper."""
+        return isinstance(other, _Reversed) and self.value == other.value
+
+    def __lt__(self, other: '_Reversed') -> bool:
+        """Check if the wrapped value is greater than the other one."""
+        return other.value < self.value
+
+
+def _flatten(constraints: List[ConstraintExpr], expression_type: type) -> List[ConstraintExpr]:
+    """
+    Flatten the nested expressions of a type, e.g. And([a, And([b, c])]) into [a, b, c].
+
+    :param constraints: the constraint expressions.
+    :param expression_type: And or Or.
+    :return: the flat list of constraint expressions.
+    """
+    result = []  # type: List[ConstraintExpr]
+    for expr in constraints:
+        if type(expr) == expression_type:
+            result.extend(_flatten(getattr(expr, "constraints"), expression_type))
+        else:
+            result.append(expr)
+    return result
+
+
+def _compile_all(constraints: List[ConstraintExpr]) -> Predicate:
+    """
+    Compile a conjunction of constraint expressions.
+
+    :param constraints: the constraint expressions.
+    :return: the predicate.
+    """
+    predicates = tuple(expr.compile() for expr in _flatten(constraints, And))
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def predicate(description: Description) -> bool:
+        for sub_predicate in predicates:
+            if not sub_predicate(description):
+                return False
+        return True
+
+    return predicate
+
+
+def _mask_all(constraints: List[ConstraintExpr], batch: 'DescriptionBatch') -> 'np.ndarray':
+    """
+    Evaluate a conjunction of constraint expressions on a batch of descriptions.
+
+    :param constraints: the constraint expressions.
+    :param batch: the batch of descriptions.
+    :return: the boolean mask.
+    """
+    result = batch.full(True)
+    for expr in constraints:
+        result &= expr.mask(batch)
+    return result
@@ -18,27 +18,644 @@
 #
 # ------------------------------------------------------------------------------
 
-"""Serialization for the FIPA protocol."""
-import base64
+"""Serialization for the OEF protocol."""
 import copy
-import json
-import pickle
+import struct
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from aea.protocols.base import Message
 from aea.protocols.base import Serializer
 from aea.protocols.oef.message import OEFMessage
-from aea.protocols.oef.models import Description, Query
+from aea.protocols.oef.models import Attribute, DataModel, Description, Query, ConstraintExpr, And, Or, Not, \
+    Constraint, ConstraintType, ConstraintTypes, ATTRIBUTE_TYPES
 
 """default 'to' field for OEF envelopes."""
 DEFAULT_OEF = "oef"
 
+"""the number of decoded data models kept in cache. The decoded messages share them."""
+DATA_MODEL_CACHE_SIZE = 256
+
+_UINT8 = struct.Struct("!B")
+_UINT32 = struct.Struct("!I")
+_INT64 = struct.Struct("!q")
+_DOUBLE = struct.Struct("!d")
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+_UINT32_MAX = 2 ** 32 - 1
+
+# tags of the values
+_NONE = b"\x00"
+_FALSE = b"\x01"
+_TRUE = b"\x02"
+_INT = b"\x03"
+_BIGINT = b"\x04"
+_FLOAT = b"\x05"
+_STR = b"\x06"
+_BYTES = b"\x07"
+_LIST = b"\x08"
+_TUPLE = b"\x09"
+_SET = b"\x0a"
+_DICT = b"\x0b"
+_DATA_MODEL = b"\x0c"
+_DESCRIPTION = b"\x0d"
+_QUERY = b"\x0e"
+_RANKED_QUERY = b"\x0f"
+
+# kinds of the constraint expressions
+_AND = 0
+_OR = 1
+_NOT = 2
+_CONSTRAINT = 3
+
+_ATTRIBUTE_TYPE_TO_CODE = {bool: 0, int: 1, float: 2, str: 3}  # type: Dict[Type[ATTRIBUTE_TYPES], int]
+_CODE_TO_ATTRIBUTE_TYPE = {code: type_ for type_, code in _ATTRIBUTE_TYPE_TO_CODE.items()}
+_CODE_TO_CONSTRAINT_TYPE = list(ConstraintTypes)
+_CONSTRAINT_TYPE_TO_CODE = {type_: code for code, type_ in enumerate(_CODE_TO_CONSTRAINT_TYPE)}
+
+
+class _Writer:
+    """
+    Accumulate the encoded parts of an object.
+
+    Strings are written once: the next occurrences are references to the first one.
+    """
+
+    __slots__ = ("parts", "strings")
+
+    def __init__(self):
+        """Initialize the writer."""
+        self.parts = []  # type: List[bytes]
+        self.strings = {}  # type: Dict[str, int]
+
+    def write_uint8(self, value: int) -> None:
+        """Write an unsigned 8-bit integer."""
+        self.parts.append(_UINT8.pack(value))
+
+    def write_uint32(self, value: int) -> None:
+        """Write an unsigned 32-bit integer."""
+        self.parts.append(_UINT32.pack(value))
+
+    def write_str(self, value: str) -> None:
+        """Write a string: either (length << 1) and its UTF-8 encoding, or (index << 1) | 1 for a string already written."""
+        index = self.strings.get(value)
+        if index is not None:
+            self.parts.append(_UINT32.pack(index << 1 | 1))
+        else:
+            self.strings[value] = len(self.strings)
+            encoded = value.encode("utf-8")
+            self.parts.append(_UINT32.pack(len(encoded) << 1))
+            self.parts.append(encoded)
+
+    def getvalue(self) -> bytes:
+        """Get the encoded bytes."""
+        return b"".join(self.parts)
+
+
+class _Reader:
+    """Read the encoded parts of an object, from the start of a buffer."""
+
+    __slots__ = ("buffer", "offset", "strings")
+
+    def __init__(self, buffer: bytes):
+        """Initialize the reader."""
+        self.buffer = buffer
+        self.offset = 0
+        self.strings = []  # type: List[str]
+
+    def read_uint8(self) -> int:
+        """Read an unsigned 8-bit integer."""
+        value = self.buffer[self.offset]
+        self.offset += 1
+        return value
+
+    def read_uint32(self) -> int:
+        """Read an unsigned 32-bit integer."""
+        value = _UINT32.unpack_from(self.buffer, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def read_bytes(self) -> bytes:
+        """Read length-prefixed bytes."""
+        length = self.read_uint32()
+        end = self.offset + length
+        if end > len(self.buffer):
+            raise ValueError("Truncated buffer.")
+        value = self.buffer[self.offset:end]
+        self.offset = end
+        return value
+
+    def read_str(self) -> str:
+        """Read a string, or a reference to a string already read."""
+        header = _UINT32.unpack_from(self.buffer, self.offset)[0]
+        self.offset += 4
+        if header & 1:
+            return self.strings[header >> 1]
+        end = self.offset + (header >> 1)
+        if end > len(self.buffer):
+            raise ValueError("Truncated buffer.")
+        value = self.buffer[self.offset:end].decode("utf-8")
+        self.offset = end
+        self.strings.append(value)
+        return value
+
+    def check_end(self) -> None:
+        """Check that the whole buffer has been read."""
+        if self.offset != len(self.buffer):
+            raise ValueError("Unexpected trailing bytes.")
+
+
+def _write_value(writer: _Writer, value: Any) -> None:
+    """
+    Write a tagged value.
+
+    :param writer: the writer.
+    :param value: the value.
+    :return: None
+    :raises ValueError: if the type of the value is not supported.
+    """
+    parts = writer.parts
+    if value is None:
+        parts.append(_NONE)
+    elif value is True:
+        parts.append(_TRUE)
+    elif value is False:
+        parts.append(_FALSE)
+    elif isinstance(value, int):
+        if _INT64_MIN <= value <= _INT64_MAX:
+            parts.append(_INT)
+            parts.append(_INT64.pack(value))
+        else:
+            parts.append(_BIGINT)
+            writer.write_str(str(value))
+    elif isinstance(value, float):
+        parts.append(_FLOAT)
+        parts.append(_DOUBLE.pack(value))
+    elif isinstance(value, str):
+        parts.append(_STR)
+        writer.write_str(value)
+    elif isinstance(value, (bytes, bytearray)):
+        parts.append(_BYTES)
+        writer.write_uint32(len(value))
+        parts.append(bytes(value))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        parts.append(_LIST if isinstance(value, list) else _TUPLE if isinstance(value, tuple) else _SET)
+        writer.write_uint32(len(value))
+        for item in value:
+            _write_value(writer, item)
+    elif isinstance(value, dict):
+        parts.append(_DICT)
+        writer.write_uint32(len(value))
+        for key, item in value.items():
+            writer.write_str(key)
+            _write_value(writer, item)
+    elif isinstance(value, DataModel):
+        parts.append(_DATA_MODEL)
+        _write_data_model(writer, value)
+    elif isinstance(value, Description):
+        parts.append(_DESCRIPTION)
+        _write_description(writer, value)
+    elif isinstance(value, Query) and value.order_by is None and value.limit is None:
+        parts.append(_QUERY)
+        _write_query(writer, value)
+    elif isinstance(value, Query):
+        parts.append(_RANKED_QUERY)
+        _write_ranked_query(writer, value)
+    else:
+        raise ValueError("Cannot encode value of type {}.".format(type(value)))
+
+
+def _read_value(reader: _Reader) -> Any:
+    """
+    Read a tagged value.
+
+    :param reader: the reader.
+    :return: the value.
+    :raises ValueError: if the tag is not known.
+    """
+    tag = reader.read_uint8()
+    try:
+        read = _VALUE_READERS[tag]
+    except IndexError:
+        raise ValueError("Unknown value tag: {}.".format(tag))
+    return read(reader)
+
+
+def _read_int(reader: _Reader) -> int:
+    """
+    Read a 64-bit signed integer.
+
+    :param reader: the reader.
+    :return: the integer.
+    """
+    value = _INT64.unpack_from(reader.buffer, reader.offset)[0]
+    reader.offset += 8
+    return value
+
+
+def _read_float(reader: _Reader) -> float:
+    """
+    Read a double-precision float.
+
+    :param reader: the reader.
+    :return: the float.
+    """
+    value = _DOUBLE.unpack_from(reader.buffer, reader.offset)[0]
+    reader.offset += 8
+    return value
+
+
+def _read_list(reader: _Reader) -> List[Any]:
+    """
+    Read a list: its length, then its tagged items.
+
+    :param reader: the reader.
+    :return: the list.
+    """
+    return [_read_value(reader) for _ in range(reader.read_uint32())]
+
+
+def _read_dict(reader: _Reader) -> Dict[str, Any]:
+    """
+    Read a dictionary: its length, then its keys and tagged values.
+
+    :param reader: the reader.
+    :return: the dictionary.
+    """
+    result = {}
+    for _ in range(reader.read_uint32()):
+        key = reader.read_str()
+        result[key] = _read_value(reader)
+    return result
+
+
+def _write_attribute(writer: _Writer, attribute: Attribute) -> None:
+    """
+    Write an attribute: name, type, is_required, description.
+
+    :param writer: the writer.
+    :param attribute: the attribute.
+    :return: None
+    :raises ValueError: if the type of the attribute is not supported.
+    """
+    writer.write_str(attribute.name)
+    try:
+        writer.write_uint8(_ATTRIBUTE_TYPE_TO_CODE[attribute.type])
+    except KeyError:
+        raise ValueError("Attribute type not supported: {}.".format(attribute.type))
+    writer.write_uint8(attribute.is_required)
+    writer.write_str(attribute.description)
+
+
+def _read_attribute(reader: _Reader) -> Attribute:
+    """
+    Read an attribute.
+
+    :param reader: the reader.
+    :return: the attribute.
+    :raises ValueError: if the type of the attribute is not known.
+    """
+    name = reader.read_str()
+    try:
+        type_ = _CODE_TO_ATTRIBUTE_TYPE[reader.read_uint8()]
+    except KeyError:
+        raise ValueError("Unknown attribute type.")
+    is_required = bool(reader.read_uint8())
+    description = reader.read_str()
+    return Attribute(name, type_, is_required, description)
+
+
+def _write_data_model(writer: _Writer, data_model: DataModel) -> None:
+    """
+    Write a data model: name, description, attributes.
+
+    The data model is a self-contained length-prefixed block, with its own strings,
+    so that the decoder can cache it: the same data models are sent over and over.
+
+    :param writer: the writer.
+    :param data_model: the data model.
+    :return: None
+    :raises ValueError: if the type of an attribute is not supported.
+    """
+    model_writer = _Writer()
+    model_writer.write_str(data_model.name)
+    model_writer.write_str(data_model.description)
+    model_writer.write_uint32(len(data_model.attributes))
+    for attribute in data_model.attributes:
+        _write_attribute(model_writer, attribute)
+    model_bytes = model_writer.getvalue()
+    writer.write_uint32(len(model_bytes))
+    writer.parts.append(model_bytes)
+
+
+def _read_data_model(reader: _Reader) -> DataModel:
+    """
+    Read a data model.
+
+    A new data model is built for every decoded message, from the cached fields, so that the messages do not share it.
+
+    :param reader: the reader.
+    :return: the data model.
+    """
+    name, description, attributes = _decode_data_model(reader.read_bytes())
+    return DataModel(name, [Attribute(*attribute) for attribute in attributes], description)
+
+
+@lru_cache(maxsize=DATA_MODEL_CACHE_SIZE)
+def _decode_data_model(model_bytes: bytes) -> Tuple[str, str, Tuple[Tuple[str, Type[ATTRIBUTE_TYPES], bool, str], ...]]:
+    """
+    Decode the fields of a data model.
+
+    The result is cached, and is immutable so that it can be shared.
+
+    :param model_bytes: the block of the data model.
+    :return: the name, the description and the attributes (name, type, is_required, description).
+    :raises ValueError: if the type of an attribute is not known, or the block has trailing bytes.
+    """
+    reader = _Reader(model_bytes)
+    name = reader.read_str()
+    description = reader.read_str()
+    attributes = tuple(_read_attribute(reader) for _ in range(reader.read_uint32()))
+    reader.check_end()
+    return name, description, tuple((a.name, a.type, a.is_required, a.description) for a in attributes)
+
+
+def _write_optional_data_model(writer: _Writer, data_model: Optional[DataModel]) -> None:
+    """
+    Write an optional data model: a presence flag, then the data model.
+
+    :param writer: the writer.
+    :param data_model: the data model, or None.
+    :return: None
+    """
+    if data_model is None:
+        writer.write_uint8(0)
+    else:
+        writer.write_uint8(1)
+        _write_data_model(writer, data_model)
+
+
+def _read_optional_data_model(reader: _Reader) -> Optional[DataModel]:
+    """
+    Read an optional data model.
+
+    :param reader: the reader.
+    :return: the data model, or None.
+    """
+    return _read_data_model(reader) if reader.read_uint8() else None
+
+
+def _write_description(writer: _Writer, description: Description) -> None:
+    """
+    Write a description: values, optional data model.
+
+    :param writer: the writer.
+    :param description: the description.
+    :return: None
+    """
+    writer.write_uint32(len(description.values))
+    for key, value in description.values.items():
+        writer.write_str(key)
+        _write_value(writer, value)
+    _write_optional_data_model(writer, description.data_model)
+
+
+def _read_description(reader: _Reader) -> Description:
+    """
+    Read a description.
+
+    :param reader: the reader.
+    :return: the description.
+    """
+    values = _read_dict(reader)
+    data_model = _read_optional_data_model(reader)
+    return Description(values, data_model=data_model)
+
+
+def _write_constraint_expr(writer: _Writer, expr: ConstraintExpr) -> None:
+    """
+    Write a constraint expression: kind, then its operands.
+
+    :param writer: the writer.
+    :param expr: the constraint expression.
+    :return: None
+    :raises ValueError: if the constraint expression is not supported.
+    """
+    if isinstance(expr, Constraint):
+        writer.write_uint8(_CONSTRAINT)
+        writer.write_str(expr.attribute_name)
+        writer.write_uint8(_CONSTRAINT_TYPE_TO_CODE[expr.constraint_type.type])
+        _write_value(writer, expr.constraint_type.value)
+    elif isinstance(expr, (And, Or)):
+        writer.write_uint8(_AND if isinstance(expr, And) else _OR)
+        writer.write_uint32(len(expr.constraints))
+        for constraint in expr.constraints:
+            _write_constraint_expr(writer, constraint)
+    elif isinstance(expr, Not):
+        writer.write_uint8(_NOT)
+        _write_constraint_expr(writer, expr.constraint)
+    else:
+        raise ValueError("Constraint expression not supported: {}.".format(type(expr)))
+
+
+def _read_constraint_expr(reader: _Reader) -> ConstraintExpr:
+    """
+    Read a constraint expression.
+
+    :param reader: the reader.
+    :return: the constraint expression.
+    :raises ValueError: if the kind or the constraint type is not known.
+    """
+    kind = reader.read_uint8()
+    if kind == _CONSTRAINT:
+        attribute_name = reader.read_str()
+        try:
+            constraint_type = _CODE_TO_CONSTRAINT_TYPE[reader.read_uint8()]
+        except IndexError:
+            raise ValueError("Unknown constraint type.")
+        return Constraint(attribute_name, ConstraintType(constraint_type, _read_value(reader)))
+    elif kind == _AND:
+        return And([_read_constraint_expr(reader) for _ in range(reader.read_uint32())])
+    elif kind == _OR:
+        return Or([_read_constraint_expr(reader) for _ in range(reader.read_uint32())])
+    elif kind == _NOT:
+        return Not(_read_constraint_expr(reader))
+    raise ValueError("Unknown constraint expression kind: {}.".format(kind))
+
+
+def _write_query(writer: _Writer, query: Query) -> None:
+    """
+    Write a query: constraint expressions, optional data model.
+
+    :param writer: the writer.
+    :param query: the query.
+    :return: None
+    """
+    writer.write_uint32(len(query.constraints))
+    for constraint in query.constraints:
+        _write_constraint_expr(writer, constraint)
+    _write_optional_data_model(writer, query.model)
+
+
+def _read_query(reader: _Reader) -> Query:
+    """
+    Read a query.
+
+    :param reader: the reader.
+    :return: the query.
+    """
+    constraints = [_read_constraint_expr(reader) for _ in range(reader.read_uint32())]
+    model = _read_optional_data_model(reader)
+    return Query(constraints, model=model)
+
+
+def _write_ranked_query(writer: _Writer, query: Query) -> None:
+    """
+    Write a query with an ordering or a limit: query, optional ordering attribute, descending, limit (0 for none).
+
+    :param writer: the writer.
+    :param query: the query.
+    :return: None
+    """
+    _write_query(writer, query)
+    if query.order_by is None:
+        writer.write_uint8(0)
+    else:
+        writer.write_uint8(1)
+        writer.write_str(query.order_by)
+    writer.write_uint8(query.descending)
+    writer.write_uint32(min(query.limit, _UINT32_MAX) if query.limit is not None else 0)
+
+
+def _read_ranked_query(reader: _Reader) -> Query:
+    """
+    Read a query with an ordering or a limit.
+
+    :param reader: the reader.
+    :return: the query.
+    """
+    query = _read_query(reader)
+    query.order_by = reader.read_str() if reader.read_uint8() else None
+    query.descending = bool(reader.read_uint8())
+    query.limit = reader.read_uint32() or None
+    return query
+
+
+_VALUE_READERS = [
+    lambda reader: None,
+    lambda reader: False,
+    lambda reader: True,
+    _read_int,
+    lambda reader: int(reader.read_str()),
+    _read_float,
+    _Reader.read_str,
+    _Reader.read_bytes,
+    _read_list,
+    lambda reader: tuple(_read_list(reader)),
+    lambda reader: set(_read_list(reader)),
+    _read_dict,
+    _read_data_model,
+    _read_description,
+    _read_query,
+    _read_ranked_query,
+]  # type: List[Callable[[_Reader], Any]]
+
+
+def _encode(obj: Any) -> bytes:
+    """
+    Encode an object as a tagged value.
+
+    :param obj: the object.
+    :return: the bytes.
+    :raises ValueError: if the object cannot be encoded.
+    """
+    writer = _Writer()
+    _write_value(writer, obj)
+    return writer.getvalue()
+
+
+def _decode(obj_bytes: bytes) -> Any:
+    """
+    Decode an object encoded as a tagged value.
+
+    :param obj_bytes: the bytes.
+    :return: the object.
+    :raises ValueError: if the bytes are malformed.
+    """
+    reader = _Reader(bytes(obj_bytes))
+    try:
+        obj = _read_value(reader)
+    except ValueError:
+        raise
+    except Exception as e:
+        # e.g. a truncated buffer, an unhashable set item, or the checks of the models.
+        raise ValueError("Malformed buffer.") from e
+    reader.check_end()
+    return obj
+
+
+def encode_description(description: Description) -> bytes:
+    """
+    Encode a description, with the binary codec of the OEF serializer.
+
+    :param description: the description.
+    :return: the bytes.
+    """
+    return _encode(description)
+
+
+def decode_description(description_bytes: bytes) -> Description:
+    """
+    Decode a description, with the binary codec of the OEF serializer.
+
+    :param description_bytes: the bytes.
+    :return: the description.
+    :raises ValueError: if the bytes do not encode a description.
+    """
+    description = _decode(description_bytes)
+    if not isinstance(description, Description):
+        raise ValueError("Expected a description, got {}.".format(type(description)))
+    return description
+
+
+def encode_query(query: Query) -> bytes:
+    """
+    Encode a query, with the binary codec of the OEF serializer.
+
+    :param query: the query.
+    :return: the bytes.
+    """
+    return _encode(query)
+
+
+def decode_query(query_bytes: bytes) -> Query:
+    """
+    Decode a query, with the binary codec of the OEF serializer.
+
+    :param query_bytes: the bytes.
+    :return: the query.
+    :raises ValueError: if the bytes do not encode a query.
+    """
+    query = _decode(query_bytes)
+    if not isinstance(query, Query):
+        raise ValueError("Expected a query, got {}.".format(type(query)))
+    return query
+
 
 class OEFSerializer(Serializer):
-    """Serialization for the OEF protocol."""
+    """
+    Serialization for the OEF protocol.
+
+    The body of the message is encoded with a compact binary codec: every value is
+    prefixed by a one-byte tag, and data models, descriptions and queries are encoded
+    field by field. Unlike pickle, decoding never instantiates arbitrary classes,
+    so messages from untrusted peers are safe to decode.
+    """
 
     def encode(self, msg: Message) -> bytes:
         """
-        Decode the message.
+        Encode the message.
 
         :param msg: the message object
         :return: the bytes
@@ -47,28 +664,15 @@ class OEFSerializer(Serializer):
         new_body = copy.copy(msg.body)
         new_body["type"] = oef_type.value
 
-        if oef_type in {OEFMessage.Type.REGISTER_SERVICE, OEFMessage.Type.UNREGISTER_SERVICE}:
-            service_description = msg.body["service_description"]  # type: Description
-            service_description_bytes = base64.b64encode(pickle.dumps(service_description)).decode("utf-8")
-            new_body["service_description"] = service_description_bytes
-        elif oef_type in {OEFMessage.Type.REGISTER_AGENT, OEFMessage.Type.UNREGISTER_AGENT}:
-            agent_description = msg.body["agent_description"]  # type: Description
-            agent_description_bytes = base64.b64encode(pickle.dumps(agent_description)).decode("utf-8")
-            new_body["agent_description"] = agent_description_bytes
-        elif oef_type in {OEFMessage.Type.SEARCH_SERVICES, OEFMessage.Type.SEARCH_AGENTS}:
-            query = msg.body["query"]  # type: Query
-            query_bytes = base64.b64encode(pickle.dumps(query)).decode("utf-8")
-            new_body["query"] = query_bytes
-        elif oef_type in {OEFMessage.Type.SEARCH_RESULT}:
+        if oef_type in {OEFMessage.Type.SEARCH_RESULT}:
             # we need this cast because the "agents" field might contains
-            # the Protobuf type "RepeatedScalarContainer", which is not JSON serializable.
+            # the Protobuf type "RepeatedScalarContainer", which is not serializable.
             new_body["agents"] = list(msg.body["agents"])
         elif oef_type in {OEFMessage.Type.OEF_ERROR}:
             operation = msg.body["operation"]
-            new_body["operation"] = str(operation)
+            new_body["operation"] = OEFMessage.OEFErrorOperation(operation).value
 
-        oef_message_bytes = json.dumps(new_body).encode("utf-8")
-        return oef_message_bytes
+        return _encode(new_body)
 
     def decode(self, obj: bytes) -> Message:
         """
@@ -76,29 +680,22 @@ class OEFSerializer(Serializer):
 
         :param obj: the bytes object
         :return: the message
+        :raises ValueError: if the bytes do not encode an OEF message.
         """
-        json_msg = json.loads(obj.decode("utf-8"))
-        oef_type = OEFMessage.Type(json_msg["type"])
-        new_body = copy.copy(json_msg)
-        new_body["type"] = oef_type
-
-        if oef_type in {OEFMessage.Type.REGISTER_SERVICE, OEFMessage.Type.UNREGISTER_SERVICE}:
-            service_description_bytes = base64.b64decode(json_msg["service_description"])
-            service_description = pickle.loads(service_description_bytes)
-            new_body["service_description"] = service_description
-        elif oef_type in {OEFMessage.Type.REGISTER_AGENT, OEFMessage.Type.UNREGISTER_AGENT}:
-            agent_description_bytes = base64.b64decode(json_msg["agent_description"])
-            agent_description = pickle.loads(agent_description_bytes)
-            new_body["agent_description"] = agent_description
-        elif oef_type in {OEFMessage.Type.SEARCH_SERVICES, OEFMessage.Type.SEARCH_AGENTS}:
-            query_bytes = base64.b64decode(json_msg["query"])
-            query = pickle.loads(query_bytes)
-            new_body["query"] = query
-        elif oef_type in {OEFMessage.Type.SEARCH_RESULT}:
-            new_body["agents"] = list(json_msg["agents"])
-        elif oef_type in {OEFMessage.Type.OEF_ERROR}:
-            operation = json_msg["operation"]
-            new_body["operation"] = OEFMessage.OEFErrorOperation(int(operation))
+        new_body = _decode(obj)
+        if not isinstance(new_body, dict):
+            raise ValueError("Expected a message body, got {}.".format(type(new_body)))
+        try:
+            oef_type = OEFMessage.Type(new_body["type"])
+            new_body["type"] = oef_type
+
+            if oef_type in {OEFMessage.Type.OEF_ERROR}:
+                new_body["operation"] = OEFMessage.OEFErrorOperation(new_body["operation"])
 
-        oef_message = OEFMessage(oef_type=oef_type, body=new_body)
+            oef_message = OEFMessage(oef_type=oef_type, body=new_body)
+        except ValueError:
+            raise
+        except Exception as e:
+            # e.g. a missing field, or a field of the wrong type failing the consistency check of the message.
+            raise ValueError("Invalid OEF message: {!r}.".format(e)) from e
         return oef_message
@@ -29,6 +29,8 @@ from aea.protocols.base import Message
 class MyScaffoldMessage(Message):
     """The scaffold message class."""
 
+    __slots__ = ()
+
     protocol_id = "my_scaffold_protocol"
 
     class Type(Enum):
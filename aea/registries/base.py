@@ -19,28 +19,34 @@
 
 """This module contains registries."""
 
+import heapq
 import importlib.util
 import inspect
+import itertools
 import logging
 import os
 import pprint
 import re
+import time
 from abc import ABC, abstractmethod
 from queue import Queue
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, cast, Union
+from typing import Callable, Optional, List, Dict, Any, Sequence, Set, Tuple, cast, Union
 
 from aea.configurations.base import ProtocolId, SkillId, ProtocolConfig, DEFAULT_PROTOCOL_CONFIG_FILE
 from aea.configurations.loader import ConfigLoader
 from aea.decision_maker.messages.transaction import TransactionMessage
-from aea.protocols.base import Protocol
+from aea.helpers.base import discard_if_awaitable
+from aea.protocols.base import Message, Protocol
 from aea.skills.base import Handler, Behaviour, Task, Skill, AgentContext
+from aea.skills.tasks import TaskManager, TaskResultMessage
 
 logger = logging.getLogger(__name__)
 
 PACKAGE_NAME_REGEX = re.compile("^([A-Z0-9]|[A-Z0-9][A-Z0-9._-]*[A-Z0-9])$", re.IGNORECASE)
 INTERNAL_PROTOCOL_ID = 'internal'
 DECISION_MAKER = 'decision_maker'
+TASK_MANAGER = 'task_manager'
 
 
 class Registry(ABC):
@@ -75,7 +81,7 @@ class Registry(ABC):
         """
 
     @abstractmethod
-    def fetch_all(self) -> Optional[List[Any]]:
+    def fetch_all(self) -> Optional[Sequence[Any]]:
         """
         Fetch all the items.
 
@@ -109,6 +115,12 @@ class ProtocolRegistry(Registry):
         :return: None
         """
         self._protocols = {}  # type: Dict[ProtocolId, Protocol]
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Get the version of the registry, which changes whenever a protocol is added or removed."""
+        return self._version
 
     def register(self, ids: Tuple[ProtocolId, None], protocol: Protocol) -> None:
         """
@@ -118,10 +130,12 @@ class ProtocolRegistry(Registry):
         """
         protocol_id = ids[0]
         self._protocols[protocol_id] = protocol
+        self._version += 1
 
     def unregister(self, protocol_id: ProtocolId) -> None:
         """Unregister a protocol."""
         self._protocols.pop(protocol_id, None)
+        self._version += 1
 
     def fetch(self, protocol_id: ProtocolId) -> Optional[Protocol]:
         """
@@ -174,6 +188,7 @@ class ProtocolRegistry(Registry):
         :return: None
         """
         self._protocols = {}
+        self._version += 1
 
     def _add_protocol(self, directory: str, protocol_name: str):
         """
@@ -214,6 +229,15 @@ class HandlerRegistry(Registry):
         :return: None
         """
         self._handlers = {}  # type: Dict[ProtocolId, Dict[SkillId, Handler]]
+        # the handlers by protocol id and all the handlers, rebuilt when the handlers change.
+        self._handlers_by_protocol = {}  # type: Dict[ProtocolId, Tuple[Handler, ...]]
+        self._all_handlers = ()  # type: Tuple[Handler, ...]
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Get the version of the registry, which changes whenever a handler is added or removed."""
+        return self._version
 
     def register(self, ids: Tuple[None, SkillId], handlers: List[Handler]) -> None:
         """
@@ -229,6 +253,7 @@ class HandlerRegistry(Registry):
             if protocol_id in self._handlers.keys():
                 logger.info("More than one handler registered against protocol with id '{}'".format(protocol_id))
             self._handlers.setdefault(protocol_id, {})[skill_id] = handler
+        self._rebuild()
 
     def unregister(self, skill_id: SkillId) -> None:
         """
@@ -247,20 +272,28 @@ class HandlerRegistry(Registry):
         # clean the dictionary up
         for protocol_id in protocol_ids_to_remove:
             self._handlers.pop(protocol_id, None)
+        self._rebuild()
 
-    def fetch(self, protocol_id: ProtocolId) -> Optional[List[Handler]]:
+    def _rebuild(self) -> None:
+        """
+        Rebuild the tuples of handlers returned by fetch and fetch_all, and bump the version of the registry.
+
+        :return: None
+        """
+        self._handlers_by_protocol = {protocol_id: tuple(skill_id_to_handler_dict.values())
+                                      for protocol_id, skill_id_to_handler_dict in self._handlers.items()}
+        self._all_handlers = tuple(handler for handlers in self._handlers_by_protocol.values() for handler in handlers)
+        self._version += 1
+
+    def fetch(self, protocol_id: ProtocolId) -> Optional[Tuple[Handler, ...]]:
         """
         Fetch the handlers for the protocol_id.
 
         :param protocol_id: the protocol id
-        :return: the list of handlers registered for the protocol_id
+        :return: the tuple of handlers registered for the protocol_id
         """
-        result = self._handlers.get(protocol_id, None)
-        if result is None:
-            return None
-        else:
-            # TODO: introduce a filter class which intelligently selects the appropriate handler.
-            return [handler for handler in result.values()]
+        # TODO: introduce a filter class which intelligently selects the appropriate handler.
+        return self._handlers_by_protocol.get(protocol_id, None)
 
     def fetch_by_skill(self, protocol_id: ProtocolId, skill_id: SkillId) -> Optional[Handler]:
         """
@@ -272,26 +305,24 @@ class HandlerRegistry(Registry):
         """
         return self._handlers.get(protocol_id, {}).get(skill_id, None)
 
-    def fetch_all(self) -> List[Handler]:
+    def fetch_all(self) -> Tuple[Handler, ...]:
         """
         Fetch all the handlers.
 
-        :return: the list of handlers.
+        :return: the tuple of handlers.
         """
-        result = []
-        for skill_id_to_handler_dict in self._handlers.values():
-            for handler in skill_id_to_handler_dict.values():
-                result.append(handler)
-        return result
+        return self._all_handlers
 
-    def fetch_internal_handler(self, skill_id: SkillId) -> Optional[Handler]:
+    def fetch_internal_handler(self, skill_id: SkillId, protocol_id: ProtocolId = INTERNAL_PROTOCOL_ID) -> Optional[Handler]:
         """
         Fetch the internal handler.
 
         :param skill_id: the skill id
+        :param protocol_id: the protocol id of the internal messages, i.e. 'internal' for the messages of the decision maker
+                            | and 'task' for the results of the tasks.
         :return: the internal handler registered for the skill id
         """
-        return self._handlers.get(INTERNAL_PROTOCOL_ID, {}).get(skill_id, None)
+        return self._handlers.get(protocol_id, {}).get(skill_id, None)
 
     def setup(self) -> None:
         """
@@ -315,6 +346,7 @@ class HandlerRegistry(Registry):
                 for handler in skill_id_to_handler_dict.values():
                     handler.teardown()
         self._handlers = {}
+        self._rebuild()
 
 
 class BehaviourRegistry(Registry):
@@ -326,7 +358,8 @@ class BehaviourRegistry(Registry):
 
         :return: None
         """
-        self._behaviours = {}  # type: Dict[SkillId, List[Behaviour]]
+        self._behaviours = {}  # type: Dict[SkillId, Tuple[Behaviour, ...]]
+        self._all_behaviours = ()  # type: Tuple[Behaviour, ...]
 
     def register(self, ids: Tuple[None, SkillId], behaviours: List[Behaviour]) -> None:
         """
@@ -339,7 +372,8 @@ class BehaviourRegistry(Registry):
         skill_id = ids[1]
         if skill_id in self._behaviours.keys():
             logger.warning("Behaviours already registered with skill id '{}'".format(skill_id))
-        self._behaviours.setdefault(skill_id, []).extend(behaviours)
+        self._behaviours[skill_id] = self._behaviours.get(skill_id, ()) + tuple(behaviours)
+        self._rebuild()
 
     def unregister(self, skill_id: SkillId) -> None:
         """
@@ -349,18 +383,27 @@ class BehaviourRegistry(Registry):
         :return: None
         """
         self._behaviours.pop(skill_id, None)
+        self._rebuild()
 
-    def fetch(self, skill_id: SkillId) -> Optional[List[Behaviour]]:
+    def _rebuild(self) -> None:
         """
-        Return a behaviour.
+        Rebuild the tuple of behaviours returned by fetch_all.
 
-        :return: the list of behaviours
+        :return: None
+        """
+        self._all_behaviours = tuple(behaviour for skill_behaviours in self._behaviours.values() for behaviour in skill_behaviours)
+
+    def fetch(self, skill_id: SkillId) -> Optional[Tuple[Behaviour, ...]]:
+        """
+        Return the behaviours of a skill.
+
+        :return: the tuple of behaviours
         """
         return self._behaviours.get(skill_id, None)
 
-    def fetch_all(self) -> List[Behaviour]:
+    def fetch_all(self) -> Tuple[Behaviour, ...]:
         """Fetch all the behaviours."""
-        return [b for skill_behaviours in self._behaviours.values() for b in skill_behaviours]
+        return self._all_behaviours
 
     def setup(self) -> None:
         """
@@ -382,6 +425,7 @@ class BehaviourRegistry(Registry):
             for behaviour in behaviours:
                 behaviour.teardown()
         self._behaviours = {}
+        self._rebuild()
 
 
 class TaskRegistry(Registry):
@@ -393,7 +437,9 @@ class TaskRegistry(Registry):
 
         :return: None
         """
-        self._tasks = {}  # type: Dict[SkillId, List[Task]]
+        self._tasks = {}  # type: Dict[SkillId, Tuple[Task, ...]]
+        self._all_tasks = ()  # type: Tuple[Task, ...]
+        self._skill_id_by_task = {}  # type: Dict[Task, SkillId]
 
     def register(self, ids: Tuple[None, SkillId], tasks: List[Task]) -> None:
         """
@@ -406,7 +452,8 @@ class TaskRegistry(Registry):
         skill_id = ids[1]
         if skill_id in self._tasks.keys():
             logger.warning("Tasks already registered with skill id '{}'".format(skill_id))
-        self._tasks.setdefault(skill_id, []).extend(tasks)
+        self._tasks[skill_id] = self._tasks.get(skill_id, ()) + tuple(tasks)
+        self._rebuild()
 
     def unregister(self, skill_id: SkillId) -> None:
         """
@@ -416,22 +463,41 @@ class TaskRegistry(Registry):
         :return: None
         """
         self._tasks.pop(skill_id, None)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """
+        Rebuild the tuple of tasks returned by fetch_all, and the skill id lookup of the tasks.
+
+        :return: None
+        """
+        self._all_tasks = tuple(task for skill_tasks in self._tasks.values() for task in skill_tasks)
+        self._skill_id_by_task = {task: skill_id for skill_id, skill_tasks in self._tasks.items() for task in skill_tasks}
 
-    def fetch(self, skill_id: SkillId) -> Optional[List[Task]]:
+    def fetch(self, skill_id: SkillId) -> Optional[Tuple[Task, ...]]:
         """
-        Return a task.
+        Return the tasks of a skill.
 
-        :return: the list of tasks
+        :return: the tuple of tasks
         """
         return self._tasks.get(skill_id, None)
 
-    def fetch_all(self) -> List[Task]:
+    def fetch_all(self) -> Tuple[Task, ...]:
+        """
+        Return the tasks for processing.
+
+        :return: a tuple of tasks.
+        """
+        return self._all_tasks
+
+    def fetch_skill_id(self, task: Task) -> Optional[SkillId]:
         """
-        Return a list of tasks for processing.
+        Return the id of the skill of a task.
 
-        :return: a list of tasks.
+        :param task: the task.
+        :return: the skill id, or None if the task is not registered.
         """
-        return [t for skill_tasks in self._tasks.values() for t in skill_tasks]
+        return self._skill_id_by_task.get(task, None)
 
     def setup(self) -> None:
         """
@@ -453,6 +519,7 @@ class TaskRegistry(Registry):
             for task in tasks:
                 task.teardown()
         self._tasks = {}
+        self._rebuild()
 
 
 class Resources(object):
@@ -545,18 +612,111 @@ class Resources(object):
             r.teardown()
 
 
+class _Scheduler:
+    """
+    Select the behaviours or tasks to run on a tick.
+
+    The items without a schedule run on every tick. The scheduled items are kept in a heap
+    ordered by due time, so that a tick only touches the items which are due.
+    """
+
+    def __init__(self, clock: Callable[[], float]):
+        """
+        Initialize the scheduler.
+
+        :param clock: the clock, in seconds since the epoch.
+        """
+        self._clock = clock
+        self._items = ()  # type: Tuple[Any, ...]
+        self._unscheduled = ()  # type: Tuple[Any, ...]
+        self._heap = []  # type: List[Tuple[float, int, Any]]
+        self._due_times = {}  # type: Dict[Any, float]
+        self._done = set()  # type: Set[Any]
+        self._counter = itertools.count()
+
+    def _rebuild(self, items: Tuple[Any, ...]) -> None:
+        """
+        Rebuild the heap for new items, keeping the due times of the items already scheduled.
+
+        :param items: the items.
+        :return: None
+        """
+        now = self._clock()
+        unscheduled = tuple(item for item in items if item.schedule is None)
+        self._unscheduled = items if len(unscheduled) == len(items) else unscheduled
+        due_times = {}  # type: Dict[Any, float]
+        for item in items:
+            if item.schedule is None or item in self._done:
+                continue
+            due_time = self._due_times.get(item, None)
+            due_times[item] = due_time if due_time is not None else item.schedule.first(now)
+        self._done &= set(items)
+        self._due_times = due_times
+        self._heap = [(due_time, next(self._counter), item) for item, due_time in due_times.items()]
+        heapq.heapify(self._heap)
+        self._items = items
+
+    def due(self, items: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """
+        Get the items to run now.
+
+        :param items: all the items, as returned by the registry.
+        :return: the items without a schedule, followed by the scheduled items which are due.
+        """
+        if items is not self._items:
+            self._rebuild(items)
+        heap = self._heap
+        if not heap:
+            return self._unscheduled
+        now = self._clock()
+        if heap[0][0] > now:
+            return self._unscheduled
+        due = []
+        while heap and heap[0][0] <= now:
+            due_time, _, item = heapq.heappop(heap)
+            due.append(item)
+            next_due_time = item.schedule.next(due_time, now)
+            if next_due_time is None:
+                del self._due_times[item]
+                self._done.add(item)
+            else:
+                self._due_times[item] = next_due_time
+                heapq.heappush(heap, (next_due_time, next(self._counter), item))
+        return self._unscheduled + tuple(due)
+
+    def next_due_time(self, items: Tuple[Any, ...]) -> Optional[float]:
+        """
+        Get the earliest time at which an item is due.
+
+        :param items: all the items, as returned by the registry.
+        :return: now if some items have no schedule, the due time of the first scheduled item otherwise, or None if no item is due.
+        """
+        if items is not self._items:
+            self._rebuild(items)
+        if self._unscheduled:
+            return self._clock()
+        return self._heap[0][0] if self._heap else None
+
+
 class Filter(object):
     """This class implements the filter of an AEA."""
 
-    def __init__(self, resources: Resources, decision_maker_out_queue: Queue):
+    def __init__(self, resources: Resources, decision_maker_out_queue: Queue, clock: Callable[[], float] = time.time,
+                 task_manager: Optional[TaskManager] = None):
         """
         Instantiate the filter.
 
         :param resources: the resources
         :param decision_maker_out_queue: the decision maker queue
+        :param clock: the clock of the schedules of the behaviours and tasks, in seconds since the epoch.
+        :param task_manager: the manager which runs the tasks. Its results are handled as internal messages.
         """
         self._resources = resources
         self._decision_maker_out_queue = decision_maker_out_queue
+        self._clock = clock
+        self._task_manager = task_manager if task_manager is not None else TaskManager()
+        self._behaviour_scheduler = _Scheduler(clock)
+        self._task_scheduler = _Scheduler(clock)
         # TODO: self._inactive_handlers = {}  # type: Dict[SkillId, List[HandlerId]]
         # TODO: self._inactive_behaviours = {}  # type: Dict[SkillId, List[BehaviourId]]
         # TODO: self._inactive_tasks = {}  # type: Dict[SkillId, List[TaskId]]
@@ -571,47 +731,94 @@ class Filter(object):
         """Get decision maker (out) queue."""
         return self._decision_maker_out_queue
 
-    def get_active_handlers(self, protocol_id: str) -> Optional[List[Handler]]:
+    @property
+    def task_manager(self) -> TaskManager:
+        """Get the task manager."""
+        return self._task_manager
+
+    def get_active_handlers(self, protocol_id: str) -> Optional[Tuple[Handler, ...]]:
         """
         Get active handlers.
 
         :param protocol_id: the protocol id
-        :return: list of handlers
+        :return: tuple of handlers
         """
         handlers = self.resources.handler_registry.fetch(protocol_id)
         # TODO: add option for advanced filtering, currently each handler independently acts on the message
         return handlers
 
-    def get_active_tasks(self) -> List[Task]:
+    def get_active_tasks(self) -> Tuple[Task, ...]:
         """
         Get the active tasks.
 
-        :return: the list of tasks currently active
+        The tasks with a schedule are only active when they are due.
+
+        :return: the tuple of tasks currently active
         """
-        tasks = self.resources.task_registry.fetch_all()
         # TODO: add filtering, remove inactive tasks
-        return tasks
+        return self._task_scheduler.due(self.resources.task_registry.fetch_all())
 
-    def get_active_behaviours(self) -> List[Behaviour]:
+    def get_active_behaviours(self) -> Tuple[Behaviour, ...]:
         """
         Get the active behaviours.
 
-        :return: the list of behaviours currently active
+        The behaviours with a schedule are only active when they are due.
+
+        :return: the tuple of behaviours currently active
         """
-        behaviours = self.resources.behaviour_registry.fetch_all()
         # TODO: add filtering, remove inactive behaviours
-        return behaviours
+        return self._behaviour_scheduler.due(self.resources.behaviour_registry.fetch_all())
+
+    def get_next_due_delay(self) -> Optional[float]:
+        """
+        Get the time until the next behaviour or task is due.
 
-    def handle_internal_messages(self) -> None:
+        The behaviours and tasks without a schedule are always due.
+
+        :return: the delay in seconds (0.0 if some are due now), or None if no behaviour or task will be due.
+        """
+        due_times = [due_time for due_time in (
+            self._behaviour_scheduler.next_due_time(self.resources.behaviour_registry.fetch_all()),
+            self._task_scheduler.next_due_time(self.resources.task_registry.fetch_all()),
+        ) if due_time is not None]
+        if not due_times:
+            return None
+        return max(0.0, min(due_times) - self._clock())
+
+    def handle_internal_messages(self, dispatch: Optional[Callable[[Handler, Message, str], None]] = None) -> None:
         """
-        Handle the messages from the decision maker.
+        Handle the messages from the decision maker and the results of the tasks.
 
+        :param dispatch: the function which calls a handler with an internal message and its sender, e.g. to schedule
+                         | the coroutine of an async handler. By default, the handler is called, and a returned awaitable is discarded.
         :return: None
         """
+        if dispatch is None:
+            dispatch = self._dispatch_internal_message
         while not self.decision_maker_out_queue.empty():
             tx_message = self.decision_maker_out_queue.get_nowait()  # type: Optional[TransactionMessage]
             if tx_message is not None:
                 skill_id = cast(str, tx_message.get("skill_id"))
                 handler = self.resources.handler_registry.fetch_internal_handler(skill_id)
                 if handler is not None:
-                    handler.handle(tx_message, DECISION_MAKER)
+                    dispatch(handler, tx_message, DECISION_MAKER)
+        while not self.task_manager.completed.empty():
+            task, future = self.task_manager.completed.get_nowait()
+            result_message = self.task_manager.get_result_message(task, future)
+            task_skill_id = self.resources.task_registry.fetch_skill_id(task)
+            handler = self.resources.handler_registry.fetch_internal_handler(task_skill_id, TaskResultMessage.protocol_id) \
+                if task_skill_id is not None else None
+            if handler is not None:
+                dispatch(handler, result_message, TASK_MANAGER)
+
+    @staticmethod
+    def _dispatch_internal_message(handler: Handler, message: Message, sender: str) -> None:
+        """
+        Call a handler with an internal message, discarding the awaitable of an async handler.
+
+        :param handler: the handler.
+        :param message: the internal message.
+        :param sender: the sender of the message.
+        :return: None
+        """
+        discard_if_awaitable(handler.handle(message, sender), handler)
@@ -26,7 +26,8 @@ import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
 from queue import Queue
-from typing import Optional, List, Dict, Any, cast
+from types import ModuleType
+from typing import Optional, List, Dict, Any, Mapping, Tuple, Callable, cast
 
 from aea.connections.base import ConnectionStatus
 from aea.configurations.base import BehaviourConfig, HandlerConfig, TaskConfig, SharedClassConfig, SkillConfig, \
@@ -36,11 +37,39 @@ from aea.context.base import AgentContext
 from aea.crypto.ledger_apis import LedgerApis
 from aea.decision_maker.base import OwnershipState, Preferences, GoalPursuitReadiness
 from aea.mail.base import OutBox
-from aea.protocols.base import Message
+from aea.protocols.base import Message, Serializer
+from aea.skills.schedule import Schedule
+from aea.skills.tasks import TaskExecutorType, TaskManager, register_skill_package
 
 logger = logging.getLogger(__name__)
 
 
+def _load_module(path: str, default_name: str, package_name: Optional[str] = None) -> ModuleType:
+    """
+    Load a module of a skill from its file.
+
+    If the package of the skill is given, the module is registered in sys.modules as a submodule
+    of the package, so that its functions and classes can be pickled, e.g. for the process executor of the tasks.
+
+    :param path: the path to the module.
+    :param default_name: the name of the module when the package is not given.
+    :param package_name: the name of the package of the skill, if any.
+    :return: the module.
+    """
+    module_name = "{}.{}".format(package_name, Path(path).stem) if package_name is not None else default_name
+    spec = importlib.util.spec_from_file_location(module_name, location=path)
+    module = importlib.util.module_from_spec(spec)
+    if package_name is not None:
+        sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)  # type: ignore
+    except BaseException:
+        if sys.modules.get(module_name, None) is module:
+            del sys.modules[module_name]
+        raise
+    return module
+
+
 class SkillContext:
     """This class implements the context of a skill."""
 
@@ -119,6 +148,30 @@ class SkillContext:
         """Get ledger APIs."""
         return self._agent_context.ledger_apis
 
+    @property
+    def serializers(self) -> Mapping[str, Serializer]:
+        """
+        Get the serializers of the agent's protocols, by protocol id.
+
+        The instances are shared with the agent, e.g. self.context.serializers["fipa"].encode(msg).
+        """
+        return self._agent_context.serializers
+
+    @property
+    def task_manager(self) -> TaskManager:
+        """
+        Get the manager which runs the tasks on their executors.
+
+        For instance, self.context.task_manager.cancel(task) cancels the executions of a task not started yet.
+        """
+        return self._agent_context.task_manager
+
+    @property
+    def max_concurrency(self) -> Optional[int]:
+        """Get the maximum number of coroutines of the skill's handlers and behaviours running at the same time."""
+        assert self._skill is not None, "Skill not initialized."
+        return self._skill.config.max_concurrency
+
     @property
     def handlers(self) -> Optional[List['Handler']]:
         """Get handlers of the skill."""
@@ -150,9 +203,11 @@ class Behaviour(ABC):
         Initialize a behaviour.
 
         :param skill_context: the skill context
+        :param schedule: the schedule of the behaviour. If None, it acts on every tick.
         :param kwargs: keyword arguments
         """
         self._context = kwargs.pop('skill_context')  # type: SkillContext
+        self._schedule = kwargs.pop('schedule', None)  # type: Optional[Schedule]
         self._config = kwargs
 
     @property
@@ -160,6 +215,11 @@ class Behaviour(ABC):
         """Get the context of the behaviour."""
         return self._context
 
+    @property
+    def schedule(self) -> Optional[Schedule]:
+        """Get the schedule of the behaviour."""
+        return self._schedule
+
     @property
     def config(self) -> Dict[Any, Any]:
         """Get the config of the behaviour."""
@@ -190,19 +250,19 @@ class Behaviour(ABC):
         """
 
     @classmethod
-    def parse_module(cls, path: str, behaviours_configs: List[BehaviourConfig], skill_context: SkillContext) -> List['Behaviour']:
+    def parse_module(cls, path: str, behaviours_configs: List[BehaviourConfig], skill_context: SkillContext,
+                     package_name: Optional[str] = None) -> List['Behaviour']:
         """
         Parse the behaviours module.
 
         :param path: path to the Python module containing the Behaviour classes.
         :param behaviours_configs: a list of behaviour configurations.
         :param skill_context: the skill context
+        :param package_name: the name of the package of the skill, to register the module in (see _load_module).
         :return: a list of Behaviour.
         """
         behaviours = []
-        behaviours_spec = importlib.util.spec_from_file_location("behaviours", location=path)
-        behaviour_module = importlib.util.module_from_spec(behaviours_spec)
-        behaviours_spec.loader.exec_module(behaviour_module)  # type: ignore
+        behaviour_module = _load_module(path, "behaviours", package_name)
         classes = inspect.getmembers(behaviour_module, inspect.isclass)
         behaviours_classes = list(filter(lambda x: re.match("\\w+Behaviour", x[0]), classes))
 
@@ -217,6 +277,8 @@ class Behaviour(ABC):
                 args = behaviour_config.args
                 assert 'skill_context' not in args.keys(), "'skill_context' is a reserved key. Please rename your arguments!"
                 args['skill_context'] = skill_context
+                if behaviour_config.schedule is not None:
+                    args['schedule'] = Schedule.from_json(behaviour_config.schedule)
                 behaviour = behaviour_class(**args)
                 behaviours.append(behaviour)
 
@@ -275,19 +337,19 @@ class Handler(ABC):
         """
 
     @classmethod
-    def parse_module(cls, path: str, handler_configs: List[HandlerConfig], skill_context: SkillContext) -> List['Handler']:
+    def parse_module(cls, path: str, handler_configs: List[HandlerConfig], skill_context: SkillContext,
+                     package_name: Optional[str] = None) -> List['Handler']:
         """
         Parse the handler module.
 
         :param path: path to the Python module containing the Handler class.
         :param handler_configs: the list of handler configurations.
         :param skill_context: the skill context
+        :param package_name: the name of the package of the skill, to register the module in (see _load_module).
         :return: an handler, or None if the parsing fails.
         """
         handlers = []
-        handler_spec = importlib.util.spec_from_file_location("handlers", location=path)
-        handler_module = importlib.util.module_from_spec(handler_spec)
-        handler_spec.loader.exec_module(handler_module)  # type: ignore
+        handler_module = _load_module(path, "handlers", package_name)
         classes = inspect.getmembers(handler_module, inspect.isclass)
         handler_classes = list(filter(lambda x: re.match("\\w+Handler", x[0]), classes))
 
@@ -316,9 +378,16 @@ class Task(ABC):
         Initialize a task.
 
         :param skill_context: the skill context
+        :param schedule: the schedule of the task. If None, it is executed on every tick.
+        :param executor: the executor of the task (a TaskExecutorType or its value). If None, the task runs inline.
+        :param max_concurrency: the maximum number of executions of the task in flight. If None, one.
         :param kwargs: keyword arguments.
         """
         self._context = kwargs.pop('skill_context')  # type: SkillContext
+        self._schedule = kwargs.pop('schedule', None)  # type: Optional[Schedule]
+        self._executor = TaskExecutorType(kwargs.pop('executor', None) or TaskExecutorType.INLINE)
+        self._max_concurrency = kwargs.pop('max_concurrency', None) or 1  # type: int
+        assert self._max_concurrency >= 1, "The maximum concurrency of a task must be at least one."
         self._config = kwargs
 
     @property
@@ -326,18 +395,54 @@ class Task(ABC):
         """Get the context of the task."""
         return self._context
 
+    @property
+    def schedule(self) -> Optional[Schedule]:
+        """Get the schedule of the task."""
+        return self._schedule
+
+    @property
+    def executor(self) -> TaskExecutorType:
+        """Get the executor of the task."""
+        return self._executor
+
+    @property
+    def max_concurrency(self) -> int:
+        """Get the maximum number of executions of the task in flight."""
+        return self._max_concurrency
+
     @property
     def config(self) -> Dict[Any, Any]:
         """Get the config of the task."""
         return self._config
 
     @abstractmethod
-    def execute(self) -> None:
+    def execute(self) -> Any:
         """
         Run the task logic.
 
-        :return: None
+        If the task does not run inline, the returned value is delivered to the handler of the skill
+        for the 'task' protocol, as a TaskResultMessage.
+
+        :return: the result of the task, if any.
+        """
+
+    def job(self) -> Tuple[Callable, Tuple]:
         """
+        Get the function and the arguments which a thread or process executor runs.
+
+        On the process executor, the function and the arguments are pickled for the worker processes,
+        which import the modules of the skills from their files (see TaskManager). The task itself
+        is pickled without its skill context: executed in a worker process, its context is None.
+
+        :return: the function and its arguments.
+        """
+        return self.execute, ()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get the state of the task to pickle, without the skill context which holds the agent's resources."""
+        state = self.__dict__.copy()
+        state["_context"] = None
+        return state
 
     @abstractmethod
     def setup(self) -> None:
@@ -356,19 +461,19 @@ class Task(ABC):
         """
 
     @classmethod
-    def parse_module(cls, path: str, tasks_configs: List[TaskConfig], skill_context: SkillContext) -> List['Task']:
+    def parse_module(cls, path: str, tasks_configs: List[TaskConfig], skill_context: SkillContext,
+                     package_name: Optional[str] = None) -> List['Task']:
         """
         Parse the tasks module.
 
         :param path: path to the Python module containing the Task classes.
         :param tasks_configs: a list of tasks configurations.
         :param skill_context: the skill context
+        :param package_name: the name of the package of the skill, to register the module in (see _load_module).
         :return: a list of Tasks.
         """
         tasks = []
-        tasks_spec = importlib.util.spec_from_file_location("tasks", location=path)
-        task_module = importlib.util.module_from_spec(tasks_spec)
-        tasks_spec.loader.exec_module(task_module)  # type: ignore
+        task_module = _load_module(path, "tasks", package_name)
         classes = inspect.getmembers(task_module, inspect.isclass)
         tasks_classes = list(filter(lambda x: re.match("\\w+Task", x[0]), classes))
 
@@ -383,6 +488,12 @@ class Task(ABC):
                 args = task_config.args
                 assert 'skill_context' not in args.keys(), "'skill_context' is a reserved key. Please rename your arguments!"
                 args['skill_context'] = skill_context
+                if task_config.schedule is not None:
+                    args['schedule'] = Schedule.from_json(task_config.schedule)
+                if task_config.executor is not None:
+                    args['executor'] = task_config.executor
+                if task_config.max_concurrency is not None:
+                    args['max_concurrency'] = task_config.max_concurrency
                 task = task_class(**args)
                 tasks.append(task)
 
@@ -413,13 +524,15 @@ class SharedClass(ABC):
         return self._config
 
     @classmethod
-    def parse_module(cls, path: str, shared_classes_configs: List[SharedClassConfig], skill_context: SkillContext) -> List['SharedClass']:
+    def parse_module(cls, path: str, shared_classes_configs: List[SharedClassConfig], skill_context: SkillContext,
+                     package_name: Optional[str] = None) -> List['SharedClass']:
         """
         Parse the tasks module.
 
         :param path: path to the Python skill module.
         :param shared_classes_configs: a list of shared class configurations.
         :param skill_context: the skill context
+        :param package_name: the name of the package of the skill, to register the modules in (see _load_module).
         :return: a list of SharedClass.
         """
         instances = []
@@ -435,9 +548,7 @@ class SharedClass(ABC):
         for module_path in module_paths:
             logger.debug("Trying to load module {}".format(module_path))
             module_name = module_path.replace(".py", "")
-            shared_class_spec = importlib.util.spec_from_file_location(module_name, location=module_path)
-            shared_class_module = importlib.util.module_from_spec(shared_class_spec)
-            shared_class_spec.loader.exec_module(shared_class_module)  # type: ignore
+            shared_class_module = _load_module(module_path, module_name, package_name)
             classes = inspect.getmembers(shared_class_module, inspect.isclass)
             filtered_classes = list(
                 filter(
@@ -502,9 +613,12 @@ class Skill:
         # check if there is the config file. If not, then return None.
         skill_loader = ConfigLoader("skill-config_schema.json", SkillConfig)
         skill_config = skill_loader.load(open(os.path.join(directory, DEFAULT_SKILL_CONFIG_FILE)))
-        skills_spec = importlib.util.spec_from_file_location(skill_config.name, os.path.join(directory, "__init__.py"))
+        package_name = skill_config.name + "_skill"
+        skills_spec = importlib.util.spec_from_file_location(package_name, os.path.join(directory, "__init__.py"),
+                                                             submodule_search_locations=[directory])
         skill_module = importlib.util.module_from_spec(skills_spec)
-        sys.modules[skill_config.name + "_skill"] = skill_module
+        sys.modules[package_name] = skill_module
+        register_skill_package(package_name, directory)
         loader_contents = [path.name for path in Path(directory).iterdir()]
         skills_packages = list(filter(lambda x: not x.startswith("__"), loader_contents))  # type: ignore
         logger.debug("Processing the following skill package: {}".format(skills_packages))
@@ -514,28 +628,28 @@ class Skill:
         handlers_by_id = skill_config.handlers.read_all()
         if len(handlers_by_id) > 0:
             handlers_configurations = list(dict(handlers_by_id).values())
-            handlers = Handler.parse_module(os.path.join(directory, "handlers.py"), handlers_configurations, skill_context)
+            handlers = Handler.parse_module(os.path.join(directory, "handlers.py"), handlers_configurations, skill_context, package_name)
         else:
             handlers = []
 
         behaviours_by_id = skill_config.behaviours.read_all()
         if len(behaviours_by_id) > 0:
             behaviours_configurations = list(dict(behaviours_by_id).values())
-            behaviours = Behaviour.parse_module(os.path.join(directory, "behaviours.py"), behaviours_configurations, skill_context)
+            behaviours = Behaviour.parse_module(os.path.join(directory, "behaviours.py"), behaviours_configurations, skill_context, package_name)
         else:
             behaviours = []
 
         tasks_by_id = skill_config.tasks.read_all()
         if len(tasks_by_id) > 0:
             tasks_configurations = list(dict(tasks_by_id).values())
-            tasks = Task.parse_module(os.path.join(directory, "tasks.py"), tasks_configurations, skill_context)
+            tasks = Task.parse_module(os.path.join(directory, "tasks.py"), tasks_configurations, skill_context, package_name)
         else:
             tasks = []
 
         shared_classes_by_id = skill_config.shared_classes.read_all()
         if len(shared_classes_by_id) > 0:
             shared_classes_configurations = list(dict(shared_classes_by_id).values())
-            shared_classes_instances = SharedClass.parse_module(directory, shared_classes_configurations, skill_context)
+            shared_classes_instances = SharedClass.parse_module(directory, shared_classes_configurations, skill_context, package_name)
         else:
             shared_classes_instances = []
 
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the schedules of the behaviours and tasks."""
+import datetime
+from typing import Any, Dict, FrozenSet, Optional
+
+# the name and the bounds of the fields of a cron expression. Both 0 and 7 are Sunday.
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_cron_field(field: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    """
+    Parse a field of a cron expression.
+
+    It supports '*', values, ranges 'a-b', steps '*/n' and 'a-b/n', and lists of them separated by commas.
+
+    :param field: the field.
+    :param name: the name of the field, for the error messages.
+    :param low: the lowest value of the field.
+    :param high: the highest value of the field.
+    :return: the values matched by the field.
+    :raises ValueError: if the field is not valid.
+    """
+    values = set()
+    for item in field.split(","):
+        range_, _, step = item.partition("/")
+        try:
+            if range_ == "*":
+                start, end = low, high
+            elif "-" in range_:
+                start, end = (int(bound) for bound in range_.split("-", 1))
+            else:
+                start = end = int(range_)
+                if step:
+                    end = high
+            step_value = int(step) if step else 1
+        except ValueError:
+            raise ValueError("Cron {} not valid: '{}'.".format(name, field))
+        if not low <= start <= end <= high or step_value < 1:
+            raise ValueError("Cron {} not valid: '{}'.".format(name, field))
+        values.update(range(start, end + 1, step_value))
+    if name == "weekday" and 7 in values:
+        values.discard(7)
+        values.add(0)
+    return frozenset(values)
+
+
+class CronExpression:
+    """
+    A cron expression: 'minute hour day month weekday', in local time.
+
+    As in cron, Sunday is 0 (or 7), and when both the day and the weekday are restricted,
+    a date matches if either matches.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parse a cron expression.
+
+        :param expression: the expression, e.g. '*/15 9-17 * * 1-5'.
+        :raises ValueError: if the expression is not valid.
+        """
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError("Cron expression not valid: '{}'. Expected 5 fields.".format(expression))
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_cron_field(field, name, low, high) for field, (name, low, high) in zip(fields, CRON_FIELDS))
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _matches_date(self, date: datetime.datetime) -> bool:
+        """Check whether the expression matches the day of a date."""
+        day_matches = date.day in self.days
+        weekday_matches = (date.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_matches and weekday_matches
+        return day_matches or weekday_matches
+
+    def next_after(self, timestamp: float) -> float:
+        """
+        Get the first time matched by the expression after a time.
+
+        :param timestamp: the time, in seconds since the epoch.
+        :return: the next matching time, in seconds since the epoch.
+        :raises ValueError: if no date matches the expression (e.g. '0 0 31 2 *').
+        """
+        date = datetime.datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0)
+        date += datetime.timedelta(minutes=1)
+        # a matching date repeats at least every 28 years.
+        limit = date + datetime.timedelta(days=366 * 29)
+        while date < limit:
+            if date.month not in self.months:
+                date = date.replace(year=date.year + date.month // 12, month=date.month % 12 + 1, day=1, hour=0, minute=0)
+            elif not self._matches_date(date):
+                date = date.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif date.hour not in self.hours:
+                date = date.replace(minute=0) + datetime.timedelta(hours=1)
+            elif date.minute not in self.minutes:
+                date += datetime.timedelta(minutes=1)
+            else:
+                return date.timestamp()
+        raise ValueError("Cron expression never matches: '{}'.".format(self.expression))
+
+
+class Schedule:
+    """
+    The schedule of a behaviour or task.
+
+    It is either periodic (every 'interval' seconds), one-shot (once), or cron-like.
+    Periodic and one-shot schedules start after 'delay' seconds.
+    """
+
+    def __init__(self, interval: Optional[float] = None,
+                 one_shot: bool = False,
+                 cron: Optional[str] = None,
+                 delay: float = 0.0):
+        """
+        Initialize the schedule.
+
+        :param interval: the period, in seconds, of a periodic schedule.
+        :param one_shot: if True, the item runs only once.
+        :param cron: the cron expression of a cron-like schedule.
+        :param delay: the delay, in seconds, before the first run of a periodic or one-shot schedule.
+        :raises ValueError: if the schedule is not valid.
+        """
+        if [interval is not None, one_shot, cron is not None].count(True) != 1:
+            raise ValueError("A schedule needs exactly one of 'interval', 'one_shot' and 'cron'.")
+        if interval is not None and interval <= 0:
+            raise ValueError("The interval of a schedule must be positive.")
+        if delay < 0 or (cron is not None and delay != 0):
+            raise ValueError("The delay of a schedule must be positive, and not set with 'cron'.")
+        self.interval = interval
+        self.one_shot = one_shot
+        self.cron = CronExpression(cron) if cron is not None else None
+        self.delay = delay
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> 'Schedule':
+        """
+        Initialize from a JSON object, e.g. the 'schedule' of a behaviour in skill.yaml.
+
+        :param obj: the JSON object.
+        :return: the schedule.
+        :raises ValueError: if the schedule is not valid.
+        """
+        return Schedule(interval=obj.get("interval"), one_shot=obj.get("one_shot", False), cron=obj.get("cron"),
+                        delay=obj.get("delay", 0.0))
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        """Return the JSON representation."""
+        result = {}  # type: Dict[str, Any]
+        if self.interval is not None:
+            result["interval"] = self.interval
+        if self.one_shot:
+            result["one_shot"] = True
+        if self.cron is not None:
+            result["cron"] = self.cron.expression
+        if self.delay:
+            result["delay"] = self.delay
+        return result
+
+    def first(self, now: float) -> float:
+        """
+        Get the time of the first run.
+
+        :param now: the current time, in seconds since the epoch.
+        :return: the time of the first run.
+        """
+        if self.cron is not None:
+            return self.cron.next_after(now)
+        return now + self.delay
+
+    def next(self, due: float, now: float) -> Optional[float]:
+        """
+        Get the time of the run after a run.
+
+        A periodic item that fell behind skips the runs it missed.
+
+        :param due: the time the run was due.
+        :param now: the current time, in seconds since the epoch.
+        :return: the time of the next run, or None if the item does not run anymore.
+        """
+        if self.one_shot:
+            return None
+        if self.cron is not None:
+            return self.cron.next_after(now)
+        assert self.interval is not None
+        next_due = due + self.interval
+        return next_due if next_due > now else now + self.interval
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare with another object."""
+        return isinstance(other, Schedule) and self.json == other.json
+
+    def __repr__(self) -> str:
+        """Get the representation of the schedule."""
+        return "Schedule({})".format(", ".join("{}={!r}".format(key, value) for key, value in self.json.items()))
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the executors of the tasks."""
+import importlib.abc
+import importlib.util
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from importlib.machinery import ModuleSpec
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from aea.mail.base import NotifyingQueue
+from aea.protocols.base import Message
+
+if TYPE_CHECKING:
+    from aea.skills.base import Task  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+
+class TaskExecutorType(Enum):
+    """The executors of the tasks."""
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __str__(self):
+        """Get the string representation."""
+        return self.value
+
+
+class TaskResultMessage(Message):
+    """
+    The internal message which delivers the outcome of a task execution to the skill of the task.
+
+    It has its own protocol id: the skill receives it on its handler for the 'task' protocol,
+    not on the internal handler of the decision maker messages.
+    """
+
+    __slots__ = ()
+
+    protocol_id = "task"
+
+    class Performative(Enum):
+        """Task result performatives."""
+
+        RESULT = "result"
+        ERROR = "error"
+        CANCELLED = "cancelled"
+
+    def __init__(self, performative: Performative,
+                 task: 'Task',
+                 result: Any = None,
+                 error: Optional[BaseException] = None,
+                 **kwargs):
+        """
+        Instantiate a task result message.
+
+        :param performative: the performative.
+        :param task: the task which was executed.
+        :param result: the value returned by the execution.
+        :param error: the exception raised by the execution.
+        """
+        super().__init__(performative=performative, task=task, result=result, error=error, **kwargs)
+        assert self.check_consistency(), "TaskResultMessage initialization inconsistent."
+
+    def check_consistency(self) -> bool:
+        """Check that the data is consistent."""
+        try:
+            performative = TaskResultMessage.Performative(self.get("performative"))
+            assert self.is_set("task")
+            if performative == TaskResultMessage.Performative.ERROR:
+                assert isinstance(self.get("error"), BaseException)
+            else:
+                assert self.get("error") is None
+        except (AssertionError, ValueError):
+            return False
+        return True
+
+
+# the packages of the skills loaded, by name: their directory.
+_SKILL_PACKAGES = {}  # type: Dict[str, str]
+
+
+def register_skill_package(package_name: str, directory: str) -> None:
+    """
+    Register the package of a skill, so that the worker processes of the process executor can import its modules.
+
+    :param package_name: the name of the package, under which the modules of the skill are registered in sys.modules.
+    :param directory: the directory of the skill.
+    :return: None
+    """
+    _SKILL_PACKAGES[package_name] = directory
+
+
+class _SkillPackageFinder(importlib.abc.MetaPathFinder):
+    """Find the packages of the skills by their directory, in the worker processes."""
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Optional[ModuleSpec]:
+        """Find the spec of a skill package; its modules are then found in its directory."""
+        directory = _SKILL_PACKAGES.get(fullname, None)
+        if directory is None:
+            return None
+        return importlib.util.spec_from_file_location(fullname, os.path.join(directory, "__init__.py"),
+                                                      submodule_search_locations=[directory])
+
+
+def _run_job(skill_packages: Tuple[Tuple[str, str], ...], job: bytes) -> Any:
+    """
+    Run a job in a worker process.
+
+    The job is unpickled once the packages of the skills are importable, since it may refer to their modules.
+
+    :param skill_packages: the packages of the skills, with their directory.
+    :param job: the pickled function and arguments.
+    :return: the value returned by the function.
+    """
+    _SKILL_PACKAGES.update(skill_packages)
+    if not any(isinstance(finder, _SkillPackageFinder) for finder in sys.meta_path):
+        sys.meta_path.append(_SkillPackageFinder())
+    function, args = pickle.loads(job)
+    return function(*args)
+
+
+class TaskManager:
+    """
+    Run the tasks on their executor.
+
+    Inline tasks are executed on the agent thread. The other tasks are submitted to a thread pool
+    or a process pool, up to their concurrency limit; the outcome of each execution is queued,
+    and delivered to the skill of the task as a TaskResultMessage.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the task manager.
+
+        :param max_workers: the number of workers of each pool. If None, the default of concurrent.futures.
+        """
+        self._max_workers = max_workers
+        self._executors = {}  # type: Dict[TaskExecutorType, Executor]
+        self._futures = {}  # type: Dict[Task, List[Future]]
+        self._completed = NotifyingQueue()  # type: NotifyingQueue
+
+    @property
+    def completed(self) -> NotifyingQueue:
+        """Get the queue of the (task, future) pairs of the completed executions."""
+        return self._completed
+
+    def _get_executor(self, executor_type: TaskExecutorType) -> Executor:
+        """Get the pool of an executor type, creating it on first use."""
+        executor = self._executors.get(executor_type, None)
+        if executor is None:
+            if executor_type == TaskExecutorType.THREAD:
+                executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix="task")
+            elif sys.version_info >= (3, 7):
+                # the agent runs several threads: forking it could deadlock the workers on a lock held by another thread.
+                executor = ProcessPoolExecutor(self._max_workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                executor = ProcessPoolExecutor(self._max_workers)  # pragma: no cover
+            self._executors[executor_type] = executor
+        return executor
+
+    def execute(self, task: 'Task') -> Any:
+        """
+        Execute a task on its executor.
+
+        :param task: the task.
+        :return: for an inline task, the value returned by task.execute() (which an async agent awaits);
+                 | otherwise, the future of the execution, or None if the task reached its concurrency limit.
+        """
+        if task.executor == TaskExecutorType.INLINE:
+            return task.execute()
+        futures = self._futures.setdefault(task, [])
+        if len(futures) >= task.max_concurrency:
+            return None
+        function, args = task.job()
+        if task.executor == TaskExecutorType.PROCESS:
+            try:
+                job = pickle.dumps((function, args))
+            except Exception as e:
+                # the pool would fail the same way, or (before Python 3.7) hang on it.
+                future = Future()  # type: Future
+                future.set_exception(ValueError("The job of task {} cannot be sent to a worker process: {}."
+                                                .format(type(task).__name__, e)))
+            else:
+                future = self._get_executor(task.executor).submit(_run_job, tuple(_SKILL_PACKAGES.items()), job)
+        else:
+            future = self._get_executor(task.executor).submit(function, *args)
+        futures.append(future)
+        future.add_done_callback(lambda f: self._completed.put((task, f)))
+        return future
+
+    def running(self, task: 'Task') -> Tuple[Future, ...]:
+        """
+        Get the executions of a task which are not completed yet.
+
+        :param task: the task.
+        :return: the futures of the executions.
+        """
+        return tuple(future for future in self._futures.get(task, []) if not future.done())
+
+    def cancel(self, task: 'Task') -> int:
+        """
+        Cancel the executions of a task which have not started yet.
+
+        The executions which already started run to completion.
+
+        :param task: the task.
+        :return: the number of executions cancelled.
+        """
+        return sum(future.cancel() for future in self._futures.get(task, []))
+
+    def get_result_message(self, task: 'Task', future: Future) -> TaskResultMessage:
+        """
+        Get the message for a completed execution, and release its concurrency slot.
+
+        :param task: the task.
+        :param future: the future of the completed execution.
+        :return: the message.
+        """
+        futures = self._futures.get(task, [])
+        if future in futures:
+            futures.remove(future)
+        try:
+            result = future.result()
+        except CancelledError:
+            return TaskResultMessage(TaskResultMessage.Performative.CANCELLED, task)
+        except Exception as e:
+            logger.warning("Task {} raised an exception: {}".format(type(task).__name__, e))
+            return TaskResultMessage(TaskResultMessage.Performative.ERROR, task, error=e)
+        return TaskResultMessage(TaskResultMessage.Performative.RESULT, task, result=result)
+
+    def shutdown(self) -> None:
+        """
+        Cancel the pending executions and shut the pools down.
+
+        The running executions of the thread pool are not waited for. The process pool waits
+        for its running executions, since shutting it down without waiting leaves
+        its workers behind at the interpreter exit (before Python 3.9).
+
+        :return: None
+        """
+        for task in list(self._futures.keys()):
+            self.cancel(task)
+        for executor_type, executor in self._executors.items():
+            executor.shutdown(wait=executor_type == TaskExecutorType.PROCESS)
+        self._executors = {}
+        self._futures = {}
@@ -57,6 +57,7 @@ class GymChannel:
         self._lock = threading.Lock()
 
         self._queues = {}  # type: Dict[str, asyncio.Queue]
+        self._serializer = GymSerializer()
 
     def connect(self) -> Optional[asyncio.Queue]:
         """
@@ -101,14 +102,14 @@ class GymChannel:
         :param envelope: the envelope
         :return: None
         """
-        gym_message = GymSerializer().decode(envelope.message)
+        gym_message = self._serializer.decode(envelope.message)
         performative = gym_message.get("performative")
         if GymMessage.Performative(performative) == GymMessage.Performative.ACT:
             action = gym_message.get("action")
             step_id = gym_message.get("step_id")
             observation, reward, done, info = self.gym_env.step(action)  # type: ignore
             msg = GymMessage(performative=GymMessage.Performative.PERCEPT, observation=observation, reward=reward, done=done, info=info, step_id=step_id)
-            msg_bytes = GymSerializer().encode(msg)
+            msg_bytes = self._serializer.encode(msg)
             envelope = Envelope(to=envelope.sender, sender=DEFAULT_GYM, protocol_id=GymMessage.protocol_id, message=msg_bytes)
             self._send(envelope)
         elif GymMessage.Performative(performative) == GymMessage.Performative.RESET:
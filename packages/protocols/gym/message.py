@@ -28,6 +28,8 @@ from aea.protocols.base import Message
 class GymMessage(Message):
     """The Gym message class."""
 
+    __slots__ = ()
+
     protocol_id = "gym"
 
     class Performative(Enum):
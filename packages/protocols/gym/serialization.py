@@ -19,12 +19,12 @@
 # ------------------------------------------------------------------------------
 
 """Serialization for the Gym protocol."""
-import base64
-import copy
-import json
 import pickle
+import struct
 import sys
-from typing import Any, TYPE_CHECKING
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 from aea.protocols.base import Message
 from aea.protocols.base import Serializer
@@ -34,40 +34,110 @@ if TYPE_CHECKING or "pytest" in sys.modules:
 else:
     from gym_protocol.message import GymMessage  # pragma: no cover
 
+_PERFORMATIVES = list(GymMessage.Performative)
+_PERFORMATIVE_TO_CODE = {performative: code for code, performative in enumerate(_PERFORMATIVES)}
+
+_HEADER = struct.Struct("!B")
+_ACT = struct.Struct("!q")
+_PERCEPT = struct.Struct("!qd?")
+_LENGTH = struct.Struct("!I")
+_DIMENSION = struct.Struct("!Q")
+
+# tags of the values
+_NDARRAY = 0
+_PICKLE = 1
+
+"""the alignment of the array buffers in the encoded message."""
+ARRAY_ALIGNMENT = 8
+
+
+def _encode_value(value: Any, parts: List[bytes], offset: int) -> int:
+    """
+    Encode a value: a NumPy array as a dtype/shape header followed by its raw buffer, anything else with pickle.
+
+    :param value: the value to encode.
+    :param parts: the parts of the message, to append to.
+    :param offset: the size of the message so far.
+    :return: the size of the message.
+    """
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject and value.dtype.fields is None:
+        array = value if value.flags.c_contiguous else np.ascontiguousarray(value)
+        dtype = array.dtype.str.encode("ascii")
+        header = b"".join([bytes((_NDARRAY, len(dtype))), dtype, bytes((array.ndim,)),
+                           *(_DIMENSION.pack(dimension) for dimension in array.shape)])
+        # the header ends with the size of the padding before the buffer.
+        offset += len(header) + 1
+        padding = -offset % ARRAY_ALIGNMENT
+        data = array.data.cast("B") if array.ndim > 0 and array.size > 0 else array.tobytes()
+        parts.extend((header, bytes((padding,)), b"\x00" * padding, data))
+        return offset + padding + array.nbytes
+    pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    parts.extend((bytes((_PICKLE,)), _LENGTH.pack(len(pickled)), pickled))
+    return offset + 1 + _LENGTH.size + len(pickled)
+
+
+def _decode_value(buffer: bytes, offset: int) -> Tuple[Any, int]:
+    """
+    Decode a value.
+
+    The arrays are views on the buffer, not copies: they are read-only if the buffer is.
+
+    :param buffer: the encoded message.
+    :param offset: the offset of the value.
+    :return: the value and the offset of the next one.
+    """
+    tag = buffer[offset]
+    offset += 1
+    if tag == _NDARRAY:
+        dtype_length = buffer[offset]
+        offset += 1
+        dtype = np.dtype(bytes(buffer[offset:offset + dtype_length]).decode("ascii"))
+        offset += dtype_length
+        ndim = buffer[offset]
+        offset += 1
+        shape = tuple(_DIMENSION.unpack_from(buffer, offset + i * _DIMENSION.size)[0] for i in range(ndim))
+        offset += ndim * _DIMENSION.size
+        offset += 1 + buffer[offset]
+        count = int(np.prod(shape))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+        return array, offset + array.nbytes
+    elif tag == _PICKLE:
+        length = _LENGTH.unpack_from(buffer, offset)[0]
+        offset += _LENGTH.size
+        return pickle.loads(buffer[offset:offset + length]), offset + length
+    raise ValueError("Unknown value tag: {}.".format(tag))
+
 
 class GymSerializer(Serializer):
-    """Serialization for the Gym protocol."""
+    """
+    Serialization for the Gym protocol.
+
+    A message starts with its performative. The scalars (step id, reward, done) are packed fields.
+    NumPy arrays (typically the observations) are sent as a dtype/shape header followed by their
+    raw buffer, and decoded with np.frombuffer, without copies. The other values
+    (e.g. the info dictionary) are pickled.
+    """
 
     def encode(self, msg: Message) -> bytes:
         """
-        Decode the message.
+        Encode the message.
 
         :param msg: the message object
         :return: the bytes
         """
         performative = GymMessage.Performative(msg.get("performative"))
-        new_body = copy.copy(msg.body)
-        new_body["performative"] = performative.value
+        parts = [_HEADER.pack(_PERFORMATIVE_TO_CODE[performative])]  # type: List[bytes]
 
         if performative == GymMessage.Performative.ACT:
-            action = msg.body["action"]  # type: Any
-            action_bytes = base64.b64encode(pickle.dumps(action)).decode("utf-8")
-            new_body["action"] = action_bytes
-            new_body["step_id"] = msg.body["step_id"]
+            parts.append(_ACT.pack(msg.body["step_id"]))
+            _encode_value(msg.body["action"], parts, _HEADER.size + _ACT.size)
         elif performative == GymMessage.Performative.PERCEPT:
             # observation, reward and info are gym implementation specific, done is boolean
-            observation = msg.body["observation"]  # type: Any
-            observation_bytes = base64.b64encode(pickle.dumps(observation)).decode("utf-8")
-            new_body["observation"] = observation_bytes
-            reward = msg.body["reward"]  # type: Any
-            reward_bytes = base64.b64encode(pickle.dumps(reward)).decode("utf-8")
-            new_body["reward"] = reward_bytes
-            info = msg.body["info"]  # type: Any
-            info_bytes = base64.b64encode(pickle.dumps(info)).decode("utf-8")
-            new_body["info"] = info_bytes
-            new_body["step_id"] = msg.body["step_id"]
-
-        gym_message_bytes = json.dumps(new_body).encode("utf-8")
+            parts.append(_PERCEPT.pack(msg.body["step_id"], msg.body["reward"], msg.body["done"]))
+            offset = _encode_value(msg.body["observation"], parts, _HEADER.size + _PERCEPT.size)
+            _encode_value(msg.body["info"], parts, offset)
+
+        gym_message_bytes = b"".join(parts)
         return gym_message_bytes
 
     def decode(self, obj: bytes) -> Message:
@@ -77,28 +147,19 @@ class GymSerializer(Serializer):
         :param obj: the bytes object
         :return: the message
         """
-        json_msg = json.loads(obj.decode("utf-8"))
-        performative = GymMessage.Performative(json_msg["performative"])
-        new_body = copy.copy(json_msg)
-        new_body["performative"] = performative
+        performative = _PERFORMATIVES[_HEADER.unpack_from(obj)[0]]
+        new_body = {}  # type: Dict[str, Any]
 
         if performative == GymMessage.Performative.ACT:
-            action_bytes = base64.b64decode(json_msg["action"])
-            action = pickle.loads(action_bytes)
-            new_body["action"] = action
-            new_body["step_id"] = json_msg["step_id"]
+            new_body["step_id"] = _ACT.unpack_from(obj, _HEADER.size)[0]
+            new_body["action"], _ = _decode_value(obj, _HEADER.size + _ACT.size)
         elif performative == GymMessage.Performative.PERCEPT:
-            # observation, reward and info are gym implementation specific, done is boolean
-            observation_bytes = base64.b64decode(json_msg["observation"])
-            observation = pickle.loads(observation_bytes)
-            new_body["observation"] = observation
-            reward_bytes = base64.b64decode(json_msg["reward"])
-            reward = pickle.loads(reward_bytes)
+            step_id, reward, done = _PERCEPT.unpack_from(obj, _HEADER.size)
+            new_body["step_id"] = step_id
             new_body["reward"] = reward
-            info_bytes = base64.b64decode(json_msg["info"])
-            info = pickle.loads(info_bytes)
-            new_body["info"] = info
-            new_body["step_id"] = json_msg["step_id"]
+            new_body["done"] = done
+            new_body["observation"], offset = _decode_value(obj, _HEADER.size + _PERCEPT.size)
+            new_body["info"], _ = _decode_value(obj, offset)
 
         gym_message = GymMessage(performative=performative, body=new_body)
         return gym_message
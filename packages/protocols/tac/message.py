@@ -20,15 +20,17 @@
 
 """This module contains the default message definition."""
 from enum import Enum
-from typing import Dict, Optional, cast
+from typing import Any, Dict, Optional, cast
 from collections import defaultdict
 
-from aea.protocols.base import Message
+from aea.protocols.base import Message, MessageField
 
 
 class TACMessage(Message):
     """The TAC message class."""
 
+    __slots__ = ()
+
     protocol_id = "tac"
 
     class Type(Enum):
@@ -75,6 +77,24 @@ class TACMessage(Message):
         ErrorCode.DIALOGUE_INCONSISTENT: "The message is inconsistent with the dialogue."
     }  # type: Dict[ErrorCode, str]
 
+    type = MessageField()  # type: MessageField[TACMessage.Type]
+    agent_name = MessageField()  # type: MessageField[str]
+    transaction_id = MessageField()  # type: MessageField[str]
+    counterparty = MessageField()  # type: MessageField[str]
+    amount_by_currency = MessageField()  # type: MessageField[Dict[str, int]]
+    sender_tx_fee = MessageField()  # type: MessageField[int]
+    counterparty_tx_fee = MessageField()  # type: MessageField[int]
+    quantities_by_good_pbk = MessageField()  # type: MessageField[Dict[str, int]]
+    exchange_params_by_currency = MessageField()  # type: MessageField[Dict[str, float]]
+    utility_params_by_good_pbk = MessageField()  # type: MessageField[Dict[str, float]]
+    tx_fee = MessageField()  # type: MessageField[int]
+    agent_pbk_to_name = MessageField()  # type: MessageField[Dict[str, str]]
+    good_pbk_to_name = MessageField()  # type: MessageField[Dict[str, str]]
+    version_id = MessageField()  # type: MessageField[str]
+    error_code = MessageField()  # type: MessageField[TACMessage.ErrorCode]
+    error_msg = MessageField()  # type: MessageField[str]
+    details = MessageField()  # type: MessageField[Dict[str, Any]]
+
     def __init__(self, tac_type: Optional[Type] = None,
                  **kwargs):
         """
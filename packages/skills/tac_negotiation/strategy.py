@@ -160,10 +160,8 @@ class Strategy(SharedClass):
         :return: a description
         """
         candidate_proposals = self._generate_candidate_proposals(is_seller)
-        proposals = []
-        for proposal in candidate_proposals:
-            if not query.check(proposal): continue
-            proposals.append(proposal)
+        predicate = query.compile()
+        proposals = [proposal for proposal in candidate_proposals if predicate(proposal)]
         if not proposals:
             return None
         else:
@@ -0,0 +1,114 @@
+# /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Measure the memory allocated per envelope, and the time to create an envelope and to read its fields.
+
+It compares the slotted Envelope with the former layout (a __dict__ per envelope,
+a property per field and a new EnvelopeContext for each envelope without context).
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from typing import Callable, Optional
+
+from aea.mail.base import Envelope
+
+
+class _DictEnvelopeContext:
+    """The former envelope context, with a __dict__."""
+
+    def __init__(self, connection_id: Optional[str] = None):
+        """Initialize the envelope context."""
+        self.connection_id = connection_id
+
+
+class _DictEnvelope:
+    """The former envelope layout, with a __dict__, a property per field and a context per instance."""
+
+    def __init__(self, to, sender, protocol_id, message, context=None):
+        """Initialize the envelope."""
+        self._to = to
+        self._sender = sender
+        self._protocol_id = protocol_id
+        self._message = message
+        self._context = context if context is not None else _DictEnvelopeContext()
+
+    @property
+    def to(self):
+        """Get public key of receiver."""
+        return self._to
+
+    @property
+    def sender(self):
+        """Get public key of sender."""
+        return self._sender
+
+    @property
+    def protocol_id(self):
+        """Get protocol id."""
+        return self._protocol_id
+
+    @property
+    def message(self):
+        """Get the Message."""
+        return self._message
+
+
+def measure(factory: Callable, nb_envelopes: int):
+    """
+    Create the envelopes and measure the allocations.
+
+    :param factory: the envelope class.
+    :param nb_envelopes: the number of envelopes to create.
+    :return: the number of allocated blocks and the bytes per envelope, the creation time per envelope in µs
+             and the time to read the four fields of an envelope in ns.
+    """
+    message = b"x" * 64
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    envelopes = [factory("receiver", "sender", "default", message) for _ in range(nb_envelopes)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    nb_blocks = sum(stat.count_diff for stat in stats)
+    nb_bytes = sum(stat.size_diff for stat in stats)
+    del envelopes
+
+    seconds = timeit.timeit(lambda: factory("receiver", "sender", "default", message), number=nb_envelopes)
+    envelope = factory("receiver", "sender", "default", message)
+    read_seconds = timeit.timeit(lambda: (envelope.to, envelope.sender, envelope.protocol_id, envelope.message),
+                                 number=nb_envelopes)
+    return nb_blocks / nb_envelopes, nb_bytes / nb_envelopes, seconds / nb_envelopes * 1e6, \
+        read_seconds / nb_envelopes * 1e9
+
+
+parser = argparse.ArgumentParser("envelope_allocations", description=__doc__)
+parser.add_argument("--nb-envelopes", type=int, default=100000, help="The number of envelopes to create.")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    for name, factory in [("before (__dict__)", _DictEnvelope), ("after (__slots__)", Envelope)]:
+        blocks, size, micros, read_nanos = measure(factory, args.nb_envelopes)
+        print("{:<20} {:6.2f} allocations/envelope {:8.1f} bytes/envelope {:6.2f} µs/envelope {:6.1f} ns/read"
+              .format(name, blocks, size, micros, read_nanos))
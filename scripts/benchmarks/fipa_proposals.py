@@ -0,0 +1,85 @@
+# /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Measure the throughput of the FIPA serializer on PROPOSE batches.
+
+It compares the protobuf encoding of the proposals with the former encoding (one pickle per proposal),
+and measures the decoding of a PROPOSE when only its header fields are accessed.
+"""
+
+import argparse
+import pickle
+import timeit
+
+from aea.protocols.fipa.message import FIPAMessage
+from aea.protocols.fipa.serialization import FIPASerializer
+from packages.skills.tac_negotiation.helpers import build_goods_description
+
+
+def build_propose(nb_proposals: int, nb_goods: int) -> FIPAMessage:
+    """Build a PROPOSE with TAC proposals."""
+    good_pbks = ["tac_good_{}_{}".format(i, "f" * 64) for i in range(nb_goods)]
+    proposal = []
+    for i in range(nb_proposals):
+        description = build_goods_description({good_pbk: i % 3 for good_pbk in good_pbks}, "FET", is_supply=True)
+        description.values.update({"price": 10 + i, "seller_tx_fee": 1, "buyer_tx_fee": 1})
+        proposal.append(description)
+    return FIPAMessage(message_id=1, dialogue_reference=("1", "2"), target=0,
+                       performative=FIPAMessage.Performative.PROPOSE, proposal=proposal)
+
+
+parser = argparse.ArgumentParser("fipa_proposals", description=__doc__)
+parser.add_argument("--nb-proposals", type=int, default=100, help="The number of proposals in the PROPOSE.")
+parser.add_argument("--nb-goods", type=int, default=10, help="The number of goods in the proposals.")
+parser.add_argument("--number", type=int, default=100, help="The number of runs of each measure.")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    msg = build_propose(args.nb_proposals, args.nb_goods)
+    proposal = msg.get("proposal")
+    serializer = FIPASerializer()
+    msg_bytes = serializer.encode(msg)
+    assert serializer.decode(msg_bytes) == msg
+    pickled = [pickle.dumps(p) for p in proposal]
+
+    measures = [
+        ("pickle", len(b"".join(pickled)),
+         lambda: [pickle.dumps(p) for p in proposal],
+         lambda: [pickle.loads(p) for p in pickled]),
+        ("protobuf", len(msg_bytes),
+         lambda: serializer.encode(msg),
+         lambda: serializer.decode(msg_bytes).proposal),
+    ]
+    for name, size, encode, decode in measures:
+        encode_time = timeit.timeit(encode, number=args.number) / args.number
+        decode_time = timeit.timeit(decode, number=args.number) / args.number
+        print("{:<10} {:8d} bytes  encode {:8.0f} proposals/s  decode {:8.0f} proposals/s"
+              .format(name, size, args.nb_proposals / encode_time, args.nb_proposals / decode_time))
+
+    def decode_header():
+        """Decode the PROPOSE and access its header fields."""
+        decoded_msg = serializer.decode(msg_bytes)
+        return decoded_msg.performative, decoded_msg.dialogue_reference
+
+    header_time = timeit.timeit(decode_header, number=args.number) / args.number
+    print("protobuf decode, header fields only: {:8.1f} µs/message".format(header_time * 1e6))
@@ -0,0 +1,86 @@
+# /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Compare the binary gym serializer with the former pickle+base64+JSON serializer.
+
+It measures the encoding and decoding time and the size of PERCEPT messages with image-like observations.
+"""
+
+import argparse
+import base64
+import copy
+import json
+import pickle
+import sys
+import timeit
+
+import numpy as np
+
+import packages.protocols.gym
+from aea.protocols.base import Message, Serializer
+from packages.protocols.gym import message
+from packages.protocols.gym.message import GymMessage
+
+# outside of the tests, the gym serializer imports its message module by the name of the loaded protocol.
+sys.modules["gym_protocol"] = packages.protocols.gym
+sys.modules["gym_protocol.message"] = message
+
+from packages.protocols.gym.serialization import GymSerializer  # noqa: E402
+
+
+class _PickleGymSerializer(Serializer):
+    """The former gym serializer: pickled fields, base64 encoded in a JSON document."""
+
+    def encode(self, msg: Message) -> bytes:
+        """Encode the message."""
+        new_body = copy.copy(msg.body)
+        new_body["performative"] = GymMessage.Performative(msg.get("performative")).value
+        for field in ["observation", "reward", "info"]:
+            new_body[field] = base64.b64encode(pickle.dumps(msg.body[field])).decode("utf-8")
+        return json.dumps(new_body).encode("utf-8")
+
+    def decode(self, obj: bytes) -> Message:
+        """Decode the message."""
+        json_msg = json.loads(obj.decode("utf-8"))
+        new_body = copy.copy(json_msg)
+        new_body["performative"] = GymMessage.Performative(json_msg["performative"])
+        for field in ["observation", "reward", "info"]:
+            new_body[field] = pickle.loads(base64.b64decode(json_msg[field]))
+        return GymMessage(performative=new_body["performative"], body=new_body)
+
+
+parser = argparse.ArgumentParser("gym_serialization", description=__doc__)
+parser.add_argument("--shape", type=int, nargs="+", default=[84, 84, 4], help="The shape of the observations.")
+parser.add_argument("--number", type=int, default=1000, help="The number of runs of each measure.")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    observation = np.random.randint(0, 256, size=args.shape, dtype=np.uint8)
+    msg = GymMessage(performative=GymMessage.Performative.PERCEPT, observation=observation,
+                     reward=1.0, done=False, info={"lives": 3}, step_id=1)
+    for name, serializer in [("pickle+json", _PickleGymSerializer()), ("binary", GymSerializer())]:
+        msg_bytes = serializer.encode(msg)
+        assert np.array_equal(serializer.decode(msg_bytes).get("observation"), observation)
+        encode = timeit.timeit(lambda: serializer.encode(msg), number=args.number) / args.number * 1e6
+        decode = timeit.timeit(lambda: serializer.decode(msg_bytes), number=args.number) / args.number * 1e6
+        print("{:<12} {:8d} bytes  encode {:8.1f} µs  decode {:8.1f} µs".format(name, len(msg_bytes), encode, decode))
@@ -0,0 +1,95 @@
+# /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Compare the indexed search of the local node with a scan of every registered description.
+
+It registers weather-like service descriptions and measures the search time of selective queries,
+the time of a search ranked by price, with and without a limit,
+and the time of the registration churn (re-registrations, updates) once the indexes are built.
+"""
+
+import argparse
+import random
+import timeit
+
+from aea.connections.local.directory import ServiceDirectory
+from aea.protocols.oef.models import Attribute, Constraint, ConstraintType, DataModel, Description, Or, Query
+
+DATA_MODEL = DataModel("weather", [Attribute("city", str, True), Attribute("price", int, True), Attribute("rating", float, True)])
+
+
+def build_directory(nb_services: int, nb_cities: int):
+    """Register random service descriptions."""
+    rng = random.Random(0)
+    directory = ServiceDirectory()
+    entries = []
+    for i in range(nb_services):
+        description = Description({"city": "city_{}".format(rng.randrange(nb_cities)),
+                                   "price": rng.randrange(100000),
+                                   "rating": rng.uniform(0.0, 5.0)}, data_model=DATA_MODEL)
+        entries.append(("agent_{}".format(i), description))
+        directory.register(*entries[-1])
+    return directory, entries
+
+
+def scan(entries, query: Query):
+    """Search by checking every description."""
+    return sorted({public_key for public_key, description in entries
+                   if description.data_model == query.model and query.check(description)})
+
+
+QUERIES = {
+    "city ==": Query([Constraint("city", ConstraintType("==", "city_7"))], model=DATA_MODEL),
+    "price within": Query([Constraint("price", ConstraintType("within", (500, 550)))], model=DATA_MODEL),
+    "city or price": Query([Or([Constraint("city", ConstraintType("in", ["city_1", "city_2"])),
+                                Constraint("price", ConstraintType("<=", 99990))])], model=DATA_MODEL),
+}
+
+parser = argparse.ArgumentParser("local_node_search", description=__doc__)
+parser.add_argument("--nb-services", type=int, default=100000, help="The number of registered services.")
+parser.add_argument("--nb-cities", type=int, default=10000, help="The number of distinct cities.")
+parser.add_argument("--number", type=int, default=100, help="The number of runs of each measure.")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    directory, entries = build_directory(args.nb_services, args.nb_cities)
+
+    for name, query in QUERIES.items():
+        result = directory.search(query)
+        assert result == scan(entries, query)
+        indexed = timeit.timeit(lambda: directory.search(query), number=args.number) / args.number * 1e3
+        full_scan = timeit.timeit(lambda: scan(entries, query), number=max(1, args.number // 100)) / max(1, args.number // 100) * 1e3
+        print("{:<14} {:6d} results  indexed {:8.3f} ms  scan {:8.1f} ms".format(name, len(result), indexed, full_scan))
+
+    ranked_query = Query([Constraint("rating", ConstraintType(">=", 1.0))], model=DATA_MODEL, order_by="price")
+    for limit in [None, 10]:
+        ranked_query.limit = limit
+        result = directory.search(ranked_query)
+        ranked = timeit.timeit(lambda: directory.search(ranked_query), number=max(1, args.number // 10)) / max(1, args.number // 10) * 1e3
+        print("ranked by price, limit {:<5} {:6d} results  {:8.2f} ms".format(str(limit), len(result), ranked))
+
+    rng = random.Random(1)
+    updates = [(public_key, description, Description(dict(description.values, price=rng.randrange(100000)), data_model=DATA_MODEL))
+               for public_key, description in rng.sample(entries, args.number * 10)]
+    reregister = timeit.timeit(lambda: [directory.register(public_key, old) for public_key, old, _ in updates], number=1) / len(updates) * 1e6
+    replace = timeit.timeit(lambda: [directory.replace(*update) for update in updates], number=1) / len(updates) * 1e6
+    print("re-register {:8.2f} µs  replace {:8.2f} µs".format(reregister, replace))
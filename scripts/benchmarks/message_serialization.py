@@ -0,0 +1,66 @@
+# /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Compare the generic serializers of the message body: Protobuf Struct, JSON and MessagePack.
+
+It measures the encoding and decoding time and the size of representative message bodies.
+"""
+
+import argparse
+import timeit
+
+from aea.protocols.base import JSONSerializer, Message, MessagePackSerializer, ProtobufSerializer
+
+
+def build_bodies(nb_goods: int):
+    """Build representative message bodies."""
+    good_pbks = ["tac_good_{}_{}".format(i, "f" * 64) for i in range(nb_goods)]
+    return {
+        "error": {"type": "error", "error_code": -10001, "error_msg": "Unsupported protocol.",
+                  "error_data": {"protocol_id": "fipa"}},
+        "fipa header": {"message_id": 1, "dialogue_reference": ["1", ""], "target": 0, "performative": "cfp"},
+        "tac holdings": {"type": "game_data", "money": 1000, "endowment": {pbk: 10 for pbk in good_pbks},
+                         "utility_params": {pbk: 2.5 for pbk in good_pbks}, "tx_fee": 1,
+                         "agent_pbk_to_name": {"a" * 64: "agent_{}".format(i) for i in range(nb_goods)}},
+        "weather data": {"readings": [{"temperature": 20 + i % 5, "humidity": 0.5, "station": "weather_station"}
+                                      for i in range(nb_goods * 5)]},
+    }
+
+
+parser = argparse.ArgumentParser("message_serialization", description=__doc__)
+parser.add_argument("--nb-goods", type=int, default=10, help="The number of goods in the TAC and weather bodies.")
+parser.add_argument("--number", type=int, default=2000, help="The number of runs of each measure.")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    serializers = [("protobuf struct", ProtobufSerializer()), ("json", JSONSerializer()),
+                   ("messagepack", MessagePackSerializer())]
+    for name, body in build_bodies(args.nb_goods).items():
+        msg = Message(body)
+        for serializer_name, serializer in serializers:
+            msg_bytes = serializer.encode(msg)
+            serializer.decode(msg_bytes)
+            encode = timeit.timeit(lambda: serializer.encode(msg), number=args.number) / args.number * 1e6
+            decode = timeit.timeit(lambda: serializer.decode(msg_bytes), number=args.number) / args.number * 1e6
+            print("{:<14} {:<16} {:6d} bytes  encode {:8.1f} µs  decode {:8.1f} µs"
+                  .format(name, serializer_name, len(msg_bytes), encode, decode))
@@ -0,0 +1,95 @@
+# /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Compare the binary OEF serializer with the former pickle+base64+JSON serializer.
+
+It measures the encoding and decoding time and the size of TAC and weather registrations and searches.
+"""
+
+import argparse
+import base64
+import copy
+import json
+import pickle
+import timeit
+
+from aea.protocols.base import Message, Serializer
+from aea.protocols.oef.message import OEFMessage
+from aea.protocols.oef.models import Description
+from aea.protocols.oef.serialization import OEFSerializer
+from packages.skills.tac_negotiation.helpers import build_goods_description, build_goods_query
+from packages.skills.weather_station.weather_station_data_model import WEATHER_STATION_DATAMODEL, SCHEME
+
+_MODEL_FIELDS = {"service_description", "agent_description", "query"}
+
+
+class _PickleOEFSerializer(Serializer):
+    """The former OEF serializer: pickled models, base64 encoded in a JSON document."""
+
+    def encode(self, msg: Message) -> bytes:
+        """Encode the message."""
+        new_body = copy.copy(msg.body)
+        new_body["type"] = OEFMessage.Type(msg.get("type")).value
+        for field in _MODEL_FIELDS & new_body.keys():
+            new_body[field] = base64.b64encode(pickle.dumps(new_body[field])).decode("utf-8")
+        return json.dumps(new_body).encode("utf-8")
+
+    def decode(self, obj: bytes) -> Message:
+        """Decode the message."""
+        json_msg = json.loads(obj.decode("utf-8"))
+        new_body = copy.copy(json_msg)
+        new_body["type"] = OEFMessage.Type(json_msg["type"])
+        for field in _MODEL_FIELDS & new_body.keys():
+            new_body[field] = pickle.loads(base64.b64decode(json_msg[field]))
+        return OEFMessage(oef_type=new_body["type"], body=new_body)
+
+
+def build_messages(nb_goods: int):
+    """Build realistic OEF messages."""
+    good_pbks = ["tac_good_{}_{}".format(i, "f" * 64) for i in range(nb_goods)]
+    tac_description = build_goods_description({good_pbk: 2 for good_pbk in good_pbks}, "FET", is_supply=True)
+    tac_query = build_goods_query(good_pbks, "FET", is_searching_for_sellers=True)
+    weather_description = Description(SCHEME, data_model=WEATHER_STATION_DATAMODEL())
+    return {
+        "tac registration": OEFMessage(oef_type=OEFMessage.Type.REGISTER_SERVICE, id=1, service_id="",
+                                       service_description=tac_description),
+        "tac search": OEFMessage(oef_type=OEFMessage.Type.SEARCH_SERVICES, id=2, query=tac_query),
+        "weather registration": OEFMessage(oef_type=OEFMessage.Type.REGISTER_SERVICE, id=3, service_id="",
+                                           service_description=weather_description),
+    }
+
+
+parser = argparse.ArgumentParser("oef_serialization", description=__doc__)
+parser.add_argument("--nb-goods", type=int, default=10, help="The number of goods in the TAC descriptions.")
+parser.add_argument("--number", type=int, default=2000, help="The number of runs of each measure.")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    for name, msg in build_messages(args.nb_goods).items():
+        for serializer_name, serializer in [("pickle+json", _PickleOEFSerializer()), ("binary", OEFSerializer())]:
+            msg_bytes = serializer.encode(msg)
+            assert serializer.decode(msg_bytes) == msg
+            encode = timeit.timeit(lambda: serializer.encode(msg), number=args.number) / args.number * 1e6
+            decode = timeit.timeit(lambda: serializer.decode(msg_bytes), number=args.number) / args.number * 1e6
+            print("{:<22} {:<12} {:6d} bytes  encode {:8.1f} µs  decode {:8.1f} µs"
+                  .format(name, serializer_name, len(msg_bytes), encode, decode))
@@ -0,0 +1,80 @@
+# /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Compare Query.check, the predicate returned by Query.compile and Query.filter, on many candidate descriptions.
+
+Query.filter evaluates the query on a DescriptionBatch, built once from the descriptions.
+
+The queries are shaped like the ones of the TAC negotiation skill: a disjunction of
+"good >= 1" constraints, plus nested and negated constraints.
+"""
+
+import argparse
+import random
+import timeit
+
+from aea.protocols.oef.batch import DescriptionBatch
+from aea.protocols.oef.models import And, Constraint, ConstraintType, Description, Not, Or, Query
+
+
+def build_descriptions(nb_descriptions: int, nb_goods: int):
+    """Build random descriptions of good quantities."""
+    rng = random.Random(0)
+    return [Description(dict({"tac_good_{}".format(i): rng.randrange(3) for i in range(nb_goods)},
+                             currency=rng.choice(["FET", "ETH"]), price=rng.uniform(0.0, 100.0)))
+            for _ in range(nb_descriptions)]
+
+
+def build_queries(nb_goods: int):
+    """Build the queries to measure."""
+    goods = [Constraint("tac_good_{}".format(i), ConstraintType(">=", 1)) for i in range(nb_goods)]
+    return {
+        "goods or": Query([Or(goods + [Constraint("currency", ConstraintType("==", "FET"))])]),
+        "nested": Query([And([Or(goods[:3]), Not(Constraint("currency", ConstraintType("in", ["ETH", "BTC"])))]),
+                         Constraint("price", ConstraintType("within", (10.0, 90.0)))]),
+        "all goods": Query(list(goods)),
+    }
+
+
+parser = argparse.ArgumentParser("query_compile", description=__doc__)
+parser.add_argument("--nb-descriptions", type=int, default=10000, help="The number of candidate descriptions.")
+parser.add_argument("--nb-goods", type=int, default=10, help="The number of goods in the descriptions.")
+parser.add_argument("--number", type=int, default=10, help="The number of runs of each measure.")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    descriptions = build_descriptions(args.nb_descriptions, args.nb_goods)
+    batch = DescriptionBatch(descriptions)
+    batch_time = timeit.timeit(lambda: DescriptionBatch(descriptions), number=args.number) / args.number * 1e3
+    print("batch of {} descriptions built in {:.2f} ms".format(len(batch), batch_time))
+
+    for name, query in build_queries(args.nb_goods).items():
+        predicate = query.compile()
+        expected = [query.check(description) for description in descriptions]
+        assert [predicate(description) for description in descriptions] == expected
+        assert query.mask(batch).tolist() == expected
+        check = timeit.timeit(lambda: [query.check(description) for description in descriptions], number=args.number) / args.number * 1e3
+        compiled = timeit.timeit(lambda: [predicate(description) for description in descriptions], number=args.number) / args.number * 1e3
+        compile_time = timeit.timeit(query.compile, number=args.number) / args.number * 1e6
+        filtered = timeit.timeit(lambda: query.filter(batch), number=args.number) / args.number * 1e3
+        print("{:<10} {:6d} matches  check {:8.2f} ms  compiled {:8.2f} ms  compile {:6.1f} µs  filter {:6.2f} ms".format(
+            name, sum(expected), check, compiled, compile_time, filtered))
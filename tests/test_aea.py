@@ -17,9 +17,11 @@
 #
 # ------------------------------------------------------------------------------
 """This module contains the tests for aea/aea.py."""
+import asyncio
 import os
 import tempfile
 import time
+import unittest.mock
 from pathlib import Path
 from threading import Thread
 
@@ -27,19 +29,21 @@ import pytest
 import yaml
 
 from aea import AEA_DIR
-from aea.aea import AEA
+from aea.aea import AEA, AsyncAEA
 from aea.configurations.base import ProtocolConfig
 from aea.connections.local.connection import LocalNode, OEFLocalConnection
 from aea.crypto.ledger_apis import LedgerApis
 from aea.crypto.wallet import Wallet
 from aea.mail.base import Envelope
-from aea.protocols.base import Protocol
+from aea.protocols.base import LazyField, Message, Protocol
 from aea.protocols.default.message import DefaultMessage
 from aea.protocols.default.serialization import DefaultSerializer
+from aea.protocols.fipa import fipa_pb2
 from aea.protocols.fipa.message import FIPAMessage
 from aea.protocols.fipa.serialization import FIPASerializer
-from aea.registries.base import Resources
+from aea.registries.base import DECISION_MAKER, Resources
 from aea.skills.base import Skill
+from aea.skills.schedule import Schedule
 from .conftest import CUR_PATH
 
 
@@ -131,6 +135,140 @@ def test_react():
             t.join()
 
 
+def test_routes():
+    """Tests that the routes of an AEA are set on its multiplexer."""
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    public_key = wallet.public_keys['default']
+    agent = AEA("MyAgent", [OEFLocalConnection(public_key, LocalNode())], wallet, LedgerApis({}),
+                resources=Resources(), routes={("other_agent", None): "local"})
+    assert agent.multiplexer.routing_table == {("other_agent", None): "local"}
+
+
+def test_relay():
+    """Tests that a relay agent forwards the envelopes addressed to other agents without decoding them."""
+    node = LocalNode()
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    public_key = wallet.public_keys['default']
+    agent = AEA("MyAgent", [OEFLocalConnection(public_key, node)], wallet, LedgerApis({}),
+                resources=Resources(str(Path(CUR_PATH, "data", "dummy_aea"))), relay=True)
+    assert agent.is_relay
+    agent.setup()
+
+    envelope = Envelope(to="other_agent", sender="sender", protocol_id="default", message=b"not decodable")
+    serializer = agent.context.serializers["default"]
+    with unittest.mock.patch.object(agent.outbox, "put") as mock_put, \
+            unittest.mock.patch.object(agent.resources.protocol_registry, "fetch") as mock_fetch, \
+            unittest.mock.patch.object(serializer, "decode") as mock_decode:
+        agent.multiplexer.in_queue.put(envelope)
+        agent.react()
+        mock_put.assert_called_once_with(envelope)
+        mock_fetch.assert_not_called()
+        mock_decode.assert_not_called()
+
+
+def test_dispatch_table():
+    """Tests that the agent resolves the serializers and the error handler once, and shares them with the skills."""
+    node = LocalNode()
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    public_key = wallet.public_keys['default']
+    agent = AEA("MyAgent", [OEFLocalConnection(public_key, node)], wallet, LedgerApis({}),
+                resources=Resources(str(Path(CUR_PATH, "data", "dummy_aea"))))
+    agent.setup()
+    serializer = agent.resources.protocol_registry.fetch("default").serializer
+    assert agent.context.serializers["default"] is serializer
+    skill_context = agent.resources.get_skill("dummy").skill_context
+    assert skill_context.serializers["default"] is serializer
+
+    msg = DefaultMessage(type=DefaultMessage.Type.BYTES, content=b"hello")
+    envelope = Envelope(to=public_key, sender=public_key, protocol_id="default", message=serializer.encode(msg))
+    unsupported_envelope = Envelope(to=public_key, sender=public_key, protocol_id="unknown", message=b"")
+    with unittest.mock.patch.object(agent.resources.protocol_registry, "fetch",
+                                    return_value=None) as mock_fetch_protocol, \
+            unittest.mock.patch.object(agent.resources.handler_registry, "fetch_by_skill") as mock_fetch_by_skill, \
+            unittest.mock.patch.object(agent.error_handler, "send_unsupported_protocol") as mock_unsupported:
+        agent.multiplexer.in_queue.put(envelope)
+        agent.react()
+        mock_fetch_protocol.assert_not_called()
+        agent.multiplexer.in_queue.put(unsupported_envelope)
+        agent.react()
+        mock_fetch_protocol.assert_not_called()
+        mock_unsupported.assert_called_once_with(unsupported_envelope)
+        mock_fetch_by_skill.assert_not_called()
+
+    handler = agent.resources.handler_registry.fetch_by_skill("default", "dummy")
+    assert msg in handler.handled_messages
+    agent.teardown()
+    assert len(agent.context.serializers) == 0
+
+
+def test_dispatch_table_follows_the_registries():
+    """Tests that the dispatch table is refilled when a protocol or a skill is removed from the registries."""
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    public_key = wallet.public_keys['default']
+    agent = AEA("MyAgent", [OEFLocalConnection(public_key, LocalNode())], wallet, LedgerApis({}),
+                resources=Resources(str(Path(CUR_PATH, "data", "dummy_aea"))))
+    agent.setup()
+    error_handler = agent.error_handler
+    protocol = agent.resources.protocol_registry.fetch("default")
+    msg = DefaultMessage(type=DefaultMessage.Type.BYTES, content=b"hello")
+    envelope = Envelope(to=public_key, sender=public_key, protocol_id="default", message=protocol.serializer.encode(msg))
+
+    agent.resources.protocol_registry.unregister("default")
+    with unittest.mock.patch.object(error_handler, "send_unsupported_protocol") as mock_unsupported:
+        assert agent._prepare_dispatch(envelope) is None
+        mock_unsupported.assert_called_once_with(envelope)
+    assert "default" not in agent.context.serializers
+
+    agent.resources.protocol_registry.register(("default", None), protocol)
+    assert agent._prepare_dispatch(envelope) is not None
+    assert agent.context.serializers["default"] is protocol.serializer
+
+    error_skill = agent.resources.get_skill("error")
+    agent.resources.remove_skill("error")
+    with pytest.raises(AssertionError):
+        agent.error_handler
+    agent.resources.add_skill(error_skill)
+    assert agent.error_handler is error_handler
+    agent.teardown()
+
+
+def test_malformed_lazy_field_replies_with_decoding_error():
+    """Tests that a handler reading a malformed lazy field gets the envelope answered with a decoding error."""
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    public_key = wallet.public_keys['default']
+    agent = AEA("MyAgent", [OEFLocalConnection(public_key, LocalNode())], wallet, LedgerApis({}),
+                resources=Resources())
+    fipa_configuration = ProtocolConfig.from_json(yaml.safe_load(open(Path(AEA_DIR, "protocols", "fipa", "protocol.yaml"))))
+    agent.resources.protocol_registry.register(("fipa", None), Protocol("fipa", FIPASerializer(), fipa_configuration))
+    agent.resources.add_skill(Skill.from_dir(Path(AEA_DIR, "skills", "error"), agent.context))
+    handler = unittest.mock.Mock(SUPPORTED_PROTOCOL="fipa")
+    handler.handle.side_effect = lambda message, sender: message.get("proposal")
+    agent.resources.handler_registry.register((None, "lazy"), [handler])
+
+    fipa_pb = fipa_pb2.FIPAMessage()
+    fipa_pb.dialogue_starter_reference = "1"
+    fipa_pb.propose.proposal.sizes = b"\x01\x00\x00\x00"
+    envelope = Envelope(to=public_key, sender=public_key, protocol_id="fipa", message=fipa_pb.SerializeToString())
+    with unittest.mock.patch.object(agent.error_handler, "send_decoding_error") as mock_decoding_error:
+        agent._handle(envelope)
+    handler.handle.assert_called_once()
+    mock_decoding_error.assert_called_once_with(envelope)
+
+    fipa_pb = fipa_pb2.FIPAMessage()
+    fipa_pb.dialogue_starter_reference = "1"
+    fipa_pb.inform.bytes = b"not json"
+    envelope = Envelope(to=public_key, sender=public_key, protocol_id="fipa", message=fipa_pb.SerializeToString())
+    with unittest.mock.patch.object(agent.error_handler, "send_decoding_error") as mock_decoding_error:
+        agent._handle(envelope)
+    handler.handle.assert_called_once()
+    mock_decoding_error.assert_called_once_with(envelope)
+
+
 @pytest.mark.asyncio
 async def test_handle():
     """Tests handle method of an agent."""
@@ -203,6 +341,27 @@ async def test_handle():
             t.join()
 
 
+@pytest.mark.parametrize("agent_class, kwargs", [(AEA, {"event_driven": True}), (AsyncAEA, {})])
+def test_idle_event_driven_agent_runs_scheduled_behaviours(agent_class, kwargs):
+    """Test that an idle event-driven agent wakes up when a scheduled behaviour is due."""
+    with LocalNode() as node:
+        private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+        wallet = Wallet({'default': private_key_pem_path})
+        connections = [OEFLocalConnection("MyAgent", node)]
+        agent = agent_class("MyAgent", connections, wallet, LedgerApis({}), resources=Resources(), **kwargs)
+        behaviour = unittest.mock.Mock(schedule=Schedule(interval=0.1), act=unittest.mock.Mock(return_value=None))
+        agent.resources.behaviour_registry.register((None, "dummy"), [behaviour])
+        assert agent._get_wakeup_timeout() is not None
+        t = Thread(target=agent.start)
+        try:
+            t.start()
+            time.sleep(1.0)
+            assert behaviour.act.call_count >= 5, "The scheduled behaviour did not run while the agent was idle."
+        finally:
+            agent.stop()
+            t.join()
+
+
 class TestInitializeAEAProgrammaticallyFromResourcesDir:
     """Test that we can initialize the agent by providing the resource object loaded from dir."""
 
@@ -317,3 +476,185 @@ class TestInitializeAEAProgrammaticallyBuildResources:
         cls.t.join()
         cls.node.stop()
         Path(cls.temp).rmdir()
+
+
+class TestAsyncAEA:
+    """Test that the asynchronous AEA runs on the multiplexer's event loop."""
+
+    @classmethod
+    def setup_class(cls):
+        """Set the test up."""
+        cls.node = LocalNode()
+        cls.node.start()
+        cls.agent_name = "MyAgent"
+        cls.private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+        cls.wallet = Wallet({'default': cls.private_key_pem_path})
+        cls.ledger_apis = LedgerApis({})
+        cls.connection = OEFLocalConnection(cls.agent_name, cls.node)
+        cls.connections = [cls.connection]
+
+        cls.resources = Resources(os.path.join(CUR_PATH, "data", "dummy_aea"))
+        cls.aea = AsyncAEA(cls.agent_name, cls.connections, cls.wallet, cls.ledger_apis, cls.resources, timeout=0.1)
+
+        cls.expected_message = DefaultMessage(type=DefaultMessage.Type.BYTES, content=b"hello")
+        envelope = Envelope(to=cls.agent_name, sender=cls.agent_name, protocol_id="default", message=DefaultSerializer().encode(cls.expected_message))
+
+        cls.t = Thread(target=cls.aea.start)
+        cls.t.start()
+
+        time.sleep(0.5)
+        cls.aea.outbox.put(envelope)
+        time.sleep(0.5)
+
+    def test_behaviours_tasks_and_handlers_are_called(self):
+        """Test that behaviours, tasks and handlers are called by the asynchronous main loop."""
+        dummy_behaviour = next(filter(lambda x: x.__class__.__name__ == "DummyBehaviour", self.aea.resources.behaviour_registry.fetch("dummy")), None)
+        assert dummy_behaviour is not None
+        assert dummy_behaviour.nb_act_called > 0
+
+        dummy_task = next(filter(lambda x: x.__class__.__name__ == "DummyTask", self.aea.resources.task_registry.fetch("dummy")), None)
+        assert dummy_task is not None
+        assert dummy_task.nb_execute_called > 0
+
+        dummy_handler = next(filter(lambda x: x.__class__.__name__ == "DummyHandler", self.aea.resources.handler_registry.fetch("default")), None)
+        assert dummy_handler is not None
+        assert len(dummy_handler.handled_messages) == 1
+        assert dummy_handler.handled_messages[0] == self.expected_message
+
+    def test_put_from_loop_thread(self):
+        """Test that an envelope can be put from the event loop thread without blocking."""
+        dummy_handler = next(filter(lambda x: x.__class__.__name__ == "DummyHandler", self.aea.resources.handler_registry.fetch("default")), None)
+        nb_handled_messages = len(dummy_handler.handled_messages)
+        envelope = Envelope(to=self.agent_name, sender=self.agent_name, protocol_id="default", message=DefaultSerializer().encode(self.expected_message))
+        self.aea.multiplexer.loop.call_soon_threadsafe(self.aea.outbox.put, envelope)
+        time.sleep(0.5)
+        assert len(dummy_handler.handled_messages) == nb_handled_messages + 1
+
+    @classmethod
+    def teardown_class(cls):
+        """Tear the test down."""
+        cls.aea.stop()
+        cls.t.join()
+        cls.node.stop()
+
+
+@pytest.mark.asyncio
+async def test_async_handlers_and_behaviours_are_scheduled():
+    """Test that coroutine handlers run concurrently across dialogues, in order within a dialogue, and that a behaviour does not overlap itself."""
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    connections = [OEFLocalConnection("MyAgent", LocalNode())]
+    agent = AsyncAEA("MyAgent", connections, wallet, LedgerApis({}), resources=Resources())
+    events = []
+
+    async def handle(msg, sender):
+        events.append(("start", msg.get("message_id")))
+        await asyncio.sleep(0.05 if msg.get("message_id") == 1 else 0.01)
+        events.append(("end", msg.get("message_id")))
+
+    handler = unittest.mock.Mock(context=unittest.mock.Mock(max_concurrency=None), handle=handle)
+    messages = [
+        FIPAMessage(message_id=1, dialogue_reference=("dialogue_1", ""), target=0, performative=FIPAMessage.Performative.ACCEPT),
+        FIPAMessage(message_id=2, dialogue_reference=("dialogue_2", ""), target=0, performative=FIPAMessage.Performative.ACCEPT),
+        FIPAMessage(message_id=3, dialogue_reference=("dialogue_1", "responder"), target=1, performative=FIPAMessage.Performative.ACCEPT),
+    ]
+    envelope = Envelope(to="MyAgent", sender="sender", protocol_id="fipa", message=b"")
+    with unittest.mock.patch.object(agent, "_prepare_dispatch", side_effect=[(msg, (handler,)) for msg in messages]):
+        for _ in messages:
+            await agent._async_handle(envelope)
+    assert agent.coroutine_scheduler.pending == 3
+    while agent.coroutine_scheduler.pending > 0:
+        await asyncio.sleep(0.01)
+    assert events.index(("start", 2)) < events.index(("end", 1)) < events.index(("start", 3))
+
+    behaviour = unittest.mock.Mock(context=unittest.mock.Mock(max_concurrency=1), act=unittest.mock.Mock(side_effect=lambda: asyncio.sleep(0.05)))
+    with unittest.mock.patch.object(agent.filter, "get_active_behaviours", return_value=(behaviour,)):
+        await agent.async_act()
+        await agent.async_act()
+        assert behaviour.act.call_count == 1
+        await asyncio.sleep(0.1)
+        await agent.async_act()
+        assert behaviour.act.call_count == 2
+    await agent.coroutine_scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_async_handlers_backlog_is_bounded():
+    """Test that the agent stops taking envelopes once a skill has SKILL_MAX_BACKLOG coroutines pending."""
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    agent = AsyncAEA("MyAgent", [OEFLocalConnection("MyAgent", LocalNode())], wallet, LedgerApis({}),
+                     resources=Resources(), max_reactions=10)
+    agent.SKILL_MAX_BACKLOG = 2
+    release = asyncio.Event()
+
+    async def handle(msg, sender):
+        await release.wait()
+
+    handler = unittest.mock.Mock(context=unittest.mock.Mock(max_concurrency=1), handle=handle)
+    envelope = Envelope(to="MyAgent", sender="sender", protocol_id="default", message=b"")
+    for _ in range(5):
+        agent.multiplexer.in_queue.put(envelope)
+    with unittest.mock.patch.object(agent, "_prepare_dispatch", return_value=(Message(), (handler,))):
+        react = asyncio.ensure_future(agent.async_react())
+        await asyncio.sleep(0.05)
+        assert not react.done()
+        assert agent.coroutine_scheduler.backlog(handler.context) == 2
+        assert agent.multiplexer.in_queue.qsize() == 2
+        release.set()
+        await asyncio.wait_for(react, timeout=1.0)
+    assert agent.multiplexer.in_queue.empty()
+    await agent.coroutine_scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_async_handler_reading_malformed_lazy_field_replies_with_decoding_error():
+    """Test that a coroutine handler reading a malformed lazy field gets the envelope answered with a decoding error."""
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    agent = AsyncAEA("MyAgent", [OEFLocalConnection("MyAgent", LocalNode())], wallet, LedgerApis({}), resources=Resources())
+
+    async def handle(msg, sender):
+        await asyncio.sleep(0)
+        return msg.get("content")
+
+    handler = unittest.mock.Mock(context=unittest.mock.Mock(max_concurrency=None), handle=handle)
+    msg = Message(content=LazyField(bytes.decode, b"\xff"))
+    envelope = Envelope(to="MyAgent", sender="sender", protocol_id="default", message=b"")
+    with unittest.mock.patch.object(agent, "_prepare_dispatch", return_value=(msg, (handler,))), \
+            unittest.mock.patch.object(type(agent), "error_handler") as mock_error_handler:
+        await agent._async_handle(envelope)
+        while agent.coroutine_scheduler.pending > 0:
+            await asyncio.sleep(0.01)
+    mock_error_handler.send_decoding_error.assert_called_once_with(envelope)
+    await agent.coroutine_scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_async_internal_handlers_are_scheduled():
+    """Test that the coroutine of an async internal handler is scheduled, while a synchronous agent discards it."""
+    private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+    wallet = Wallet({'default': private_key_pem_path})
+    agent = AsyncAEA("MyAgent", [OEFLocalConnection("MyAgent", LocalNode())], wallet, LedgerApis({}), resources=Resources())
+    handled = []
+
+    async def handle(msg, sender):
+        await asyncio.sleep(0)
+        handled.append((msg, sender))
+
+    handler = unittest.mock.Mock(context=unittest.mock.Mock(max_concurrency=None), handle=handle)
+    tx_message = unittest.mock.Mock()
+    with unittest.mock.patch.object(agent.resources.handler_registry, "fetch_internal_handler", return_value=handler):
+        agent.filter.decision_maker_out_queue.put(tx_message)
+        await agent.async_update()
+        while agent.coroutine_scheduler.pending > 0:
+            await asyncio.sleep(0.01)
+        assert handled == [(tx_message, DECISION_MAKER)]
+
+        sync_agent = AEA("MyAgent", [OEFLocalConnection("MyAgent", LocalNode())], wallet, LedgerApis({}), resources=agent.resources)
+        sync_agent.filter.decision_maker_out_queue.put(tx_message)
+        with unittest.mock.patch("aea.helpers.base.logger") as mock_logger:
+            sync_agent.filter.handle_internal_messages()
+        mock_logger.error.assert_called_once()
+        assert handled == [(tx_message, DECISION_MAKER)]
+    await agent.coroutine_scheduler.close()
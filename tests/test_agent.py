@@ -25,7 +25,7 @@ from threading import Thread
 from aea.agent import Agent, AgentState
 from aea.connections.local.connection import LocalNode, OEFLocalConnection
 from aea.crypto.wallet import Wallet
-from aea.mail.base import InBox, OutBox
+from aea.mail.base import Envelope, InBox, OutBox
 from .conftest import CUR_PATH
 
 
@@ -84,3 +84,31 @@ def test_run_agent():
             agent.stop()
             agent.multiplexer.disconnect()
             agent_thread.join()
+
+
+def test_run_agent_event_driven():
+    """Test that an event-driven agent wakes up as soon as an envelope is received."""
+    with LocalNode() as node:
+        agent_name = "dummyagent"
+        private_key_pem_path = os.path.join(CUR_PATH, "data", "priv.pem")
+        wallet = Wallet({'default': private_key_pem_path})
+        agent = DummyAgent(agent_name, [OEFLocalConnection("mypbk", node)], wallet, timeout=10.0, event_driven=True)
+        assert agent.is_event_driven
+        reactions = []
+        agent.react = lambda: reactions.append(agent.inbox.get_nowait())  # type: ignore
+
+        agent_thread = Thread(target=agent.start)
+        agent_thread.start()
+        time.sleep(0.5)
+
+        try:
+            assert agent.agent_state == AgentState.RUNNING, "Agent state must be 'running'"
+            nb_reactions = len(reactions)
+            agent.multiplexer.in_queue.put(Envelope(to="mypbk", sender="mypbk", protocol_id="default", message=b""))
+            time.sleep(0.5)
+            assert len(reactions) == nb_reactions + 1, "The agent did not wake up on the incoming envelope."
+            assert reactions[-1] is not None
+        finally:
+            agent.stop()
+            agent_thread.join(timeout=1.0)
+            assert not agent_thread.is_alive(), "The agent did not wake up when stopped."
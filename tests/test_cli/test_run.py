@@ -1060,3 +1060,18 @@ class TestRunFailsWhenProtocolNotComplete:
             shutil.rmtree(cls.t)
         except (OSError, IOError):
             pass
+
+
+def test_get_routes():
+    """Test that the routes of the agent configuration are kept for the connections in use only."""
+    from aea.cli.run import _get_routes
+    from aea.configurations.base import AgentConfig, RouteConfig
+    agent_config = AgentConfig(routes=[RouteConfig("local", address="agent_1"),
+                                       RouteConfig("oef", protocol="fipa"),
+                                       RouteConfig("local", address="agent_2", protocol="fipa")])
+    ctx = unittest.mock.Mock(agent_config=agent_config)
+    connection = unittest.mock.Mock(connection_id="local")
+    with unittest.mock.patch.object(aea.cli.run.logger, "warning") as mock_warning:
+        routes = _get_routes(ctx, [connection])
+    assert routes == {("agent_1", None): "local", ("agent_2", "fipa"): "local"}
+    mock_warning.assert_called_once()
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests for the indexed directory of the local node."""
+import random
+
+import pytest
+
+from aea.connections.local.directory import ServiceDirectory
+from aea.protocols.oef.models import And, Attribute, Constraint, ConstraintType, DataModel, Description, Not, Or, Query
+
+WEATHER = DataModel("weather", [Attribute("city", str, True), Attribute("price", int, True), Attribute("rating", float, False)])
+BOOKS = DataModel("books", [Attribute("city", str, True), Attribute("price", int, True)])
+CITIES = ["Berlin", "Cambridge", "London", "Paris", "Zurich"]
+
+
+def _random_description(rng: random.Random) -> Description:
+    """Generate a random description."""
+    values = {"city": rng.choice(CITIES), "price": rng.randint(0, 20)}
+    if rng.random() < 0.7:
+        values["rating"] = rng.choice([rng.uniform(0.0, 5.0), rng.randint(0, 5)])
+    if rng.random() < 0.1:
+        values["price"] = str(values["price"])
+    return Description(values, data_model=rng.choice([WEATHER, BOOKS, None]))
+
+
+QUERIES = [
+    Query([]),
+    Query([], model=WEATHER),
+    Query([Constraint("city", ConstraintType("==", "London"))], model=WEATHER),
+    Query([Constraint("city", ConstraintType("in", ["Paris", "Zurich"]))]),
+    Query([Constraint("price", ConstraintType("within", (5, 10)))], model=BOOKS),
+    Query([Constraint("price", ConstraintType("<", 15)), Constraint("price", ConstraintType(">=", 18))]),
+    Query([Constraint("price", ConstraintType("<=", 15)), Constraint("city", ConstraintType("!=", "Berlin"))]),
+    Query([Constraint("price", ConstraintType(">", 3))]),
+    Query([Constraint("rating", ConstraintType("within", (1.5, 3.5)))]),
+    Query([Constraint("rating", ConstraintType(">", 2))]),
+    Query([Constraint("city", ConstraintType("<", "London"))]),
+    Query([Or([Constraint("city", ConstraintType("==", "Berlin")), Constraint("price", ConstraintType("==", 7))])]),
+    Query([Or([Constraint("city", ConstraintType("==", "Berlin")), Not(Constraint("price", ConstraintType("==", 7)))])]),
+    Query([And([Constraint("city", ConstraintType("not_in", ["Paris"])), Constraint("price", ConstraintType("in", [1, 2, 3]))])]),
+    Query([Constraint("missing", ConstraintType("==", 1))]),
+]
+
+
+def _expected(entries, query: Query):
+    """Search the entries by checking every description against the query."""
+    return sorted({public_key for public_key, description in entries
+                   if (query.model is None or description.data_model == query.model) and query.check(description)})
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_matches_full_scan(query):
+    """Test that the indexed search returns the same agents as a check of every description."""
+    rng = random.Random(0)
+    directory = ServiceDirectory()
+    entries = []
+    for i in range(500):
+        entry = ("agent_{}".format(i % 200), _random_description(rng))
+        if directory.register(*entry):
+            entries.append(entry)
+    assert directory.search(query) == _expected(entries, query)
+
+    # the sorted indexes, built by the first search, are kept up to date.
+    for _ in range(200):
+        if rng.random() < 0.5:
+            entry = entries.pop(rng.randrange(len(entries)))
+            assert directory.unregister(*entry)
+        else:
+            entry = ("agent_{}".format(rng.randrange(300)), _random_description(rng))
+            if directory.register(*entry):
+                entries.append(entry)
+    assert directory.search(query) == _expected(entries, query)
+
+
+def test_register_and_unregister():
+    """Test the registration and the unregistration of the descriptions."""
+    directory = ServiceDirectory()
+    description = Description({"city": "London", "price": 3}, data_model=WEATHER)
+    directory.register("agent_1", description)
+    directory.register("agent_1", Description({"city": "Paris", "price": 3}, data_model=WEATHER))
+    directory.register("agent_2", description)
+    assert len(directory) == 3 and "agent_1" in directory
+    assert directory.get("agent_1")[0] == description
+
+    query = Query([Constraint("city", ConstraintType("==", "London"))], model=WEATHER)
+    assert directory.search(query) == ["agent_1", "agent_2"]
+    assert not directory.register("agent_1", Description({"price": 3, "city": "London"}, data_model=WEATHER))
+    assert len(directory) == 3
+    assert directory.unregister("agent_1", description)
+    assert not directory.unregister("agent_1", description)
+    assert directory.search(query) == ["agent_2"]
+
+    directory.remove("agent_2")
+    assert "agent_2" not in directory
+    assert directory.public_keys == ["agent_1"]
+    assert directory.search(query) == []
+
+
+def test_unhashable_values():
+    """Test that the descriptions with unhashable values are still found by the full check."""
+    directory = ServiceDirectory()
+    directory.register("agent_1", Description({"tags": ["a", "b"]}))
+    directory.register("agent_2", Description({"tags": ("a", "b")}))
+    assert directory.search(Query([Constraint("tags", ConstraintType("==", 1))])) == []
+    assert directory.search(Query([Constraint("tags", ConstraintType("!=", 1))])) == []
+    directory.remove("agent_1")
+    assert len(directory) == 1
+
+
+def test_nan_values():
+    """Test that the NaN values, which are not ordered, do not break the range searches."""
+    rng = random.Random(0)
+    directory = ServiceDirectory()
+    entries = [("agent_{}".format(i), Description({"price": float("nan") if i % 7 == 0 else rng.uniform(0.0, 10.0)}))
+               for i in range(200)]
+    for entry in entries:
+        directory.register(*entry)
+    queries = [Query([Constraint("price", ConstraintType("<", 5.0))]),
+               Query([Constraint("price", ConstraintType("within", (2.0, 8.0)))]),
+               Query([Constraint("price", ConstraintType("!=", 5.0))])]
+    for query in queries:
+        assert directory.search(query) == _expected(entries, query)
+
+    # the sorted indexes, built by the first search, skip the NaN values of the later registrations too.
+    for i in range(200, 300):
+        entry = ("agent_{}".format(i), Description({"price": float("nan") if i % 3 == 0 else rng.uniform(0.0, 10.0)}))
+        directory.register(*entry)
+        entries.append(entry)
+    for entry in entries[:100]:
+        directory.unregister(*entry)
+    entries = entries[100:]
+    for query in queries:
+        assert directory.search(query) == _expected(entries, query)
+
+
+def test_replace():
+    """Test that a description can be replaced by an updated one."""
+    directory = ServiceDirectory()
+    old = Description({"city": "London", "price": 3}, data_model=WEATHER)
+    new = Description({"city": "London", "price": 4}, data_model=WEATHER)
+    directory.register("agent_1", old)
+    query = Query([Constraint("price", ConstraintType("<", 3))], model=WEATHER)
+    assert directory.search(query) == []
+    assert directory.replace("agent_1", old, new)
+    assert directory.get("agent_1") == [new]
+    assert directory.search(query) == ["agent_1"]
+    assert not directory.replace("agent_2", old, new)
+    assert directory.public_keys == ["agent_1", "agent_2"]
+
+
+def test_description_hash():
+    """Test that the hash of a description is consistent with its equality."""
+    description = Description({"city": "London", "tags": ["a", {"b": 1}]}, data_model=WEATHER)
+    same = Description({"tags": ["a", {"b": 1}], "city": "London"}, data_model=WEATHER)
+    assert description == same and hash(description) == hash(same)
+    assert len({description, same, Description({"city": "London", "tags": ["a", {"b": 1}]})}) == 2
+
+
+@pytest.mark.parametrize("order_by", [None, "price", "rating", "city", "missing"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [None, 1, 7, 1000])
+def test_search_ranked(order_by, descending, limit):
+    """Test that the heap selection of the ranked results matches a full sort of the matching agents."""
+    rng = random.Random(1)
+    directory = ServiceDirectory()
+    entries = []
+    for i in range(300):
+        entry = ("agent_{}".format(i % 100), _random_description(rng))
+        if directory.register(*entry):
+            entries.append(entry)
+    query = Query([Constraint("city", ConstraintType("!=", "Paris"))], order_by=order_by, descending=descending, limit=limit)
+    public_keys = _expected(entries, query)
+    if order_by is not None:
+        best_key = {public_key: min(query.ordering_key(description) for key, description in entries
+                                    if key == public_key and query.check(description))
+                    for public_key in public_keys}
+        public_keys.sort(key=lambda public_key: (best_key[public_key], public_key))
+    assert directory.search(query) == public_keys[:limit]
+
+
+def test_search_cheapest():
+    """Test that the agents are ranked by their best description, with the incomparable values last."""
+    directory = ServiceDirectory()
+    directory.register("agent_1", Description({"city": "London", "price": 10}))
+    directory.register("agent_1", Description({"city": "London", "price": 2}))
+    directory.register("agent_2", Description({"city": "London", "price": 5.5}))
+    directory.register("agent_3", Description({"city": "London", "price": "cheap"}))
+    directory.register("agent_4", Description({"city": "London"}))
+    directory.register("agent_5", Description({"city": "London", "price": float("nan")}))
+    directory.register("agent_6", Description({"city": "Paris", "price": 1}))
+    constraints = [Constraint("city", ConstraintType("==", "London"))]
+    assert directory.search(Query(constraints, order_by="price")) == ["agent_1", "agent_2", "agent_3", "agent_4", "agent_5"]
+    assert directory.search(Query(constraints, order_by="price", limit=2)) == ["agent_1", "agent_2"]
+    assert directory.search(Query(constraints, order_by="price", descending=True, limit=3)) == ["agent_1", "agent_2", "agent_3"]
+    assert directory.search(Query(constraints, limit=2)) == ["agent_1", "agent_2"]
+    with pytest.raises(AssertionError):
+        Query(constraints, limit=0)
@@ -29,7 +29,7 @@ from aea.protocols.fipa.message import FIPAMessage
 from aea.protocols.fipa.serialization import FIPASerializer
 from aea.protocols.oef.message import OEFMessage
 from aea.protocols.oef.models import Query, DataModel, Description, Constraint, ConstraintType
-from aea.protocols.oef.serialization import DEFAULT_OEF, OEFSerializer
+from aea.protocols.oef.serialization import DEFAULT_OEF, OEFSerializer, _encode
 
 
 class TestEmptySearch:
@@ -89,6 +89,44 @@ class TestEmptySearch:
         cls.node.stop()
 
 
+class TestCorruptedOEFMessage:
+    """Test that the node discards a corrupted OEF message, and keeps serving the agents."""
+
+    @classmethod
+    def setup_class(cls):
+        """Set up the test."""
+        cls.node = LocalNode()
+        cls.node.start()
+
+        cls.public_key_1 = "public_key_1"
+        cls.multiplexer = Multiplexer([OEFLocalConnection(cls.public_key_1, cls.node)])
+        cls.multiplexer.connect()
+
+    def test_corrupted_message_is_discarded(self):
+        """Test that a search request sent after a corrupted message gets its result."""
+        for corrupted in [b"\xff", _encode({"type": "search_services"})]:
+            envelope = Envelope(to=DEFAULT_OEF, sender=self.public_key_1, protocol_id=OEFMessage.protocol_id,
+                                message=corrupted)
+            self.multiplexer.put(envelope)
+
+        search_services_request = OEFMessage(oef_type=OEFMessage.Type.SEARCH_SERVICES, id=1, query=Query([]))
+        envelope = Envelope(to=DEFAULT_OEF, sender=self.public_key_1, protocol_id=OEFMessage.protocol_id,
+                            message=OEFSerializer().encode(search_services_request))
+        self.multiplexer.put(envelope)
+
+        response_envelope = self.multiplexer.get(block=True, timeout=2.0)
+        search_result = OEFSerializer().decode(response_envelope.message)
+        assert search_result.get("type") == OEFMessage.Type.SEARCH_RESULT
+        assert search_result.get("id") == 1
+        assert self.node._receiving_loop_task is not None and not self.node._receiving_loop_task.done()
+
+    @classmethod
+    def teardown_class(cls):
+        """Teardown the test."""
+        cls.multiplexer.disconnect()
+        cls.node.stop()
+
+
 class TestSimpleSearchResult:
     """Test that a simple search result return the expected result."""
 
@@ -182,8 +220,8 @@ class TestUnregister:
         envelope = Envelope(to=DEFAULT_OEF, sender=self.public_key_1, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         self.multiplexer1.put(envelope)
 
-        # Search for the register agent
-        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_AGENTS, id=0, query=Query([Constraint("foo", ConstraintType("==", 1))]))
+        # Search for the registered service
+        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_SERVICES, id=0, query=Query([Constraint("foo", ConstraintType("==", 1))]))
         msg_bytes = OEFSerializer().encode(msg)
         envelope = Envelope(to=DEFAULT_OEF, sender=self.public_key_1, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         self.multiplexer1.put(envelope)
@@ -205,8 +243,8 @@ class TestUnregister:
         self.multiplexer1.put(envelope)
 
         # the same query returns empty
-        # Search for the register agent
-        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_AGENTS, id=0, query=Query([Constraint("foo", ConstraintType("==", 1))]))
+        # Search for the registered service
+        msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_SERVICES, id=0, query=Query([Constraint("foo", ConstraintType("==", 1))]))
         msg_bytes = OEFSerializer().encode(msg)
         envelope = Envelope(to=DEFAULT_OEF, sender=self.public_key_1, protocol_id=OEFMessage.protocol_id, message=msg_bytes)
         self.multiplexer1.put(envelope)
@@ -24,6 +24,7 @@ from unittest import mock
 import pytest
 
 from aea.connections.oef.connection import OEFObjectTranslator
+from aea.protocols.oef.batch import DescriptionBatch
 from aea.protocols.oef.models import Attribute, DataModel, Description, Query, And, Or, Not, Constraint, ConstraintType
 
 
@@ -83,6 +84,14 @@ class TestTranslator:
         actual_query = query
         assert expected_query == actual_query
 
+    def test_search_result(self):
+        """Test the selection of the agents found by the OEF."""
+        agents = ["agent_3", "agent_1", "agent_2"]
+        assert OEFObjectTranslator.from_oef_search_result(agents, Query([])) == agents
+        assert OEFObjectTranslator.from_oef_search_result(agents, Query([], limit=2)) == ["agent_1", "agent_2"]
+        ranked_query = Query([], order_by="price", limit=1)
+        assert OEFObjectTranslator.from_oef_search_result(agents, ranked_query) == ["agent_1", "agent_2", "agent_3"]
+
 
 class TestPickable:
     """Test that the OEF objects can be pickled."""
@@ -180,6 +189,15 @@ class TestCheckValidity:
             mocked_types.EQUAL.value = "unknown"
             assert not m_constraint._check_validity(), "My constraint must not be valid"
 
+    def test_collection_constraints_check(self):
+        """Test that the within, in and not_in constraints check the type of the elements."""
+        description = Description({"foo": 5, "bar": "baz"})
+        assert Constraint("foo", ConstraintType("within", (1, 10))).check(description)
+        assert not Constraint("foo", ConstraintType("within", (1.0, 10.0))).check(description)
+        assert Constraint("bar", ConstraintType("in", ["baz", "qux"])).check(description)
+        assert not Constraint("bar", ConstraintType("not_in", {"baz"})).check(description)
+        assert not Constraint("foo", ConstraintType("in", ["5"])).check(description)
+
     def test_not_check(self):
         """Test the not().check function."""
         attribute_foo = Attribute("foo", int, True, "a foo attribute.")
@@ -228,3 +246,145 @@ class TestCheckValidity:
         ],
             data_model_foobar)
         assert not query.check(description=description_foobar)
+
+
+class TestCompile:
+    """Test that the compiled queries are equivalent to the check methods."""
+
+    descriptions = [
+        Description({"foo": foo, "bar": bar})
+        for foo in (0, 1, 2, 5, 10, 1.0, "1", True)
+        for bar in ("baz", "qux", "", 3)
+    ] + [Description({}), Description({"foo": 1}), Description({"bar": "baz"})]
+
+    constraints = [
+        Constraint("foo", ConstraintType(constraint_type, value))
+        for constraint_type, value in [("==", 1), ("!=", 1), ("<", 1), ("<=", 1), (">", 1), (">=", 1),
+                                       ("==", 1.0), ("<", "1"), ("==", True)]
+    ] + [
+        Constraint("foo", ConstraintType("within", (1, 5))),
+        Constraint("foo", ConstraintType("within", [1.0, 5.0])),
+        Constraint("foo", ConstraintType("in", [0, 2, 10])),
+        Constraint("foo", ConstraintType("not_in", {1, 5})),
+        Constraint("bar", ConstraintType("in", ("baz", ""))),
+        Constraint("bar", ConstraintType("not_in", ["qux"])),
+        Constraint("bar", ConstraintType("==", "baz")),
+    ]
+
+    def _assert_equivalent(self, expr):
+        """Assert that the compiled expression gives the same results as check."""
+        predicate = expr.compile()
+        for description in self.descriptions:
+            assert predicate(description) == expr.check(description), "{} on {}".format(expr, description.values)
+
+    def test_constraints(self):
+        """Test the compiled constraints."""
+        for constraint in self.constraints:
+            self._assert_equivalent(constraint)
+
+    def test_expressions(self):
+        """Test the compiled nested expressions, including the ones which are flattened."""
+        for index, first in enumerate(self.constraints):
+            second = self.constraints[(index * 7 + 3) % len(self.constraints)]
+            third = self.constraints[(index * 5 + 1) % len(self.constraints)]
+            self._assert_equivalent(And([first, And([second, Not(third)])]))
+            self._assert_equivalent(Or([Or([first, second]), And([Not(Not(third)), first])]))
+            self._assert_equivalent(Not(Or([first, Not(second)])))
+            self._assert_equivalent(Or([first]))
+            self._assert_equivalent(Query([first, Or([second, third])]))
+
+    def test_empty_collection(self):
+        """Test that the constraints on an empty collection do not fail, even on unhashable values."""
+        for description in [Description({"foo": 1}), Description({"foo": [1]})]:
+            for constraint in [Constraint("foo", ConstraintType("in", [])), Constraint("foo", ConstraintType("not_in", ()))]:
+                assert constraint.compile()(description) == constraint.check(description)
+            assert not Constraint("foo", ConstraintType("in", [])).check(description)
+            assert Query([Constraint("foo", ConstraintType("not_in", []))]).compile()(description)
+
+    def test_unhashable_value(self):
+        """Test that the compiled collection constraint types look unhashable values up like check."""
+        for constraint_type in [ConstraintType("in", [1, 2]), ConstraintType("not_in", [1, 2]), ConstraintType("in", [])]:
+            assert constraint_type.compile()([1]) == constraint_type.check([1])
+
+    def test_empty_query(self):
+        """Test that the compiled empty query is satisfied by any description."""
+        predicate = Query([]).compile()
+        assert all(predicate(description) for description in self.descriptions)
+
+    def test_unknown_constraint_type(self):
+        """Test that compiling an unknown constraint type raises an error."""
+        constraint_type = ConstraintType("==", 1)
+        constraint_type.type = "unknown"
+        with pytest.raises(ValueError):
+            constraint_type.compile()
+
+
+class TestDescriptionBatch:
+    """Test that the masks of a batch of descriptions are equivalent to the check methods."""
+
+    descriptions = TestCompile.descriptions + [
+        Description({"foo": 2 ** 70, "bar": "baz\x00"}),
+        Description({"foo": float("nan"), "bar": "ba"}),
+        Description({"foo": False, "bar": ("baz",)}),
+    ]
+
+    constraints = TestCompile.constraints + [
+        Constraint("foo", ConstraintType("<", 2 ** 65)),
+        Constraint("foo", ConstraintType("within", (0, 2 ** 80))),
+        Constraint("foo", ConstraintType("in", [2 ** 70, 5])),
+        Constraint("foo", ConstraintType("not_in", [False])),
+        Constraint("foo", ConstraintType("!=", 0.0)),
+        Constraint("bar", ConstraintType(">=", "baz")),
+        Constraint("bar", ConstraintType("==", "baz\x00")),
+        Constraint("foo", ConstraintType("in", [5, True])),
+        Constraint("bar", ConstraintType("in", [])),
+        Constraint("bar", ConstraintType("in", {"bazz", "qux"})),
+        Constraint("bar", ConstraintType("not_in", ["quxx"])),
+        Constraint("bar", ConstraintType("==", "bazz")),
+        Constraint("bar", ConstraintType("<", "bazz")),
+    ]
+
+    def _assert_equivalent(self, expr):
+        """Assert that the mask of the expression gives the same results as check."""
+        batch = DescriptionBatch(self.descriptions)
+        expected = [expr.check(description) for description in self.descriptions]
+        assert expr.mask(batch).tolist() == expected, "{}".format(expr)
+
+    def test_constraints(self):
+        """Test the masks of the constraints."""
+        for constraint in self.constraints:
+            self._assert_equivalent(constraint)
+
+    def test_expressions(self):
+        """Test the masks of the nested expressions."""
+        for index, first in enumerate(self.constraints):
+            second = self.constraints[(index * 7 + 3) % len(self.constraints)]
+            third = self.constraints[(index * 5 + 1) % len(self.constraints)]
+            self._assert_equivalent(And([first, And([second, Not(third)])]))
+            self._assert_equivalent(Or([Or([first, second]), And([Not(Not(third)), first])]))
+            self._assert_equivalent(Query([first, Or([second, third])]))
+
+    def test_filter(self):
+        """Test that the query filter returns the matching descriptions in order."""
+        batch = DescriptionBatch(self.descriptions)
+        query = Query([Constraint("bar", ConstraintType("==", "baz")), Constraint("foo", ConstraintType(">", 1))])
+        assert query.filter(batch) == [description for description in self.descriptions if query.check(description)]
+        assert Query([]).filter(batch) == self.descriptions
+        assert query.filter(DescriptionBatch([])) == []
+
+    def test_constraint_strings(self):
+        """Test that the constraint strings are not truncated to the width of a column, nor stripped of their null characters."""
+        batch = DescriptionBatch([Description({"name": "abc"}), Description({"name": "xyz"}), Description({"name": ""})])
+        assert Query([Constraint("name", ConstraintType("in", {"abcd"}))]).filter(batch) == []
+        assert Query([Constraint("name", ConstraintType("not_in", ["abcd", "xyzw"]))]).filter(batch) == batch.descriptions
+        for constraint_type in [ConstraintType("==", "\x00"), ConstraintType("<=", "\x00"), ConstraintType("in", ["\x00"])]:
+            query = Query([Constraint("name", constraint_type)])
+            assert query.filter(batch) == [description for description in batch.descriptions if query.check(description)]
+
+    def test_batch_is_a_snapshot(self):
+        """Test that the batch does not follow the changes of the descriptions."""
+        description = Description({"foo": 1})
+        batch = DescriptionBatch([description])
+        description.values["foo"] = 2
+        assert len(batch) == 1 and batch.descriptions == [description]
+        assert Constraint("foo", ConstraintType("==", 1)).mask(batch).tolist() == [True]
@@ -19,9 +19,15 @@
 
 """This test module contains the tests for the OEF serializer."""
 
+import pickle
+
+import pytest
+
 from aea.protocols.oef.message import OEFMessage
-from aea.protocols.oef.serialization import OEFSerializer
-from aea.protocols.oef.models import Attribute, DataModel, Description
+from aea.protocols.oef.serialization import OEFSerializer, encode_description, decode_description, encode_query, \
+    decode_query, _encode
+from aea.protocols.oef.models import Attribute, DataModel, Description, Query, And, Or, Not, Constraint, \
+    ConstraintType
 
 
 def test_oef_serialization():
@@ -31,3 +37,81 @@ def test_oef_serialization():
     msg = OEFMessage(oef_type=OEFMessage.Type.REGISTER_SERVICE, id=1, service_description=desc, service_id="")
     msg_bytes = OEFSerializer().encode(msg)
     assert len(msg_bytes) > 0
+
+
+def test_oef_serialization_roundtrip():
+    """Test that the binary codec decodes the messages it encodes."""
+    data_model = DataModel("foo", [Attribute("bar", int, True, "A bar attribute."),
+                                   Attribute("baz", str, False),
+                                   Attribute("price", float, True),
+                                   Attribute("available", bool, False)])
+    desc = Description({"bar": 2 ** 70, "baz": "ünïcode", "price": 1.5, "available": True}, data_model=data_model)
+    query = Query([And([Constraint("bar", ConstraintType(">=", 1)),
+                        Or([Constraint("baz", ConstraintType("in", {"a", "b"})),
+                            Not(Constraint("baz", ConstraintType("not_in", ["c"])))])]),
+                   Constraint("price", ConstraintType("within", (1.0, 2.0)))], model=data_model)
+    messages = [
+        OEFMessage(oef_type=OEFMessage.Type.REGISTER_SERVICE, id=1, service_description=desc, service_id="s"),
+        OEFMessage(oef_type=OEFMessage.Type.UNREGISTER_AGENT, id=2, agent_description=Description({}), agent_id="a"),
+        OEFMessage(oef_type=OEFMessage.Type.SEARCH_SERVICES, id=3, query=query),
+        OEFMessage(oef_type=OEFMessage.Type.SEARCH_AGENTS, id=4, query=Query([])),
+        OEFMessage(oef_type=OEFMessage.Type.SEARCH_SERVICES, id=3, query=Query([], order_by="price", limit=3)),
+        OEFMessage(oef_type=OEFMessage.Type.SEARCH_SERVICES, id=3, query=Query([], order_by="price", descending=True)),
+        OEFMessage(oef_type=OEFMessage.Type.SEARCH_AGENTS, id=4, query=Query([], model=data_model, limit=1)),
+        OEFMessage(oef_type=OEFMessage.Type.SEARCH_RESULT, id=5, agents=["agent_1", "agent_2"]),
+        OEFMessage(oef_type=OEFMessage.Type.OEF_ERROR, id=6, operation=OEFMessage.OEFErrorOperation.SEARCH_AGENTS),
+        OEFMessage(oef_type=OEFMessage.Type.DIALOGUE_ERROR, id=7, dialogue_id=1, origin="agent_1"),
+    ]
+    for msg in messages:
+        assert OEFSerializer().decode(OEFSerializer().encode(msg)) == msg
+
+    assert decode_description(encode_description(desc)) == desc
+    assert decode_query(encode_query(query)) == query
+
+
+def test_oef_serialization_ranked_query():
+    """Test that the ordering and the limit of a query are encoded, and that the other queries are encoded as before."""
+    query = Query([Constraint("bar", ConstraintType(">=", 1))])
+    ranked_query = Query([Constraint("bar", ConstraintType(">=", 1))], order_by="price", descending=True, limit=5)
+    assert encode_query(query)[0:1] == b"\x0e"
+    assert encode_query(ranked_query)[0:1] == b"\x0f"
+    assert decode_query(encode_query(ranked_query)) == ranked_query
+    assert decode_query(encode_query(ranked_query)) != query
+    assert decode_query(encode_query(Query([], limit=2 ** 40))).limit == 2 ** 32 - 1
+
+
+def test_oef_serialization_malformed():
+    """Test that decoding malformed bytes raises a ValueError."""
+    msg = OEFMessage(oef_type=OEFMessage.Type.SEARCH_RESULT, id=5, agents=["agent_1"])
+    msg_bytes = OEFSerializer().encode(msg)
+    for malformed in [msg_bytes[:-1], msg_bytes + b"\x00", b"\xff", b"", pickle.dumps(msg.body)]:
+        with pytest.raises(ValueError):
+            OEFSerializer().decode(malformed)
+    with pytest.raises(ValueError):
+        decode_query(encode_description(Description({})))
+
+
+@pytest.mark.parametrize("body", [{}, {"type": [1]}, {"type": "search_result"}, {"type": "oef_error", "id": 1},
+                                  {"type": "search_result", "id": 1, "agents": 1}, {"type": "oef_error", "id": 1, "operation": {}}])
+def test_oef_serialization_corrupted(body):
+    """Test that decoding a well-formed buffer with a corrupted message body raises a ValueError, whatever the failure."""
+    with pytest.raises(ValueError):
+        OEFSerializer().decode(_encode(body))
+
+
+def test_oef_serialization_corrupted_value():
+    """Test that decoding a buffer whose values cannot be built raises a ValueError."""
+    with pytest.raises(ValueError):
+        OEFSerializer().decode(_encode({"type": "search_result", "id": 1, "agents": {("a",)}}).replace(b"\x09", b"\x08"))
+
+
+def test_decoded_data_models_are_not_shared():
+    """Test that the decoded messages do not share the cached data models."""
+    data_model = DataModel("foo", [Attribute("bar", int, True, "A bar attribute.")])
+    description_bytes = encode_description(Description({"bar": 1}, data_model=data_model))
+    first = decode_description(description_bytes)
+    first.data_model.attributes.append(Attribute("baz", str, False))
+    first.data_model.name = "changed"
+    second = decode_description(description_bytes)
+    assert second.data_model == data_model
+    assert second.data_model is not first.data_model
@@ -73,3 +73,23 @@ class TestTransaction:
                                               ledger_id="fetchai")
 
         assert msg.matches(mirrored_message), "It should match since the messages mirror each other"
+
+    def test_fields(self):
+        """Test that the fields of the message are accessible as attributes."""
+        msg = TransactionMessage(performative=TransactionMessage.Performative.PROPOSE,
+                                 skill_id="default",
+                                 transaction_id="transaction0",
+                                 sender="agent_1",
+                                 counterparty="pk",
+                                 is_sender_buyer=True,
+                                 currency_pbk="FET",
+                                 amount=2,
+                                 sender_tx_fee=1,
+                                 counterparty_tx_fee=0,
+                                 quantities_by_good_pbk={"good": 10},
+                                 ledger_id="fetchai")
+        assert msg.performative == TransactionMessage.Performative.PROPOSE
+        assert (msg.transaction_id, msg.sender, msg.counterparty, msg.amount) == ("transaction0", "agent_1", "pk", 2)
+        assert msg.quantities_by_good_pbk == {"good": 10} and msg.transaction_digest is None
+        msg.transaction_digest = "digest"
+        assert msg.get("transaction_digest") == "digest"
@@ -0,0 +1,128 @@
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests for the scheduler of the coroutines of the skills."""
+import asyncio
+from unittest import mock
+
+import pytest
+
+from aea.helpers.async_utils import CoroutineScheduler
+
+
+class _Recorder:
+    """Record the coroutines running at the same time."""
+
+    def __init__(self):
+        """Initialize the recorder."""
+        self.running = 0
+        self.max_running = 0
+        self.events = []
+
+    async def run(self, name: str, delay: float = 0.01):
+        """Run for a while, recording the start and the end."""
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.events.append(("start", name))
+        await asyncio.sleep(delay)
+        self.events.append(("end", name))
+        self.running -= 1
+        return name
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    """Test that the coroutines of a group run at most 'limit' at a time, and the groups independently."""
+    scheduler = CoroutineScheduler()
+    recorder, other = _Recorder(), _Recorder()
+    futures = [scheduler.submit(recorder.run(str(i)), "skill", 2) for i in range(6)]
+    futures += [scheduler.submit(other.run(str(i)), "other", 3) for i in range(6)]
+    assert scheduler.pending == 12
+    results = await asyncio.gather(*futures)
+    assert results == [str(i) for i in range(6)] * 2
+    assert recorder.max_running == 2 and other.max_running == 3
+    assert scheduler.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_ordering_key():
+    """Test that the coroutines with the same key run in order, and the others concurrently."""
+    scheduler = CoroutineScheduler()
+    recorder = _Recorder()
+    futures = [
+        scheduler.submit(recorder.run("a1", delay=0.03), "skill", 10, key="a"),
+        scheduler.submit(recorder.run("b1"), "skill", 10, key="b"),
+        scheduler.submit(recorder.run("a2"), "skill", 10, key="a"),
+    ]
+    await asyncio.gather(*futures)
+    assert recorder.events.index(("end", "a1")) < recorder.events.index(("start", "a2"))
+    assert recorder.events.index(("start", "b1")) < recorder.events.index(("end", "a1"))
+    assert scheduler._tails == {}
+
+
+@pytest.mark.asyncio
+async def test_failure_does_not_break_ordering():
+    """Test that a failing coroutine is logged, and does not prevent its successors from running."""
+    async def fail():
+        raise ValueError("failed")
+
+    scheduler = CoroutineScheduler()
+    recorder = _Recorder()
+    with mock.patch("aea.helpers.async_utils.logger.error") as mock_error:
+        failing = scheduler.submit(fail(), "skill", 1, key="a")
+        following = scheduler.submit(recorder.run("a2"), "skill", 1, key="a")
+        assert await following == "a2"
+        assert isinstance(failing.exception(), ValueError)
+    mock_error.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_close():
+    """Test that closing the scheduler cancels the running and the waiting coroutines."""
+    scheduler = CoroutineScheduler()
+    recorder = _Recorder()
+    running = scheduler.submit(recorder.run("a1", delay=10), "skill", 1, key="a")
+    waiting = scheduler.submit(recorder.run("a2"), "skill", 1, key="a")
+    await asyncio.sleep(0.01)
+    await scheduler.close()
+    assert running.cancelled() and waiting.cancelled()
+    assert recorder.events == [("start", "a1")]
+    assert scheduler.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_room():
+    """Test that waiting for room in a group returns once its backlog is below the maximum."""
+    scheduler = CoroutineScheduler()
+    recorder = _Recorder()
+    futures = [scheduler.submit(recorder.run(str(i)), "skill", 1) for i in range(3)]
+    scheduler.submit(recorder.run("other"), "other", 1)
+    assert scheduler.backlog("skill") == 3
+    await asyncio.wait_for(scheduler.wait_for_room("skill", 4), timeout=0.1)
+
+    cancelled = asyncio.ensure_future(scheduler.wait_for_room("skill", 2))
+    waiting = asyncio.ensure_future(scheduler.wait_for_room("skill", 2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.wait_for(waiting, timeout=1.0)
+    assert scheduler.backlog("skill") < 2
+    assert futures[0].done()
+
+    await scheduler.close()
+    assert scheduler.backlog("skill") == 0 and scheduler._room_waiters == {}
@@ -18,11 +18,13 @@
 # ------------------------------------------------------------------------------
 
 """This module contains the tests for the helper module."""
+import asyncio
 import os
 import sys
+from unittest import mock
 
 from aea.connections.oef.connection import OEFConnection
-from aea.helpers.base import locate
+from aea.helpers.base import locate, await_if_awaitable, discard_if_awaitable
 from ..conftest import CUR_PATH
 
 
@@ -64,3 +66,28 @@ class TestHelpersBase:
 
         result = locate("ThisClassDoesNotExist")
         assert result is None
+
+    def test_await_if_awaitable(self):
+        """Test that coroutines are awaited and plain values are returned as they are."""
+        async def coroutine_function():
+            return 42
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(await_if_awaitable(coroutine_function())) == 42
+            assert loop.run_until_complete(await_if_awaitable(None)) is None
+        finally:
+            loop.close()
+
+    def test_discard_if_awaitable(self):
+        """Test that the awaitables of a synchronous agent are closed with an error, and plain values are ignored."""
+        async def coroutine_function():
+            return 42  # pragma: no cover
+
+        coroutine = coroutine_function()
+        with mock.patch("aea.helpers.base.logger") as mock_logger:
+            discard_if_awaitable(coroutine, self)
+            assert coroutine.cr_frame is None, "The coroutine was not closed."
+            mock_logger.error.assert_called_once()
+            discard_if_awaitable(None, self)
+            mock_logger.error.assert_called_once()
@@ -20,12 +20,14 @@
 """This module contains the tests for Envelope of mail.base.py."""
 import time
 import unittest.mock
+from threading import Event
 
 import pytest
 
 import aea
 from aea.connections.local.connection import LocalNode, OEFLocalConnection
-from aea.mail.base import Envelope, InBox, OutBox, Multiplexer
+from aea.mail.base import Envelope, EnvelopeContext, InBox, OutBox, Multiplexer, \
+    NotifyingQueue, PriorityLanes, LengthPrefixedEnvelopeSerializer
 from aea.protocols.base import Message
 from aea.protocols.base import ProtobufSerializer
 from aea.protocols.default.message import DefaultMessage
@@ -57,6 +59,87 @@ def test_envelope_initialisation():
     assert envelope.message == b"HelloWorld", "Cannot set message on Envelope"
 
 
+def test_envelope_hash_and_context():
+    """Test that envelopes are slotted and hashable, and that their context is created on first access."""
+    envelope_1 = Envelope(to="Agent1", sender="Agent0", protocol_id="default", message=b"hello")
+    envelope_2 = Envelope(to="Agent1", sender="Agent0", protocol_id="default", message=b"hello")
+    assert not hasattr(envelope_1, "__dict__")
+    assert envelope_1 == envelope_2 and hash(envelope_1) == hash(envelope_2)
+    assert len({envelope_1, envelope_2}) == 1
+
+    envelope_2.message = b"world"
+    assert envelope_1 != envelope_2
+    assert hash(envelope_2) == hash(Envelope(to="Agent1", sender="Agent0", protocol_id="default", message=b"world"))
+
+    assert envelope_1.context is not envelope_2.context
+    assert envelope_1.context == EnvelopeContext()
+    envelope_1.context.connection_id = "stub"
+    assert envelope_1.context.connection_id == "stub"
+    assert envelope_2.context.connection_id is None
+    assert envelope_1 != Envelope(to="Agent1", sender="Agent0", protocol_id="default", message=b"hello")
+    assert envelope_1 == Envelope(to="Agent1", sender="Agent0", protocol_id="default", message=b"hello",
+                                  context=EnvelopeContext(connection_id="stub"))
+
+    context = envelope_1.context.replace(connection_id="oef")
+    assert context.connection_id == "oef"
+    assert envelope_1.context.connection_id == "stub"
+
+
+def test_length_prefixed_envelope_serializer():
+    """Test that the length-prefixed serializer decodes the message as a view on the buffer."""
+    serializer = LengthPrefixedEnvelopeSerializer()
+    envelope = Envelope(to="Agent1", sender="Agent0", protocol_id="default", message=b"\x00hello,world\n")
+    envelope_bytes = envelope.encode(serializer)
+    decoded = Envelope.decode(envelope_bytes, serializer)
+    assert decoded == envelope
+    assert isinstance(decoded.message, memoryview) and decoded.message.obj is envelope_bytes
+
+    assert decoded.encode(serializer) == envelope_bytes
+    assert Envelope.decode(decoded.encode()) == envelope
+
+    with pytest.raises(ValueError):
+        serializer.decode(envelope_bytes[:-1])
+    with pytest.raises(ValueError):
+        serializer.decode(b"\x00")
+
+
+def test_notifying_queue():
+    """Test that the notifying queue calls its listeners on put."""
+    q = NotifyingQueue()
+    event = Event()
+    q.add_listener(event.set)
+    q.add_listener(event.set)
+    assert not event.is_set()
+    q.put_nowait(1)
+    assert event.is_set(), "The listener must be called after a put."
+    assert q.get_nowait() == 1
+
+    event.clear()
+    q.remove_listener(event.set)
+    q.put_nowait(2)
+    assert not event.is_set(), "A removed listener must not be called."
+
+
+def test_priority_lanes():
+    """Test that the priority lanes are drained by weighted round robin."""
+    lanes = PriorityLanes(lambda item: item[0], weights=(2, 1))
+    for i in range(3):
+        lanes.append((1, i))
+    for i in range(3):
+        lanes.append((0, i))
+    assert len(lanes) == 6
+    assert [lanes.popleft() for _ in range(6)] == [(0, 0), (0, 1), (1, 0), (0, 2), (1, 1), (1, 2)]
+    assert not lanes
+    with pytest.raises(IndexError):
+        lanes.popleft()
+
+    q = NotifyingQueue(lanes=PriorityLanes(lambda item: item[0], weights=(2, 1)))
+    q.put_nowait((1, 0))
+    q.put_nowait((0, 0))
+    assert q.get_nowait() == (0, 0)
+    assert q.get_nowait() == (1, 0)
+
+
 def test_inbox_empty():
     """Tests if the inbox is empty."""
     multiplexer = Multiplexer([DummyConnection()])
@@ -137,6 +220,24 @@ def test_outbox_put_message():
     multiplexer.disconnect()
 
 
+def test_outbox_put_many():
+    """Tests that a batch of envelopes is put into the queue."""
+    msg = DefaultMessage(type=DefaultMessage.Type.BYTES, content=b"hello")
+    message_bytes = DefaultSerializer().encode(msg)
+    multiplexer = Multiplexer([DummyConnection()])
+    outbox = OutBox(multiplexer)
+    inbox = InBox(multiplexer)
+    multiplexer.connect()
+    envelopes = [Envelope(to="Agent1", sender="Agent0", protocol_id=DefaultMessage.protocol_id, message=message_bytes)
+                 for _ in range(10)]
+    outbox.put_many(envelopes)
+    time.sleep(0.5)
+    assert outbox.empty(), "The outbox must be empty after the envelopes have been sent."
+    for envelope in envelopes:
+        assert inbox.get(block=True, timeout=1.0) == envelope
+    multiplexer.disconnect()
+
+
 def test_outbox_empty():
     """Test thet the outbox queue is empty."""
     multiplexer = Multiplexer([DummyConnection()])
@@ -32,7 +32,8 @@ import pytest
 import aea
 from aea.connections.local.connection import LocalNode, OEFLocalConnection
 from aea.connections.stub.connection import StubConnection
-from aea.mail.base import Multiplexer, AEAConnectionError, Envelope, EnvelopeContext
+from aea.mail.base import Multiplexer, AEAConnectionError, Envelope, EnvelopeContext, Full, Watermarks, \
+    HIGH_PRIORITY, LOW_PRIORITY, OutBox
 from aea.protocols.default.message import DefaultMessage
 from aea.protocols.default.serialization import DefaultSerializer
 from .conftest import DummyConnection
@@ -343,3 +344,207 @@ def test_send_message_no_supported_protocol():
                                                    .format(connection_1_id, protocol_id))
 
         multiplexer.disconnect()
+
+
+def test_put_many_preserves_order():
+    """Test that a batch of envelopes put without waiting is sent in order."""
+    multiplexer = Multiplexer([DummyConnection()])
+    multiplexer.connect()
+
+    try:
+        envelopes = [Envelope(to="to", sender="sender", protocol_id="default", message=str(i).encode("utf-8"))
+                     for i in range(100)]
+        multiplexer.put_nowait(envelopes[0])
+        multiplexer.put_many(envelopes[1:])
+
+        received = []
+        for _ in range(len(envelopes)):
+            received.append(multiplexer.get(block=True, timeout=2.0))
+        assert received == envelopes
+        assert len(multiplexer.out_buffer) == 0
+    finally:
+        multiplexer.disconnect()
+
+
+def test_put_fails_fast_when_out_queue_full():
+    """Test that putting envelopes above the high watermark fails fast and is counted."""
+    multiplexer = Multiplexer([DummyConnection()], out_queue_watermarks=Watermarks(high=2), block_when_full=False)
+    envelope = Envelope(to="to", sender="sender", protocol_id="default", message=b"")
+    multiplexer.put_nowait(envelope)
+    multiplexer.put_many([envelope])
+    with pytest.raises(Full):
+        multiplexer.put_many([envelope, envelope])
+    with pytest.raises(Full):
+        multiplexer.put_many([envelope], block=True, timeout=0.1)
+    assert multiplexer.stats.nb_dropped_envelopes == 3
+    assert multiplexer.stats.nb_deferred_puts == 1
+
+
+def test_blocked_put_returns_on_disconnect():
+    """Test that the producers blocked on the high watermark are released when the multiplexer disconnects."""
+    class StuckConnection(DummyConnection):
+        """A connection which never completes a send."""
+
+        async def send(self, envelope: Envelope):
+            """Wait forever."""
+            await asyncio.Event().wait()
+
+    multiplexer = Multiplexer([StuckConnection()], out_queue_watermarks=Watermarks(high=2, low=0), block_when_full=True)
+    multiplexer.connect()
+    envelope = Envelope(to="to", sender="sender", protocol_id="default", message=b"")
+    errors = []
+
+    def put(put_function):
+        try:
+            put_function(envelope)
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        multiplexer.put_many([envelope] * 3, block=False)
+        time.sleep(0.2)
+        threads = [Thread(target=put, args=(lambda e: multiplexer.put_many([e]),)),
+                   Thread(target=put, args=(multiplexer.put,)),
+                   Thread(target=put, args=(OutBox(multiplexer).put,))]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        assert all(thread.is_alive() for thread in threads), "The producers must block on the high watermark."
+    finally:
+        multiplexer.disconnect()
+
+    for thread in threads:
+        thread.join(timeout=2.0)
+        assert not thread.is_alive(), "A producer is still blocked after the disconnection."
+    assert len(errors) == 3 and all(isinstance(e, AEAConnectionError) for e in errors)
+    assert multiplexer.stats.nb_dropped_envelopes == 3
+
+
+def test_in_queue_backpressure():
+    """Test that the reception is paused when the in queue is full, and resumed when it is drained."""
+    multiplexer = Multiplexer([DummyConnection()], in_queue_watermarks=Watermarks(high=2, low=0))
+    multiplexer.connect()
+
+    try:
+        envelopes = [Envelope(to="to", sender="sender", protocol_id="default", message=str(i).encode("utf-8"))
+                     for i in range(5)]
+        for envelope in envelopes:
+            multiplexer.put(envelope)
+        time.sleep(0.5)
+        assert multiplexer.in_queue.qsize() == 2
+        assert multiplexer.stats.nb_deferred_receptions == 1
+
+        received = []
+        for _ in range(len(envelopes)):
+            received.append(multiplexer.get(block=True, timeout=2.0))
+        assert received == envelopes
+    finally:
+        multiplexer.disconnect()
+
+
+def test_receiving_from_many_connections():
+    """Test that each connection is read by its own reader."""
+    connections = [DummyConnection(connection_id="dummy_{}".format(i)) for i in range(10)]
+    multiplexer = Multiplexer(connections)
+    multiplexer.connect()
+
+    try:
+        envelopes = [Envelope(to="to", sender="sender", protocol_id="default", message=str(i).encode("utf-8"),
+                              context=EnvelopeContext(connection_id=connection.connection_id))
+                     for i, connection in enumerate(connections) for _ in range(100)]
+        multiplexer.put_many(envelopes)
+
+        received = []
+        for _ in range(len(envelopes)):
+            received.append(multiplexer.get(block=True, timeout=2.0))
+        assert sorted(received, key=lambda e: e.message) == sorted(envelopes, key=lambda e: e.message)
+    finally:
+        multiplexer.disconnect()
+
+
+def test_routing_table():
+    """Test that the envelopes without connection id are routed by destination address and protocol id."""
+    connection_1 = DummyConnection(connection_id="dummy_1")
+    connection_2 = OEFLocalConnection("public_key", LocalNode(), connection_id="dummy_2", restricted_to_protocols={"gym"})
+    connection_3 = DummyConnection(connection_id="dummy_3")
+    multiplexer = Multiplexer([connection_1, connection_2, connection_3], routes={("agent_3", None): "dummy_3"})
+
+    def envelope(to, protocol_id):
+        return Envelope(to=to, sender="sender", protocol_id=protocol_id, message=b"")
+
+    assert multiplexer._route(envelope("agent_1", "default")) is None
+    assert multiplexer._route(envelope("agent_1", "gym")) is connection_2
+    assert multiplexer._route(envelope("agent_3", "default")) is connection_3
+    assert multiplexer._route(envelope("agent_3", "gym")) is connection_3
+
+    multiplexer.add_route("dummy_1", address="agent_3", protocol_id="gym")
+    assert multiplexer._route(envelope("agent_3", "gym")) is connection_1
+    multiplexer.remove_route(address="agent_3", protocol_id="gym")
+    assert multiplexer._route(envelope("agent_3", "gym")) is connection_3
+
+    connection_1.notify_address("agent_4")
+    assert multiplexer._route(envelope("agent_4", "default")) is connection_1
+    connection_2.notify_address("agent_4", is_reachable=False)
+    assert multiplexer._route(envelope("agent_4", "default")) is connection_1
+    connection_1.notify_address("agent_4", is_reachable=False)
+    assert multiplexer._route(envelope("agent_4", "default")) is None
+
+    # the first connection that notified an address keeps it, until it notifies it unreachable.
+    connection_1.notify_address("agent_4")
+    connection_3.notify_address("agent_4")
+    assert multiplexer._route(envelope("agent_4", "gym")) is connection_1
+    assert multiplexer.learned_routes == {"agent_4": "dummy_1"}
+    connection_1.notify_address("agent_4", is_reachable=False)
+    assert multiplexer._route(envelope("agent_4", "default")) is connection_3
+
+    # the learned routes never replace the routes set explicitly.
+    connection_1.notify_address("agent_3")
+    assert multiplexer._route(envelope("agent_3", "default")) is connection_3
+    connection_3.notify_address("agent_3", is_reachable=False)
+    assert multiplexer._route(envelope("agent_3", "default")) is connection_3
+    assert multiplexer.routing_table[("agent_3", None)] == "dummy_3"
+    multiplexer.remove_route(address="agent_3")
+    assert multiplexer._route(envelope("agent_3", "default")) is connection_1
+
+    with pytest.raises(ValueError, match="No connection registered with id"):
+        multiplexer.add_route("unknown", address="agent_1")
+    with pytest.raises(ValueError, match="A route needs"):
+        multiplexer.add_route("dummy_1")
+
+
+def test_send_envelope_through_route():
+    """Test that the multiplexer sends an envelope through the routed connection."""
+    connection_1 = DummyConnection(connection_id="dummy_1")
+    connection_2 = DummyConnection(connection_id="dummy_2")
+    multiplexer = Multiplexer([connection_1, connection_2], routes={("agent_2", None): "dummy_2"})
+    multiplexer.connect()
+
+    try:
+        envelope = Envelope(to="agent_2", sender="sender", protocol_id="default", message=b"")
+        with unittest.mock.patch.object(connection_2, "send", wraps=connection_2.send) as mock_send:
+            multiplexer.put(envelope)
+            assert multiplexer.get(block=True, timeout=2.0) == envelope
+            mock_send.assert_called_with(envelope)
+    finally:
+        multiplexer.disconnect()
+
+
+def test_priority_lanes():
+    """Test that the envelopes of high priority protocols overtake the bulk traffic in the multiplexer queues."""
+    connection = DummyConnection(connection_id="dummy")
+    multiplexer = Multiplexer([connection], protocol_priorities={"oef": HIGH_PRIORITY, "gym": LOW_PRIORITY})
+
+    bulk = [Envelope(to="agent", sender="sender", protocol_id="gym", message=b"") for _ in range(10)]
+    control = Envelope(to="agent", sender="sender", protocol_id="oef", message=b"")
+    for envelope in bulk + [control]:
+        multiplexer.in_queue.put_nowait(envelope)
+    assert multiplexer.get() is control
+    assert [multiplexer.get() for _ in range(10)] == bulk
+
+    multiplexer.connect()
+    try:
+        multiplexer.put_many(bulk + [control])
+        received = [multiplexer.get(block=True, timeout=2.0) for _ in range(11)]
+        assert received.index(control) < 10
+    finally:
+        multiplexer.disconnect()
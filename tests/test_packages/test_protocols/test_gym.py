@@ -20,6 +20,8 @@
 """This module contains the tests of the messages module."""
 from unittest import mock
 
+import numpy as np
+
 from packages.protocols.gym.message import GymMessage
 from packages.protocols.gym.serialization import GymSerializer
 
@@ -52,3 +54,28 @@ def test_gym_serialization():
     actual_msg = GymSerializer().decode(msg_bytes)
     expected_msg = msg
     assert expected_msg == actual_msg
+
+
+def test_gym_serialization_ndarray():
+    """Test that the arrays are sent as raw buffers and decoded without copies."""
+    observation = np.arange(2 * 3 * 4, dtype=np.float32).reshape((2, 3, 4))[:, ::-1]
+    msg = GymMessage(performative=GymMessage.Performative.PERCEPT, observation=observation, reward=1.5,
+                     info={"lives": 3}, done=False, step_id=7)
+    msg_bytes = GymSerializer().encode(msg)
+    assert len(msg_bytes) < observation.nbytes + 100
+    actual_msg = GymSerializer().decode(msg_bytes)
+    actual_observation = actual_msg.get("observation")
+    assert actual_observation.dtype == observation.dtype and actual_observation.shape == observation.shape
+    assert np.array_equal(actual_observation, observation)
+    assert not actual_observation.flags.owndata and actual_observation.flags.aligned
+    assert actual_msg.get("reward") == 1.5 and actual_msg.get("done") is False and actual_msg.get("step_id") == 7
+    assert actual_msg.get("info") == {"lives": 3}
+
+    for action in [np.array(3, dtype=np.int64), np.zeros((0, 2), dtype=np.uint8), np.array([1.0, -1.0])]:
+        msg = GymMessage(performative=GymMessage.Performative.ACT, action=action, step_id=1)
+        actual_action = GymSerializer().decode(GymSerializer().encode(msg)).get("action")
+        assert actual_action.dtype == action.dtype and np.array_equal(actual_action, action)
+
+    for performative in [GymMessage.Performative.RESET, GymMessage.Performative.CLOSE]:
+        msg = GymMessage(performative=performative)
+        assert GymSerializer().decode(GymSerializer().encode(msg)) == msg
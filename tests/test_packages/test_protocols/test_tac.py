@@ -64,6 +64,19 @@ def test_tac_message_instantiation():
             "Expect the consistency to return False"
 
 
+def test_tac_message_fields():
+    """Test that the fields of the tac message are accessible as attributes."""
+    msg = TACMessage(tac_type=TACMessage.Type.TRANSACTION_CONFIRMATION,
+                     transaction_id='some_id',
+                     amount_by_currency={'FET': 10},
+                     quantities_by_good_pbk={'good_1': 20})
+    assert msg.type == TACMessage.Type.TRANSACTION_CONFIRMATION
+    assert msg.transaction_id == 'some_id'
+    assert msg.amount_by_currency == {'FET': 10} and msg.quantities_by_good_pbk == {'good_1': 20}
+    msg.transaction_id = 'other_id'
+    assert msg.get("transaction_id") == 'other_id'
+
+
 def test_tac_serialization():
     """Test that the serialization for the tac message works."""
     msg = TACMessage(tac_type=TACMessage.Type.REGISTER,
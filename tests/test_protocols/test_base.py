@@ -18,12 +18,37 @@
 # ------------------------------------------------------------------------------
 
 """This module contains the tests of the messages module."""
-from typing import cast
+from collections import OrderedDict, defaultdict
+from enum import Enum, IntEnum
+from typing import NamedTuple, cast
+from unittest import mock
+
+import pytest
 
 from aea.configurations.base import ProtocolConfig
 from aea.mail.base import Envelope
-from aea.protocols.base import Message, Serializer, Protocol
-from aea.protocols.base import ProtobufSerializer, JSONSerializer
+from aea.protocols.base import LazyField, Message, MessageField, Serializer, Protocol
+from aea.protocols.base import ProtobufSerializer, JSONSerializer, MessagePackSerializer
+
+
+class _Color(IntEnum):
+    """A color, to check the IntEnum values."""
+
+    RED = 1
+    BIG = 2 ** 64
+
+
+class _Shape(str, Enum):
+    """A shape, to check the str enum values."""
+
+    SQUARE = "square"
+
+
+class _Price(float):
+    """A price, to check the float subclasses."""
+
+
+_Pair = NamedTuple("_Pair", [("number", int), ("name", str)])
 
 
 class TestBaseSerializations:
@@ -63,6 +88,42 @@ class TestBaseSerializations:
         actual_msg = self.message
         assert expected_msg == actual_msg
 
+    def test_messagepack_serialization(self):
+        """Test that the MessagePack serialization preserves the types of the body values."""
+        body = {"none": None, "flags": [True, False], "float": 0.5, "text": "hello" * 10, "content": b"\x00" * 300,
+                "ints": [0, 127, 128, -1, -33, 2 ** 16, -2 ** 16, 2 ** 64 - 1, -2 ** 63],
+                "nested": {"list": list(range(20)), "map": {str(i): i for i in range(20)}}}
+        message_bytes = MessagePackSerializer().encode(Message(body))
+        actual_msg = MessagePackSerializer().decode(message_bytes)
+        assert actual_msg.body == body
+        assert type(actual_msg.get("ints")[0]) == int
+        assert MessagePackSerializer().decode(MessagePackSerializer().encode(Message(pair=(1, 2)))).get("pair") == [1, 2]
+
+    def test_messagepack_serialization_subclasses(self):
+        """Test that the MessagePack serialization encodes the subclasses of the supported types as their base type."""
+        body = {"int_enum": _Color.RED, "str_enum": _Shape.SQUARE, "pair": _Pair(1, "a"),
+                "ordered": OrderedDict([("b", 1), ("a", 2)]), "default": defaultdict(int, a=1), "float": _Price(0.5),
+                "big_int_enum": _Color.BIG}
+        with pytest.raises(ValueError, match="Integer too large"):
+            MessagePackSerializer().encode(Message(body))
+        del body["big_int_enum"]
+        actual_body = MessagePackSerializer().decode(MessagePackSerializer().encode(Message(body))).body
+        assert actual_body == {"int_enum": 1, "str_enum": "square", "pair": [1, "a"], "ordered": {"b": 1, "a": 2},
+                               "default": {"a": 1}, "float": 0.5}
+        assert [type(actual_body[key]) for key in ("int_enum", "str_enum", "float")] == [int, str, float]
+
+    @pytest.mark.parametrize("body", [{"set": {1}}, {"int": 2 ** 64}, {"int": -2 ** 63 - 1}])
+    def test_messagepack_serialization_unsupported_value(self, body):
+        """Test that the MessagePack serialization raises an error for the values it does not support."""
+        with pytest.raises(ValueError):
+            MessagePackSerializer().encode(Message(body))
+
+    @pytest.mark.parametrize("message_bytes", [b"", b"\x81\xa1a", b"\x91\x01", b"\x80\x00", b"\xc1"])
+    def test_messagepack_deserialization_malformed(self, message_bytes):
+        """Test that the MessagePack deserialization raises an error for malformed messages."""
+        with pytest.raises(ValueError):
+            MessagePackSerializer().decode(message_bytes)
+
     def test_str(self):
         """Test the __str__ of the message."""
         assert "hello" in str(self.message2)
@@ -93,3 +154,49 @@ class TestBaseSerializations:
     def test_check_consistency_returns_true(self):
         """Test that the check consistency method returns True."""
         assert self.message.check_consistency()
+
+
+class TestMessageFields:
+    """Test the typed and lazily decoded fields of the messages."""
+
+    class FieldsMessage(Message):
+        """A message with typed fields."""
+
+        __slots__ = ()
+
+        content = MessageField()  # type: MessageField[str]
+        length = MessageField("content_length")  # type: MessageField[int]
+
+    def test_typed_fields(self):
+        """Test that the typed fields get and set the body."""
+        message = self.FieldsMessage(content="hello", content_length=5)
+        assert message.content == "hello"
+        assert message.length == 5
+        message.length = 6
+        assert message.get("content_length") == 6
+        assert self.FieldsMessage.length.name == "content_length"
+
+    def test_slots(self):
+        """Test that the messages have no instance dictionary."""
+        with pytest.raises(AttributeError):
+            self.FieldsMessage().other = "hello"
+
+    def test_lazy_field_decoded_once(self):
+        """Test that a lazy field is decoded on first access only."""
+        decode = mock.Mock(return_value="hello")
+        message = Message(content=LazyField(decode, b"hello"), other=1)
+        assert message.is_set("content")
+        assert not message.is_decoded("content")
+        assert message.get("other") == 1
+        decode.assert_not_called()
+
+        assert message.get("content") == "hello"
+        assert message.get("content") == "hello"
+        decode.assert_called_once_with(b"hello")
+        assert message.is_decoded("content")
+
+    def test_lazy_fields_decoded_by_body(self):
+        """Test that the body decodes the lazy fields."""
+        message = Message(content=LazyField(bytes.decode, b"hello"))
+        assert message.body == {"content": "hello"}
+        assert message == Message(content="hello")
@@ -18,6 +18,7 @@
 # ------------------------------------------------------------------------------
 
 """This module contains the tests for the FIPA protocol."""
+from enum import IntEnum
 from unittest import mock
 
 import pytest
@@ -25,8 +26,17 @@ import pytest
 from aea.mail.base import Envelope
 from aea.protocols.fipa.dialogues import FIPADialogues, FIPADialogue
 from aea.protocols.fipa.message import FIPAMessage
+from aea.protocols.base import FieldDecodingError
+from aea.protocols.fipa import fipa_pb2
 from aea.protocols.fipa.serialization import FIPASerializer
-from aea.protocols.oef.models import Description, Query, Constraint, ConstraintType
+from aea.protocols.oef.models import Attribute, DataModel, Description, Query, Constraint, ConstraintType, And, Or, \
+    Not
+
+
+class _Level(IntEnum):
+    """A level, to check the values of IntEnum types."""
+
+    HIGH = 2
 
 
 def test_fipa_cfp_serialization():
@@ -57,6 +67,23 @@ def test_fipa_cfp_serialization():
         FIPASerializer().encode(msg)
 
 
+@pytest.mark.parametrize("query", [
+    Query([Constraint("price", ConstraintType("<", 10))], order_by="price", limit=3),
+    Query([], order_by="", descending=True),
+    Query([Constraint("city", ConstraintType("==", "London"))], descending=True, limit=2 ** 70),
+])
+def test_fipa_cfp_ranked_query_serialization(query):
+    """Test that the ordering and the limit of the query of a CFP are serialized."""
+    msg = FIPAMessage(message_id=0, dialogue_reference=("0", ""), target=0, performative=FIPAMessage.Performative.CFP, query=query)
+    actual_query = FIPASerializer().decode(FIPASerializer().encode(msg)).get("query")
+    assert actual_query.order_by == query.order_by
+    assert actual_query.descending == query.descending
+    if query.limit is not None and query.limit >= 2 ** 64:
+        assert actual_query.limit == 2 ** 64 - 1
+    else:
+        assert actual_query == query
+
+
 def test_fipa_cfp_serialization_bytes():
     """Test that the serialization - deserialization for the 'fipa' protocol works."""
     query = b'Hello'
@@ -84,6 +111,119 @@ def test_fipa_cfp_serialization_bytes():
     assert msg.get("performative") == deserialised_msg.get("performative")
 
 
+def test_fipa_cfp_serialization_structured_query():
+    """Test that the CFP queries are encoded as protobuf fields, whatever their constraints."""
+    data_model = DataModel("foo", [Attribute("bar", int, True, "A bar attribute."), Attribute("baz", str, False)])
+    query = Query([And([Constraint("bar", ConstraintType("within", (1, 10))),
+                        Or([Constraint("baz", ConstraintType("in", {"a", "b"})),
+                            Not(Constraint("baz", ConstraintType("not_in", ["c"])))])]),
+                   Constraint("price", ConstraintType("<=", 1.5)),
+                   Constraint("available", ConstraintType("==", True))], model=data_model)
+    for q in [query, Query([])]:
+        msg = FIPAMessage(message_id=0, dialogue_reference=(str(0), ''), target=0,
+                          performative=FIPAMessage.Performative.CFP, query=q)
+        msg_bytes = FIPASerializer().encode(msg)
+        assert b"\x80\x03" not in msg_bytes, "The query must not be pickled."
+        assert FIPASerializer().decode(msg_bytes) == msg
+
+
+def test_fipa_propose_serialization_with_data_model():
+    """Test that the proposals are decoded with their data model."""
+    data_model = DataModel("foo", [Attribute("bar", int, True), Attribute("price", float, False)])
+    proposal = [Description({"bar": 1, "price": 2.5, "currency": "FET", "ok": False}, data_model=data_model)]
+    msg = FIPAMessage(message_id=0, dialogue_reference=(str(0), ''), target=0,
+                      performative=FIPAMessage.Performative.PROPOSE, proposal=proposal)
+    actual_msg = FIPASerializer().decode(FIPASerializer().encode(msg))
+    assert actual_msg == msg
+    assert actual_msg.get("proposal")[0].data_model == data_model
+
+    msg.set("proposal", [Description({"bar": [1, 2]})])
+    with pytest.raises(ValueError, match="Value type not supported:"):
+        FIPASerializer().encode(msg)
+
+
+def test_fipa_cfp_serialization_big_integers():
+    """Test that the integers out of the int64 range are encoded in the query constraints."""
+    query = Query([Constraint("price", ConstraintType("<=", 2 ** 64)),
+                   Constraint("id", ConstraintType("in", [-2 ** 63 - 1, 1]))])
+    msg = FIPAMessage(message_id=0, dialogue_reference=(str(0), ''), target=0,
+                      performative=FIPAMessage.Performative.CFP, query=query)
+    assert FIPASerializer().decode(FIPASerializer().encode(msg)) == msg
+
+
+def test_fipa_propose_serialization_value_types():
+    """Test that the proposals are decoded with the values and the types they were encoded with."""
+    values = {"none": None, "true": True, "false": False, "integer": -2 ** 63, "big_integer": 2 ** 64,
+              "negative_big_integer": -2 ** 70, "double": -0.5, "string": "\x00é", "bytes": b"\x00\xff",
+              "int_enum": _Level.HIGH}
+    proposal = [Description(values), Description({}), Description({"string": "", "integer": 2 ** 63 - 1})]
+    msg = FIPAMessage(message_id=0, dialogue_reference=(str(0), ''), target=0,
+                      performative=FIPAMessage.Performative.PROPOSE, proposal=proposal)
+    actual_proposal = FIPASerializer().decode(FIPASerializer().encode(msg)).proposal
+    assert actual_proposal == proposal
+    assert [{key: type(value) for key, value in description.values.items()} for description in actual_proposal] \
+        == [{key: int if type(value) is _Level else type(value) for key, value in description.values.items()}
+            for description in proposal]
+
+
+@pytest.mark.parametrize("column, value", [("sizes", b"\x02\x00\x00\x00"), ("sizes", b"\x01"),
+                                           ("types", b"\x03\x03"), ("types", b"\x09"),
+                                           ("key_indexes", b"\x05\x00\x00\x00"), ("integers", b""),
+                                           ("model_indexes", b"\x02\x00\x00\x00")])
+def test_fipa_propose_inconsistent_columns(column, value):
+    """Test that inconsistent columns of proposals are rejected on access."""
+    msg = FIPAMessage(message_id=0, dialogue_reference=(str(0), ''), target=0,
+                      performative=FIPAMessage.Performative.PROPOSE, proposal=[Description({"foo": 1})])
+    fipa_pb = fipa_pb2.FIPAMessage()
+    fipa_pb.ParseFromString(FIPASerializer().encode(msg))
+    setattr(fipa_pb.propose.proposal, column, value)
+    actual_msg = FIPASerializer().decode(fipa_pb.SerializeToString())
+    with pytest.raises(FieldDecodingError, match="'proposal'"):
+        actual_msg.proposal
+
+
+def test_fipa_propose_lazy_decoding():
+    """Test that the proposal of a decoded PROPOSE is only decoded on first access."""
+    proposal = [Description({"foo1": 1, "bar1": 2})]
+    msg = FIPAMessage(message_id=1, dialogue_reference=("1", "2"), target=0,
+                      performative=FIPAMessage.Performative.PROPOSE, proposal=proposal)
+    actual_msg = FIPASerializer().decode(FIPASerializer().encode(msg))
+    assert actual_msg.performative == FIPAMessage.Performative.PROPOSE
+    assert actual_msg.dialogue_reference == ("1", "2")
+    assert not actual_msg.is_decoded("proposal")
+
+    with mock.patch("aea.protocols.fipa.serialization._descriptions_from_pb",
+                    side_effect=ValueError("decoded")):
+        actual_msg.message_id
+        with pytest.raises(ValueError, match="decoded"):
+            actual_msg.proposal
+
+    assert actual_msg.proposal == proposal
+    assert actual_msg.is_decoded("proposal")
+    assert actual_msg == msg
+
+
+def test_fipa_malformed_fields():
+    """Test that malformed fields are rejected at decoding, or on first access for the lazy ones."""
+    fipa_pb = fipa_pb2.FIPAMessage()
+    fipa_pb.message_id = 1
+    fipa_pb.dialogue_starter_reference = "1"
+    fipa_pb.inform.bytes = b"not json"
+    with pytest.raises(ValueError):
+        FIPASerializer().decode(fipa_pb.SerializeToString())
+
+    fipa_pb = fipa_pb2.FIPAMessage()
+    fipa_pb.message_id = 1
+    fipa_pb.dialogue_starter_reference = "1"
+    fipa_pb.propose.proposal.sizes = b"\x01\x00\x00\x00"
+    actual_msg = FIPASerializer().decode(fipa_pb.SerializeToString())
+    with pytest.raises(FieldDecodingError, match="'proposal'"):
+        actual_msg.proposal
+    with pytest.raises(FieldDecodingError):
+        actual_msg.body
+    assert not actual_msg.is_decoded("proposal")
+
+
 def test_fipa_propose_serialization():
     """Test that the serialization for the 'fipa' protocol works."""
     proposal = [
@@ -164,6 +164,24 @@ class TestResources:
         self.resources.handler_registry.register((None, "dummy"), [dummy_handler])
         assert len(self.resources.handler_registry.fetch_all()) == 2
 
+    def test_precomputed_handlers(self):
+        """Test that the registries return the same tuples until the skills change."""
+        handler_registry = self.resources.handler_registry
+        default_handlers = handler_registry.fetch("default")
+        assert isinstance(default_handlers, tuple)
+        assert handler_registry.fetch("default") is default_handlers
+        assert self.aea.filter.get_active_handlers("default") is default_handlers
+        assert self.aea.filter.get_active_behaviours() is self.resources.behaviour_registry.fetch_all()
+        assert self.aea.filter.get_active_tasks() is self.resources.task_registry.fetch_all()
+
+        dummy_handler = handler_registry.fetch_by_skill("default", "dummy")
+        handler_registry.unregister("dummy")
+        assert dummy_handler not in handler_registry.fetch("default")
+        assert dummy_handler not in handler_registry.fetch_all()
+        handler_registry.register((None, "dummy"), [dummy_handler])
+        assert handler_registry.fetch("default") is not default_handlers
+        assert set(handler_registry.fetch("default")) == set(default_handlers)
+
     def test_fake_skill_loading_failed(self):
         """Test that when the skill is bad formatted, we print a log message."""
         s = "A problem occurred while parsing the skill directory {}. Exception: {}".format(
@@ -0,0 +1,139 @@
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests for the schedules of the behaviours and tasks."""
+import datetime
+from queue import Queue
+from unittest import mock
+
+import pytest
+
+from aea.configurations.base import BehaviourConfig, TaskConfig
+from aea.registries.base import Filter, Resources
+from aea.skills.schedule import CronExpression, Schedule
+
+
+def _timestamp(*args) -> float:
+    """Get the timestamp of a local date."""
+    return datetime.datetime(*args).timestamp()
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("*/15 9-17 * * 1-5", (2026, 10, 17, 8, 0), (2026, 10, 19, 9, 0)),
+    ("*/15 9-17 * * 1-5", (2026, 10, 19, 9, 0), (2026, 10, 19, 9, 15)),
+    ("0 0 29 2 *", (2026, 10, 17), (2028, 2, 29)),
+    ("30 12 13 * 5", (2026, 10, 17), (2026, 10, 23, 12, 30)),
+    ("0 0 * * 7", (2026, 10, 17), (2026, 10, 18)),
+    ("5,10-11 * * * *", (2026, 10, 17, 8, 10), (2026, 10, 17, 8, 11)),
+    ("0 0 1 1 *", (2026, 12, 31, 23, 59), (2027, 1, 1)),
+    ("0 * * * *", (2024, 2, 29, 12, 0), (2024, 2, 29, 13, 0)),
+])
+def test_cron_expression(expression, after, expected):
+    """Test that the cron expressions match the expected times."""
+    assert CronExpression(expression).next_after(_timestamp(*after)) == _timestamp(*expected)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* * 0 * *", "*/0 * * * *", "a * * * *", "* * * * 8"])
+def test_cron_expression_not_valid(expression):
+    """Test that the invalid cron expressions are rejected."""
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_cron_expression_never_matches():
+    """Test that a cron expression which never matches raises an error."""
+    with pytest.raises(ValueError, match="never matches"):
+        CronExpression("0 0 31 2 *").next_after(_timestamp(2026, 1, 1))
+
+
+@pytest.mark.parametrize("obj", [{}, {"interval": 1, "cron": "* * * * *"}, {"interval": 0}, {"one_shot": True, "delay": -1},
+                                 {"cron": "* * * * *", "delay": 1}])
+def test_schedule_not_valid(obj):
+    """Test that the invalid schedules are rejected."""
+    with pytest.raises(ValueError):
+        Schedule.from_json(obj)
+
+
+def test_schedule():
+    """Test the due times of the schedules."""
+    periodic = Schedule.from_json({"interval": 10, "delay": 5})
+    assert periodic.first(100) == 105
+    assert periodic.next(105, 106) == 115
+    assert periodic.next(105, 142) == 152, "A late periodic schedule skips the runs it missed."
+    one_shot = Schedule(one_shot=True)
+    assert one_shot.first(100) == 100
+    assert one_shot.next(100, 100) is None
+    cron = Schedule(cron="0 * * * *")
+    assert cron.next(0, _timestamp(2026, 10, 17, 8, 30)) == _timestamp(2026, 10, 17, 9)
+    assert Schedule.from_json(periodic.json) == periodic
+
+
+def test_configuration_schedule():
+    """Test that the configurations of the behaviours and tasks hold their schedule."""
+    config = BehaviourConfig.from_json({"class_name": "MyBehaviour", "args": {"arg": 1}, "schedule": {"interval": 5}})
+    assert config.schedule == {"interval": 5}
+    assert config.args == {"arg": 1}
+    assert BehaviourConfig.from_json(config.json).json == config.json
+    assert "schedule" not in TaskConfig.from_json({"class_name": "MyTask"}).json
+
+
+class TestFilterSchedules:
+    """Test that the filter only selects the behaviours and tasks which are due."""
+
+    def setup_method(self):
+        """Set up the test."""
+        self.now = 1000.0
+        self.resources = Resources()
+        self.filter = Filter(self.resources, Queue(), clock=lambda: self.now)
+        self.always = mock.Mock(schedule=None)
+        self.periodic = mock.Mock(schedule=Schedule(interval=10))
+        self.one_shot = mock.Mock(schedule=Schedule(one_shot=True, delay=5))
+        self.resources.behaviour_registry.register((None, "skill"), [self.always, self.periodic, self.one_shot])
+
+    def test_due_behaviours(self):
+        """Test the behaviours selected over time."""
+        assert self.filter.get_active_behaviours() == (self.always, self.periodic)
+        self.now = 1001
+        assert self.filter.get_active_behaviours() == (self.always,)
+        self.now = 1005
+        assert self.filter.get_active_behaviours() == (self.always, self.one_shot)
+        self.now = 1010
+        assert self.filter.get_active_behaviours() == (self.always, self.periodic)
+        self.now = 1100
+        assert self.filter.get_active_behaviours() == (self.always, self.periodic)
+        self.now = 1105
+        assert self.filter.get_active_behaviours() == (self.always,)
+
+    def test_schedules_kept_when_skills_change(self):
+        """Test that the due times and the finished one-shot behaviours survive a change of the registry."""
+        assert self.filter.get_active_behaviours() == (self.always, self.periodic)
+        self.now = 1005
+        assert self.filter.get_active_behaviours() == (self.always, self.one_shot)
+        other = mock.Mock(schedule=Schedule(interval=1))
+        self.resources.behaviour_registry.register((None, "other"), [other])
+        self.now = 1006
+        assert self.filter.get_active_behaviours() == (self.always, other)
+        self.now = 1010
+        assert self.filter.get_active_behaviours() == (self.always, other, self.periodic)
+
+    def test_unscheduled_tasks(self):
+        """Test that the tasks without a schedule are returned as registered."""
+        task = mock.Mock(schedule=None)
+        self.resources.task_registry.register((None, "skill"), [task])
+        assert self.filter.get_active_tasks() is self.resources.task_registry.fetch_all()
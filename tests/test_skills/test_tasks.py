@@ -0,0 +1,209 @@
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains the tests for the executors of the tasks."""
+import operator
+import os
+import threading
+from queue import Queue
+from unittest import mock
+
+import pytest
+import yaml
+
+from aea.configurations.base import DEFAULT_SKILL_CONFIG_FILE, TaskConfig
+from aea.registries.base import Filter, Resources, TASK_MANAGER
+from aea.skills.base import Skill, Task
+from aea.skills.tasks import TaskExecutorType, TaskManager, TaskResultMessage
+
+
+class DummyTask(Task):
+    """A task which returns its argument, after an optional event is set."""
+
+    def setup(self) -> None:
+        """Set up the task."""
+
+    def execute(self):
+        """Execute the task."""
+        event = self.config.get("event")
+        if event is not None:
+            event.wait(5.0)
+        if self.config.get("fail", False):
+            raise ValueError("failed")
+        return self.config.get("value")
+
+    def teardown(self) -> None:
+        """Teardown the task."""
+
+
+class AddTask(DummyTask):
+    """A task which runs operator.add in another process."""
+
+    def job(self):
+        """Get the picklable job of the task."""
+        return operator.add, (self.config["a"], self.config["b"])
+
+
+_PROCESS_TASK_MODULE = """
+import os
+
+from aea.skills.base import Task
+
+from process_task_skill.helpers import add
+
+
+class PidTask(Task):
+    def setup(self):
+        pass
+
+    def execute(self):
+        return os.getpid(), self.context, add(self.config["a"], self.config["b"])
+
+    def teardown(self):
+        pass
+"""
+
+
+def _wait_results(manager: TaskManager, count: int):
+    """Wait for a number of completed executions, and get their messages."""
+    return [manager.get_result_message(*manager.completed.get(timeout=30.0)) for _ in range(count)]
+
+
+def test_configuration_executor():
+    """Test that the executor settings of a task are parsed and serialized."""
+    config = TaskConfig.from_json({"class_name": "DummyTask", "executor": "thread", "max_concurrency": 2, "args": {"value": 1}})
+    assert config.executor == "thread" and config.max_concurrency == 2 and config.args == {"value": 1}
+    assert TaskConfig.from_json(config.json).json == config.json
+    assert "executor" not in TaskConfig("DummyTask").json
+
+
+def test_task_executor():
+    """Test the executor settings of a task."""
+    task = DummyTask(skill_context=mock.Mock())
+    assert task.executor == TaskExecutorType.INLINE and task.max_concurrency == 1
+    task = DummyTask(skill_context=mock.Mock(), executor="process", max_concurrency=3)
+    assert task.executor == TaskExecutorType.PROCESS and task.max_concurrency == 3
+    with pytest.raises(ValueError):
+        DummyTask(skill_context=mock.Mock(), executor="fiber")
+
+
+class TestTaskManager:
+    """Test the task manager."""
+
+    def setup_method(self):
+        """Set up the test."""
+        self.manager = TaskManager(max_workers=2)
+
+    def test_inline(self):
+        """Test that an inline task runs on the calling thread and returns its result."""
+        task = DummyTask(skill_context=mock.Mock(), value=42)
+        assert self.manager.execute(task) == 42
+        assert self.manager.completed.empty()
+
+    def test_thread(self):
+        """Test that a thread task delivers its result, or its exception."""
+        task = DummyTask(skill_context=mock.Mock(), executor="thread", value=42)
+        failing = DummyTask(skill_context=mock.Mock(), executor="thread", fail=True)
+        self.manager.execute(task)
+        self.manager.execute(failing)
+        messages = {message.get("task"): message for message in _wait_results(self.manager, 2)}
+        assert messages[task].get("performative") == TaskResultMessage.Performative.RESULT
+        assert messages[task].get("result") == 42
+        assert messages[failing].get("performative") == TaskResultMessage.Performative.ERROR
+        assert isinstance(messages[failing].get("error"), ValueError)
+
+    def test_process(self):
+        """Test that a process task runs its job in another process."""
+        task = AddTask(skill_context=mock.Mock(), executor="process", a=1, b=2)
+        self.manager.execute(task)
+        message, = _wait_results(self.manager, 1)
+        assert message.get("result") == 3
+
+    def test_process_job_from_skill_module(self, tmp_path):
+        """Test that a process task defined in a skill runs its default job in a worker process, without its context."""
+        skill_directory = tmp_path / "process_task"
+        skill_directory.mkdir()
+        (skill_directory / "__init__.py").write_text("")
+        (skill_directory / "helpers.py").write_text("def add(a, b):\n    return a + b\n")
+        (skill_directory / "tasks.py").write_text(_PROCESS_TASK_MODULE)
+        (skill_directory / DEFAULT_SKILL_CONFIG_FILE).write_text(yaml.safe_dump({
+            "name": "process_task", "authors": "Fetch.AI Limited", "version": "0.1.0", "license": "Apache 2.0",
+            "url": "", "behaviours": [], "handlers": [], "shared_classes": [], "protocols": [],
+            "tasks": [{"task": {"class_name": "PidTask", "executor": "process", "args": {"a": 1, "b": 2}}}]}))
+        skill = Skill.from_dir(str(skill_directory), mock.Mock())
+        task, = skill.tasks
+        self.manager.execute(task)
+        message, = _wait_results(self.manager, 1)
+        assert message.get("performative") == TaskResultMessage.Performative.RESULT, message.get("error")
+        pid, context, result = message.get("result")
+        assert pid != os.getpid() and context is None and result == 3
+        assert task.context is skill.skill_context
+
+    def test_process_job_not_picklable(self):
+        """Test that a process task whose job cannot be pickled fails without reaching the pool."""
+        task = DummyTask(skill_context=mock.Mock(), executor="process")
+        with mock.patch.object(task, "job", return_value=(lambda: 1, ())):  # type: ignore
+            self.manager.execute(task)
+        message, = _wait_results(self.manager, 1)
+        assert message.get("performative") == TaskResultMessage.Performative.ERROR
+        assert isinstance(message.get("error"), ValueError)
+        assert "cannot be sent to a worker process" in str(message.get("error"))
+
+    def test_concurrency_limit_and_cancel(self):
+        """Test that the executions in flight are limited, and that the pending ones can be cancelled."""
+        event = threading.Event()
+        blocking = DummyTask(skill_context=mock.Mock(), executor="thread", max_concurrency=2, event=event)
+        task = DummyTask(skill_context=mock.Mock(), executor="thread", max_concurrency=5, value=1)
+        running = [self.manager.execute(blocking), self.manager.execute(blocking)]
+        assert self.manager.execute(blocking) is None
+        pending = self.manager.execute(task)
+        assert self.manager.running(blocking) == tuple(running)
+        assert self.manager.cancel(task) == 1 and pending.cancelled()
+        event.set()
+        messages = _wait_results(self.manager, 3)
+        performatives = sorted(message.get("performative").value for message in messages)
+        assert performatives == ["cancelled", "result", "result"]
+        assert self.manager.running(blocking) == ()
+        assert self.manager.execute(blocking) is not None
+
+    def teardown_method(self):
+        """Tear down the test."""
+        self.manager.shutdown()
+
+
+def test_filter_delivers_results():
+    """Test that the filter delivers the results of the tasks to the handler of their skill for the 'task' protocol."""
+    manager = TaskManager()
+    resources = Resources()
+    filter = Filter(resources, Queue(), task_manager=manager)
+    task = DummyTask(skill_context=mock.Mock(), executor="thread", value="done")
+    handler = mock.Mock(SUPPORTED_PROTOCOL=TaskResultMessage.protocol_id)
+    internal_handler = mock.Mock(SUPPORTED_PROTOCOL="internal")
+    resources.task_registry.register((None, "skill"), [task])
+    resources.handler_registry.register((None, "skill"), [handler, internal_handler])
+    completed = threading.Event()
+    manager.completed.add_listener(completed.set)
+    manager.execute(task)
+    assert completed.wait(5.0)
+    filter.handle_internal_messages()
+    message, sender = handler.handle.call_args[0]
+    assert sender == TASK_MANAGER and message.get("result") == "done"
+    internal_handler.handle.assert_not_called()
+    assert manager.completed.empty()
+    manager.shutdown()